@@ -0,0 +1,130 @@
+# app/arranque.py
+"""
+Informe del costo de arranque de un worker.
+
+- Fases: InformeArranque mide cada fase del arranque (migraciones, tareas en segundo
+  plano). El lifespan de app.main lo registra en el log y lo deja en
+  `app.state.informe_arranque`.
+- Importaciones: `medir_importaciones` importa un módulo en un intérprete nuevo con
+  `python -X importtime` y agrupa el costo por módulo y por paquete de primer nivel.
+
+Uso: python -m app.arranque [--modulo app.main] [--limite 15] [--db database.db]
+"""
+import argparse
+import logging
+import re
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Tuple
+from infrastructure.registro import configurar_registro
+
+logger = logging.getLogger(__name__)
+
+_LINEA_IMPORTTIME = re.compile(r"^import time:\s*(\d+)\s*\|\s*(\d+)\s*\|(\s*)(\S+)\s*$")
+
+
+class InformeArranque:
+    """
+    Duración de cada fase del arranque, en el orden en que ocurrieron.
+    """
+
+    def __init__(self):
+        self.fases: List[Tuple[str, float]] = []
+
+    def registrar(self, nombre: str, segundos: float) -> None:
+        self.fases.append((nombre, segundos))
+
+    @contextmanager
+    def fase(self, nombre: str) -> Iterator[None]:
+        """Mide la duración del bloque y la registra con el nombre dado."""
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.registrar(nombre, time.perf_counter() - inicio)
+
+    def total(self) -> float:
+        return sum(segundos for _, segundos in self.fases)
+
+    def formatear(self) -> str:
+        lineas = [f"  {nombre:<24}{segundos * 1000:>10.1f} ms" for nombre, segundos in self.fases]
+        lineas.append(f"  {'total':<24}{self.total() * 1000:>10.1f} ms")
+        return "\n".join(lineas)
+
+
+def analizar_importtime(salida: str) -> List[Tuple[str, int, int, int]]:
+    """
+    Interpreta la salida de `python -X importtime`.
+
+    Returns:
+        List[Tuple[str, int, int, int]]: (módulo, microsegundos propios, microsegundos
+            acumulados, profundidad de anidamiento) por cada importación
+    """
+    importaciones = []
+    for linea in salida.splitlines():
+        coincidencia = _LINEA_IMPORTTIME.match(linea)
+        if coincidencia:
+            propio, acumulado, sangria, modulo = coincidencia.groups()
+            importaciones.append((modulo, int(propio), int(acumulado), (len(sangria) - 1) // 2))
+    return importaciones
+
+
+def costo_por_paquete(importaciones: List[Tuple[str, int, int, int]]) -> Dict[str, int]:
+    """Suma los microsegundos propios de cada paquete de primer nivel, de mayor a menor."""
+    paquetes: Dict[str, int] = defaultdict(int)
+    for modulo, propio, _, _ in importaciones:
+        paquetes[modulo.split(".")[0]] += propio
+    return dict(sorted(paquetes.items(), key=lambda par: par[1], reverse=True))
+
+
+def costo_total(importaciones: List[Tuple[str, int, int, int]], modulo: str) -> int:
+    """Microsegundos acumulados de importar `modulo`, incluidos sus paquetes padre."""
+    paquete = modulo.split(".")[0]
+    return sum(
+        acumulado for nombre, _, acumulado, profundidad in importaciones
+        if profundidad == 0 and nombre.split(".")[0] == paquete
+    )
+
+
+def medir_importaciones(modulo: str = "app.main") -> List[Tuple[str, int, int, int]]:
+    """Importa `modulo` en un intérprete nuevo y retorna el costo de cada importación."""
+    resultado = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {modulo}"],
+        capture_output=True, text=True, check=True
+    )
+    return analizar_importtime(resultado.stderr)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Informa el costo de arranque de la aplicación.")
+    parser.add_argument("--modulo", default="app.main", help="Módulo cuya importación se mide")
+    parser.add_argument("--limite", type=int, default=15, help="Módulos y paquetes listados")
+    parser.add_argument("--db", default="database.db", help="Ruta a la base de datos SQLite")
+    args = parser.parse_args(argv)
+
+    configurar_registro()
+    importaciones = medir_importaciones(args.modulo)
+    print(f"Importaciones más costosas (tiempo propio) de {args.modulo}:")
+    for modulo, propio, acumulado, _ in sorted(importaciones, key=lambda i: i[1], reverse=True)[:args.limite]:
+        print(f"  {modulo:<56}{propio / 1000:>10.1f} ms  (acumulado {acumulado / 1000:.1f} ms)")
+    print("Por paquete:")
+    for paquete, propio in list(costo_por_paquete(importaciones).items())[:args.limite]:
+        print(f"  {paquete:<56}{propio / 1000:>10.1f} ms")
+
+    from app.contenedor import Contenedor
+    informe = InformeArranque()
+    informe.registrar(f"importar {args.modulo}", costo_total(importaciones, args.modulo) / 1_000_000)
+    contenedor = Contenedor(db_path=args.db)
+    try:
+        contenedor.iniciar(informe)
+    finally:
+        contenedor.detener()
+    print("Fases del arranque:")
+    print(informe.formatear())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,192 @@
+# app/contenedor.py
+"""
+Contenedor de dependencias de la aplicación.
+
+Cada dependencia se construye al primer uso (incluidas sus importaciones) y se reutiliza
+después. Así importar app.main no ejecuta DDL, no abre conexiones ni importa pymongo: eso
+ocurre en el lifespan de FastAPI (ver `iniciar`) o en la primera petición que lo necesite.
+"""
+import logging
+import threading
+from typing import Callable, Dict, Optional
+from app.arranque import InformeArranque
+from infrastructure.metricas import Metricas, instrumentar
+
+logger = logging.getLogger(__name__)
+
+
+class Contenedor:
+    """
+    Construye y cachea los repositorios, servicios y tareas en segundo plano de la aplicación.
+    """
+
+    def __init__(
+        self,
+        db_path: str = "database.db",
+        mongo_uri: Optional[str] = None,
+        cache_cuentas: bool = True,
+        metricas: Optional[Metricas] = None,
+        replicar_mongo: bool = True
+    ):
+        """
+        Args:
+            db_path: Ruta al archivo de base de datos SQLite
+            mongo_uri: URI de MongoDB (réplica); por defecto la de MongoTransactionRepository
+            cache_cuentas: Servir las lecturas de cuentas desde un CachedAccountRepository
+            metricas: Si se indican, los servicios y repositorios se construyen instrumentados
+                (ver infrastructure/metricas.py); sin ellas no se envuelve nada
+            replicar_mongo: Iniciar el replicador a MongoDB, que activa el encolado en la
+                outbox; sin él SQLite no encola nada (ver infrastructure/db/replicador_mongo.py)
+        """
+        self.db_path = db_path
+        self.mongo_uri = mongo_uri
+        self.cache_cuentas = cache_cuentas
+        self.metricas = metricas
+        self.replicar_mongo = replicar_mongo
+        self._instancias: Dict[str, object] = {}
+        self._lock = threading.RLock()  # Reentrante: una dependencia construye las suyas
+
+    def _obtener(self, nombre: str, fabrica: Callable[[], object]):
+        instancia = self._instancias.get(nombre)
+        if instancia is None:
+            with self._lock:
+                instancia = self._instancias.get(nombre)
+                if instancia is None:
+                    instancia = self._instancias[nombre] = fabrica()
+                    logger.debug("Dependencia construida: %s", nombre)
+        return instancia
+
+    def construida(self, nombre: str) -> bool:
+        """Indica si la dependencia ya fue construida."""
+        return nombre in self._instancias
+
+    @property
+    def account_repository(self):
+        def fabrica():
+            from infrastructure.repositories.sqlite_account_repository import SQLiteAccountRepository
+            repositorio = SQLiteAccountRepository(db_path=self.db_path)
+            if self.cache_cuentas:
+                from infrastructure.repositories.cached_account_repository import CachedAccountRepository
+                repositorio = CachedAccountRepository(repositorio)
+            return instrumentar(repositorio, "repositorio", self.metricas)
+        return self._obtener("account_repository", fabrica)
+
+    @property
+    def transaction_repository(self):
+        def fabrica():
+            from infrastructure.repositories.sqlite_transaction_repository import SQLiteTransactionRepository
+            # Con caché de cuentas, cada saldo confirmado se aplica también a la cuenta en caché
+            al_cambiar_saldo = self.account_repository.actualizar_saldo if self.cache_cuentas else None
+            repositorio = SQLiteTransactionRepository(db_path=self.db_path, al_cambiar_saldo=al_cambiar_saldo)
+            return instrumentar(repositorio, "repositorio", self.metricas)
+        return self._obtener("transaction_repository", fabrica)
+
+    @property
+    def transaction_service(self):
+        def fabrica():
+            from domain.services.transaction_service import TransactionService
+            servicio = TransactionService(
+                transaction_repository=self.transaction_repository,
+                account_repository=self.account_repository
+            )
+            return instrumentar(servicio, "servicio", self.metricas)
+        return self._obtener("transaction_service", fabrica)
+
+    @property
+    def transaction_app_service(self):
+        def fabrica():
+            from application.services.transaction_application_service import TransactionApplicationService
+            servicio = TransactionApplicationService(
+                transaction_service=self.transaction_service,
+                account_repository=self.account_repository
+            )
+            return instrumentar(servicio, "aplicacion", self.metricas)
+        return self._obtener("transaction_app_service", fabrica)
+
+    @property
+    def async_account_repository(self):
+        def fabrica():
+            from infrastructure.repositories.async_sqlite_account_repository import AsyncSQLiteAccountRepository
+            from infrastructure.db.sqlite_pool import obtener_pool
+            repositorio = AsyncSQLiteAccountRepository(pool=obtener_pool(self.db_path), repositorio=self.account_repository)
+            return instrumentar(repositorio, "repositorio", self.metricas)
+        return self._obtener("async_account_repository", fabrica)
+
+    @property
+    def async_transaction_repository(self):
+        def fabrica():
+            from infrastructure.repositories.async_sqlite_transaction_repository import AsyncSQLiteTransactionRepository
+            repositorio = AsyncSQLiteTransactionRepository(repositorio=self.transaction_repository)
+            return instrumentar(repositorio, "repositorio", self.metricas)
+        return self._obtener("async_transaction_repository", fabrica)
+
+    @property
+    def async_transaction_app_service(self):
+        """
+        Servicio usado por los endpoints async def (SQLite en el hilo de E/S del pool).
+        Es compartido; cada operación abre su propia unidad de trabajo.
+        """
+        def fabrica():
+            from application.services.async_transaction_application_service import AsyncTransactionApplicationService
+            servicio = AsyncTransactionApplicationService(
+                transaction_repository=self.async_transaction_repository,
+                account_repository=self.async_account_repository,
+                envolver_servicio=lambda s: instrumentar(s, "servicio", self.metricas)
+            )
+            return instrumentar(servicio, "aplicacion", self.metricas)
+        return self._obtener("async_transaction_app_service", fabrica)
+
+    @property
+    def mongo_transaction_repository(self):
+        def fabrica():
+            from infrastructure.repositories.mongo_transaction_repository import MongoTransactionRepository
+            if self.mongo_uri is None:
+                repositorio = MongoTransactionRepository()
+            else:
+                repositorio = MongoTransactionRepository(self.mongo_uri)
+            return instrumentar(repositorio, "repositorio", self.metricas)
+        return self._obtener("mongo_transaction_repository", fabrica)
+
+    @property
+    def replicador_mongo(self):
+        """Réplica asíncrona en MongoDB: drena la outbox que SQLite llena en cada escritura."""
+        def fabrica():
+            from infrastructure.db.replicador_mongo import ReplicadorMongo
+            repositorio = self.mongo_transaction_repository
+            return ReplicadorMongo(repositorio.db, db_path=self.db_path, preparar=repositorio.asegurar_indices)
+        return self._obtener("replicador_mongo", fabrica)
+
+    @property
+    def limpieza_limites(self):
+        """Limpieza de los límites diarios vencidos (SQLite; en MongoDB lo hace un índice TTL)."""
+        def fabrica():
+            from infrastructure.db.limites_diarios import LimpiezaLimitesDiarios
+            return LimpiezaLimitesDiarios(db_path=self.db_path)
+        return self._obtener("limpieza_limites", fabrica)
+
+    def iniciar(self, informe: Optional[InformeArranque] = None) -> InformeArranque:
+        """
+        Prepara la aplicación para atender peticiones: migra SQLite e inicia las tareas en
+        segundo plano. Cada fase queda medida en el informe.
+
+        MongoDB es una réplica y el arranque no lo espera: el replicador aplica sus índices
+        antes del primer lote y reintenta mientras no esté disponible.
+        """
+        informe = informe or InformeArranque()
+        with informe.fase("sqlite"):  # Ejecuta las migraciones: la outbox debe existir antes de replicar
+            self.async_transaction_app_service
+        with informe.fase("tareas"):
+            if self.replicar_mongo:
+                self.replicador_mongo.iniciar()
+            self.limpieza_limites.iniciar()
+        return informe
+
+    def detener(self) -> None:
+        """Detiene las tareas en segundo plano iniciadas y cierra los clientes MongoDB."""
+        if self.construida("limpieza_limites"):
+            self.limpieza_limites.detener()
+        if self.construida("replicador_mongo"):
+            self.replicador_mongo.detener()
+        if self.construida("mongo_transaction_repository"):
+            from infrastructure.db.mongo_clientes import cerrar_clientes
+            cerrar_clientes()
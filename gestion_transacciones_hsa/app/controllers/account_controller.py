@@ -1,9 +1,8 @@
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Request
 from uuid import UUID, uuid4
 from decimal import Decimal
 from domain.entities.account import Account
-from infrastructure.repositories.sqlite_account_repository import SQLiteAccountRepository
-from infrastructure.repositories.mongo_account_repository import MongoAccountRepository
+from domain.repositories.i_async_account_repository import IAsyncAccountRepository
 import logging
 
 logger = logging.getLogger(__name__)
@@ -11,23 +10,18 @@ logger = logging.getLogger(__name__)
 # Crear el router
 router = APIRouter()
 
-def get_account_repository() -> SQLiteAccountRepository:
-    from app.main import account_repository
-    return account_repository
-
-def get_mongo_repository():
-    from app.main import mongo_account_repository
-    return mongo_account_repository
+def get_account_repository(request: Request) -> IAsyncAccountRepository:
+    return request.app.state.contenedor.async_account_repository
 
 @router.post("/cuentas/")
-def crear_cuenta(
+async def crear_cuenta(
     cuenta_json: dict,
-    sqlite_repository: SQLiteAccountRepository = Depends(get_account_repository),
-    mongo_repository: MongoAccountRepository = Depends(get_mongo_repository)
+    sqlite_repository: IAsyncAccountRepository = Depends(get_account_repository)
 ):
     """
     Crea una nueva cuenta en la base de datos.
     Genera automáticamente 'id' y 'usuario_id' si no se proporcionan.
+    La réplica en MongoDB es asíncrona (ver infrastructure/db/replicador_mongo.py).
     """
     try:
         # Generar 'id' automáticamente si no se proporciona
@@ -44,15 +38,8 @@ def crear_cuenta(
             limite_diario=Decimal(str(cuenta_json.get("limite_diario", 2000.00)))
         )
 
-        # Guardar la cuenta en la base de datos
-        sqlite_repository.guardar(nueva_cuenta)
-        
-        # Guardar en MongoDB
-        try:
-            mongo_repository.guardar(nueva_cuenta)
-        except Exception as e:
-            logger.error(f"Error al guardar en MongoDB: {str(e)}")
-            # Continuar aunque falle MongoDB
+        # Guardar la cuenta en la base de datos (encola la réplica en la outbox)
+        await sqlite_repository.guardar(nueva_cuenta)
 
         return {"message": "Cuenta creada con éxito", "cuenta_id": str(nueva_cuenta.id), "usuario_id": str(nueva_cuenta.usuario_id)}
     except ValueError as e:
@@ -1,29 +1,26 @@
-from fastapi import APIRouter, HTTPException, Depends
-from application.services.transaction_application_service import TransactionApplicationService
+from fastapi import APIRouter, HTTPException, Depends, Query, Request
+from fastapi.responses import StreamingResponse
+from application.services.async_transaction_application_service import AsyncTransactionApplicationService
 from app.mappers.transaction_mapper import TransactionMapper
 from application.dtos.transaction_dto import TransactionDTO
 from uuid import UUID, uuid4
-from typing import List
+from typing import Annotated, AsyncIterator, List, Optional, Union
+from contextlib import aclosing
 from application.dtos.informe_dto import InformeDTO
 from pydantic import BaseModel
 from datetime import datetime
 import logging
 from domain.entities.transaction import TransactionState
+from domain.repositories.proyeccion_transaccion import ProyeccionTransaccion
 
 logger = logging.getLogger(__name__)
-logger.setLevel(logging.DEBUG)
 
 # Crear el router para las rutas relacionadas con transacciones
 router = APIRouter()
 
-# Función para obtener la instancia del servicio de aplicación desde main.py
-def get_transaction_app_service() -> TransactionApplicationService:
-    from app.main import transaction_app_service
-    return transaction_app_service
-
-def get_mongo_transaction_service():
-    from app.main import mongo_transaction_service
-    return mongo_transaction_service
+# Función para obtener el servicio de aplicación del contenedor creado en el lifespan (ver app/main.py)
+def get_transaction_app_service(request: Request) -> AsyncTransactionApplicationService:
+    return request.app.state.contenedor.async_transaction_app_service
 
 class TransactionRequest(BaseModel):
     cuenta_id: UUID
@@ -33,17 +30,17 @@ class TransactionRequest(BaseModel):
     fecha: str
 
 @router.post("/transacciones/")
-def realizar_transaccion(
+async def realizar_transaccion(
     transaction_request: TransactionRequest,
-    transaction_app_service: TransactionApplicationService = Depends(get_transaction_app_service),
-    mongo_service = Depends(get_mongo_transaction_service)
+    transaction_app_service: AsyncTransactionApplicationService = Depends(get_transaction_app_service)
 ):
     """
     Realiza una transacción.
     Espera un objeto TransactionRequest con los campos necesarios.
+    La réplica en MongoDB es asíncrona (ver infrastructure/db/replicador_mongo.py).
     """
     try:
-        logger.debug(f"Iniciando procesamiento de transacción con request: {transaction_request}")
+        logger.debug("Iniciando procesamiento de transacción con request: %s", transaction_request)
         
         # Validar estado antes de procesar
         estado = transaction_request.estado.upper()
@@ -61,7 +58,7 @@ def realizar_transaccion(
             "estado": estado,
             "fecha": transaction_request.fecha
         }
-        logger.debug(f"JSON creado: {transaction_json}")
+        logger.debug("JSON creado: %s", transaction_json)
 
         # Validar los campos requeridos
         if not all([transaction_json["cuenta_id"], transaction_json["monto"], 
@@ -71,20 +68,10 @@ def realizar_transaccion(
 
         logger.debug("Convirtiendo JSON a DTO...")
         transaction_dto = TransactionMapper.json_to_dto(transaction_json)
-        logger.debug(f"DTO creado exitosamente: {transaction_dto}")
+        logger.debug("DTO creado exitosamente: %s", transaction_dto)
         
         logger.debug("Realizando transacción...")
-        transaction_app_service.realizar_transaccion(transaction_dto)  # SQLite
-        
-        try:
-            # Convertir DTO a entidad para MongoDB
-            transaction_entity = TransactionMapper.dto_to_entity(transaction_dto)
-            logger.debug(f"Intentando guardar en MongoDB: {transaction_entity}")
-            mongo_service.procesar_transaccion(transaction_entity)
-            logger.debug("Transacción guardada exitosamente en MongoDB")
-        except Exception as e:
-            logger.error(f"Error al guardar en MongoDB: {str(e)}", exc_info=True)
-            # Continuar aunque falle MongoDB
+        await transaction_app_service.realizar_transaccion(transaction_dto)  # SQLite (encola la réplica en la outbox)
         
         logger.debug("Transacción completada exitosamente")
         
@@ -92,67 +79,101 @@ def realizar_transaccion(
                 "transaction_id": transaction_json["id"]}
                 
     except ValueError as e:
-        logger.error(f"Error de validación: {str(e)}", exc_info=True)
+        logger.error("Error de validación: %s", e, exc_info=True)
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         # Agregar logging del error real
-        logger.error(f"Error inesperado: {str(e)}", exc_info=True)
+        logger.error("Error inesperado: %s", e, exc_info=True)
         raise HTTPException(status_code=500, 
                           detail=f"Error interno del servidor: {str(e)}")
 
-@router.get("/transacciones/{cuenta_id}", response_model=List[dict])
-def listar_transacciones(
+# Tamaño de página cuando se envía `after` sin `limit`, y máximo permitido
+LIMITE_PAGINA_DEFECTO = 20
+LIMITE_PAGINA_MAXIMO = 500
+
+@router.get("/transacciones/{cuenta_id}", response_model=Union[List[dict], dict])
+async def listar_transacciones(
     cuenta_id: UUID,
-    transaction_app_service: TransactionApplicationService = Depends(get_transaction_app_service)
+    transaction_app_service: AsyncTransactionApplicationService = Depends(get_transaction_app_service),
+    limit: Annotated[Optional[int], Query(ge=1, le=LIMITE_PAGINA_MAXIMO)] = None,
+    after: Annotated[Optional[str], Query()] = None
 ):
     """
-    Lista todas las transacciones de una cuenta específica.
+    Lista las transacciones de una cuenta específica.
+    Sin `limit` ni `after` retorna el historial completo (lista), que se escribe en la
+    respuesta a medida que se lee, sin construir entidades ni DTOs. Cada lote se lee con
+    su propia consulta y devuelve la conexión al pool, así que las respuestas en curso no
+    retienen conexiones mientras el cliente las recibe.
+    Con `limit` y/o `after` retorna una página, de la más reciente a la más antigua:
+    {"items": [...], "next_cursor": "..."}; `next_cursor` es null en la última página.
     """
     try:
-        logger.debug(f"Iniciando listado de transacciones para cuenta_id: {cuenta_id}")
-        logger.debug(f"Usando servicio: {transaction_app_service}")
-        
-        transacciones = transaction_app_service.listar_transacciones(cuenta_id)
-        logger.debug(f"Transacciones recuperadas: {transacciones}")
-        
-        resultado = [TransactionMapper.dto_to_json(t) for t in transacciones]
-        logger.debug(f"Transacciones convertidas a JSON: {resultado}")
+        logger.debug("Iniciando listado de transacciones para cuenta_id: %s", cuenta_id)
+        logger.debug("Usando servicio: %s", transaction_app_service)
         
-        return resultado
+        if limit is not None or after is not None:
+            pagina = await transaction_app_service.listar_transacciones_paginado(
+                cuenta_id, limit or LIMITE_PAGINA_DEFECTO, after
+            )
+            return {
+                "items": [TransactionMapper.dto_to_json(t) for t in pagina.items],
+                "next_cursor": pagina.next_cursor
+            }
+
+        # Historial completo: filas -> proyecciones -> JSON, escrito por partes mientras se lee.
+        # La cuenta se verifica antes: si no existe, la respuesta sigue siendo un 400
+        proyecciones = await transaction_app_service.iterar_proyecciones(cuenta_id)
+        return StreamingResponse(_escribir_listado(cuenta_id, proyecciones), media_type="application/json")
     except ValueError as e:
-        logger.error(f"Error de validación al listar transacciones: {str(e)}", exc_info=True)
+        logger.error("Error de validación al listar transacciones: %s", e, exc_info=True)
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
-        logger.error(f"Error inesperado al listar transacciones: {str(e)}", exc_info=True)
+        logger.error("Error inesperado al listar transacciones: %s", e, exc_info=True)
         raise HTTPException(status_code=500, detail="Error interno del servidor")
 
+async def _escribir_listado(cuenta_id: UUID, proyecciones: AsyncIterator[ProyeccionTransaccion]) -> AsyncIterator[bytes]:
+    """Cuerpo del historial completo; cierra el recorrido aunque el cliente corte."""
+    async with aclosing(proyecciones):
+        try:
+            async for fragmento in TransactionMapper.proyecciones_a_json(proyecciones):
+                yield fragmento
+        except Exception as e:
+            # El estado ya se envió: solo queda registrar el error y cortar la respuesta
+            logger.error("Error al escribir las transacciones de la cuenta %s: %s", cuenta_id, e, exc_info=True)
+            raise
+
 @router.get("/informes/{cuenta_id}", response_model=dict)
-def generar_informe_financiero(
+async def generar_informe_financiero(
     cuenta_id: UUID,
-    transaction_app_service: TransactionApplicationService = Depends(get_transaction_app_service)
+    transaction_app_service: AsyncTransactionApplicationService = Depends(get_transaction_app_service),
+    incluir_transacciones: Annotated[bool, Query()] = False
 ):
     """
     Genera un informe financiero de una cuenta específica.
+    Los totales se calculan en la base de datos; el detalle de transacciones solo se
+    incluye con `incluir_transacciones=true` (para recorrerlo por páginas, usar
+    GET /transacciones/{cuenta_id}?limit=...). Sin él, `transacciones` es null.
     """
     try:
-        logger.debug(f"Iniciando generación de informe para cuenta_id: {cuenta_id}")
-        logger.debug(f"Usando servicio: {transaction_app_service}")
+        logger.debug("Iniciando generación de informe para cuenta_id: %s", cuenta_id)
+        logger.debug("Usando servicio: %s", transaction_app_service)
         
-        informe: InformeDTO = transaction_app_service.generar_informe_financiero(cuenta_id)
-        logger.debug(f"Informe generado: {informe}")
+        informe: InformeDTO = await transaction_app_service.generar_informe_financiero(cuenta_id, incluir_transacciones)
+        logger.debug("Informe generado: %s depósitos, %s retiros", informe.total_depositos, informe.total_retiros)
         
         resultado = {
             "total_depositos": float(informe.total_depositos),
             "total_retiros": float(informe.total_retiros),
             "saldo_promedio": float(informe.saldo_promedio),
-            "transacciones": [TransactionMapper.dto_to_json(t) for t in informe.transacciones]
+            "transacciones": (
+                [TransactionMapper.dto_to_json(t) for t in informe.transacciones]
+                if informe.transacciones is not None else None
+            )
         }
-        logger.debug(f"Informe convertido a JSON: {resultado}")
-        
         return resultado
     except ValueError as e:
-        logger.error(f"Error de validación al generar informe: {str(e)}", exc_info=True)
+        logger.error("Error de validación al generar informe: %s", e, exc_info=True)
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
-        logger.error(f"Error inesperado al generar informe: {str(e)}", exc_info=True)
+        logger.error("Error inesperado al generar informe: %s", e, exc_info=True)
         raise HTTPException(status_code=500, detail="Error interno del servidor")
@@ -1,51 +1,51 @@
+import logging
+import os
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
-from infrastructure.repositories.sqlite_account_repository import SQLiteAccountRepository
-from infrastructure.repositories.sqlite_transaction_repository import SQLiteTransactionRepository
-from infrastructure.repositories.mongo_account_repository import MongoAccountRepository
-from infrastructure.repositories.mongo_transaction_repository import MongoTransactionRepository
-from domain.services.transaction_service import TransactionService
-from application.services.transaction_application_service import TransactionApplicationService
+from app.arranque import InformeArranque
+from app.contenedor import Contenedor
 from app.controllers.transaction_controller import router as transaction_router
 from app.controllers.account_controller import router as account_router
-
-# Crear repositorios SQLite
-account_repository = SQLiteAccountRepository(db_path="database.db")
-transaction_repository = SQLiteTransactionRepository(db_path="database.db")
-
-# Crear repositorios MongoDB
-mongo_account_repository = MongoAccountRepository()
-mongo_transaction_repository = MongoTransactionRepository()
-
-# Crear el servicio de dominio con ambos repositorios
-transaction_service = TransactionService(
-    transaction_repository=transaction_repository,
-    account_repository=account_repository
-)
-
-# Crear el servicio de aplicación
-transaction_app_service = TransactionApplicationService(
-    transaction_service=transaction_service,
-    account_repository=account_repository
-)
-
-# Crear servicio de transacción para MongoDB
-mongo_transaction_service = TransactionService(
-    transaction_repository=mongo_transaction_repository,
-    account_repository=mongo_account_repository
-)
-
-# Crear servicio de aplicación para MongoDB
-mongo_app_service = TransactionApplicationService(
-    transaction_service=mongo_transaction_service,
-    account_repository=mongo_account_repository
-)
+from app.metricas_http import MiddlewareMetricas, router as metricas_router
+from infrastructure.db.sqlite_pool import instalar_trazador
+from infrastructure.db.trazador_sql import TrazadorSQL
+from infrastructure.metricas import Metricas
+from infrastructure.registro import configurar_registro, detener_registro
+
+logger = logging.getLogger(__name__)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    configurar_registro()  # Niveles y formato desde HSA_LOG_* (ver infrastructure/registro.py)
+    # Repositorios, servicios y tareas en segundo plano se construyen aquí, no al importar
+    informe = InformeArranque()
+    app.state.metricas = Metricas.desde_entorno()  # None salvo con HSA_METRICAS=1
+    app.state.trazador_sql = TrazadorSQL.desde_entorno()  # None salvo con HSA_SQL_LENTAS_MS
+    instalar_trazador(app.state.trazador_sql)  # Antes de que el contenedor abra los pools
+    db_path = os.environ.get("HSA_DB_PATH", "database.db")  # Otra base (por ejemplo, en las pruebas de carga)
+    # Sin MongoDB: HSA_REPLICACION_MONGO=0 (y replicador_mongo --desactivar si ya estaba activa)
+    replicar_mongo = os.environ.get("HSA_REPLICACION_MONGO", "1") != "0"
+    contenedor = Contenedor(db_path=db_path, metricas=app.state.metricas, replicar_mongo=replicar_mongo)
+    contenedor.iniciar(informe)
+    app.state.contenedor = contenedor
+    app.state.informe_arranque = informe
+    logger.info("Arranque completado en %.1f ms:\n%s", informe.total() * 1000, informe.formatear())
+    yield
+    contenedor.detener()
+    if app.state.trazador_sql is not None:
+        logger.info("Sentencias SQLite por tiempo total:\n%s", app.state.trazador_sql.formatear())
+    detener_registro()
 
 # Crear la aplicación FastAPI
-app = FastAPI()
+app = FastAPI(lifespan=lifespan)
+app.state.metricas = None  # Hasta el arranque (ver lifespan)
+app.state.trazador_sql = None
+app.add_middleware(MiddlewareMetricas)
 
 # Incluir los routers
 app.include_router(transaction_router)
 app.include_router(account_router)
+app.include_router(metricas_router)
 
 @app.get("/")
 def root():
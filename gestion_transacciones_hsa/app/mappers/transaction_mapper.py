@@ -2,18 +2,27 @@ from decimal import Decimal
 from domain.entities.transaction_type import TransactionType
 from domain.entities.transaction import Transaction, TransactionState
 from application.dtos.transaction_dto import TransactionDTO
+from domain.repositories.proyeccion_transaccion import ProyeccionTransaccion
 from datetime import datetime
 import logging
+from typing import AsyncIterator, List
 from uuid import UUID
 
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Objeto JSON de una proyección, con las mismas claves, orden y separadores que la respuesta
+# de FastAPI para dto_to_json. Los textos (UUID, nombres de tipo y estado, fechas ISO) nunca
+# necesitan escaparse, y %r de un float es su representación JSON.
+_PLANTILLA_JSON = '{"id":"%s","cuenta_id":"%s","monto":%r,"tipo":"%s","estado":"%s","fecha":"%s"}'
+
+# Transacciones por fragmento del cuerpo en los listados escritos por partes
+FILAS_POR_FRAGMENTO = 500
+
 class TransactionMapper:
     @staticmethod
     def json_to_dto(data: dict) -> TransactionDTO:
         try:
-            logger.debug(f"Iniciando mapeo de JSON a DTO con datos: {data}")
+            logger.debug("Iniciando mapeo de JSON a DTO con datos: %s", data)
             
             # Convertir strings a tipos apropiados
             id_trans = UUID(data["id"]) if isinstance(data["id"], str) else data["id"]
@@ -23,7 +32,7 @@ class TransactionMapper:
             
             # Asegurarse de que el tipo sea TransactionType
             tipo = TransactionType.from_string(data["tipo"])
-            logger.debug(f"Tipo convertido: {tipo.name}")
+            logger.debug("Tipo convertido: %s", tipo.name)
             
             dto = TransactionDTO(
                 id=id_trans,
@@ -33,11 +42,11 @@ class TransactionMapper:
                 estado=data["estado"],
                 fecha=fecha
             )
-            logger.debug(f"DTO creado exitosamente: {dto}")
+            logger.debug("DTO creado exitosamente: %s", dto)
             return dto
             
         except Exception as e:
-            logger.error(f"Error en el mapeo: {str(e)}", exc_info=True)
+            logger.error("Error en el mapeo: %s", e, exc_info=True)
             raise ValueError(f"Error en el mapeo: {str(e)}")
 
     @staticmethod
@@ -51,6 +60,32 @@ class TransactionMapper:
             "fecha": dto.fecha.strftime("%Y-%m-%d")
         }
 
+    @staticmethod
+    def proyeccion_a_json(proyeccion: ProyeccionTransaccion) -> str:
+        """Codifica una proyección como el objeto JSON que produce dto_to_json."""
+        return _PLANTILLA_JSON % proyeccion
+
+    @staticmethod
+    async def proyecciones_a_json(
+        proyecciones: AsyncIterator[ProyeccionTransaccion],
+        filas_por_fragmento: int = FILAS_POR_FRAGMENTO
+    ) -> AsyncIterator[bytes]:
+        """
+        Codifica las proyecciones como un arreglo JSON, en fragmentos de hasta
+        `filas_por_fragmento` transacciones, para escribirlo en la respuesta a medida que se lee.
+        """
+        apertura = "["
+        fragmento: List[str] = []
+        async for proyeccion in proyecciones:
+            fragmento.append(_PLANTILLA_JSON % proyeccion)
+            if len(fragmento) >= filas_por_fragmento:
+                yield (apertura + ",".join(fragmento)).encode()
+                apertura, fragmento = ",", []
+        if fragmento:
+            yield (apertura + ",".join(fragmento) + "]").encode()
+        else:
+            yield b"[]" if apertura == "[" else b"]"
+
     @staticmethod
     def dto_to_entity(dto: TransactionDTO) -> Transaction:
         """
@@ -63,7 +98,7 @@ class TransactionMapper:
             Transaction: La entidad de transacción
         """
         try:
-            logger.debug(f"Convirtiendo DTO a entidad: {dto}")
+            logger.debug("Convirtiendo DTO a entidad: %s", dto)
             
             # Convertir tipo string a TransactionType si es necesario
             tipo = dto.tipo if isinstance(dto.tipo, TransactionType) else TransactionType.from_string(str(dto.tipo))
@@ -79,9 +114,9 @@ class TransactionMapper:
                 estado=estado,
                 fecha=dto.fecha if isinstance(dto.fecha, datetime) else datetime.strptime(dto.fecha, "%Y-%m-%d %H:%M:%S")
             )
-            logger.debug(f"Entidad creada exitosamente: {transaction}")
+            logger.debug("Entidad creada exitosamente: %s", transaction)
             return transaction
             
         except Exception as e:
-            logger.error(f"Error en la conversión de DTO a entidad: {str(e)}", exc_info=True)
+            logger.error("Error en la conversión de DTO a entidad: %s", e, exc_info=True)
             raise ValueError(f"Error en la conversión de DTO a entidad: {str(e)}")
@@ -0,0 +1,71 @@
+# app/metricas_http.py
+"""
+Middleware ASGI de métricas por petición y endpoints de diagnóstico (GET /metrics y
+GET /sql/sentencias).
+
+El middleware lee `app.state.metricas` (ver app/main.py); si es None deja pasar la
+petición sin medir nada. Con métricas, abre la traza de la petición (ver
+infrastructure/metricas.py), registra su duración por método, ruta y estado, el número de
+operaciones de repositorio y, opcionalmente, agrega la cabecera Server-Timing.
+"""
+import time
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import PlainTextResponse
+
+TIPO_PROMETHEUS = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class MiddlewareMetricas:
+    """Middleware ASGI puro: no agrega tareas ni copia el cuerpo de las respuestas."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        metricas = getattr(scope["app"].state, "metricas", None) if scope["type"] == "http" else None
+        if metricas is None:
+            await self.app(scope, receive, send)
+            return
+
+        inicio = time.perf_counter()
+        estado = 500  # Si la aplicación falla antes de responder
+        with metricas.traza() as traza:
+            async def enviar(mensaje):
+                nonlocal estado
+                if mensaje["type"] == "http.response.start":
+                    estado = mensaje["status"]
+                    if metricas.server_timing:  # En streaming solo cubre hasta el envío de las cabeceras
+                        valor = traza.server_timing(time.perf_counter() - inicio).encode("latin-1")
+                        mensaje = {**mensaje, "headers": [*mensaje.get("headers", []), (b"server-timing", valor)]}
+                await send(mensaje)
+
+            try:
+                await self.app(scope, receive, enviar)
+            finally:
+                ruta = scope.get("route")  # Plantilla de la ruta: no una serie por cada UUID
+                metricas.observar_peticion(
+                    scope["method"],
+                    getattr(ruta, "path", "sin_ruta"),
+                    estado,
+                    time.perf_counter() - inicio,
+                    traza.consultas
+                )
+
+
+router = APIRouter()
+
+@router.get("/metrics", include_in_schema=False)
+def exportar_metricas(request: Request):
+    """Métricas en formato de texto de Prometheus; 404 si no están habilitadas."""
+    metricas = getattr(request.app.state, "metricas", None)
+    if metricas is None:
+        raise HTTPException(status_code=404, detail="Métricas deshabilitadas (ver HSA_METRICAS)")
+    return PlainTextResponse(metricas.exportar(), media_type=TIPO_PROMETHEUS)
+
+@router.get("/sql/sentencias", include_in_schema=False)
+def exportar_sentencias_sql(request: Request):
+    """Estadísticas del trazador SQLite por huella de sentencia; 404 si no está habilitado."""
+    trazador = getattr(request.app.state, "trazador_sql", None)
+    if trazador is None:
+        raise HTTPException(status_code=404, detail="Trazador SQL deshabilitado (ver HSA_SQL_LENTAS_MS)")
+    return trazador.volcar()
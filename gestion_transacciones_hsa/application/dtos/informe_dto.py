@@ -1,14 +1,16 @@
-from typing import List
+from typing import List, Optional
 from decimal import Decimal
 from .transaction_dto import TransactionDTO
 
 class InformeDTO:
+    __slots__ = ("total_depositos", "total_retiros", "saldo_promedio", "transacciones")
+
     def __init__(
         self,
         total_depositos: Decimal,
         total_retiros: Decimal,
         saldo_promedio: Decimal,
-        transacciones: List[TransactionDTO]
+        transacciones: Optional[List[TransactionDTO]] = None  # None: el informe no incluye el detalle
     ):
         self.total_depositos = total_depositos
         self.total_retiros = total_retiros
@@ -0,0 +1,42 @@
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import List, Optional, Tuple
+from uuid import UUID
+from .transaction_dto import TransactionDTO
+
+class PaginaDTO:
+    """
+    Página de transacciones con el cursor opaco para pedir la siguiente.
+    """
+
+    def __init__(self, items: List[TransactionDTO], next_cursor: Optional[str] = None):
+        self.items = items
+        self.next_cursor = next_cursor
+
+    @staticmethod
+    def codificar_cursor(fecha: datetime, id: UUID) -> str:
+        """
+        Codifica la clave (fecha, id) de la última transacción entregada en un cursor opaco.
+        """
+        contenido = json.dumps({"f": fecha.isoformat(), "i": str(id)}, separators=(",", ":"))
+        return base64.urlsafe_b64encode(contenido.encode()).decode().rstrip("=")
+
+    @staticmethod
+    def decodificar_cursor(cursor: str) -> Tuple[datetime, UUID]:
+        """
+        Decodifica un cursor generado por codificar_cursor.
+
+        Raises:
+            ValueError: Si el cursor no es válido
+        """
+        try:
+            relleno = "=" * (-len(cursor) % 4)
+            contenido = json.loads(base64.urlsafe_b64decode(cursor + relleno))
+            return datetime.fromisoformat(contenido["f"]), UUID(contenido["i"])
+        except (binascii.Error, UnicodeDecodeError, json.JSONDecodeError, KeyError, TypeError, ValueError):
+            raise ValueError("Cursor de paginación inválido")
+
+    def __repr__(self):
+        return f"PaginaDTO(items={self.items}, next_cursor={self.next_cursor!r})"
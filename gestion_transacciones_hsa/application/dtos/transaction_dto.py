@@ -8,6 +8,8 @@ import logging
 logger = logging.getLogger(__name__)
 
 class TransactionDTO:
+    __slots__ = ("id", "cuenta_id", "monto", "tipo", "estado", "fecha")
+
     def __init__(self, id: UUID, cuenta_id: UUID, monto: Decimal, tipo: TransactionType, estado: TransactionState, fecha: datetime):
         self.id = id
         self.cuenta_id = cuenta_id
@@ -34,7 +36,7 @@ class TransactionDTO:
                 fecha=entity.fecha
             )
         except Exception as e:
-            logger.error(f"Error al convertir entidad a DTO: {str(e)}", exc_info=True)
+            logger.error("Error al convertir entidad a DTO: %s", e, exc_info=True)
             raise ValueError(f"Error en la conversión de entidad a DTO: {str(e)}")
 
     def __repr__(self):
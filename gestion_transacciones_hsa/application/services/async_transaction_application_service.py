@@ -0,0 +1,133 @@
+import logging
+from application.dtos.transaction_dto import TransactionDTO
+from application.dtos.informe_dto import InformeDTO
+from application.dtos.pagina_dto import PaginaDTO
+from application.services.transaction_application_service import TransactionApplicationService
+from application.services.unidad_de_trabajo import UnidadDeTrabajo
+from domain.repositories.i_async_account_repository import IAsyncAccountRepository
+from domain.repositories.i_async_transaction_repository import IAsyncTransactionRepository
+from domain.repositories.proyeccion_transaccion import ProyeccionTransaccion
+from domain.services.async_transaction_service import AsyncTransactionService
+from uuid import UUID
+from typing import AsyncIterator, Callable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+class AsyncTransactionApplicationService:
+    """
+    Variante asíncrona de TransactionApplicationService, usada por los endpoints async def.
+
+    Cada operación corre en su propia UnidadDeTrabajo: la cuenta se lee una sola vez aunque
+    la verifiquen este servicio y el de dominio, y las escrituras se confirman juntas al
+    final de la operación.
+    """
+
+    def __init__(
+        self,
+        transaction_repository: IAsyncTransactionRepository,
+        account_repository: IAsyncAccountRepository,
+        envolver_servicio: Optional[Callable[[AsyncTransactionService], AsyncTransactionService]] = None
+    ):
+        """
+        Args:
+            transaction_repository: Repositorio asíncrono de transacciones
+            account_repository: Repositorio asíncrono de cuentas
+            envolver_servicio: Se aplica al servicio de dominio de cada unidad de trabajo
+                (por ejemplo, para instrumentarlo)
+        """
+        self.transaction_repository = transaction_repository
+        self.account_repository = account_repository
+        self._envolver_servicio = envolver_servicio
+
+    def unidad_de_trabajo(self) -> UnidadDeTrabajo:
+        """Crea la unidad de trabajo de una operación."""
+        return UnidadDeTrabajo(self.account_repository, self.transaction_repository)
+
+    def _servicio(self, uow: UnidadDeTrabajo) -> AsyncTransactionService:
+        servicio = AsyncTransactionService(uow.transacciones, uow.cuentas)
+        return self._envolver_servicio(servicio) if self._envolver_servicio else servicio
+
+    async def _verificar_cuenta(self, uow: UnidadDeTrabajo, cuenta_id: UUID, mensaje: str) -> None:
+        if not await uow.obtener_cuenta(cuenta_id):
+            logger.error("Cuenta no encontrada: %s", cuenta_id)
+            raise ValueError(mensaje)
+
+    async def realizar_transaccion(self, dto: TransactionDTO):
+        try:
+            async with self.unidad_de_trabajo() as uow:
+                await self._verificar_cuenta(uow, dto.cuenta_id, "La cuenta no existe.")
+                await self._servicio(uow).preparar_transaccion(dto)
+                uow.registrar(dto)
+        except Exception as e:
+            logger.error("Error en realizar_transaccion: %s", e, exc_info=True)
+            raise
+
+    async def listar_transacciones(self, cuenta_id: UUID) -> List[TransactionDTO]:
+        try:
+            async with self.unidad_de_trabajo() as uow:
+                await self._verificar_cuenta(uow, cuenta_id, f"La cuenta {cuenta_id} no existe")
+                return [dto async for dto in self._iterar_dtos(self._servicio(uow), cuenta_id)]
+        except Exception as e:
+            logger.error("Error en listar_transacciones: %s", e, exc_info=True)
+            raise
+
+    async def listar_transacciones_paginado(self, cuenta_id: UUID, limite: int, cursor: Optional[str] = None) -> PaginaDTO:
+        """
+        Retorna una página de transacciones de la cuenta, de la más reciente a la más antigua
+        (ver TransactionApplicationService.listar_transacciones_paginado).
+        """
+        try:
+            if limite < 1:
+                raise ValueError("El límite debe ser mayor a 0")
+            despues = PaginaDTO.decodificar_cursor(cursor) if cursor else None
+            async with self.unidad_de_trabajo() as uow:
+                transacciones = await self._servicio(uow).listar_pagina_por_cuenta(cuenta_id, limite + 1, despues)
+            return TransactionApplicationService._construir_pagina(transacciones, limite)
+        except Exception as e:
+            logger.error("Error en listar_transacciones_paginado: %s", e, exc_info=True)
+            raise
+
+    @staticmethod
+    async def _iterar_dtos(servicio: AsyncTransactionService, cuenta_id: UUID) -> AsyncIterator[TransactionDTO]:
+        async for t in await servicio.iterar_transacciones_por_cuenta(cuenta_id):
+            yield TransactionDTO.from_entity(t)
+
+    async def iterar_transacciones(self, cuenta_id: UUID) -> AsyncIterator[TransactionDTO]:
+        """
+        Recorre las transacciones de una cuenta como DTOs sin materializar el historial.
+        Lanza ValueError de inmediato si la cuenta no existe.
+        """
+        uow = self.unidad_de_trabajo()  # Solo lecturas: no hay nada que confirmar
+        await self._verificar_cuenta(uow, cuenta_id, f"La cuenta {cuenta_id} no existe")
+        return self._iterar_dtos(self._servicio(uow), cuenta_id)
+
+    async def iterar_proyecciones(self, cuenta_id: UUID) -> AsyncIterator[ProyeccionTransaccion]:
+        """
+        Recorre las transacciones de una cuenta como proyecciones de solo lectura, para los
+        listados que se escriben directo en la respuesta (sin entidades ni DTOs).
+        Lanza ValueError de inmediato si la cuenta no existe.
+        """
+        uow = self.unidad_de_trabajo()  # Solo lecturas: no hay nada que confirmar
+        await self._verificar_cuenta(uow, cuenta_id, f"La cuenta {cuenta_id} no existe")
+        return await self._servicio(uow).iterar_proyecciones_por_cuenta(cuenta_id)
+
+    async def generar_informe_financiero(self, cuenta_id: UUID, incluir_transacciones: bool = False) -> InformeDTO:
+        """
+        Genera el informe financiero de la cuenta (ver
+        TransactionApplicationService.generar_informe_financiero).
+        """
+        try:
+            async with self.unidad_de_trabajo() as uow:
+                await self._verificar_cuenta(uow, cuenta_id, "La cuenta no existe.")
+                servicio = self._servicio(uow)
+                resumen = await servicio.resumir_transacciones_aprobadas(cuenta_id)
+                dtos = [dto async for dto in self._iterar_dtos(servicio, cuenta_id)] if incluir_transacciones else None
+            return InformeDTO(
+                total_depositos=resumen.num_depositos,
+                total_retiros=resumen.num_retiros,
+                saldo_promedio=resumen.saldo_promedio,
+                transacciones=dtos
+            )
+        except Exception as e:
+            logger.error("Error generando informe financiero: %s", e, exc_info=True)
+            raise
@@ -1,19 +1,22 @@
 import logging
 from application.dtos.transaction_dto import TransactionDTO
 from application.dtos.informe_dto import InformeDTO
+from application.dtos.pagina_dto import PaginaDTO
 from domain.repositories.i_transaction_repository import ITransactionRepository
 from domain.repositories.i_account_repository import IAccountRepository
 from domain.services.transaction_service import TransactionService
 from uuid import UUID
-from typing import List
-from decimal import Decimal
-from domain.entities.transaction_type import TransactionType
-from domain.entities.transaction import TransactionState
+from typing import Iterator, Optional
 
 logger = logging.getLogger(__name__)
-logger.setLevel(logging.DEBUG)
 
 class TransactionApplicationService:
+    """
+    Servicio de aplicación síncrono, fuera de los endpoints HTTP (por ejemplo, en los
+    benchmarks). A diferencia de AsyncTransactionApplicationService no usa UnidadDeTrabajo:
+    cada lectura de cuenta va al repositorio, que con el caché activo es un CachedAccountRepository.
+    """
+
     def __init__(
         self,
         transaction_service: TransactionService,
@@ -24,85 +27,105 @@ class TransactionApplicationService:
 
     def realizar_transaccion(self, dto: TransactionDTO):
         try:
-            logger.debug(f"Procesando transacción - ID: {dto.id}, Tipo: {dto.tipo}, Estado: {dto.estado}")
-            logger.debug(f"Iniciando proceso de transacción con DTO: {dto}")
+            logger.debug("Procesando transacción - ID: %s, Tipo: %s, Estado: %s", dto.id, dto.tipo, dto.estado)
+            logger.debug("Iniciando proceso de transacción con DTO: %s", dto)
             cuenta = self.account_repository.obtener_por_id(dto.cuenta_id)
             if not cuenta:
                 raise ValueError("La cuenta no existe.")
             return self.transaction_service.procesar_transaccion(dto)
             logger.debug("Transacción completada exitosamente")
         except Exception as e:
-            logger.error(f"Error en realizar_transaccion: {str(e)}", exc_info=True)
+            logger.error("Error en realizar_transaccion: %s", e, exc_info=True)
             raise
 
-    def listar_transacciones(self, cuenta_id: UUID) -> List[TransactionDTO]:
+    def listar_transacciones(self, cuenta_id: UUID) -> Iterator[TransactionDTO]:
+        """
+        Transacciones de la cuenta como DTOs, convertidas a medida que se recorren: la
+        memoria no depende del tamaño del historial (ver iterar_transacciones). Para
+        listados completos, preferir listar_transacciones_paginado.
+        """
         try:
-            logger.debug(f"Application Service: Iniciando listado de transacciones para cuenta {cuenta_id}")
-            
-            # Verificar si la cuenta existe
-            cuenta = self.account_repository.obtener_por_id(cuenta_id)
-            if not cuenta:
-                logger.error(f"Cuenta no encontrada: {cuenta_id}")
-                raise ValueError(f"La cuenta {cuenta_id} no existe")
-                
-            transacciones = self.transaction_service.listar_transacciones_por_cuenta(cuenta_id)
-            logger.debug(f"Transacciones recuperadas: {len(transacciones)}")
-            
-            dtos = [TransactionDTO.from_entity(t) for t in transacciones]
-            logger.debug(f"DTOs creados: {len(dtos)}")
-            
-            return dtos
-            
+            logger.debug("Application Service: Iniciando listado de transacciones para cuenta %s", cuenta_id)
+            return self.iterar_transacciones(cuenta_id)
+        except Exception as e:
+            logger.error("Error en listar_transacciones: %s", e, exc_info=True)
+            raise
+
+    def listar_transacciones_paginado(self, cuenta_id: UUID, limite: int, cursor: Optional[str] = None) -> PaginaDTO:
+        """
+        Retorna una página de transacciones de la cuenta, de la más reciente a la más antigua.
+
+        Args:
+            cuenta_id: UUID de la cuenta
+            limite: Máximo de transacciones de la página
+            cursor: Cursor opaco devuelto como next_cursor por la página anterior
+
+        Returns:
+            PaginaDTO: Transacciones de la página y cursor de la siguiente (None si no hay más)
+        """
+        try:
+            if limite < 1:
+                raise ValueError("El límite debe ser mayor a 0")
+            despues = PaginaDTO.decodificar_cursor(cursor) if cursor else None
+
+            # Se pide un elemento extra para saber si existe una página siguiente
+            transacciones = self.transaction_service.listar_pagina_por_cuenta(cuenta_id, limite + 1, despues)
+            return self._construir_pagina(transacciones, limite)
         except Exception as e:
-            logger.error(f"Error en listar_transacciones: {str(e)}", exc_info=True)
+            logger.error("Error en listar_transacciones_paginado: %s", e, exc_info=True)
             raise
 
-    def generar_informe_financiero(self, cuenta_id: UUID) -> InformeDTO:
+    @staticmethod
+    def _construir_pagina(transacciones: list, limite: int) -> PaginaDTO:
+        """Arma la página a partir de hasta `limite + 1` transacciones (la extra indica que hay más)."""
+        hay_mas = len(transacciones) > limite
+        transacciones = transacciones[:limite]
+
+        next_cursor = None
+        if hay_mas:
+            ultima = transacciones[-1]
+            next_cursor = PaginaDTO.codificar_cursor(ultima.fecha, ultima.id)
+        return PaginaDTO([TransactionDTO.from_entity(t) for t in transacciones], next_cursor)
+
+    def _iterar_dtos(self, cuenta_id: UUID) -> Iterator[TransactionDTO]:
+        for t in self.transaction_service.iterar_transacciones_por_cuenta(cuenta_id):
+            yield TransactionDTO.from_entity(t)
+
+    def iterar_transacciones(self, cuenta_id: UUID) -> Iterator[TransactionDTO]:
+        """
+        Recorre las transacciones de una cuenta como DTOs sin materializar el historial.
+        Lanza ValueError de inmediato si la cuenta no existe.
+        """
+        cuenta = self.account_repository.obtener_por_id(cuenta_id)
+        if not cuenta:
+            logger.error("Cuenta no encontrada: %s", cuenta_id)
+            raise ValueError(f"La cuenta {cuenta_id} no existe")
+        return self._iterar_dtos(cuenta_id)
+
+    def generar_informe_financiero(self, cuenta_id: UUID, incluir_transacciones: bool = False) -> InformeDTO:
+        """
+        Genera el informe financiero de la cuenta.
+
+        Los totales de transacciones aprobadas se calculan en el repositorio (agregación en
+        la base de datos), así que el costo no depende del tamaño del historial. El detalle
+        de transacciones solo se lee si se pide con `incluir_transacciones`.
+        """
         try:
             cuenta = self.account_repository.obtener_por_id(cuenta_id)
             if not cuenta:
                 raise ValueError("La cuenta no existe.")
             
-            logger.debug("Obteniendo transacciones de la cuenta...")
-            transacciones = self.transaction_service.listar_transacciones_por_cuenta(cuenta_id)
-            
-            logger.debug("Calculando totales de transacciones APROBADAS...")
-            num_depositos = 0
-            num_retiros = 0
-            total_monto_depositos = Decimal("0")
-            total_monto_retiros = Decimal("0")
-
-            for t in transacciones:
-                logger.debug(f"Procesando transacción: tipo={t.tipo}, estado={t.estado}, monto={t.monto}")
-                if t.estado == TransactionState.APROBADA:
-                    if t.tipo == TransactionType.DEPOSITO:
-                        num_depositos += 1
-                        total_monto_depositos += t.monto
-                        logger.debug(f"Sumando depósito: monto={t.monto}, total_depositos={total_monto_depositos}")
-                    elif t.tipo == TransactionType.RETIRO:
-                        num_retiros += 1
-                        total_monto_retiros += t.monto
-                        logger.debug(f"Sumando retiro: monto={t.monto}, total_retiros={total_monto_retiros}")
-
-            # Calcular saldo promedio considerando los montos
-            saldo_acumulado = total_monto_depositos - total_monto_retiros
-            transacciones_aprobadas = num_depositos + num_retiros
-            saldo_promedio = (saldo_acumulado / transacciones_aprobadas 
-                            if transacciones_aprobadas > 0 
-                            else Decimal("0"))
-
-            logger.debug(f"Totales finales: Num. Depósitos={num_depositos}, Num. Retiros={num_retiros}")
-            logger.debug(f"Montos totales: Depósitos={total_monto_depositos}, Retiros={total_monto_retiros}")
-            logger.debug(f"Saldo promedio calculado: {saldo_promedio}")
-            
-            dtos = [TransactionDTO.from_entity(t) for t in transacciones]
+            resumen = self.transaction_service.resumir_transacciones_aprobadas(cuenta_id)
+            logger.debug("Resumen de transacciones aprobadas: %s", resumen)
+
+            dtos = list(self._iterar_dtos(cuenta_id)) if incluir_transacciones else None
 
             return InformeDTO(
-                total_depositos=num_depositos,
-                total_retiros=num_retiros,
-                saldo_promedio=saldo_promedio,
+                total_depositos=resumen.num_depositos,
+                total_retiros=resumen.num_retiros,
+                saldo_promedio=resumen.saldo_promedio,
                 transacciones=dtos
             )
         except Exception as e:
-            logger.error(f"Error generando informe financiero: {str(e)}", exc_info=True)
+            logger.error("Error generando informe financiero: %s", e, exc_info=True)
             raise
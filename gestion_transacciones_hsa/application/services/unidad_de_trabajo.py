@@ -0,0 +1,115 @@
+from typing import Dict, List, Optional
+from uuid import UUID
+from domain.entities.account import Account
+from domain.entities.transaction import Transaction
+from domain.repositories.i_async_account_repository import IAsyncAccountRepository
+from domain.repositories.i_async_transaction_repository import IAsyncTransactionRepository
+
+class UnidadDeTrabajo:
+    """
+    Unidad de trabajo de una petición.
+
+    Lleva un mapa de identidad de las cuentas (cada cuenta se lee una sola vez, aunque la
+    pidan el servicio de aplicación y el de dominio) y acumula las transacciones nuevas
+    para escribirlas juntas en `confirmar`, con una sola llamada a
+    `registrar_lote_con_saldo`. Las cuentas del mapa quedan con el saldo y la versión
+    resultantes.
+
+    Se usa como administrador de contexto asíncrono: al salir sin errores confirma y, si
+    hubo una excepción, descarta lo pendiente. No es segura para compartirse entre
+    peticiones: se crea una por operación.
+
+    Alcance: solo la usa AsyncTransactionApplicationService (los endpoints HTTP). El camino
+    síncrono (TransactionApplicationService) no tiene unidad de trabajo; sus lecturas
+    repetidas de cuentas las absorbe CachedAccountRepository cuando el caché está activo.
+    Tampoco rastrea cambios en las cuentas: lo único que escribe son las transacciones
+    nuevas, y los cambios hechos a mano sobre una cuenta del mapa no se guardan.
+    """
+
+    def __init__(
+        self,
+        account_repository: IAsyncAccountRepository,
+        transaction_repository: IAsyncTransactionRepository
+    ):
+        self._account_repository = account_repository
+        self.transacciones = transaction_repository  # Las lecturas de transacciones no se cachean
+        self.cuentas = _CuentasConIdentidad(self)
+        self._mapa: Dict[UUID, Optional[Account]] = {}
+        self._ausentes: Dict[UUID, str] = {}  # Cuentas cuyo repositorio lanzó ValueError
+        self._nuevas: List[Transaction] = []
+
+    async def obtener_cuenta(self, cuenta_id: UUID) -> Optional[Account]:
+        """
+        Retorna la cuenta, leyéndola del repositorio solo la primera vez.
+        Una cuenta inexistente también se recuerda: se repite la respuesta del repositorio
+        (None o el mismo ValueError).
+        """
+        if cuenta_id in self._ausentes:
+            raise ValueError(self._ausentes[cuenta_id])
+        if cuenta_id not in self._mapa:
+            try:
+                self._mapa[cuenta_id] = await self._account_repository.obtener_por_id(cuenta_id)
+            except ValueError as e:
+                self._ausentes[cuenta_id] = str(e)
+                raise
+        return self._mapa[cuenta_id]
+
+    def registrar(self, transaccion: Transaction) -> None:
+        """Agrega una transacción nueva; se escribe al confirmar la unidad."""
+        self._nuevas.append(transaccion)
+
+    @property
+    def pendientes(self) -> List[Transaction]:
+        """Transacciones registradas que aún no se confirmaron."""
+        return list(self._nuevas)
+
+    async def confirmar(self) -> None:
+        """
+        Escribe las transacciones pendientes en una sola operación del repositorio y
+        actualiza saldo y versión de las cuentas del mapa.
+
+        Raises:
+            ValueError: Si una cuenta no existe, no tiene fondos o se supera el límite diario;
+                en ese caso las transacciones pendientes se descartan
+        """
+        if not self._nuevas:
+            return
+        nuevas, self._nuevas = self._nuevas, []
+        resultados = await self.transacciones.registrar_lote_con_saldo(nuevas)
+        for transaccion, (saldo, version) in zip(nuevas, resultados):
+            cuenta = self._mapa.get(transaccion.cuenta_id)
+            if cuenta is not None:
+                cuenta.saldo, cuenta.version = saldo, version
+
+    def descartar(self) -> None:
+        """Descarta las transacciones pendientes."""
+        self._nuevas.clear()
+
+    async def __aenter__(self) -> "UnidadDeTrabajo":
+        return self
+
+    async def __aexit__(self, tipo, valor, traza) -> bool:
+        if tipo is None:
+            await self.confirmar()
+        else:
+            self.descartar()
+        return False
+
+
+class _CuentasConIdentidad(IAsyncAccountRepository):
+    """Repositorio de cuentas visto a través del mapa de identidad de una unidad de trabajo."""
+
+    def __init__(self, unidad: UnidadDeTrabajo):
+        self._unidad = unidad
+
+    async def obtener_por_id(self, id: UUID) -> Account:
+        return await self._unidad.obtener_cuenta(id)
+
+    async def obtener_por_usuario(self, usuario_id: UUID) -> List[Account]:
+        return await self._unidad._account_repository.obtener_por_usuario(usuario_id)
+
+    async def listar_todos(self) -> List[Account]:
+        return await self._unidad._account_repository.listar_todos()
+
+    async def guardar(self, cuenta: Account) -> None:
+        await self._unidad._account_repository.guardar(cuenta)
@@ -0,0 +1,476 @@
+# benchmarks/carga_http.py
+"""
+Prueba de carga HTTP de los endpoints de la API.
+
+Envía una mezcla configurable de peticiones a `app.main:app` (en el mismo proceso, por ASGI,
+con su lifespan completo) o a un servidor local (--url, por ejemplo uvicorn):
+
+- crear_transaccion: POST /transacciones/ (depósitos y retiros de montos pequeños);
+- listar: GET /transacciones/{cuenta_id} (una página de --limite-listado; 0 = historial completo);
+- informe: GET /informes/{cuenta_id};
+- crear_cuenta: POST /cuentas/.
+
+Antes de medir se crean --cuentas cuentas con saldo; las peticiones las eligen con la
+distribución de actividad de benchmarks.generador (las calientes se repiten).
+
+Modos de llegada:
+
+- cerrado: --concurrencia clientes envían una petición tras otra (mide la capacidad);
+- abierto: llegadas de Poisson a --tasa peticiones por segundo, con hasta --concurrencia en
+  curso. La latencia se cuenta desde la llegada programada, así que incluye la espera
+  cuando el servidor no da abasto (sin omisión coordinada).
+
+Informa, por operación y en total, peticiones por segundo, p50/p95/p99/p99.9, errores (5xx
+o sin respuesta) y rechazos (4xx). Con --perfil se guarda un perfil de cProfile de la
+corrida; en el mismo proceso cubre el bucle de eventos (rutas, validación, serialización),
+no el hilo de E/S de SQLite.
+
+En el mismo proceso, la base es un archivo nuevo en --directorio (por defecto, uno temporal;
+ver HSA_DB_PATH en app/main.py); la réplica en MongoDB sigue su configuración habitual.
+
+Uso:
+    python -m benchmarks.carga_http --concurrencia 32 --duracion 20
+    python -m benchmarks.carga_http --modo abierto --tasa 500 --mezcla crear_transaccion=70,informe=30
+    python -m benchmarks.carga_http --url http://127.0.0.1:8000 --salida carga.json --perfil carga.prof
+"""
+import argparse
+import asyncio
+import cProfile
+import json
+import logging
+import os
+import pstats
+import random
+import shutil
+import sys
+import tempfile
+import time
+from collections import Counter
+from datetime import date
+from itertools import cycle
+from typing import Dict, List, Optional, Sequence, Tuple
+from urllib.parse import urlsplit
+from benchmarks.estadisticas import metadatos, resumir
+from benchmarks.generador import GeneradorHSA
+
+logger = logging.getLogger(__name__)
+
+OPERACIONES = ("crear_transaccion", "listar", "informe", "crear_cuenta")
+MEZCLA_DEFECTO = {"crear_transaccion": 40, "listar": 25, "informe": 25, "crear_cuenta": 10}
+
+SALDO_INICIAL = 100_000.0
+LIMITE_DIARIO = 1_000_000.0  # Alto: la carga no debe quedar limitada por el límite diario
+
+# Cuentas elegidas de antemano (se recorren en ciclo)
+MUESTRA_CUENTAS = 10_000
+
+# Respuesta de una petición: código de estado y cuerpo
+Respuesta = Tuple[int, bytes]
+
+
+def interpretar_mezcla(texto: str) -> Dict[str, float]:
+    """
+    Convierte "crear_transaccion=70,informe=30" en pesos por operación.
+
+    Raises:
+        ValueError: Si una operación no existe o ningún peso es positivo
+    """
+    mezcla = {}
+    for parte in filter(None, (p.strip() for p in texto.split(","))):
+        nombre, _, peso = parte.partition("=")
+        nombre = nombre.strip()
+        if nombre not in OPERACIONES:
+            raise ValueError(f"Operación desconocida: {nombre}. Operaciones válidas: {list(OPERACIONES)}")
+        mezcla[nombre] = float(peso) if peso else 1.0
+    if not any(peso > 0 for peso in mezcla.values()):
+        raise ValueError("La mezcla necesita al menos una operación con peso positivo.")
+    return mezcla
+
+
+class ClienteASGI:
+    """Envía peticiones directamente a una aplicación ASGI, sin red."""
+
+    def __init__(self, app):
+        self.app = app
+        self._lifespan: Optional[asyncio.Task] = None
+        self._entrada: asyncio.Queue = asyncio.Queue()
+        self._salida: asyncio.Queue = asyncio.Queue()
+
+    async def iniciar(self) -> None:
+        """Ejecuta el arranque del lifespan de la aplicación."""
+        scope = {"type": "lifespan", "asgi": {"version": "3.0"}, "state": {}}
+        self._lifespan = asyncio.create_task(self.app(scope, self._entrada.get, self._salida.put))
+        await self._evento_lifespan("startup")
+
+    async def detener(self) -> None:
+        """Ejecuta el cierre del lifespan."""
+        if self._lifespan is not None:
+            await self._evento_lifespan("shutdown")
+            await self._lifespan
+
+    async def _evento_lifespan(self, evento: str) -> None:
+        await self._entrada.put({"type": f"lifespan.{evento}"})
+        mensaje = await self._salida.get()
+        if mensaje["type"] != f"lifespan.{evento}.complete":
+            raise RuntimeError(f"Falló el {evento} de la aplicación: {mensaje.get('message', '')}")
+
+    async def peticion(self, metodo: str, ruta: str, cuerpo: Optional[dict] = None) -> Respuesta:
+        datos = json.dumps(cuerpo).encode() if cuerpo is not None else b""
+        camino, _, consulta = ruta.partition("?")
+        scope = {
+            "type": "http", "method": metodo, "path": camino, "raw_path": camino.encode(),
+            "query_string": consulta.encode(), "scheme": "http", "server": ("carga", 80),
+            "client": ("carga", 1), "http_version": "1.1", "root_path": "", "asgi": {"version": "3.0"},
+            "headers": [(b"host", b"carga"), (b"content-type", b"application/json"),
+                        (b"content-length", str(len(datos)).encode())],
+        }
+        pendiente = True
+        terminada = asyncio.Event()
+        estado = 0
+        partes: List[bytes] = []
+
+        async def recibir():
+            nonlocal pendiente
+            if pendiente:
+                pendiente = False
+                return {"type": "http.request", "body": datos, "more_body": False}
+            await terminada.wait()  # El cliente no corta: se desconecta cuando la respuesta termina
+            return {"type": "http.disconnect"}
+
+        async def enviar(mensaje):
+            nonlocal estado
+            if mensaje["type"] == "http.response.start":
+                estado = mensaje["status"]
+            elif mensaje["type"] == "http.response.body":
+                partes.append(mensaje.get("body", b""))
+                if not mensaje.get("more_body", False):
+                    terminada.set()
+
+        try:
+            await self.app(scope, recibir, enviar)
+        finally:
+            terminada.set()
+        return estado, b"".join(partes)
+
+
+class ClienteHTTP:
+    """Cliente HTTP/1.1 mínimo sobre asyncio, con conexiones persistentes reutilizadas."""
+
+    def __init__(self, url: str):
+        partes = urlsplit(url)
+        if partes.scheme != "http":
+            raise ValueError("Solo se admiten URLs http:// (servidor local).")
+        self.host = partes.hostname or "127.0.0.1"
+        self.puerto = partes.port or 80
+        self.prefijo = partes.path.rstrip("/")
+        self._libres: List[Tuple[asyncio.StreamReader, asyncio.StreamWriter]] = []
+
+    async def iniciar(self) -> None:
+        pass
+
+    async def detener(self) -> None:
+        while self._libres:
+            self._libres.pop()[1].close()
+
+    async def peticion(self, metodo: str, ruta: str, cuerpo: Optional[dict] = None) -> Respuesta:
+        datos = json.dumps(cuerpo).encode() if cuerpo is not None else b""
+        lector, escritor = self._libres.pop() if self._libres else await asyncio.open_connection(self.host, self.puerto)
+        try:
+            escritor.write(
+                f"{metodo} {self.prefijo}{ruta} HTTP/1.1\r\nHost: {self.host}:{self.puerto}\r\n"
+                f"Content-Type: application/json\r\nContent-Length: {len(datos)}\r\n\r\n".encode() + datos
+            )
+            await escritor.drain()
+            estado, cabeceras = await self._leer_cabeceras(lector)
+            if cabeceras.get("transfer-encoding", "").lower() == "chunked":
+                cuerpo_respuesta = await self._leer_por_partes(lector)
+            else:
+                cuerpo_respuesta = await lector.readexactly(int(cabeceras.get("content-length", 0)))
+        except BaseException:
+            escritor.close()
+            raise
+        if cabeceras.get("connection", "").lower() == "close":
+            escritor.close()
+        else:
+            self._libres.append((lector, escritor))
+        return estado, cuerpo_respuesta
+
+    @staticmethod
+    async def _leer_cabeceras(lector: asyncio.StreamReader) -> Tuple[int, Dict[str, str]]:
+        linea = await lector.readline()
+        if not linea:
+            raise ConnectionError("El servidor cerró la conexión")
+        estado = int(linea.split()[1])
+        cabeceras = {}
+        while (linea := await lector.readline()) not in (b"\r\n", b"\n", b""):
+            nombre, _, valor = linea.decode("latin-1").partition(":")
+            cabeceras[nombre.strip().lower()] = valor.strip()
+        return estado, cabeceras
+
+    @staticmethod
+    async def _leer_por_partes(lector: asyncio.StreamReader) -> bytes:
+        partes = []
+        while True:
+            tamano = int((await lector.readline()).split(b";")[0], 16)
+            if tamano == 0:
+                await lector.readline()  # Línea vacía final (sin trailers)
+                return b"".join(partes)
+            partes.append(await lector.readexactly(tamano))
+            await lector.readexactly(2)
+
+
+class PruebaCarga:
+    """Prepara las cuentas, genera las peticiones de la mezcla y acumula sus resultados."""
+
+    def __init__(
+        self,
+        cliente,
+        mezcla: Optional[Dict[str, float]] = None,
+        cuentas: int = 100,
+        semilla: int = 2024,
+        zipf: float = 0.8,
+        limite_listado: int = 20
+    ):
+        """
+        Args:
+            cliente: ClienteASGI o ClienteHTTP
+            mezcla: Peso de cada operación (ver OPERACIONES)
+            cuentas: Cuentas creadas antes de medir
+            semilla: Semilla de la mezcla, las cuentas elegidas y los montos
+            zipf: Exponente de la distribución de actividad de las cuentas
+            limite_listado: Tamaño de página de `listar`; 0 pide el historial completo
+        """
+        self.cliente = cliente
+        self.mezcla = dict(mezcla or MEZCLA_DEFECTO)
+        self.num_cuentas = cuentas
+        self.semilla = semilla
+        self.zipf = zipf
+        self.limite_listado = limite_listado
+        self._aleatorio = random.Random(semilla)
+        self._operaciones = list(self.mezcla)
+        self._pesos = [self.mezcla[nombre] for nombre in self._operaciones]
+        self.cuentas: List[str] = []
+        self._elegidas = iter(())
+        self.reiniciar()
+
+    def reiniciar(self) -> None:
+        """Descarta los resultados acumulados (por ejemplo, los del calentamiento)."""
+        self.latencias: Dict[str, List[float]] = {nombre: [] for nombre in self._operaciones}
+        self.estados: Dict[str, Counter] = {nombre: Counter() for nombre in self._operaciones}
+
+    async def preparar(self) -> None:
+        """Crea las cuentas que usarán las peticiones."""
+        for _ in range(self.num_cuentas):
+            estado, cuerpo = await self.cliente.peticion(
+                "POST", "/cuentas/", {"saldo": SALDO_INICIAL, "limite_diario": LIMITE_DIARIO}
+            )
+            if estado != 200:
+                raise RuntimeError(f"No se pudo crear una cuenta ({estado}): {cuerpo[:200]!r}")
+            self.cuentas.append(json.loads(cuerpo)["cuenta_id"])
+        indices = GeneradorHSA(self.num_cuentas, semilla=self.semilla, zipf=self.zipf).elegir_indices(MUESTRA_CUENTAS)
+        self._elegidas = cycle([self.cuentas[indice] for indice in indices])
+
+    def siguiente(self) -> Tuple[str, str, str, Optional[dict]]:
+        """La próxima petición de la mezcla: operación, método, ruta y cuerpo."""
+        operacion = self._aleatorio.choices(self._operaciones, self._pesos)[0]
+        if operacion == "crear_cuenta":
+            return operacion, "POST", "/cuentas/", {"saldo": SALDO_INICIAL, "limite_diario": LIMITE_DIARIO}
+        cuenta_id = next(self._elegidas)
+        if operacion == "crear_transaccion":
+            deposito = self._aleatorio.random() < 0.5
+            cuerpo = {
+                "cuenta_id": cuenta_id,
+                "monto": round(self._aleatorio.uniform(1, 50), 2),
+                "tipo": "DEPOSITO" if deposito else "RETIRO",
+                "estado": "PENDIENTE",
+                "fecha": date.today().isoformat(),
+            }
+            return operacion, "POST", "/transacciones/", cuerpo
+        if operacion == "listar":
+            consulta = f"?limit={self.limite_listado}" if self.limite_listado else ""
+            return operacion, "GET", f"/transacciones/{cuenta_id}{consulta}", None
+        return operacion, "GET", f"/informes/{cuenta_id}", None
+
+    async def _enviar(self, peticion: Tuple[str, str, str, Optional[dict]], inicio: float) -> None:
+        operacion, metodo, ruta, cuerpo = peticion
+        try:
+            estado, _ = await self.cliente.peticion(metodo, ruta, cuerpo)
+        except Exception as e:
+            logger.debug("Petición %s %s sin respuesta: %s", metodo, ruta, e)
+            estado = 0
+        self.latencias[operacion].append(time.perf_counter() - inicio)
+        self.estados[operacion][estado] += 1
+
+    async def ciclo_cerrado(self, concurrencia: int, duracion: float) -> float:
+        """`concurrencia` clientes envían peticiones en serie durante `duracion` segundos."""
+        inicio = time.perf_counter()
+        fin = inicio + duracion
+
+        async def cliente():
+            while (ahora := time.perf_counter()) < fin:
+                await self._enviar(self.siguiente(), ahora)
+
+        await asyncio.gather(*(cliente() for _ in range(concurrencia)))
+        return time.perf_counter() - inicio
+
+    async def ciclo_abierto(self, tasa: float, duracion: float, max_en_curso: int) -> float:
+        """Llegadas de Poisson a `tasa` por segundo durante `duracion` segundos."""
+        limite = asyncio.Semaphore(max_en_curso)
+        tareas = set()
+        inicio = llegada = time.perf_counter()
+
+        async def atender(peticion, programada: float):
+            async with limite:  # La espera por el límite cuenta en la latencia
+                await self._enviar(peticion, programada)
+
+        while True:
+            llegada += self._aleatorio.expovariate(tasa)
+            if llegada - inicio >= duracion:
+                break
+            espera = llegada - time.perf_counter()
+            if espera > 0:
+                await asyncio.sleep(espera)
+            tarea = asyncio.create_task(atender(self.siguiente(), llegada))
+            tareas.add(tarea)
+            tarea.add_done_callback(tareas.discard)
+        if tareas:
+            await asyncio.gather(*tareas)
+        return time.perf_counter() - inicio
+
+    def resultados(self, segundos: float) -> List[Dict[str, object]]:
+        """Un resultado por operación y uno total (ver estadisticas.resumir)."""
+        resultados = []
+        grupos = [(nombre, self.latencias[nombre], self.estados[nombre]) for nombre in self._operaciones]
+        grupos.append(("total", [l for nombre in self._operaciones for l in self.latencias[nombre]],
+                       sum(self.estados.values(), Counter())))
+        for nombre, latencias, estados in grupos:
+            peticiones = sum(estados.values())
+            errores = sum(cantidad for estado, cantidad in estados.items() if estado == 0 or estado >= 500)
+            rechazos = sum(cantidad for estado, cantidad in estados.items() if 400 <= estado < 500)
+            resultado = {"operacion": nombre}
+            resultado.update(resumir(latencias, segundos))
+            resultado.update({
+                "errores": errores,
+                "tasa_errores": errores / peticiones if peticiones else 0.0,
+                "rechazos": rechazos,
+                "estados": {str(estado): cantidad for estado, cantidad in sorted(estados.items())},
+            })
+            resultados.append(resultado)
+        return resultados
+
+
+async def ejecutar(
+    cliente,
+    modo: str = "cerrado",
+    concurrencia: int = 32,
+    tasa: float = 200.0,
+    duracion: float = 10.0,
+    calentamiento: float = 1.0,
+    perfil: Optional[cProfile.Profile] = None,
+    **opciones
+) -> Dict[str, object]:
+    """
+    Arranca el cliente, prepara las cuentas, calienta y mide.
+
+    Args:
+        cliente: ClienteASGI o ClienteHTTP
+        modo: "cerrado" (concurrencia fija) o "abierto" (tasa de llegadas)
+        perfil: Si se indica, se habilita solo durante la medición
+        **opciones: Argumentos de PruebaCarga (mezcla, cuentas, semilla, zipf, limite_listado)
+
+    Returns:
+        Dict[str, object]: metadatos y resultados
+    """
+    if modo not in ("cerrado", "abierto"):
+        raise ValueError(f"Modo inválido: {modo}")
+    prueba = PruebaCarga(cliente, **opciones)
+
+    async def medir(segundos: float) -> float:
+        if modo == "cerrado":
+            return await prueba.ciclo_cerrado(concurrencia, segundos)
+        return await prueba.ciclo_abierto(tasa, segundos, concurrencia)
+
+    await cliente.iniciar()
+    try:
+        await prueba.preparar()
+        if calentamiento > 0:
+            await medir(calentamiento)
+            prueba.reiniciar()
+        if perfil is not None:
+            perfil.enable()
+        try:
+            segundos = await medir(duracion)
+        finally:
+            if perfil is not None:
+                perfil.disable()
+    finally:
+        await cliente.detener()
+    configuracion = {
+        "destino": getattr(cliente, "host", "en proceso"), "modo": modo, "concurrencia": concurrencia,
+        "duracion": duracion, "mezcla": prueba.mezcla, "cuentas": prueba.num_cuentas, "semilla": prueba.semilla,
+    }
+    if modo == "abierto":
+        configuracion["tasa"] = tasa
+    return {"metadatos": {**metadatos(), **configuracion}, "resultados": prueba.resultados(segundos)}
+
+
+def _imprimir(resultados: Sequence[Dict[str, object]]) -> None:
+    print(f"{'operación':<20}{'peticiones':>11}{'pet/s':>10}{'p50 ms':>9}{'p95 ms':>9}"
+          f"{'p99 ms':>9}{'p99.9 ms':>10}{'errores':>9}{'4xx':>7}")
+    for r in resultados:
+        print(f"{r['operacion']:<20}{r['operaciones']:>11}{r['ops_s']:>10,.1f}{r['p50_ms']:>9.2f}{r['p95_ms']:>9.2f}"
+              f"{r['p99_ms']:>9.2f}{r['p999_ms']:>10.2f}{r['tasa_errores']:>8.1%}{r['rechazos']:>7}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Prueba de carga HTTP de la API.")
+    parser.add_argument("--url", help="Servidor local (por ejemplo http://127.0.0.1:8000); sin ella, en el mismo proceso")
+    parser.add_argument("--modo", choices=("cerrado", "abierto"), default="cerrado")
+    parser.add_argument("--concurrencia", type=int, default=32, help="Clientes (cerrado) o máximo en curso (abierto)")
+    parser.add_argument("--tasa", type=float, default=200.0, help="Llegadas por segundo en modo abierto")
+    parser.add_argument("--duracion", type=float, default=10.0, help="Segundos medidos")
+    parser.add_argument("--calentamiento", type=float, default=1.0, help="Segundos descartados antes de medir")
+    parser.add_argument("--mezcla", type=interpretar_mezcla, default=dict(MEZCLA_DEFECTO),
+                        help="Pesos por operación, por ejemplo crear_transaccion=40,listar=25,informe=25,crear_cuenta=10")
+    parser.add_argument("--cuentas", type=int, default=100, help="Cuentas creadas antes de medir")
+    parser.add_argument("--semilla", type=int, default=2024)
+    parser.add_argument("--zipf", type=float, default=0.8, help="Sesgo de actividad de las cuentas (0 = uniforme)")
+    parser.add_argument("--limite-listado", type=int, default=20, help="Página de GET /transacciones (0 = historial completo)")
+    parser.add_argument("--directorio", help="Directorio de la base en el mismo proceso (por defecto, uno temporal)")
+    parser.add_argument("--perfil", help="Archivo donde guardar el perfil de cProfile de la medición")
+    parser.add_argument("--salida", help="Archivo JSON de resultados")
+    args = parser.parse_args(argv)
+
+    temporal = None
+    if args.url:
+        cliente = ClienteHTTP(args.url)
+    else:
+        if args.directorio is None:
+            temporal = args.directorio = tempfile.mkdtemp(prefix="hsa_carga_")
+        os.environ["HSA_DB_PATH"] = os.path.join(args.directorio, f"carga_{time.time_ns()}.db")
+        from app.main import app
+        cliente = ClienteASGI(app)
+
+    perfil = cProfile.Profile() if args.perfil else None
+    try:
+        documento = asyncio.run(ejecutar(
+            cliente, args.modo, args.concurrencia, args.tasa, args.duracion, args.calentamiento, perfil,
+            mezcla=args.mezcla, cuentas=args.cuentas, semilla=args.semilla, zipf=args.zipf,
+            limite_listado=args.limite_listado
+        ))
+    finally:
+        if temporal is not None:
+            shutil.rmtree(temporal, ignore_errors=True)
+    if args.salida:
+        with open(args.salida, "w", encoding="utf-8") as archivo:
+            json.dump(documento, archivo, indent=2, ensure_ascii=False)
+    _imprimir(documento["resultados"])
+    if perfil is not None:
+        perfil.dump_stats(args.perfil)
+        print(f"\nPerfil guardado en {args.perfil}; funciones con más tiempo propio:")
+        pstats.Stats(perfil).sort_stats("tottime").print_stats(15)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,53 @@
+# benchmarks/estadisticas.py
+"""Percentiles de latencia y metadatos del entorno para los resultados de los benchmarks."""
+import math
+import os
+import platform
+import sqlite3
+import sys
+from datetime import datetime
+from typing import Dict, Optional, Sequence
+
+# Percentiles informados, con el nombre de su campo
+PERCENTILES = (("p50_ms", 50), ("p95_ms", 95), ("p99_ms", 99), ("p999_ms", 99.9))
+
+
+def percentil(ordenados: Sequence[float], p: float) -> float:
+    """Percentil por rango más cercano de una secuencia ya ordenada (0 si está vacía)."""
+    if not ordenados:
+        return 0.0
+    return ordenados[max(0, math.ceil(p / 100 * len(ordenados)) - 1)]
+
+
+def resumir(latencias: Sequence[float], segundos: Optional[float] = None) -> Dict[str, float]:
+    """
+    Resume latencias en segundos: operaciones, operaciones por segundo, percentiles y
+    máximo en milisegundos.
+
+    Args:
+        latencias: Duración de cada operación
+        segundos: Tiempo total transcurrido; por defecto, la suma de las latencias
+            (operaciones en serie)
+    """
+    ordenadas = sorted(latencias)
+    total = sum(ordenadas) if segundos is None else segundos
+    resumen = {
+        "operaciones": len(ordenadas),
+        "segundos": total,
+        "ops_s": len(ordenadas) / total if total > 0 else 0.0,
+    }
+    for nombre, p in PERCENTILES:
+        resumen[nombre] = percentil(ordenadas, p) * 1000
+    resumen["max_ms"] = ordenadas[-1] * 1000 if ordenadas else 0.0
+    return resumen
+
+
+def metadatos() -> Dict[str, object]:
+    """Entorno de la medición, para interpretar comparaciones entre corridas."""
+    return {
+        "fecha": datetime.now().isoformat(timespec="seconds"),
+        "python": sys.version.split()[0],
+        "sqlite": sqlite3.sqlite_version,
+        "plataforma": platform.platform(),
+        "procesadores": os.cpu_count(),
+    }
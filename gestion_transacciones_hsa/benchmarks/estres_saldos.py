@@ -0,0 +1,396 @@
+# benchmarks/estres_saldos.py
+"""
+Prueba de estrés de concurrencia sobre los saldos.
+
+Dispara miles de depósitos y retiros en paralelo sobre unas pocas cuentas calientes, con
+TransactionService.procesar_transaccion (registrar_con_saldo en el repositorio), desde
+--hilos hilos en cada uno de --procesos procesos (0 procesos = hilos en este mismo proceso).
+Todos los procesos escriben en la misma base (con --backend sqlite-sharded, en los --shards
+archivos de un mismo conjunto).
+
+Al terminar, recalcula cada saldo desde el libro de transacciones y verifica, por cuenta:
+
+- saldo == suma de los montos de las transacciones APROBADAS registradas;
+- saldo >= 0 (ningún retiro concurrente lo dejó en negativo);
+- transacciones registradas == las que los trabajadores vieron aprobadas (sin escrituras
+  perdidas ni fantasmas);
+- versión == versión inicial + transacciones registradas (cada escritura la incrementa una vez).
+
+Informa las divergencias, el rendimiento (transacciones por segundo y latencias) y las
+esperas. En SQLite, la principal es la del bloqueo de escritura: el tiempo que tarda el
+BEGIN IMMEDIATE de registrar_con_saldo (SQLiteTransactionRepository.estadisticas_bloqueo),
+que SQLite absorbe dentro de busy_timeout. Los reintentos por "Base ocupada" y las esperas
+del pool solo aparecen cuando esa espera supera busy_timeout o se agotan las conexiones.
+En MongoDB, los conflictos de escritura del servidor (serverStatus).
+El proceso termina con código 1 si hay alguna divergencia.
+
+MongoDB usa la base hsa_db de --mongo-uri y la elimina al terminar (ver
+benchmarks.repositorios.backend_mongo): usar solo una instancia local desechable.
+
+Uso:
+    python -m benchmarks.estres_saldos --operaciones 5000 --cuentas 4 --hilos 16
+    python -m benchmarks.estres_saldos --procesos 4 --hilos 8 --salida estres.json
+    python -m benchmarks.estres_saldos --backend sqlite-sharded --shards 4 --cuentas 16 --procesos 4
+    python -m benchmarks.estres_saldos --backend mongo --mongo-uri mongodb://localhost:27017
+"""
+import argparse
+import json
+import logging
+import multiprocessing
+import random
+import shutil
+import sys
+import tempfile
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from decimal import Decimal
+from typing import Dict, List, Optional, Sequence, Tuple
+from uuid import UUID, uuid4
+from benchmarks.estadisticas import metadatos, resumir
+from benchmarks.repositorios import BACKENDS, crear_backend
+from domain.entities.account import Account
+from domain.entities.transaction import Transaction, TransactionState
+from domain.entities.transaction_type import TransactionType
+from infrastructure.db import codificacion
+
+logger = logging.getLogger(__name__)
+
+SALDO_INICIAL = 1_000_000   # Centavos depositados en cada cuenta antes de la carga
+LIMITE_DIARIO = Decimal("1000000000.00")  # La carga no debe quedar limitada por el límite diario
+
+# Logger y mensaje con los que SQLiteTransactionRepository registra cada reintento
+_LOGGER_REINTENTOS = "infrastructure.repositories.sqlite_transaction_repository"
+_MENSAJE_REINTENTO = "Base ocupada"
+
+# Operación: cuenta y monto en centavos (negativo en los retiros)
+Operacion = Tuple[UUID, int]
+
+
+def generar_operaciones(
+    cuentas: Sequence[UUID],
+    n: int,
+    proporcion_retiros: float = 0.5,
+    semilla: int = 2024
+) -> List[Operacion]:
+    """
+    Depósitos y retiros repartidos al azar entre las cuentas. Los retiros son algo mayores
+    que los depósitos, así que con carga suficiente algunos se rechazan por fondos.
+    """
+    aleatorio = random.Random(semilla)
+    operaciones = []
+    for _ in range(n):
+        cuenta_id = aleatorio.choice(cuentas)
+        if aleatorio.random() < proporcion_retiros:
+            operaciones.append((cuenta_id, -aleatorio.randint(100, 40_000)))
+        else:
+            operaciones.append((cuenta_id, aleatorio.randint(100, 30_000)))
+    return operaciones
+
+
+class _ContadorReintentos(logging.Handler):
+    """Cuenta los avisos de reintento de registrar_con_saldo."""
+
+    def __init__(self):
+        super().__init__(logging.WARNING)
+        self.reintentos = 0
+
+    def emit(self, registro: logging.LogRecord) -> None:
+        if registro.msg.startswith(_MENSAJE_REINTENTO):
+            self.reintentos += 1
+
+
+def _repositorios(backend: str, destino: str, shards: int = 4):
+    """Repositorios de cuentas y transacciones sin caché (cada proceso construye los suyos)."""
+    if backend == "sqlite-sharded":
+        from infrastructure.repositories.sharded_sqlite_account_repository import ShardedSQLiteAccountRepository
+        from infrastructure.repositories.sharded_sqlite_transaction_repository import ShardedSQLiteTransactionRepository
+        return (ShardedSQLiteAccountRepository(db_path=destino, shards=shards),
+                ShardedSQLiteTransactionRepository(db_path=destino, shards=shards))
+    if backend == "sqlite":
+        from infrastructure.repositories.sqlite_account_repository import SQLiteAccountRepository
+        from infrastructure.repositories.sqlite_transaction_repository import SQLiteTransactionRepository
+        return SQLiteAccountRepository(db_path=destino), SQLiteTransactionRepository(db_path=destino)
+    from infrastructure.repositories.mongo_account_repository import MongoAccountRepository
+    from infrastructure.repositories.mongo_transaction_repository import MongoTransactionRepository
+    return MongoAccountRepository(destino), MongoTransactionRepository(destino)
+
+
+def _pools(transacciones) -> list:
+    """Pools de conexiones del repositorio de transacciones (uno por shard; ninguno en MongoDB)."""
+    repositorios = getattr(transacciones, "shards", [transacciones])
+    return [repositorio._pool for repositorio in repositorios if getattr(repositorio, "_pool", None) is not None]
+
+
+def _medidores_bloqueo(transacciones) -> list:
+    """Repositorios SQLite que miden la toma del bloqueo de escritura (uno por shard; ninguno en MongoDB)."""
+    repositorios = getattr(transacciones, "shards", [transacciones])
+    return [repositorio for repositorio in repositorios if hasattr(repositorio, "estadisticas_bloqueo")]
+
+
+def ejecutar_operaciones(
+    backend: str,
+    destino: str,
+    operaciones: Sequence[Operacion],
+    hilos: int,
+    shards: int = 4
+) -> Dict[str, object]:
+    """
+    Procesa las operaciones con `hilos` hilos en este proceso.
+
+    Returns:
+        Dict[str, object]: latencias, resultados (aprobada, fondos, rechazada, error),
+            aprobadas por cuenta, reintentos y esperas del pool
+    """
+    from domain.services.transaction_service import TransactionService
+    cuentas, transacciones = _repositorios(backend, destino, shards)
+    servicio = TransactionService(transacciones, cuentas)
+    pools = _pools(transacciones)
+    antes = [pool.estadisticas() for pool in pools]
+    medidores = _medidores_bloqueo(transacciones)
+    bloqueo_antes = [medidor.estadisticas_bloqueo() for medidor in medidores]
+    contador = _ContadorReintentos()
+    registro_reintentos = logging.getLogger(_LOGGER_REINTENTOS)
+    registro_reintentos.addHandler(contador)
+    fecha = datetime.now()
+
+    def procesar(operacion: Operacion) -> Tuple[UUID, str, float]:
+        cuenta_id, centavos = operacion
+        tipo = TransactionType.DEPOSITO if centavos > 0 else TransactionType.RETIRO
+        transaccion = Transaction(uuid4(), cuenta_id, codificacion.desde_centavos(centavos), tipo,
+                                  TransactionState.APROBADA, fecha)
+        inicio = time.perf_counter()
+        try:
+            servicio.procesar_transaccion(transaccion)
+            resultado = "aprobada"
+        except ValueError as e:
+            resultado = "fondos" if "Fondos insuficientes" in str(e) else "rechazada"
+        except Exception as e:
+            logger.warning("Error al procesar %s en %s: %s", centavos, cuenta_id, e)
+            resultado = "error"
+        return cuenta_id, resultado, time.perf_counter() - inicio
+
+    latencias: List[float] = []
+    resultados: Counter = Counter()
+    aprobadas: Counter = Counter()
+    try:
+        with ThreadPoolExecutor(max_workers=hilos) as ejecutor:
+            for cuenta_id, resultado, latencia in ejecutor.map(procesar, operaciones):
+                latencias.append(latencia)
+                resultados[resultado] += 1
+                if resultado == "aprobada":
+                    aprobadas[cuenta_id] += 1
+    finally:
+        registro_reintentos.removeHandler(contador)
+    estadisticas = {
+        "latencias": latencias,
+        "resultados": dict(resultados),
+        "aprobadas": dict(aprobadas),
+        "reintentos": contador.reintentos,
+    }
+    if pools:
+        despues = [pool.estadisticas() for pool in pools]
+        estadisticas["esperas_pool"] = sum(d["esperas"] - a["esperas"] for a, d in zip(antes, despues))
+        estadisticas["tiempo_espera_pool_s"] = sum(d["tiempo_espera_s"] - a["tiempo_espera_s"]
+                                                   for a, d in zip(antes, despues))
+    if medidores:
+        despues = [medidor.estadisticas_bloqueo() for medidor in medidores]
+        estadisticas["esperas_bloqueo"] = sum(d["esperas"] - a["esperas"] for a, d in zip(bloqueo_antes, despues))
+        estadisticas["tiempo_espera_bloqueo_s"] = sum(d["tiempo_espera_s"] - a["tiempo_espera_s"]
+                                                      for a, d in zip(bloqueo_antes, despues))
+        # El máximo es acumulado del repositorio; cada proceso construye los suyos para esta carga
+        estadisticas["max_espera_bloqueo_s"] = max(d["max_espera_s"] for d in despues)
+    return estadisticas
+
+
+def _ejecutar_en_proceso(argumentos: tuple) -> Dict[str, object]:
+    """Punto de entrada de cada proceso trabajador."""
+    estadisticas = ejecutar_operaciones(*argumentos)
+    from infrastructure.db.sqlite_pool import cerrar_pools
+    cerrar_pools()
+    return estadisticas
+
+
+def verificar_saldos(
+    cuentas_repositorio,
+    transacciones_repositorio,
+    versiones_iniciales: Dict[UUID, int],
+    aprobadas: Dict[UUID, int]
+) -> List[Dict[str, object]]:
+    """
+    Recalcula el saldo de cada cuenta desde sus transacciones y lo compara con el almacenado.
+
+    Args:
+        versiones_iniciales: Versión de cada cuenta antes de su primera transacción
+        aprobadas: Transacciones que los trabajadores vieron aprobadas, por cuenta
+
+    Returns:
+        List[Dict[str, object]]: Una fila por cuenta, con `divergencias` (vacía si es consistente)
+    """
+    filas = []
+    for cuenta_id, version_inicial in versiones_iniciales.items():
+        cuenta = cuentas_repositorio.obtener_por_id(cuenta_id)
+        libro = [t for t in transacciones_repositorio.listar_por_cuenta(cuenta_id) if t.estado == TransactionState.APROBADA]
+        saldo_libro = sum((t.monto for t in libro), Decimal("0"))
+        divergencias = []
+        if cuenta.saldo != saldo_libro:
+            divergencias.append(f"saldo {cuenta.saldo} != libro {saldo_libro}")
+        if cuenta.saldo < 0:
+            divergencias.append(f"saldo negativo {cuenta.saldo}")
+        if len(libro) != aprobadas.get(cuenta_id, 0):
+            divergencias.append(f"{len(libro)} transacciones registradas != {aprobadas.get(cuenta_id, 0)} aprobadas")
+        if cuenta.version != version_inicial + len(libro):
+            divergencias.append(f"versión {cuenta.version} != {version_inicial} + {len(libro)}")
+        filas.append({
+            "cuenta_id": str(cuenta_id), "saldo": str(cuenta.saldo), "saldo_libro": str(saldo_libro),
+            "transacciones": len(libro), "version": cuenta.version, "divergencias": divergencias,
+        })
+    return filas
+
+
+def _preparar(backend, cuentas: int) -> Tuple[Dict[UUID, int], Counter]:
+    """Crea las cuentas en cero y les deposita SALDO_INICIAL por registrar_con_saldo (queda en el libro)."""
+    versiones: Dict[UUID, int] = {}
+    for _ in range(cuentas):
+        cuenta = Account(id=uuid4(), usuario_id=uuid4(), saldo=Decimal("0"), limite_diario=LIMITE_DIARIO)
+        backend.cuentas.guardar(cuenta)
+        versiones[cuenta.id] = backend.cuentas.obtener_por_id(cuenta.id).version
+        backend.transacciones.registrar_con_saldo(Transaction(
+            uuid4(), cuenta.id, codificacion.desde_centavos(SALDO_INICIAL), TransactionType.DEPOSITO,
+            TransactionState.APROBADA, datetime.now()
+        ))
+    return versiones, Counter({cuenta_id: 1 for cuenta_id in versiones})
+
+
+def _conflictos_mongo(backend) -> Optional[int]:
+    """Conflictos de escritura acumulados por el servidor MongoDB (None si no se pueden leer)."""
+    try:
+        estado = backend.transacciones.db.client.admin.command("serverStatus")
+        return estado["metrics"]["operation"]["writeConflicts"]
+    except Exception:
+        return None
+
+
+def ejecutar(
+    backend: str = "sqlite",
+    operaciones: int = 5000,
+    cuentas: int = 4,
+    hilos: int = 16,
+    procesos: int = 0,
+    proporcion_retiros: float = 0.5,
+    semilla: int = 2024,
+    directorio: Optional[str] = None,
+    mongo_uri: Optional[str] = None,
+    shards: int = 4
+) -> Dict[str, object]:
+    """
+    Prepara las cuentas, ejecuta la carga y verifica los saldos.
+
+    Returns:
+        Dict[str, object]: metadatos, resultado (rendimiento y esperas) y cuentas (verificación)
+    """
+    sqlite = backend != "mongo"
+    temporal = tempfile.mkdtemp(prefix="hsa_estres_") if directorio is None and sqlite else None
+    repositorios = crear_backend(backend, directorio or temporal, mongo_uri, shards)
+    destino = repositorios.transacciones.db_path if sqlite else mongo_uri
+    try:
+        versiones, aprobadas = _preparar(repositorios, cuentas)
+        lista = generar_operaciones(list(versiones), operaciones, proporcion_retiros, semilla)
+        conflictos_antes = _conflictos_mongo(repositorios) if backend == "mongo" else None
+
+        inicio = time.perf_counter()
+        if procesos:
+            partes = [(backend, destino, lista[i::procesos], hilos, shards) for i in range(procesos)]
+            with multiprocessing.get_context("spawn").Pool(procesos) as pool:
+                parciales = pool.map(_ejecutar_en_proceso, partes)
+        else:
+            parciales = [ejecutar_operaciones(backend, destino, lista, hilos, shards)]
+        segundos = time.perf_counter() - inicio
+
+        resultados: Counter = Counter()
+        for parcial in parciales:
+            resultados.update(parcial["resultados"])
+            aprobadas.update(parcial["aprobadas"])
+        resultado = resumir([l for parcial in parciales for l in parcial["latencias"]], segundos)
+        resultado.update({
+            "aprobadas_s": resultados["aprobada"] / segundos if segundos > 0 else 0.0,
+            "resultados": dict(resultados),
+            "reintentos": sum(parcial["reintentos"] for parcial in parciales),
+        })
+        if sqlite:
+            resultado["esperas_pool"] = sum(parcial["esperas_pool"] for parcial in parciales)
+            resultado["tiempo_espera_pool_s"] = sum(parcial["tiempo_espera_pool_s"] for parcial in parciales)
+            resultado["esperas_bloqueo"] = sum(parcial["esperas_bloqueo"] for parcial in parciales)
+            resultado["tiempo_espera_bloqueo_s"] = sum(parcial["tiempo_espera_bloqueo_s"] for parcial in parciales)
+            resultado["max_espera_bloqueo_ms"] = max(parcial["max_espera_bloqueo_s"] for parcial in parciales) * 1000
+        elif conflictos_antes is not None:
+            resultado["conflictos_escritura"] = _conflictos_mongo(repositorios) - conflictos_antes
+
+        verificacion = verificar_saldos(repositorios.cuentas, repositorios.transacciones, versiones, aprobadas)
+    finally:
+        repositorios.cerrar()
+        if temporal is not None:
+            shutil.rmtree(temporal, ignore_errors=True)
+    resultado["divergencias"] = sum(1 for fila in verificacion if fila["divergencias"])
+    configuracion = {
+        "backend": backend, "operaciones": operaciones, "cuentas": cuentas, "hilos": hilos,
+        "procesos": procesos, "proporcion_retiros": proporcion_retiros, "semilla": semilla,
+    }
+    if backend == "sqlite-sharded":
+        configuracion["shards"] = shards
+    return {"metadatos": {**metadatos(), **configuracion}, "resultado": resultado, "cuentas": verificacion}
+
+
+def _imprimir(documento: Dict[str, object]) -> None:
+    r = documento["resultado"]
+    m = documento["metadatos"]
+    print(f"{m['backend']}: {m['operaciones']} operaciones sobre {m['cuentas']} cuentas, "
+          f"{m['procesos'] or 1} proceso(s) x {m['hilos']} hilos")
+    print(f"  {r['ops_s']:,.1f} ops/s ({r['aprobadas_s']:,.1f} aprobadas/s); p50 {r['p50_ms']:.2f} ms, "
+          f"p95 {r['p95_ms']:.2f} ms, p99 {r['p99_ms']:.2f} ms, max {r['max_ms']:.2f} ms")
+    if "esperas_bloqueo" in r:
+        print(f"  bloqueo de escritura: {r['esperas_bloqueo']} esperas, {r['tiempo_espera_bloqueo_s'] * 1000:.1f} ms "
+              f"en total, máximo {r['max_espera_bloqueo_ms']:.2f} ms")
+    print(f"  resultados: {r['resultados']}; reintentos: {r['reintentos']}", end="")
+    if "esperas_pool" in r:
+        print(f"; esperas del pool: {r['esperas_pool']} ({r['tiempo_espera_pool_s'] * 1000:.1f} ms)", end="")
+    if "conflictos_escritura" in r:
+        print(f"; conflictos de escritura: {r['conflictos_escritura']}", end="")
+    print()
+    for fila in documento["cuentas"]:
+        estado = "; ".join(fila["divergencias"]) or "consistente"
+        print(f"  {fila['cuenta_id']}  saldo {fila['saldo']:>14}  transacciones {fila['transacciones']:>7}  {estado}")
+    print(f"Divergencias: {r['divergencias']}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Estrés de concurrencia sobre los saldos de las cuentas.")
+    parser.add_argument("--backend", choices=BACKENDS, default="sqlite")
+    parser.add_argument("--shards", type=int, default=4, help="Archivos del backend sqlite-sharded")
+    parser.add_argument("--operaciones", type=int, default=5000, help="Depósitos y retiros en total")
+    parser.add_argument("--cuentas", type=int, default=4, help="Cuentas calientes")
+    parser.add_argument("--hilos", type=int, default=16, help="Hilos por proceso")
+    parser.add_argument("--procesos", type=int, default=0, help="Procesos trabajadores (0 = solo hilos en este proceso)")
+    parser.add_argument("--proporcion-retiros", type=float, default=0.5)
+    parser.add_argument("--semilla", type=int, default=2024)
+    parser.add_argument("--directorio", help="Directorio de la base SQLite (por defecto, uno temporal)")
+    parser.add_argument("--mongo-uri", help="Instancia de MongoDB local y desechable")
+    parser.add_argument("--salida", help="Archivo JSON de resultados")
+    args = parser.parse_args(argv)
+    if args.backend == "mongo" and not args.mongo_uri:
+        parser.error("--backend mongo requiere --mongo-uri")
+
+    from infrastructure.registro import configurar_registro
+    configurar_registro()
+    documento = ejecutar(args.backend, args.operaciones, args.cuentas, args.hilos, args.procesos,
+                         args.proporcion_retiros, args.semilla, args.directorio, args.mongo_uri, args.shards)
+    if args.salida:
+        with open(args.salida, "w", encoding="utf-8") as archivo:
+            json.dump(documento, archivo, indent=2, ensure_ascii=False)
+    _imprimir(documento)
+    return 1 if documento["resultado"]["divergencias"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
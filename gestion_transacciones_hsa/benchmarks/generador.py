@@ -0,0 +1,171 @@
+# benchmarks/generador.py
+"""
+Generador determinista de datos sintéticos de cuentas HSA.
+
+- La actividad de las cuentas sigue una distribución de Zipf: con el exponente por
+  defecto y 20.000 cuentas, el 1% más activo concentra cerca de un tercio de las
+  transacciones (ver participacion_mas_activas). El orden de actividad se asigna al
+  azar (las cuentas calientes no son las primeras).
+- Los depósitos (aportes) son menos frecuentes y de mayor monto que los retiros (gastos
+  médicos); ambos montos siguen distribuciones lognormales.
+- Los saldos se siguen mientras se genera: un retiro sin fondos queda RECHAZADO y una
+  fracción de las transacciones queda PENDIENTE. Al terminar, el saldo de cada cuenta es
+  la suma de sus transacciones APROBADAS (los retiros son montos negativos).
+
+La misma semilla produce siempre las mismas cuentas, transacciones e identificadores.
+"""
+import math
+import random
+from bisect import bisect
+from datetime import datetime, timedelta
+from decimal import Decimal
+from itertools import accumulate
+from typing import Iterator, List, Sequence
+from uuid import UUID
+from domain.entities.account import Account
+from domain.entities.transaction import Transaction, TransactionState
+from domain.entities.transaction_type import TransactionType
+from infrastructure.db import codificacion
+
+# Transacciones por cuenta en promedio al dimensionar un conjunto de datos por filas
+TRANSACCIONES_POR_CUENTA = 50
+
+# Transacciones cuyos ids se guardan como muestra para las lecturas por id
+TAMANO_MUESTRA = 10_000
+
+LIMITE_DIARIO = Decimal("5000.00")
+
+
+class GeneradorHSA:
+    """Cuentas y transacciones sintéticas reproducibles a partir de una semilla."""
+
+    def __init__(
+        self,
+        num_cuentas: int,
+        semilla: int = 2024,
+        zipf: float = 0.8,
+        proporcion_depositos: float = 0.4,
+        proporcion_pendientes: float = 0.02,
+        inicio: datetime = datetime(2024, 1, 1),
+        dias: int = 365
+    ):
+        """
+        Args:
+            num_cuentas: Cuentas del conjunto de datos
+            semilla: Semilla de todos los valores aleatorios
+            zipf: Exponente de la distribución de actividad (0 = uniforme)
+            proporcion_depositos: Fracción de las transacciones que son depósitos
+            proporcion_pendientes: Fracción de las transacciones que quedan PENDIENTES
+            inicio: Fecha de la primera transacción
+            dias: Días que cubren las transacciones (en orden cronológico)
+        """
+        if num_cuentas < 1:
+            raise ValueError("Se necesita al menos una cuenta.")
+        self.semilla = semilla
+        self.proporcion_depositos = proporcion_depositos
+        self.proporcion_pendientes = proporcion_pendientes
+        self.inicio = inicio
+        self.dias = dias
+        self._aleatorio = random.Random(semilla)
+        self._muestreo = random.Random(semilla + 1)  # No altera la secuencia de transacciones
+        self.cuentas_ids: List[UUID] = [self._uuid() for _ in range(num_cuentas)]
+        self._usuarios: List[UUID] = [self._uuid() for _ in range(num_cuentas)]
+        # Rango de actividad -> cuenta, y pesos acumulados 1/rango^zipf
+        self._por_rango = list(range(num_cuentas))
+        self._aleatorio.shuffle(self._por_rango)
+        self._pesos = list(accumulate(1 / (rango ** zipf) for rango in range(1, num_cuentas + 1)))
+        self._saldos = [0] * num_cuentas  # Centavos
+        self._generadas = 0
+        self.muestra_transacciones: List[UUID] = []
+
+    def _uuid(self) -> UUID:
+        return UUID(int=self._aleatorio.getrandbits(128), version=4)
+
+    def _indice_cuenta(self, aleatorio: random.Random) -> int:
+        return self._por_rango[bisect(self._pesos, aleatorio.random() * self._pesos[-1])]
+
+    def elegir_indices(self, n: int, semilla: int = 0) -> List[int]:
+        """Posiciones de cuentas elegidas con la distribución de actividad (las calientes se repiten)."""
+        aleatorio = random.Random(self.semilla * 1_000_003 + semilla)
+        return [self._indice_cuenta(aleatorio) for _ in range(n)]
+
+    def elegir_cuentas(self, n: int, semilla: int = 0) -> List[UUID]:
+        """Cuentas elegidas con la misma distribución de actividad (ver elegir_indices)."""
+        return [self.cuentas_ids[indice] for indice in self.elegir_indices(n, semilla)]
+
+    def participacion_mas_activas(self, fraccion: float = 0.01) -> float:
+        """Fracción esperada de las transacciones que corresponde a las cuentas más activas."""
+        cantidad = max(1, math.ceil(len(self._pesos) * fraccion))
+        return self._pesos[cantidad - 1] / self._pesos[-1]
+
+    def transacciones(self, n: int, tamano_lote: int = 10_000) -> Iterator[List[Transaction]]:
+        """
+        Genera `n` transacciones más, en lotes, continuando la secuencia (y los saldos) de
+        las llamadas anteriores.
+        """
+        aleatorio = self._aleatorio
+        paso = timedelta(days=self.dias) / max(n, 1)
+        aprobada, rechazada, pendiente = TransactionState.APROBADA, TransactionState.RECHAZADA, TransactionState.PENDIENTE
+        desde_centavos = codificacion.desde_centavos
+        lote: List[Transaction] = []
+        for i in range(n):
+            indice = self._indice_cuenta(aleatorio)
+            if aleatorio.random() < self.proporcion_depositos:
+                tipo = TransactionType.DEPOSITO
+                centavos = max(100, int(aleatorio.lognormvariate(math.log(250), 0.6) * 100))
+            else:
+                tipo = TransactionType.RETIRO
+                centavos = -max(100, int(aleatorio.lognormvariate(math.log(60), 1.0) * 100))
+
+            if aleatorio.random() < self.proporcion_pendientes:
+                estado = pendiente
+            elif self._saldos[indice] + centavos < 0:
+                estado = rechazada  # Fondos insuficientes
+            else:
+                estado = aprobada
+                self._saldos[indice] += centavos
+
+            transaccion = Transaction.desde_almacenamiento(
+                self._uuid(), self.cuentas_ids[indice], desde_centavos(centavos), tipo, estado,
+                self.inicio + paso * i
+            )
+            self._muestrear(transaccion.id)
+            lote.append(transaccion)
+            if len(lote) == tamano_lote:
+                yield lote
+                lote = []
+        if lote:
+            yield lote
+
+    def _muestrear(self, id: UUID) -> None:
+        """Muestreo de reservorio de los ids generados."""
+        self._generadas += 1
+        if len(self.muestra_transacciones) < TAMANO_MUESTRA:
+            self.muestra_transacciones.append(id)
+            return
+        posicion = self._muestreo.randrange(self._generadas)
+        if posicion < TAMANO_MUESTRA:
+            self.muestra_transacciones[posicion] = id
+
+    def cuentas(self) -> List[Account]:
+        """Las cuentas con el saldo que resulta de las transacciones generadas hasta ahora."""
+        return [
+            Account.desde_almacenamiento(
+                id, usuario_id, codificacion.desde_centavos(saldo), LIMITE_DIARIO, 0
+            )
+            for id, usuario_id, saldo in zip(self.cuentas_ids, self._usuarios, self._saldos)
+        ]
+
+
+def generador_para(filas: int, semilla: int = 2024, **opciones) -> GeneradorHSA:
+    """Generador dimensionado para `filas` transacciones (TRANSACCIONES_POR_CUENTA por cuenta)."""
+    return GeneradorHSA(max(10, filas // TRANSACCIONES_POR_CUENTA), semilla=semilla, **opciones)
+
+
+def saldos_por_cuenta(transacciones: Sequence[Transaction]) -> dict:
+    """Suma de los montos APROBADOS por cuenta (el saldo esperado)."""
+    saldos: dict = {}
+    for transaccion in transacciones:
+        if transaccion.estado == TransactionState.APROBADA:
+            saldos[transaccion.cuenta_id] = saldos.get(transaccion.cuenta_id, Decimal("0")) + transaccion.monto
+    return saldos
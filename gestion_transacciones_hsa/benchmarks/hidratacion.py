@@ -0,0 +1,188 @@
+# benchmarks/hidratacion.py
+"""
+Memoria y velocidad de hidratación de entidades leídas del almacenamiento.
+
+Compara, sobre las mismas filas de transacciones_v2 y cuentas_v2:
+
+- antes: clases con __dict__ por instancia y constructor que valida y convierte, un
+  UUID nuevo por columna y el tipo buscado recorriendo el enum (una copia de la
+  implementación anterior, incluida aquí como referencia);
+- después: las entidades con __slots__, construidas con `desde_almacenamiento` desde
+  los _desde_fila de los repositorios SQLite (cuenta_id compartido entre filas), y el
+  tipo buscado en un diccionario.
+
+La memoria se mide con tracemalloc (objetos creados al hidratar, incluidos los
+valores de cada campo) y se informa extrapolada a 1M de transacciones.
+
+Uso: python -m benchmarks.hidratacion [--n 200000] [--repeticiones 3]
+"""
+import argparse
+import gc
+import logging
+import os
+import random
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+from typing import Callable, List, Optional, Sequence, Tuple
+from uuid import UUID, uuid4
+from domain.entities.transaction import TransactionState
+from domain.entities.transaction_type import TransactionType
+from infrastructure.db import codificacion
+from infrastructure.repositories.sqlite_account_repository import SQLiteAccountRepository
+from infrastructure.repositories.sqlite_transaction_repository import SQLiteTransactionRepository
+
+logger = logging.getLogger(__name__)
+
+POR_MILLON = 1_000_000
+_EPOCA = datetime(1970, 1, 1)
+
+
+class _TransaccionAnterior:
+    """Transaction antes de __slots__: atributos en __dict__ y conversión en el constructor."""
+
+    def __init__(self, id, cuenta_id, monto, tipo, estado, fecha=None):
+        self.id = id
+        self.cuenta_id = cuenta_id
+        self.monto = monto
+        self.tipo = tipo if isinstance(tipo, TransactionType) else _tipo_anterior(tipo)
+        self.estado = estado if isinstance(estado, TransactionState) else TransactionState(estado.upper())
+        self.fecha = fecha or datetime.now()
+        logger.debug("Transacción creada - ID: %s, Tipo: %s, Estado: %s", id, self.tipo, self.estado)
+
+
+class _CuentaAnterior:
+    """Account antes de __slots__: valida cada UUID pasándolo dos veces por texto."""
+
+    def __init__(self, id, usuario_id, saldo, limite_diario, version=0):
+        if not self._is_valid_uuid(id) or not self._is_valid_uuid(usuario_id):
+            raise ValueError("UUID mal formado.")
+        self.id = id
+        self.usuario_id = usuario_id
+        self.saldo = saldo
+        self.limite_diario = limite_diario
+        self.version = version
+
+    @staticmethod
+    def _is_valid_uuid(uuid_to_test, version=4):
+        try:
+            uuid_obj = UUID(str(uuid_to_test), version=version)
+        except ValueError:
+            return False
+        return str(uuid_obj) == str(uuid_to_test)
+
+
+def _tipo_anterior(value: str) -> TransactionType:
+    """TransactionType.from_string antes del diccionario: recorre el enum."""
+    normalized_value = value.upper()
+    for tipo in TransactionType:
+        if tipo.value == normalized_value:
+            return tipo
+    raise ValueError(f"Tipo de transacción no válido: {value}")
+
+
+def _transaccion_anterior(row: tuple) -> _TransaccionAnterior:
+    return _TransaccionAnterior(
+        id=UUID(bytes=bytes(row[0])),
+        cuenta_id=UUID(bytes=bytes(row[1])),
+        monto=codificacion.desde_centavos(row[2]),
+        tipo=codificacion.TIPOS_POR_CODIGO[row[3]],
+        estado=codificacion.ESTADOS_POR_CODIGO[row[4]],
+        fecha=_EPOCA + timedelta(microseconds=row[5])
+    )
+
+
+def _cuenta_anterior(row: tuple) -> _CuentaAnterior:
+    return _CuentaAnterior(
+        id=UUID(bytes=bytes(row[0])),
+        usuario_id=UUID(bytes=bytes(row[1])),
+        saldo=codificacion.desde_centavos(row[2]),
+        limite_diario=codificacion.desde_centavos(row[3]),
+        version=row[4]
+    )
+
+
+def filas_transacciones(n: int, semilla: int = 7) -> List[tuple]:
+    """Filas de transacciones_v2 (id, cuenta_id, centavos, tipo, estado, fecha) como las entrega sqlite3."""
+    aleatorio = random.Random(semilla)
+    cuentas = [uuid4().bytes for _ in range(max(1, n // 100))]
+    tipos = list(TransactionType)
+    inicio = codificacion.fecha_a_epoch(datetime(2024, 1, 1))
+    return [
+        (os.urandom(16), aleatorio.choice(cuentas), aleatorio.randint(1, 500_000),
+         codificacion.CODIGOS_TIPO[aleatorio.choice(tipos)], codificacion.CODIGOS_ESTADO[TransactionState.APROBADA],
+         inicio + i * 1_000_000)
+        for i in range(n)
+    ]
+
+
+def filas_cuentas(n: int) -> List[tuple]:
+    """Filas de cuentas_v2 (id, usuario_id, saldo, límite, versión)."""
+    return [(uuid4().bytes, uuid4().bytes, 100_000, 500_000, 1) for _ in range(n)]
+
+
+def medir_memoria(hidratar: Callable[[tuple], object], filas: Sequence[tuple]) -> float:
+    """Bytes asignados por entidad al hidratar todas las filas (entidad y valores de sus campos)."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        entidades = [hidratar(row) for row in filas]
+        asignados = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    del entidades
+    return asignados / len(filas)
+
+
+def medir_velocidad(funcion: Callable[[object], object], entradas: Sequence, repeticiones: int) -> float:
+    """Llamadas por segundo, con la mejor de `repeticiones` pasadas."""
+    mejor = float("inf")
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        for entrada in entradas:
+            funcion(entrada)
+        mejor = min(mejor, time.perf_counter() - inicio)
+    return len(entradas) / mejor
+
+
+def comparar(n: int = 200_000, repeticiones: int = 3) -> List[Tuple[str, float, float]]:
+    """
+    Mide antes y después cada aspecto.
+
+    Returns:
+        List[Tuple[str, float, float]]: (medida, antes, después)
+    """
+    transacciones = filas_transacciones(n)
+    cuentas = filas_cuentas(max(1, n // 10))
+    textos_tipo = ["deposito", "RETIRO"] * (n // 2)
+    nueva_transaccion = SQLiteTransactionRepository._desde_fila
+    nueva_cuenta = SQLiteAccountRepository._desde_fila
+    return [
+        ("MB por 1M de transacciones",
+         medir_memoria(_transaccion_anterior, transacciones) * POR_MILLON / 2**20,
+         medir_memoria(nueva_transaccion, transacciones) * POR_MILLON / 2**20),
+        ("transacciones hidratadas/s",
+         medir_velocidad(_transaccion_anterior, transacciones, repeticiones),
+         medir_velocidad(nueva_transaccion, transacciones, repeticiones)),
+        ("cuentas hidratadas/s",
+         medir_velocidad(_cuenta_anterior, cuentas, repeticiones),
+         medir_velocidad(nueva_cuenta, cuentas, repeticiones)),
+        ("TransactionType.from_string/s",
+         medir_velocidad(_tipo_anterior, textos_tipo, repeticiones),
+         medir_velocidad(TransactionType.from_string, textos_tipo, repeticiones)),
+    ]
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Compara memoria y velocidad de hidratación de entidades.")
+    parser.add_argument("--n", type=int, default=200_000, help="Filas de transacciones a hidratar")
+    parser.add_argument("--repeticiones", type=int, default=3, help="Pasadas por medida (se toma la mejor)")
+    args = parser.parse_args(argv)
+
+    print(f"{'medida':<32}{'antes':>14}{'después':>14}{'cambio':>10}")
+    for medida, antes, despues in comparar(args.n, args.repeticiones):
+        print(f"{medida:<32}{antes:>14,.1f}{despues:>14,.1f}{despues / antes:>9.2f}x")
+
+
+if __name__ == "__main__":
+    main()
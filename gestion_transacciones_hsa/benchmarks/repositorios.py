@@ -0,0 +1,336 @@
+# benchmarks/repositorios.py
+"""
+Rendimiento de los repositorios por backend y tamaño del conjunto de datos.
+
+Para cada backend (SQLite, SQLite en --shards archivos y, si se indica una instancia
+local, MongoDB) y cada tamaño
+(por ejemplo 10k, 1M y 10M transacciones) carga un conjunto generado con
+benchmarks.generador y mide:
+
+- carga: guardar_lote de todo el conjunto (filas por segundo);
+- guardar: transacciones nuevas de a una;
+- obtener_por_id: transacciones y cuentas por id;
+- listar_por_cuenta y generar_informe_financiero: cuentas elegidas con la misma
+  distribución de actividad (las calientes, con historiales largos, se repiten);
+- listar_todos: cuentas y, hasta --max-filas-listar, transacciones (REPETICIONES_LISTADOS
+  pasadas completas).
+
+Los resultados se escriben en JSON. Con --linea-base se comparan contra una corrida
+anterior: una caída de operaciones por segundo o una suba del p95 mayor que la
+tolerancia cuenta como regresión y el proceso termina con código 1.
+
+MongoDB usa la base hsa_db de la instancia indicada y la elimina al terminar: usar solo
+una instancia local desechable (por ejemplo, un contenedor de prueba). Si la base ya
+tiene datos, el backend no se ejecuta.
+
+Uso:
+    python -m benchmarks.repositorios --filas 10000 1000000 10000000 --salida resultados.json
+    python -m benchmarks.repositorios --linea-base resultados.json --tolerancia 0.2
+    python -m benchmarks.repositorios --backends sqlite mongo --mongo-uri mongodb://localhost:27017
+"""
+import argparse
+import json
+import logging
+import os
+import shutil
+import sys
+import tempfile
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Sequence
+from benchmarks.estadisticas import metadatos, resumir
+from benchmarks.generador import generador_para
+
+logger = logging.getLogger(__name__)
+
+BACKENDS = ("sqlite", "sqlite-sharded", "mongo")
+
+TAMANO_LOTE_CARGA = 10_000
+MAX_FILAS_LISTAR = 1_000_000
+
+# Pasadas de listar_todos (cada una lee el conjunto completo)
+REPETICIONES_LISTADOS = 3
+
+# Métricas comparadas con la línea base y si un valor mayor es mejor
+METRICAS_COMPARADAS = (("ops_s", True), ("p95_ms", False))
+
+# Diferencias de latencia menores que esta no cuentan como regresión (ruido de medición)
+MIN_DIFERENCIA_MS = 0.1
+
+
+class Backend:
+    """Repositorios y servicio de aplicación de un backend, listos para medir."""
+
+    def __init__(self, nombre: str, cuentas, transacciones, cerrar: Callable[[], None]):
+        from domain.services.transaction_service import TransactionService
+        from application.services.transaction_application_service import TransactionApplicationService
+        self.nombre = nombre
+        self.cuentas = cuentas
+        self.transacciones = transacciones
+        self.informes = TransactionApplicationService(TransactionService(transacciones, cuentas), cuentas)
+        self.cerrar = cerrar
+
+
+def backend_sqlite(directorio: str) -> Backend:
+    """Repositorios SQLite (sin caché de cuentas) sobre una base nueva en `directorio`."""
+    from infrastructure.db.sqlite_pool import cerrar_pools
+    from infrastructure.repositories.sqlite_account_repository import SQLiteAccountRepository
+    from infrastructure.repositories.sqlite_transaction_repository import SQLiteTransactionRepository
+    db_path = os.path.join(directorio, f"benchmark_{time.time_ns()}.db")
+    return Backend(
+        "sqlite",
+        SQLiteAccountRepository(db_path=db_path),
+        SQLiteTransactionRepository(db_path=db_path),
+        cerrar_pools
+    )
+
+
+def backend_sqlite_sharded(directorio: str, shards: int = 4) -> Backend:
+    """Repositorios SQLite repartidos en `shards` archivos nuevos en `directorio` (ver shards_sqlite)."""
+    from infrastructure.db.sqlite_pool import cerrar_pools
+    from infrastructure.repositories.sharded_sqlite_account_repository import ShardedSQLiteAccountRepository
+    from infrastructure.repositories.sharded_sqlite_transaction_repository import ShardedSQLiteTransactionRepository
+    db_path = os.path.join(directorio, f"benchmark_{time.time_ns()}.db")
+    return Backend(
+        "sqlite-sharded",
+        ShardedSQLiteAccountRepository(db_path=db_path, shards=shards),
+        ShardedSQLiteTransactionRepository(db_path=db_path, shards=shards),
+        cerrar_pools
+    )
+
+
+def backend_mongo(uri: str) -> Backend:
+    """
+    Repositorios MongoDB sobre la base hsa_db de `uri`, que se elimina al cerrar.
+
+    Raises:
+        RuntimeError: Si la base ya tiene datos
+    """
+    from infrastructure.db.mongo_clientes import cerrar_clientes, obtener_cliente
+    from infrastructure.repositories.mongo_account_repository import MongoAccountRepository
+    from infrastructure.repositories.mongo_transaction_repository import MongoTransactionRepository
+    cliente = obtener_cliente(uri)
+    if any(cliente.hsa_db[coleccion].estimated_document_count() for coleccion in cliente.hsa_db.list_collection_names()):
+        raise RuntimeError(f"La base hsa_db de {uri} tiene datos: se necesita una instancia desechable")
+
+    def cerrar():
+        cliente.drop_database("hsa_db")
+        cerrar_clientes()
+
+    return Backend("mongo", MongoAccountRepository(uri), MongoTransactionRepository(uri), cerrar)
+
+
+def crear_backend(nombre: str, directorio: str, mongo_uri: Optional[str] = None, shards: int = 4) -> Backend:
+    """Backend por nombre: sqlite, sqlite-sharded o mongo."""
+    if nombre == "sqlite":
+        return backend_sqlite(directorio)
+    if nombre == "sqlite-sharded":
+        return backend_sqlite_sharded(directorio, shards)
+    return backend_mongo(mongo_uri)
+
+
+def _medir(operacion: Callable[[object], object], argumentos: Iterable) -> List[float]:
+    """Latencia de cada llamada a `operacion`, en serie."""
+    latencias = []
+    for argumento in argumentos:
+        inicio = time.perf_counter()
+        operacion(argumento)
+        latencias.append(time.perf_counter() - inicio)
+    return latencias
+
+
+def _agotar(iterable) -> None:
+    for _ in iterable:
+        pass
+
+
+def medir_backend(
+    backend: Backend,
+    filas: int,
+    operaciones: int = 1000,
+    semilla: int = 2024,
+    max_filas_listar: int = MAX_FILAS_LISTAR
+) -> List[Dict[str, object]]:
+    """
+    Carga `filas` transacciones generadas en el backend y mide cada operación.
+
+    Returns:
+        List[Dict[str, object]]: Un resultado por operación (ver estadisticas.resumir)
+    """
+    generador = generador_para(filas, semilla=semilla)
+    resultados = []
+
+    def agregar(operacion: str, latencias: Sequence[float], segundos: Optional[float] = None, **extra) -> None:
+        resultado = {"backend": backend.nombre, "filas": filas, "operacion": operacion}
+        resultado.update(resumir(latencias, segundos))
+        resultado.update(extra)
+        resultados.append(resultado)
+        logger.info("%s %s %s: %.0f ops/s, p95 %.2f ms", backend.nombre, filas, operacion,
+                    resultado["ops_s"], resultado["p95_ms"])
+
+    inicio = time.perf_counter()
+    for lote in generador.transacciones(filas, TAMANO_LOTE_CARGA):
+        backend.transacciones.guardar_lote(lote)
+    cuentas = generador.cuentas()
+    for desde in range(0, len(cuentas), TAMANO_LOTE_CARGA):
+        backend.cuentas.guardar_lote(cuentas[desde:desde + TAMANO_LOTE_CARGA])
+    segundos = time.perf_counter() - inicio
+    resultados.append({"backend": backend.nombre, "filas": filas, "operacion": "carga",
+                       "segundos": segundos, "filas_s": filas / segundos})
+
+    lecturas = max(10, operaciones // 10)  # Los listados e informes leen historiales completos
+    muestra = generador.muestra_transacciones[:operaciones]
+    nuevas = [t for lote in generador.transacciones(operaciones) for t in lote]
+    agregar("guardar", _medir(backend.transacciones.guardar, nuevas))
+    agregar("obtener_por_id", _medir(backend.transacciones.obtener_por_id, muestra))
+    agregar("cuentas.obtener_por_id", _medir(backend.cuentas.obtener_por_id, generador.elegir_cuentas(operaciones, 1)))
+    agregar("listar_por_cuenta", _medir(backend.transacciones.listar_por_cuenta, generador.elegir_cuentas(lecturas, 2)))
+    agregar("generar_informe_financiero",
+            _medir(backend.informes.generar_informe_financiero, generador.elegir_cuentas(lecturas, 3)))
+    pasadas = [None] * REPETICIONES_LISTADOS
+    agregar("cuentas.listar_todos", _medir(lambda _: backend.cuentas.listar_todos(), pasadas),
+            filas_leidas=len(cuentas))
+    if filas <= max_filas_listar:
+        latencias = _medir(lambda _: _agotar(backend.transacciones.listar_todos()), pasadas)
+        agregar("listar_todos", latencias, filas_leidas=filas + len(nuevas),
+                filas_s=(filas + len(nuevas)) / min(latencias))
+    return resultados
+
+
+def _clave(resultado: Dict[str, object]) -> tuple:
+    return resultado["backend"], resultado["filas"], resultado["operacion"]
+
+
+def comparar_con_linea_base(
+    resultados: Sequence[Dict[str, object]],
+    linea_base: Sequence[Dict[str, object]],
+    tolerancia: float = 0.2
+) -> List[Dict[str, object]]:
+    """
+    Compara cada métrica de METRICAS_COMPARADAS (y filas_s de la carga y los listados)
+    con la de la misma operación en la línea base. Las latencias solo cuentan como
+    regresión si además suben al menos MIN_DIFERENCIA_MS.
+
+    Returns:
+        List[Dict[str, object]]: backend, filas, operacion, metrica, antes, despues,
+            cambio (despues / antes) y regresion
+    """
+    anteriores = {_clave(resultado): resultado for resultado in linea_base}
+    comparacion = []
+    for resultado in resultados:
+        anterior = anteriores.get(_clave(resultado))
+        if anterior is None:
+            continue
+        for metrica, mayor_es_mejor in METRICAS_COMPARADAS + (("filas_s", True),):
+            antes, despues = anterior.get(metrica), resultado.get(metrica)
+            if not antes or despues is None:
+                continue
+            cambio = despues / antes
+            if mayor_es_mejor:
+                regresion = cambio < 1 - tolerancia
+            else:
+                regresion = cambio > 1 + tolerancia and despues - antes >= MIN_DIFERENCIA_MS
+            backend, filas, operacion = _clave(resultado)
+            comparacion.append({
+                "backend": backend, "filas": filas, "operacion": operacion, "metrica": metrica,
+                "antes": antes, "despues": despues, "cambio": cambio, "regresion": regresion
+            })
+    return comparacion
+
+
+def ejecutar(
+    filas: Sequence[int],
+    backends: Sequence[str] = ("sqlite",),
+    operaciones: int = 1000,
+    semilla: int = 2024,
+    directorio: Optional[str] = None,
+    mongo_uri: Optional[str] = None,
+    max_filas_listar: int = MAX_FILAS_LISTAR,
+    shards: int = 4
+) -> Dict[str, object]:
+    """
+    Ejecuta la suite y retorna el documento de resultados (metadatos y resultados).
+
+    Los tamaños se miden de menor a mayor, cada uno sobre una base nueva, para obtener las
+    curvas de escalamiento de cada operación.
+    """
+    temporal = tempfile.mkdtemp(prefix="hsa_benchmark_") if directorio is None else None
+    resultados: List[Dict[str, object]] = []
+    omitidos: Dict[str, str] = {}
+    try:
+        for nombre in backends:
+            for cantidad in sorted(filas):
+                try:
+                    backend = crear_backend(nombre, directorio or temporal, mongo_uri, shards)
+                except Exception as e:  # Sin instancia de MongoDB, o con datos
+                    logger.warning("Backend %s omitido: %s", nombre, e)
+                    omitidos[nombre] = str(e)
+                    break
+                try:
+                    resultados.extend(medir_backend(backend, cantidad, operaciones, semilla, max_filas_listar))
+                finally:
+                    backend.cerrar()
+    finally:
+        if temporal is not None:
+            shutil.rmtree(temporal, ignore_errors=True)
+    documento = {
+        "metadatos": {**metadatos(), "semilla": semilla, "operaciones": operaciones, "shards": shards},
+        "resultados": resultados,
+    }
+    if omitidos:
+        documento["omitidos"] = omitidos
+    return documento
+
+
+def _imprimir(resultados: Sequence[Dict[str, object]], comparacion: Sequence[Dict[str, object]]) -> None:
+    print(f"{'backend':<8}{'filas':>10}  {'operación':<28}{'ops/s':>12}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    for r in resultados:
+        if r["operacion"] == "carga":
+            print(f"{r['backend']:<8}{r['filas']:>10}  {'carga (filas/s)':<28}{r['filas_s']:>12,.0f}")
+            continue
+        print(f"{r['backend']:<8}{r['filas']:>10}  {r['operacion']:<28}{r['ops_s']:>12,.1f}"
+              f"{r['p50_ms']:>10.2f}{r['p95_ms']:>10.2f}{r['p99_ms']:>10.2f}")
+    if comparacion:
+        print(f"\n{'backend':<8}{'filas':>10}  {'operación':<28}{'métrica':<9}{'antes':>12}{'después':>12}{'cambio':>9}")
+        for c in comparacion:
+            marca = "  REGRESIÓN" if c["regresion"] else ""
+            print(f"{c['backend']:<8}{c['filas']:>10}  {c['operacion']:<28}{c['metrica']:<9}"
+                  f"{c['antes']:>12,.2f}{c['despues']:>12,.2f}{c['cambio']:>8.2f}x{marca}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Mide los repositorios sobre datos sintéticos.")
+    parser.add_argument("--filas", type=int, nargs="+", default=[10_000], help="Tamaños del conjunto de datos")
+    parser.add_argument("--backends", nargs="+", choices=BACKENDS, default=["sqlite"])
+    parser.add_argument("--shards", type=int, default=4, help="Archivos del backend sqlite-sharded")
+    parser.add_argument("--operaciones", type=int, default=1000, help="Operaciones medidas por tipo")
+    parser.add_argument("--semilla", type=int, default=2024)
+    parser.add_argument("--directorio", help="Directorio de las bases SQLite (por defecto, uno temporal)")
+    parser.add_argument("--mongo-uri", help="Instancia de MongoDB local y desechable")
+    parser.add_argument("--max-filas-listar", type=int, default=MAX_FILAS_LISTAR,
+                        help="Tamaño máximo en el que se mide listar_todos de transacciones")
+    parser.add_argument("--salida", help="Archivo JSON de resultados")
+    parser.add_argument("--linea-base", help="Resultados JSON anteriores contra los que comparar")
+    parser.add_argument("--tolerancia", type=float, default=0.2, help="Cambio relativo aceptado antes de una regresión")
+    args = parser.parse_args(argv)
+    if "mongo" in args.backends and not args.mongo_uri:
+        parser.error("--backends mongo requiere --mongo-uri")
+
+    from infrastructure.registro import configurar_registro
+    configurar_registro()
+    documento = ejecutar(args.filas, args.backends, args.operaciones, args.semilla, args.directorio,
+                         args.mongo_uri, args.max_filas_listar, args.shards)
+    comparacion: List[Dict[str, object]] = []
+    if args.linea_base:
+        with open(args.linea_base, encoding="utf-8") as archivo:
+            linea_base = json.load(archivo)
+        comparacion = comparar_con_linea_base(documento["resultados"], linea_base["resultados"], args.tolerancia)
+        documento["comparacion"] = {"linea_base": args.linea_base, "tolerancia": args.tolerancia, "metricas": comparacion}
+    if args.salida:
+        with open(args.salida, "w", encoding="utf-8") as archivo:
+            json.dump(documento, archivo, indent=2, ensure_ascii=False)
+    _imprimir(documento["resultados"], comparacion)
+    return 1 if any(c["regresion"] for c in comparacion) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
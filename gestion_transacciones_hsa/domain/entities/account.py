@@ -3,12 +3,15 @@ from uuid import UUID
 from decimal import Decimal
 
 class Account:
+    __slots__ = ("id", "usuario_id", "saldo", "limite_diario", "version")
+
     def __init__(
         self,
         id: UUID,
         usuario_id: UUID,
         saldo: Decimal,
-        limite_diario: Decimal
+        limite_diario: Decimal,
+        version: int = 0
     ):
         if not self._is_valid_uuid(id) or not self._is_valid_uuid(usuario_id):
             raise ValueError("UUID mal formado.")
@@ -16,9 +19,34 @@ class Account:
         self.usuario_id = usuario_id
         self.saldo = saldo
         self.limite_diario = limite_diario
+        self.version = version  # Escrituras confirmadas de la cuenta (control optimista de concurrencia)
+
+    @classmethod
+    def desde_almacenamiento(
+        cls,
+        id: UUID,
+        usuario_id: UUID,
+        saldo: Decimal,
+        limite_diario: Decimal,
+        version: int
+    ) -> 'Account':
+        """
+        Construye una cuenta leída del almacenamiento, cuyos UUID ya se validaron al
+        guardarla: no los vuelve a validar.
+        """
+        cuenta = object.__new__(cls)
+        cuenta.id = id
+        cuenta.usuario_id = usuario_id
+        cuenta.saldo = saldo
+        cuenta.limite_diario = limite_diario
+        cuenta.version = version
+        return cuenta
 
     @staticmethod
     def _is_valid_uuid(uuid_to_test, version=4):
+        if isinstance(uuid_to_test, UUID):
+            # UUID.version es None si la variante no es la de RFC 4122: equivale a comparar el texto
+            return uuid_to_test.version == version
         try:
             uuid_obj = UUID(str(uuid_to_test), version=version)
         except ValueError:
@@ -32,7 +60,8 @@ class Account:
             id=UUID(data[id_key]),
             usuario_id=UUID(data["usuario_id"]),
             saldo=Decimal(str(data["saldo"])),
-            limite_diario=Decimal(str(data["limite_diario"]))
+            limite_diario=Decimal(str(data["limite_diario"])),
+            version=int(data.get("version", 0))
         )
 
     def actualizar_saldo(self, monto: Decimal):
@@ -0,0 +1,66 @@
+# domain/entities/resumen_cuenta.py
+from datetime import datetime
+from decimal import Decimal
+from typing import Optional
+from domain.entities.transaction_type import TransactionType
+
+class ResumenCuenta:
+    """
+    Totales de las transacciones APROBADAS de una cuenta, por tipo.
+
+    Los montos se suman tal como están guardados (los retiros son negativos).
+    `num_transacciones`, `primera_fecha` y `ultima_fecha` cubren todas las transacciones
+    de la cuenta, en cualquier estado (None si el almacenamiento no las mantiene).
+    """
+
+    def __init__(
+        self,
+        num_depositos: int = 0,
+        monto_depositos: Decimal = Decimal("0"),
+        num_retiros: int = 0,
+        monto_retiros: Decimal = Decimal("0"),
+        num_transacciones: Optional[int] = None,
+        primera_fecha: Optional[datetime] = None,
+        ultima_fecha: Optional[datetime] = None
+    ):
+        self.num_depositos = num_depositos
+        self.monto_depositos = monto_depositos
+        self.num_retiros = num_retiros
+        self.monto_retiros = monto_retiros
+        self.num_transacciones = num_transacciones
+        self.primera_fecha = primera_fecha
+        self.ultima_fecha = ultima_fecha
+
+    def agregar(self, tipo: TransactionType, cantidad: int, monto: Decimal) -> None:
+        """Suma al resumen un grupo de transacciones aprobadas del mismo tipo."""
+        if tipo == TransactionType.DEPOSITO:
+            self.num_depositos += cantidad
+            self.monto_depositos += monto
+        elif tipo == TransactionType.RETIRO:
+            self.num_retiros += cantidad
+            self.monto_retiros += monto
+
+    @property
+    def transacciones_aprobadas(self) -> int:
+        return self.num_depositos + self.num_retiros
+
+    @property
+    def saldo_aprobado(self) -> Decimal:
+        """Suma de los montos aprobados (depósitos positivos, retiros negativos)."""
+        return self.monto_depositos + self.monto_retiros
+
+    @property
+    def saldo_promedio(self) -> Decimal:
+        if self.transacciones_aprobadas == 0:
+            return Decimal("0")
+        return (self.monto_depositos - self.monto_retiros) / self.transacciones_aprobadas
+
+    def __eq__(self, other):
+        if not isinstance(other, ResumenCuenta):
+            return NotImplemented
+        return (self.num_depositos, self.monto_depositos, self.num_retiros, self.monto_retiros) == \
+            (other.num_depositos, other.monto_depositos, other.num_retiros, other.monto_retiros)
+
+    def __repr__(self):
+        return (f"ResumenCuenta(num_depositos={self.num_depositos}, monto_depositos={self.monto_depositos}, "
+                f"num_retiros={self.num_retiros}, monto_retiros={self.monto_retiros})")
@@ -7,7 +7,6 @@ from decimal import Decimal
 import logging
 
 logger = logging.getLogger(__name__)
-logger.setLevel(logging.DEBUG)
 
 class TransactionState(Enum):
     PENDIENTE = "PENDIENTE"
@@ -16,17 +15,23 @@ class TransactionState(Enum):
 
     @classmethod
     def from_string(cls, value: str) -> 'TransactionState':
-        """Convierte un string a TransactionState de manera segura"""
-        try:
-            return cls(value.upper())
-        except ValueError:
+        """Convierte un string a TransactionState de manera segura (búsqueda en un diccionario)"""
+        estado = (_ESTADOS_POR_TEXTO.get(value) or _ESTADOS_POR_TEXTO.get(value.upper())) if isinstance(value, str) else None
+        if estado is None:
             estados_validos = [e.value for e in cls]
             raise ValueError(f"Estado inválido '{value}'. Estados válidos: {estados_validos}")
+        return estado
 
     def __str__(self):
         return self.value
 
+# Estados por su valor en texto (el formato de la API y del almacenamiento anterior)
+_ESTADOS_POR_TEXTO = {estado.value: estado for estado in TransactionState}
+
 class Transaction:
+    # Sin __dict__ por instancia: los listados y recorridos crean una por fila
+    __slots__ = ("id", "cuenta_id", "monto", "tipo", "estado", "fecha")
+
     def __init__(
         self,
         id: UUID,
@@ -36,19 +41,41 @@ class Transaction:
         estado: str | TransactionState,
         fecha: datetime = None
     ):
-        logger.debug(f"Creando nueva transacción - ID: {id}, Tipo: {tipo}, Estado: {estado}")
         self.id = id
         self.cuenta_id = cuenta_id
         self.monto = monto
-        logger.debug(f"Procesando tipo de transacción: {tipo}, Tipo de dato: {type(tipo)}")
         self.tipo = tipo if isinstance(tipo, TransactionType) else TransactionType.from_string(tipo)
-        logger.debug(f"Procesando estado de transacción: {estado}")
         self.estado = estado if isinstance(estado, TransactionState) else TransactionState.from_string(estado)
         self.fecha = fecha or datetime.now()  # Si no se proporciona, asigna la fecha actual.
-        logger.debug(f"Transacción creada exitosamente con estado: {self.estado}")
+        # Se crea una por fila leída: mensaje perezoso, muestreable por configuración (ver infrastructure/registro.py)
+        logger.debug("Transacción creada - ID: %s, Tipo: %s, Estado: %s", id, self.tipo, self.estado)
+
+    @classmethod
+    def desde_almacenamiento(
+        cls,
+        id: UUID,
+        cuenta_id: UUID,
+        monto: Decimal,
+        tipo: TransactionType,
+        estado: TransactionState,
+        fecha: datetime
+    ) -> 'Transaction':
+        """
+        Construye una transacción leída del almacenamiento, cuyos valores ya tienen el tipo
+        correcto (las columnas y campos se decodifican con infrastructure.db.codificacion):
+        no convierte tipo ni estado, no asigna fecha por defecto y no registra nada.
+        """
+        transaccion = object.__new__(cls)
+        transaccion.id = id
+        transaccion.cuenta_id = cuenta_id
+        transaccion.monto = monto
+        transaccion.tipo = tipo
+        transaccion.estado = estado
+        transaccion.fecha = fecha
+        return transaccion
         
     def validar(self):  # Valida que los atributos de la transacción sean válidos
-        logger.debug(f"Validando transacción {self.id}")
+        logger.debug("Validando transacción %s", self.id)
         if self.monto <= 0:
             raise ValueError("El monto de la transacción debe ser mayor a 0.")
         if self.estado not in TransactionState:
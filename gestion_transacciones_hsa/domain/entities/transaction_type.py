@@ -1,10 +1,6 @@
 # domain/entities/transaction_type.py
 
 from enum import Enum
-import logging
-
-logging.basicConfig(level=logging.DEBUG)
-logger = logging.getLogger(__name__)
 
 class TransactionType(Enum):
     DEPOSITO = "DEPOSITO"
@@ -12,23 +8,11 @@ class TransactionType(Enum):
 
     @classmethod
     def from_string(cls, value: str):
-        try:
-            logger.debug(f"Intentando convertir valor '{value}' a TransactionType")
-            normalized_value = value.upper()
-            logger.debug(f"Valor normalizado: '{normalized_value}'")
-            
-            for tipo in cls:
-                if tipo.value == normalized_value:
-                    logger.debug(f"Valor identificado como {tipo.name}")
-                    return tipo
-                    
-            error_msg = f"Tipo de transacción no válido: {value}"
-            logger.error(error_msg)
-            raise ValueError(error_msg)
-        except Exception as e:
-            error_msg = f"Error al procesar el tipo de transacción: {value}. Error: {str(e)}"
-            logger.error(error_msg, exc_info=True)
-            raise ValueError(error_msg)
+        """Convierte un string a TransactionType (búsqueda en un diccionario, sin distinguir mayúsculas)"""
+        tipo = (_TIPOS_POR_TEXTO.get(value) or _TIPOS_POR_TEXTO.get(value.upper())) if isinstance(value, str) else None
+        if tipo is None:
+            raise ValueError(f"Tipo de transacción no válido: {value}. Tipos válidos: {[t.value for t in cls]}")
+        return tipo
 
     @property
     def descripcion(self) -> str:
@@ -44,7 +28,6 @@ class TransactionType(Enum):
     def __repr__(self):
         return self.name
 
-    @property
-    def value(self):
-        return super().value
+# Tipos por su valor en texto (el formato de la API y del almacenamiento anterior)
+_TIPOS_POR_TEXTO = {tipo.value: tipo for tipo in TransactionType}
 
@@ -0,0 +1,15 @@
+class ConflictoConcurrencia(Exception):
+    """
+    La entidad fue modificada por otra operación desde que se leyó.
+
+    Se lanza cuando la versión de la entidad no coincide con la almacenada; el
+    llamador debe volver a leerla antes de reintentar.
+    """
+
+    def __init__(self, entidad: str, id, version_esperada: int):
+        self.id = id
+        self.version_esperada = version_esperada
+        super().__init__(
+            f"La {entidad} con ID {id} fue modificada por otra operación "
+            f"(versión esperada {version_esperada})."
+        )
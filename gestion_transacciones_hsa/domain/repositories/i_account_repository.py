@@ -1,6 +1,7 @@
 from uuid import UUID
 from typing import List
 from domain.entities.account import Account
+from domain.repositories.resultado_lote import ResultadoLote
 
 class IAccountRepository:
     def obtener_por_usuario(self, id: UUID) -> Account:
@@ -21,6 +22,13 @@ class IAccountRepository:
         """
         pass
 
+    def guardar_lote(self, cuentas: List[Account]) -> List[ResultadoLote]:
+        """
+        Guarda varias cuentas en una sola operación.
+        Retorna un resultado por cuenta, en el mismo orden.
+        """
+        pass
+
     def eliminar(self, id: UUID):
         """
         Elimina una cuenta por su ID.
@@ -0,0 +1,33 @@
+from uuid import UUID
+from typing import List
+from domain.entities.account import Account
+
+class IAsyncAccountRepository:
+    """
+    Interfaz asíncrona del repositorio de cuentas (mismo contrato que IAccountRepository).
+    """
+
+    async def obtener_por_id(self, id: UUID) -> Account:
+        """
+        Obtiene una cuenta por su ID.
+        Lanza ValueError si no existe.
+        """
+        pass
+
+    async def obtener_por_usuario(self, usuario_id: UUID) -> List[Account]:
+        """
+        Lista las cuentas de un usuario.
+        """
+        pass
+
+    async def listar_todos(self) -> List[Account]:
+        """
+        Lista todas las cuentas.
+        """
+        pass
+
+    async def guardar(self, cuenta: Account):
+        """
+        Guarda una cuenta.
+        """
+        pass
@@ -0,0 +1,120 @@
+from abc import ABC, abstractmethod
+from uuid import UUID
+from datetime import datetime
+from decimal import Decimal
+from typing import AsyncIterator, List, Optional, Tuple
+from ..entities.transaction import Transaction, TransactionState
+from ..entities.resumen_cuenta import ResumenCuenta
+from .proyeccion_transaccion import ProyeccionTransaccion, proyectar
+
+class IAsyncTransactionRepository(ABC):
+    """
+    Interfaz asíncrona del repositorio de transacciones.
+
+    Mismo contrato que ITransactionRepository, con métodos awaitable para usarse desde
+    corrutinas sin ocupar un hilo por petición.
+    """
+
+    @abstractmethod
+    async def guardar(self, transaccion: Transaction) -> None:
+        """
+        Guarda una transacción.
+        Args:
+            transaccion (Transaction): Transacción a guardar.
+        """
+        pass
+
+    @abstractmethod
+    async def obtener_por_id(self, id: UUID) -> Transaction:
+        """
+        Obtiene una transacción por su ID.
+        Raises:
+            ValueError: Si no se encuentra la transacción.
+        """
+        pass
+
+    @abstractmethod
+    async def listar_por_cuenta(self, cuenta_id: UUID) -> List[Transaction]:
+        """
+        Lista las transacciones asociadas a una cuenta por su ID.
+        Args:
+            cuenta_id (UUID): Identificador único de la cuenta.
+        Returns:
+            List[Transaction]: Lista de transacciones asociadas.
+        """
+        pass
+
+    @abstractmethod
+    async def registrar_con_saldo(self, transaccion: Transaction) -> Tuple[Decimal, int]:
+        """
+        Guarda la transacción y aplica su monto al saldo de la cuenta en una sola operación
+        atómica (ver ITransactionRepository.registrar_con_saldo).
+        Returns:
+            Tuple[Decimal, int]: Saldo y versión de la cuenta tras aplicar la transacción.
+        Raises:
+            ValueError: Si la cuenta no existe, no tiene fondos suficientes o se supera el límite diario.
+        """
+        pass
+
+    async def registrar_lote_con_saldo(self, transacciones: List[Transaction]) -> List[Tuple[Decimal, int]]:
+        """
+        Registra varias transacciones como registrar_con_saldo, en orden
+        (ver ITransactionRepository.registrar_lote_con_saldo).
+        Por defecto las registra una por una.
+        """
+        return [await self.registrar_con_saldo(t) for t in transacciones]
+
+    async def iterar_por_cuenta(self, cuenta_id: UUID, tamano_lote: int = 500) -> AsyncIterator[Transaction]:
+        """
+        Recorre las transacciones de una cuenta de forma perezosa.
+        Las implementaciones leen por lotes para mantener acotado el uso de memoria.
+        Args:
+            cuenta_id (UUID): Identificador único de la cuenta.
+            tamano_lote (int): Elementos leídos del almacenamiento por lote.
+        Returns:
+            AsyncIterator[Transaction]: Transacciones de la cuenta.
+        """
+        for transaccion in await self.listar_por_cuenta(cuenta_id):
+            yield transaccion
+
+    async def iterar_proyecciones_por_cuenta(
+        self,
+        cuenta_id: UUID,
+        tamano_lote: int = 500
+    ) -> AsyncIterator[ProyeccionTransaccion]:
+        """
+        Recorre las transacciones de una cuenta como proyecciones de solo lectura
+        (ver ITransactionRepository.iterar_proyecciones_por_cuenta).
+        """
+        async for transaccion in self.iterar_por_cuenta(cuenta_id, tamano_lote):
+            yield proyectar(transaccion)
+
+    async def listar_pagina_por_cuenta(
+        self,
+        cuenta_id: UUID,
+        limite: int,
+        despues: Optional[Tuple[datetime, UUID]] = None
+    ) -> List[Transaction]:
+        """
+        Retorna una página de transacciones de la cuenta, de la más reciente a la más antigua
+        (ver ITransactionRepository.listar_pagina_por_cuenta).
+        """
+        transacciones = sorted(await self.listar_por_cuenta(cuenta_id), key=lambda t: (t.fecha, str(t.id)), reverse=True)
+        if despues is not None:
+            clave = (despues[0], str(despues[1]))
+            transacciones = [t for t in transacciones if (t.fecha, str(t.id)) < clave]
+        return transacciones[:limite]
+
+    async def resumir_aprobadas_por_cuenta(self, cuenta_id: UUID) -> ResumenCuenta:
+        """
+        Cuenta y suma las transacciones APROBADAS de la cuenta, agrupadas por tipo
+        (ver ITransactionRepository.resumir_aprobadas_por_cuenta).
+        """
+        resumen = ResumenCuenta(num_transacciones=0)
+        async for t in self.iterar_por_cuenta(cuenta_id):
+            resumen.num_transacciones += 1
+            resumen.primera_fecha = min(resumen.primera_fecha or t.fecha, t.fecha)
+            resumen.ultima_fecha = max(resumen.ultima_fecha or t.fecha, t.fecha)
+            if t.estado == TransactionState.APROBADA:
+                resumen.agregar(t.tipo, 1, t.monto)
+        return resumen
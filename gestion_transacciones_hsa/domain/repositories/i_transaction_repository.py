@@ -1,10 +1,15 @@
 from abc import ABC, abstractmethod
 from uuid import UUID
-from typing import List
+from datetime import datetime
+from decimal import Decimal
+from typing import Iterator, List, Optional, Tuple
 from abc import ABC, abstractmethod
 from ..entities.transaction import Transaction
 from ..repositories.i_repository import IRepository
-from ..entities.transaction import Transaction
+from ..entities.transaction import Transaction, TransactionState
+from ..entities.resumen_cuenta import ResumenCuenta
+from .resultado_lote import ResultadoLote
+from .proyeccion_transaccion import ProyeccionTransaccion, proyectar
 
 class ITransactionRepository(IRepository[Transaction]):
     """
@@ -33,6 +38,117 @@ class ITransactionRepository(IRepository[Transaction]):
             List[Transaction]: Lista de transacciones asociadas.
         """
         pass
+
+    def iterar_por_cuenta(self, cuenta_id: UUID, tamano_lote: int = 500) -> Iterator[Transaction]:
+        """
+        Recorre las transacciones de una cuenta de forma perezosa.
+        Las implementaciones leen por lotes para mantener acotado el uso de memoria.
+        Args:
+            cuenta_id (UUID): Identificador único de la cuenta.
+            tamano_lote (int): Elementos leídos del almacenamiento por lote.
+        Returns:
+            Iterator[Transaction]: Transacciones de la cuenta.
+        """
+        return iter(self.listar_por_cuenta(cuenta_id))
+
+    def iterar_proyecciones_por_cuenta(self, cuenta_id: UUID, tamano_lote: int = 500) -> Iterator[ProyeccionTransaccion]:
+        """
+        Recorre las transacciones de una cuenta como proyecciones de solo lectura, en el
+        orden de iterar_por_cuenta. Las implementaciones las arman desde las filas, sin
+        construir entidades.
+        Args:
+            cuenta_id (UUID): Identificador único de la cuenta.
+            tamano_lote (int): Elementos leídos del almacenamiento por lote.
+        Returns:
+            Iterator[ProyeccionTransaccion]: Proyecciones de las transacciones de la cuenta.
+        """
+        return map(proyectar, self.iterar_por_cuenta(cuenta_id, tamano_lote))
+
+    def listar_pagina_por_cuenta(
+        self,
+        cuenta_id: UUID,
+        limite: int,
+        despues: Optional[Tuple[datetime, UUID]] = None
+    ) -> List[Transaction]:
+        """
+        Retorna una página de transacciones de la cuenta, de la más reciente a la más antigua.
+        Las implementaciones deben resolverlo como un rango sobre el índice (cuenta_id, fecha, id).
+        Args:
+            cuenta_id (UUID): Identificador único de la cuenta.
+            limite (int): Máximo de transacciones a retornar.
+            despues (Tuple[datetime, UUID]): Clave (fecha, id) de la última transacción de la
+                página anterior; None para la primera página.
+        Returns:
+            List[Transaction]: Transacciones ordenadas por (fecha, id) descendente.
+        """
+        transacciones = sorted(self.listar_por_cuenta(cuenta_id), key=lambda t: (t.fecha, str(t.id)), reverse=True)
+        if despues is not None:
+            clave = (despues[0], str(despues[1]))
+            transacciones = [t for t in transacciones if (t.fecha, str(t.id)) < clave]
+        return transacciones[:limite]
+
+    def resumir_aprobadas_por_cuenta(self, cuenta_id: UUID) -> ResumenCuenta:
+        """
+        Cuenta y suma las transacciones APROBADAS de la cuenta, agrupadas por tipo.
+        Las implementaciones deben resolverlo en el almacenamiento (resumen mantenido
+        en cada escritura, GROUP BY o $group), sin construir entidades.
+        Args:
+            cuenta_id (UUID): Identificador único de la cuenta.
+        Returns:
+            ResumenCuenta: Cantidades y montos de depósitos y retiros aprobados.
+        """
+        resumen = ResumenCuenta(num_transacciones=0)
+        for t in self.iterar_por_cuenta(cuenta_id):
+            resumen.num_transacciones += 1
+            resumen.primera_fecha = min(resumen.primera_fecha or t.fecha, t.fecha)
+            resumen.ultima_fecha = max(resumen.ultima_fecha or t.fecha, t.fecha)
+            if t.estado == TransactionState.APROBADA:
+                resumen.agregar(t.tipo, 1, t.monto)
+        return resumen
+
+    @abstractmethod
+    def registrar_con_saldo(self, transaccion: Transaction) -> Tuple[Decimal, int]:
+        """
+        Guarda la transacción y aplica su monto al saldo de la cuenta en una sola operación
+        atómica. En los retiros, la verificación de fondos forma parte de la misma operación,
+        por lo que dos retiros concurrentes nunca dejan el saldo en negativo.
+        Args:
+            transaccion (Transaction): Transacción a registrar.
+        Returns:
+            Tuple[Decimal, int]: Saldo y versión de la cuenta tras aplicar la transacción.
+        Raises:
+            ValueError: Si la cuenta no existe o no tiene fondos suficientes.
+        """
+        pass
+
+    def registrar_lote_con_saldo(self, transacciones: List[Transaction]) -> List[Tuple[Decimal, int]]:
+        """
+        Registra varias transacciones como registrar_con_saldo, en orden.
+        Las implementaciones que lo permiten las aplican todas o ninguna; esta
+        implementación por defecto las registra una por una.
+        Returns:
+            List[Tuple[Decimal, int]]: Saldo y versión de la cuenta tras cada transacción.
+        """
+        return [self.registrar_con_saldo(t) for t in transacciones]
+
+    def iterar_todos(self, tamano_lote: int = 500) -> Iterator[Transaction]:
+        """
+        Recorre todas las transacciones de forma perezosa.
+        Returns:
+            Iterator[Transaction]: Todas las transacciones.
+        """
+        return iter(self.listar_todos())
+
+    def guardar_lote(self, transacciones: List[Transaction]) -> List[ResultadoLote]:
+        """
+        Guarda varias transacciones en una sola operación.
+        Args:
+            transacciones (List[Transaction]): Transacciones a guardar.
+        Returns:
+            List[ResultadoLote]: Un resultado por transacción, en el mismo orden.
+        """
+        pass
+
     @abstractmethod
     def save(self, transaction: 'Transaction'):
             pass
@@ -0,0 +1,21 @@
+from typing import Tuple
+from ..entities.transaction import Transaction
+
+# Proyección de solo lectura de una transacción para los listados: los campos que expone la
+# API, ya como texto y números y en este orden:
+#   (id, cuenta_id, monto, tipo, estado, fecha 'AAAA-MM-DD')
+# Los repositorios la arman directamente desde sus filas o documentos, sin construir
+# Transaction ni TransactionDTO.
+ProyeccionTransaccion = Tuple[str, str, float, str, str, str]
+
+
+def proyectar(transaccion: Transaction) -> ProyeccionTransaccion:
+    """Proyección de una entidad ya construida (implementación por defecto de los repositorios)."""
+    return (
+        str(transaccion.id),
+        str(transaccion.cuenta_id),
+        float(transaccion.monto),
+        transaccion.tipo.name,
+        str(transaccion.estado),
+        transaccion.fecha.strftime("%Y-%m-%d")
+    )
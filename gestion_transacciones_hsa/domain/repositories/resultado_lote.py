@@ -0,0 +1,19 @@
+from typing import Any, Optional
+
+class ResultadoLote:
+    """
+    Resultado del guardado de un elemento dentro de una operación por lotes.
+    """
+
+    def __init__(self, id: Any, exito: bool, error: Optional[str] = None):
+        self.id = id
+        self.exito = exito
+        self.error = error
+
+    def __eq__(self, other):
+        if not isinstance(other, ResultadoLote):
+            return NotImplemented
+        return (self.id, self.exito, self.error) == (other.id, other.exito, other.error)
+
+    def __repr__(self):
+        return f"ResultadoLote(id={self.id}, exito={self.exito}, error={self.error!r})"
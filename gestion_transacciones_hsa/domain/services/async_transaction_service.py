@@ -0,0 +1,98 @@
+# domain/services/async_transaction_service.py
+from domain.repositories.i_async_transaction_repository import IAsyncTransactionRepository
+from domain.repositories.i_async_account_repository import IAsyncAccountRepository
+from domain.entities.transaction import Transaction
+from domain.entities.transaction_type import TransactionType
+from domain.entities.account import Account
+from decimal import Decimal
+import logging
+
+logger = logging.getLogger(__name__)
+
+class AsyncTransactionService:
+    """
+    Variante asíncrona de TransactionService: mismas reglas, sobre repositorios asíncronos.
+    """
+
+    def __init__(
+        self,
+        transaction_repository: IAsyncTransactionRepository,
+        account_repository: IAsyncAccountRepository
+    ):
+        self._transaction_repository = transaction_repository
+        self._account_repository = account_repository
+
+    async def _obtener_cuenta(self, cuenta_id) -> Account:
+        cuenta = await self._account_repository.obtener_por_id(cuenta_id)
+        if cuenta is None:
+            logger.error("Cuenta no encontrada para ID: %s", cuenta_id)
+            raise ValueError(f"La cuenta con ID {cuenta_id} no existe.")
+        return cuenta
+
+    async def procesar_transaccion(self, transaccion: Transaction):
+        """
+        Procesa una transacción verificando los límites diarios, fondos suficientes y actualizando el saldo.
+        El saldo se persiste junto con la transacción en una sola operación atómica del repositorio.
+        """
+        cuenta = await self.preparar_transaccion(transaccion)
+        cuenta.saldo, cuenta.version = await self._transaction_repository.registrar_con_saldo(transaccion)
+
+    async def preparar_transaccion(self, transaccion: Transaction) -> Account:
+        """
+        Aplica las verificaciones de procesar_transaccion sin escribir nada y retorna la cuenta.
+        Lo usa la unidad de trabajo, que registra la transacción al confirmar.
+        """
+        cuenta = await self._obtener_cuenta(transaccion.cuenta_id)
+
+        if not isinstance(transaccion.monto, Decimal):
+            raise ValueError("El monto debe ser de tipo Decimal.")
+        self.validar_transaccion(transaccion, cuenta)
+
+        # Rechazo temprano; el repositorio lo vuelve a verificar de forma atómica
+        if transaccion.tipo == TransactionType.RETIRO:
+            if cuenta.saldo + transaccion.monto < 0:
+                raise ValueError("Fondos insuficientes para realizar la transacción.")
+        return cuenta
+
+    def validar_transaccion(self, transaccion: Transaction, cuenta: Account):
+        """
+        Valida una transacción verificando si cumple con los límites diarios.
+        """
+        cuenta.verificar_limite_diario(transaccion.monto)
+
+    async def iterar_transacciones_por_cuenta(self, cuenta_id):
+        """
+        Retorna un iterador asíncrono sobre las transacciones de una cuenta.
+        La existencia de la cuenta se verifica antes de empezar a leer.
+        """
+        await self._obtener_cuenta(cuenta_id)
+        return self._transaction_repository.iterar_por_cuenta(cuenta_id)
+
+    async def iterar_proyecciones_por_cuenta(self, cuenta_id):
+        """
+        Retorna un iterador asíncrono sobre las proyecciones de solo lectura de las
+        transacciones de una cuenta. La existencia de la cuenta se verifica antes de empezar a leer.
+        """
+        await self._obtener_cuenta(cuenta_id)
+        return self._transaction_repository.iterar_proyecciones_por_cuenta(cuenta_id)
+
+    async def listar_pagina_por_cuenta(self, cuenta_id, limite, despues=None):
+        """
+        Retorna una página de transacciones de la cuenta, de la más reciente a la más antigua.
+        """
+        await self._obtener_cuenta(cuenta_id)
+        return await self._transaction_repository.listar_pagina_por_cuenta(cuenta_id, limite, despues)
+
+    async def resumir_transacciones_aprobadas(self, cuenta_id):
+        """
+        Retorna los totales por tipo de las transacciones APROBADAS de la cuenta.
+        La existencia de la cuenta la verifica el llamador.
+        """
+        return await self._transaction_repository.resumir_aprobadas_por_cuenta(cuenta_id)
+
+    async def listar_transacciones_por_cuenta(self, cuenta_id):
+        """
+        Retorna todas las transacciones asociadas a una cuenta específica.
+        """
+        await self._obtener_cuenta(cuenta_id)
+        return await self._transaction_repository.listar_por_cuenta(cuenta_id)
@@ -10,7 +10,6 @@ import logging
 from domain.entities.transaction_type import TransactionType
 
 logger = logging.getLogger(__name__)
-logger.setLevel(logging.DEBUG)
 
 class TransactionService:
     def __init__(
@@ -20,27 +19,28 @@ class TransactionService:
     ):
         self._transaction_repository = transaction_repository
         self._account_repository = account_repository
-        logger.debug(f"TransactionService inicializado con repositorio: {transaction_repository.__class__.__name__}")
+        logger.debug("TransactionService inicializado con repositorio: %s", transaction_repository.__class__.__name__)
 
     def procesar_transaccion(self, transaccion: Transaction) -> None:
         """
         Procesa y guarda una transacción en el repositorio correspondiente.
         """
         try:
-            logger.debug(f"Procesando transacción en {self._transaction_repository.__class__.__name__}")
-            logger.debug(f"Detalles de la transacción: {transaccion}")
+            logger.debug("Procesando transacción en %s", self._transaction_repository.__class__.__name__)
+            logger.debug("Detalles de la transacción: %s", transaccion)
             
             # Guardar la transacción
             self._transaction_repository.guardar(transaccion)
             logger.debug("Transacción guardada exitosamente")
             
         except Exception as e:
-            logger.error(f"Error al procesar transacción: {str(e)}", exc_info=True)
+            logger.error("Error al procesar transacción: %s", e, exc_info=True)
             raise
 
     def procesar_transaccion(self, transaccion: Transaction):
         """
         Procesa una transacción verificando los límites diarios, fondos suficientes y actualizando el saldo.
+        El saldo se persiste junto con la transacción en una sola operación atómica del repositorio.
         """
         cuenta = self._account_repository.obtener_por_id(transaccion.cuenta_id)
         if cuenta is None:
@@ -51,14 +51,14 @@ class TransactionService:
         # Validar la transacción antes de procesarla
         self.validar_transaccion(transaccion, cuenta)
 
-        # Validar fondos insuficientes en retiros
+        # Validar fondos insuficientes en retiros (rechazo temprano; el repositorio lo vuelve
+        # a verificar de forma atómica con el saldo vigente)
         if transaccion.tipo == TransactionType.RETIRO:
             if cuenta.saldo + transaccion.monto < 0:  # Saldo insuficiente
                 raise ValueError("Fondos insuficientes para realizar la transacción.")
 
         # Guardar la transacción y actualizar el saldo
-        cuenta.actualizar_saldo(transaccion.monto)
-        self._transaction_repository.guardar(transaccion)
+        cuenta.saldo, cuenta.version = self._transaction_repository.registrar_con_saldo(transaccion)
 
     def realizar_transaccion(self, transaccion: Transaction) -> None:
         # Guardar en SQLite
@@ -77,21 +77,50 @@ class TransactionService:
         """
         cuenta.verificar_limite_diario(transaccion.monto)
 
+    def iterar_transacciones_por_cuenta(self, cuenta_id):
+        """
+        Retorna un iterador perezoso sobre las transacciones de una cuenta.
+        La existencia de la cuenta se verifica antes de empezar a leer.
+        """
+        cuenta = self._account_repository.obtener_por_id(cuenta_id)
+        if cuenta is None:
+            logger.error("Cuenta no encontrada para ID: %s", cuenta_id)
+            raise ValueError(f"La cuenta con ID {cuenta_id} no existe.")
+        return self._transaction_repository.iterar_por_cuenta(cuenta_id)
+
+    def listar_pagina_por_cuenta(self, cuenta_id, limite, despues=None):
+        """
+        Retorna una página de transacciones de la cuenta, de la más reciente a la más antigua.
+        """
+        cuenta = self._account_repository.obtener_por_id(cuenta_id)
+        if cuenta is None:
+            logger.error("Cuenta no encontrada para ID: %s", cuenta_id)
+            raise ValueError(f"La cuenta con ID {cuenta_id} no existe.")
+        return self._transaction_repository.listar_pagina_por_cuenta(cuenta_id, limite, despues)
+
+    def resumir_transacciones_aprobadas(self, cuenta_id):
+        """
+        Retorna los totales por tipo de las transacciones APROBADAS de la cuenta,
+        calculados por el repositorio sin cargar las transacciones.
+        La existencia de la cuenta la verifica el llamador.
+        """
+        return self._transaction_repository.resumir_aprobadas_por_cuenta(cuenta_id)
+
     def listar_transacciones_por_cuenta(self, cuenta_id):
         """
         Retorna todas las transacciones asociadas a una cuenta específica.
         """
         try:
-            logger.debug(f"Intentando listar transacciones para cuenta_id: {cuenta_id}")
+            logger.debug("Intentando listar transacciones para cuenta_id: %s", cuenta_id)
             cuenta = self._account_repository.obtener_por_id(cuenta_id)
             if cuenta is None:
-                logger.error(f"Cuenta no encontrada para ID: {cuenta_id}")
+                logger.error("Cuenta no encontrada para ID: %s", cuenta_id)
                 raise ValueError(f"La cuenta con ID {cuenta_id} no existe.")
                 
             transacciones = self._transaction_repository.listar_por_cuenta(cuenta_id)
-            logger.debug(f"Transacciones encontradas: {len(transacciones)}")
+            logger.debug("Transacciones encontradas: %s", len(transacciones))
             return transacciones
             
         except Exception as e:
-            logger.error(f"Error al listar transacciones: {str(e)}", exc_info=True)
+            logger.error("Error al listar transacciones: %s", e, exc_info=True)
             raise
@@ -0,0 +1,3 @@
+# infrastructure/db/__init__.py
+from .sqlite_pool import SQLitePool, obtener_pool, cerrar_pools
+from .migraciones import Migracion, MigradorSQLite, MigradorMongo
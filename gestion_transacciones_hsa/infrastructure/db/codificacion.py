@@ -0,0 +1,117 @@
+# infrastructure/db/codificacion.py
+"""
+Codificación compacta del formato de almacenamiento v2.
+
+- Montos: enteros en centavos (sin texto ni DECIMAL).
+- UUID: 16 bytes.
+- Fechas: enteros en microsegundos desde la época Unix (UTC).
+- Tipo y estado de transacción: códigos enteros pequeños.
+"""
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal, ROUND_HALF_EVEN
+from functools import lru_cache
+from typing import Union
+from uuid import UUID
+from domain.entities.transaction import TransactionState
+from domain.entities.transaction_type import TransactionType
+
+_CENTAVO = Decimal("0.01")
+_EPOCA = datetime(1970, 1, 1)
+_UN_MICROSEGUNDO = timedelta(microseconds=1)
+MICROSEGUNDOS_POR_DIA = 86_400_000_000
+
+# Cuentas distintas cuyo UUID se recuerda en bytes_a_uuid_compartido
+UUIDS_COMPARTIDOS = 4096
+
+# Los códigos son parte del formato persistido: nunca reutilizar ni renumerar
+CODIGOS_TIPO = {TransactionType.DEPOSITO: 1, TransactionType.RETIRO: 2}
+CODIGOS_ESTADO = {TransactionState.PENDIENTE: 1, TransactionState.APROBADA: 2, TransactionState.RECHAZADA: 3}
+TIPOS_POR_CODIGO = {codigo: tipo for tipo, codigo in CODIGOS_TIPO.items()}
+ESTADOS_POR_CODIGO = {codigo: estado for estado, codigo in CODIGOS_ESTADO.items()}
+# Texto con el que la API muestra cada código (ver domain/repositories/proyeccion_transaccion.py)
+NOMBRES_TIPO_POR_CODIGO = {codigo: tipo.name for codigo, tipo in TIPOS_POR_CODIGO.items()}
+NOMBRES_ESTADO_POR_CODIGO = {codigo: str(estado) for codigo, estado in ESTADOS_POR_CODIGO.items()}
+
+
+def a_centavos(monto: Union[Decimal, int, float, str]) -> int:
+    """Convierte un monto a centavos enteros, redondeando como f"{monto:.2f}"."""
+    if not isinstance(monto, Decimal):
+        monto = Decimal(str(monto))
+    return int(monto.quantize(_CENTAVO, rounding=ROUND_HALF_EVEN).scaleb(2))
+
+
+def desde_centavos(centavos: int) -> Decimal:
+    """Convierte centavos enteros a Decimal con exactamente dos decimales."""
+    return Decimal(centavos).scaleb(-2)
+
+
+def uuid_a_bytes(valor: Union[UUID, str]) -> bytes:
+    """Convierte un UUID (o su texto) a sus 16 bytes."""
+    return valor.bytes if isinstance(valor, UUID) else UUID(str(valor)).bytes
+
+
+def bytes_a_uuid(valor: bytes) -> UUID:
+    return UUID(bytes=valor if type(valor) is bytes else bytes(valor))  # memoryview o bytearray: se copian
+
+
+@lru_cache(maxsize=UUIDS_COMPARTIDOS)
+def bytes_a_uuid_compartido(valor: bytes) -> UUID:
+    """
+    bytes_a_uuid para columnas que se repiten en muchas filas (cuenta_id): las filas de
+    una misma cuenta comparten un único UUID, que es inmutable.
+    """
+    return UUID(bytes=valor)
+
+
+def fecha_a_epoch(fecha: datetime) -> int:
+    """
+    Convierte una fecha a microsegundos desde la época.
+    Las fechas sin zona horaria se interpretan como UTC.
+    """
+    if fecha.tzinfo is not None:
+        fecha = fecha.astimezone(timezone.utc).replace(tzinfo=None)
+    return (fecha - _EPOCA) // _UN_MICROSEGUNDO
+
+
+def fecha_a_dia(fecha: datetime) -> int:
+    """Convierte una fecha al número de día (UTC) desde la época: la clave de los límites diarios."""
+    return fecha_a_epoch(fecha) // MICROSEGUNDOS_POR_DIA
+
+
+def epoch_a_fecha(microsegundos: int) -> datetime:
+    """Convierte microsegundos desde la época a una fecha sin zona horaria (UTC)."""
+    return _EPOCA + timedelta(0, 0, microsegundos)  # Posicional: más rápido que microseconds=
+
+
+def bytes_a_texto_uuid(valor: bytes) -> str:
+    """Texto canónico del UUID (como str(UUID)) directamente desde sus 16 bytes."""
+    h = valor.hex()
+    return f"{h[:8]}-{h[8:12]}-{h[12:16]}-{h[16:20]}-{h[20:]}"
+
+
+def epoch_a_dia_iso(microsegundos: int) -> str:
+    """Día 'AAAA-MM-DD' (UTC) de una fecha en microsegundos desde la época."""
+    return _dia_iso(microsegundos // MICROSEGUNDOS_POR_DIA)
+
+
+@lru_cache(maxsize=4096)
+def _dia_iso(dia: int) -> str:
+    # Las transacciones de un historial se concentran en pocos días: cada texto se arma una vez
+    return (_EPOCA + timedelta(days=dia)).strftime("%Y-%m-%d")
+
+
+def codigo_tipo(tipo: Union[TransactionType, str]) -> int:
+    if not isinstance(tipo, TransactionType):
+        tipo = TransactionType.from_string(str(tipo))
+    return CODIGOS_TIPO[tipo]
+
+
+def codigo_estado(estado: Union[TransactionState, str]) -> int:
+    if not isinstance(estado, TransactionState):
+        estado = TransactionState.from_string(str(estado))
+    return CODIGOS_ESTADO[estado]
+
+
+def es_aprobada(estado: Union[TransactionState, str]) -> bool:
+    """Indica si el estado (enum o texto, como el de los DTO) es APROBADA."""
+    return codigo_estado(estado) == CODIGOS_ESTADO[TransactionState.APROBADA]
@@ -0,0 +1,201 @@
+# infrastructure/db/codificacion_mongo.py
+"""
+Documentos MongoDB del formato de almacenamiento v2.
+
+- `_id`, `cuenta_id`, `usuario_id`: UUID binario (BSON subtipo 4).
+- `monto`, `saldo`, `limite_diario`: enteros en centavos.
+- `fecha`: entero en microsegundos desde la época (UTC).
+- `tipo`, `estado`: códigos enteros (ver infrastructure/db/codificacion.py).
+- `v`: 2. Los documentos sin este campo están en el formato anterior (texto y float).
+
+La lectura acepta ambos formatos; `convertir_coleccion` reescribe por lotes los documentos
+del formato anterior.
+"""
+import logging
+from datetime import datetime, timezone
+from decimal import Decimal
+from typing import Callable, Union
+from uuid import UUID
+from bson.binary import Binary
+from pymongo import DeleteOne, UpdateOne
+from domain.entities.account import Account
+from domain.entities.transaction import Transaction
+from infrastructure.db import codificacion
+
+logger = logging.getLogger(__name__)
+
+VERSION_DOCUMENTO = 2
+
+
+def uuid_a_binario(valor: Union[UUID, str]) -> Binary:
+    return Binary.from_uuid(valor if isinstance(valor, UUID) else UUID(str(valor)))
+
+
+def _a_uuid(valor) -> UUID:
+    # Binary (v2), UUID ya decodificado por el cliente o texto (formato anterior)
+    if isinstance(valor, Binary):
+        return valor.as_uuid()
+    return valor if isinstance(valor, UUID) else UUID(str(valor))
+
+
+def filtro_uuid(valor: Union[UUID, str], legado: bool):
+    """Valor de filtro para un campo UUID; con `legado` también coincide el texto anterior."""
+    binario = uuid_a_binario(valor)
+    return {"$in": [binario, str(valor)]} if legado else binario
+
+
+def transaccion_a_documento(transaccion: Transaction) -> dict:
+    return {
+        "_id": uuid_a_binario(transaccion.id),
+        "cuenta_id": uuid_a_binario(transaccion.cuenta_id),
+        "monto": codificacion.a_centavos(transaccion.monto),
+        "tipo": codificacion.codigo_tipo(transaccion.tipo),
+        "estado": codificacion.codigo_estado(transaccion.estado),
+        "fecha": codificacion.fecha_a_epoch(transaccion.fecha),
+        "v": VERSION_DOCUMENTO,
+    }
+
+
+def transaccion_desde_documento(t: dict) -> Transaction:
+    if t.get("v") == VERSION_DOCUMENTO:
+        return Transaction.desde_almacenamiento(
+            id=_a_uuid(t["_id"]),
+            cuenta_id=_a_uuid(t["cuenta_id"]),
+            monto=codificacion.desde_centavos(t["monto"]),
+            tipo=codificacion.TIPOS_POR_CODIGO[t["tipo"]],
+            estado=codificacion.ESTADOS_POR_CODIGO[t["estado"]],
+            fecha=codificacion.epoch_a_fecha(t["fecha"])
+        )
+    return Transaction(
+        id=_a_uuid(t["_id"]),
+        cuenta_id=_a_uuid(t["cuenta_id"]),
+        monto=Decimal(t["monto"]),
+        tipo=t["tipo"],
+        estado=t["estado"],
+        fecha=datetime.fromisoformat(t["fecha"])
+    )
+
+
+def cuenta_a_documento(cuenta: Account) -> dict:
+    return {
+        "_id": uuid_a_binario(cuenta.id),
+        "usuario_id": uuid_a_binario(cuenta.usuario_id),
+        "saldo": codificacion.a_centavos(cuenta.saldo),
+        "limite_diario": codificacion.a_centavos(cuenta.limite_diario),
+        "version": cuenta.version,
+        "v": VERSION_DOCUMENTO,
+    }
+
+
+def cuenta_desde_documento(c: dict) -> Account:
+    if c.get("v") == VERSION_DOCUMENTO:
+        return Account.desde_almacenamiento(
+            id=_a_uuid(c["_id"]),
+            usuario_id=_a_uuid(c["usuario_id"]),
+            saldo=codificacion.desde_centavos(c["saldo"]),
+            limite_diario=codificacion.desde_centavos(c["limite_diario"]),
+            version=c.get("version", 0)
+        )
+    # Formato anterior: saldo y límite como float o texto
+    return Account(
+        id=_a_uuid(c["_id"]),
+        usuario_id=_a_uuid(c["usuario_id"]),
+        saldo=codificacion.desde_centavos(codificacion.a_centavos(c["saldo"])),
+        limite_diario=codificacion.desde_centavos(codificacion.a_centavos(c["limite_diario"]))
+    )
+
+
+def _marca(coleccion) -> str:
+    return f"datos_v2:{coleccion.name}"
+
+
+def legado_pendiente(db, coleccion) -> bool:
+    """
+    Indica si `coleccion` todavía puede tener documentos del formato anterior.
+
+    Cuando la conversión terminó queda una marca en `schema_version` y la consulta es
+    una búsqueda por _id. Si no hay marca pero tampoco documentos sin `v` (por ejemplo,
+    una base nueva), se registra la marca en ese momento.
+    """
+    if db.schema_version.find_one({"_id": _marca(coleccion)}) is not None:
+        return False
+    if coleccion.find_one({"v": {"$exists": False}}, {"_id": 1}) is not None:
+        return True
+    _registrar_marca(db, coleccion)
+    return False
+
+
+async def legado_pendiente_async(db, coleccion) -> bool:
+    """Versión de legado_pendiente para una base de AsyncMongoClient."""
+    if await db.schema_version.find_one({"_id": _marca(coleccion)}) is not None:
+        return False
+    if await coleccion.find_one({"v": {"$exists": False}}, {"_id": 1}) is not None:
+        return True
+    await db.schema_version.update_one(*_actualizacion_marca(coleccion), upsert=True)
+    return False
+
+
+def _registrar_marca(db, coleccion) -> None:
+    db.schema_version.update_one(*_actualizacion_marca(coleccion), upsert=True)
+
+
+def _actualizacion_marca(coleccion) -> tuple:
+    return (
+        {"_id": _marca(coleccion)},
+        {"$setOnInsert": {
+            "descripcion": f"Documentos de {coleccion.name} en formato v2",
+            "aplicada_en": datetime.now(timezone.utc).isoformat()
+        }},
+    )
+
+
+def _operaciones_conversion(anterior: dict, desde_documento, a_documento) -> list:
+    """Inserta la versión v2 del documento (si no existe ya) y elimina el anterior."""
+    nuevo = a_documento(desde_documento(anterior))
+    nuevo_id = nuevo.pop("_id")
+    return [
+        UpdateOne({"_id": nuevo_id}, {"$setOnInsert": nuevo}, upsert=True),
+        DeleteOne({"_id": anterior["_id"]}),
+    ]
+
+
+def convertir_documento(
+    coleccion,
+    anterior: dict,
+    desde_documento: Callable[[dict], object],
+    a_documento: Callable[[object], dict]
+) -> None:
+    """Reescribe en formato v2 un único documento del formato anterior."""
+    coleccion.bulk_write(_operaciones_conversion(anterior, desde_documento, a_documento), ordered=True)
+
+
+def convertir_coleccion(
+    db,
+    coleccion,
+    desde_documento: Callable[[dict], object],
+    a_documento: Callable[[object], dict],
+    tamano_lote: int = 1000
+) -> int:
+    """
+    Reescribe por lotes los documentos del formato anterior al formato v2.
+
+    Cada documento convertido se inserta con `$setOnInsert` (si la aplicación ya escribió
+    la versión v2 con el mismo id, esa versión gana) y el documento anterior se elimina,
+    todo en un bulk_write por lote.
+
+    Returns:
+        int: Documentos del formato anterior procesados
+    """
+    procesados = 0
+    while True:
+        lote = list(coleccion.find({"v": {"$exists": False}}, limit=tamano_lote))
+        if not lote:
+            break
+        operaciones = []
+        for anterior in lote:
+            operaciones.extend(_operaciones_conversion(anterior, desde_documento, a_documento))
+        coleccion.bulk_write(operaciones, ordered=True)
+        procesados += len(lote)
+        logger.info("Conversión v2: %s documentos de %s convertidos", procesados, coleccion.name)
+    _registrar_marca(db, coleccion)
+    return procesados
@@ -0,0 +1,174 @@
+# infrastructure/db/limites_diarios.py
+"""
+Límite diario acumulado por cuenta.
+
+Cada transacción aprobada registrada con registrar_con_saldo suma |monto| al contador
+(cuenta_id, dia) en la misma operación que actualiza el saldo; las pendientes y rechazadas no
+cuentan para el límite, así que verificar el límite es una búsqueda por
+clave y no un recorrido de las transacciones del día. `dia` es el número de día UTC de la
+fecha de la transacción (ver codificacion.fecha_a_dia).
+
+Los días vencidos se eliminan en segundo plano: en SQLite con LimpiezaLimitesDiarios y en
+MongoDB con el índice TTL sobre `expira` (migración 5 de MIGRACIONES_MONGO).
+"""
+import logging
+import sqlite3
+import threading
+from datetime import datetime, timezone
+from typing import Optional
+from infrastructure.db import codificacion
+from infrastructure.db.sqlite_pool import obtener_pool
+
+logger = logging.getLogger(__name__)
+
+# Días anteriores a hoy que se conservan (transacciones con fecha de ayer, zonas horarias)
+DIAS_RETENCION = 2
+
+MENSAJE_LIMITE_EXCEDIDO = "El monto excede el límite diario permitido."
+
+_SQL_ACUMULAR = """
+    INSERT INTO limites_diarios (cuenta_id, dia, acumulado) VALUES (?, ?, ?)
+    ON CONFLICT(cuenta_id, dia) DO UPDATE SET acumulado = acumulado + excluded.acumulado
+    RETURNING acumulado
+"""
+
+
+def _hoy() -> int:
+    return codificacion.fecha_a_dia(datetime.now(timezone.utc))
+
+
+def acumular(conn: sqlite3.Connection, cuenta_id: bytes, dia: int, centavos: int, limite: int) -> int:
+    """
+    Suma `centavos` al acumulado del día. Debe ejecutarse dentro de la transacción que
+    registra la transacción: si se supera el límite, el ValueError la revierte completa.
+
+    Returns:
+        int: Acumulado del día en centavos, incluida esta transacción
+    """
+    acumulado = conn.execute(_SQL_ACUMULAR, (cuenta_id, dia, centavos)).fetchone()[0]
+    if acumulado > limite:
+        raise ValueError(MENSAJE_LIMITE_EXCEDIDO)
+    return acumulado
+
+
+def acumulado_del_dia(conn: sqlite3.Connection, cuenta_id: bytes, dia: int) -> int:
+    """Retorna el acumulado en centavos de la cuenta en el día (0 si no hubo transacciones)."""
+    fila = conn.execute(
+        "SELECT acumulado FROM limites_diarios WHERE cuenta_id = ? AND dia = ?", (cuenta_id, dia)
+    ).fetchone()
+    return fila[0] if fila else 0
+
+
+def limpiar_vencidos(conn: sqlite3.Connection, hoy: Optional[int] = None, dias_retencion: int = DIAS_RETENCION) -> int:
+    """
+    Elimina los contadores de días anteriores al período de retención (usa idx_limites_diarios_dia).
+
+    Returns:
+        int: Contadores eliminados
+    """
+    desde = (_hoy() if hoy is None else hoy) - dias_retencion
+    return conn.execute("DELETE FROM limites_diarios WHERE dia < ?", (desde,)).rowcount
+
+
+def acumular_mongo(coleccion, cuenta_id, dia: int, centavos: int, limite: int) -> int:
+    """
+    Suma `centavos` al acumulado del día con un find_one_and_update.
+
+    El filtro exige que el acumulado admita el monto. Si no lo admite, el upsert intenta
+    insertar un segundo documento (cuenta_id, dia) y el índice único lo rechaza, así que
+    dos transacciones concurrentes nunca superan juntas el límite. El mismo error aparece
+    cuando dos upserts concurrentes crean a la vez el primer documento del día (el servidor
+    no los reintenta por el filtro sobre `acumulado`): como el documento ya existe, se
+    reintenta una vez sin upsert y solo se informa el límite si tampoco coincide.
+
+    Returns:
+        int: Acumulado del día en centavos, incluida esta transacción
+    """
+    from pymongo import ReturnDocument  # Solo necesario con MongoDB: la ruta SQLite no importa pymongo
+    from pymongo.errors import DuplicateKeyError
+
+    filtro, actualizacion = _actualizacion_mongo(cuenta_id, dia, centavos, limite)
+    try:
+        documento = coleccion.find_one_and_update(
+            filtro, actualizacion, upsert=True, return_document=ReturnDocument.AFTER
+        )
+    except DuplicateKeyError:
+        documento = coleccion.find_one_and_update(filtro, actualizacion, return_document=ReturnDocument.AFTER)
+    if documento is None:
+        raise ValueError(MENSAJE_LIMITE_EXCEDIDO)
+    return documento["acumulado"]
+
+
+async def acumular_mongo_async(coleccion, cuenta_id, dia: int, centavos: int, limite: int) -> int:
+    """Versión de acumular_mongo para una colección de AsyncMongoClient."""
+    from pymongo import ReturnDocument
+    from pymongo.errors import DuplicateKeyError
+
+    filtro, actualizacion = _actualizacion_mongo(cuenta_id, dia, centavos, limite)
+    try:
+        documento = await coleccion.find_one_and_update(
+            filtro, actualizacion, upsert=True, return_document=ReturnDocument.AFTER
+        )
+    except DuplicateKeyError:
+        documento = await coleccion.find_one_and_update(filtro, actualizacion, return_document=ReturnDocument.AFTER)
+    if documento is None:
+        raise ValueError(MENSAJE_LIMITE_EXCEDIDO)
+    return documento["acumulado"]
+
+
+def _actualizacion_mongo(cuenta_id, dia: int, centavos: int, limite: int) -> tuple:
+    """Filtro y actualización de acumular_mongo; ValueError si el monto solo ya supera el límite."""
+    if centavos > limite:
+        raise ValueError(MENSAJE_LIMITE_EXCEDIDO)
+    expira = codificacion.epoch_a_fecha((dia + 1 + DIAS_RETENCION) * codificacion.MICROSEGUNDOS_POR_DIA)
+    return (
+        {"cuenta_id": cuenta_id, "dia": dia, "acumulado": {"$lte": limite - centavos}},
+        {"$inc": {"acumulado": centavos}, "$setOnInsert": {"expira": expira}},
+    )
+
+
+class LimpiezaLimitesDiarios:
+    """
+    Hilo en segundo plano que elimina periódicamente los contadores de días vencidos.
+    """
+
+    def __init__(self, db_path: str = "database.db", intervalo: float = 3600.0, dias_retencion: int = DIAS_RETENCION):
+        """
+        Args:
+            db_path: Ruta al archivo de base de datos SQLite
+            intervalo: Segundos entre limpiezas
+            dias_retencion: Días anteriores a hoy que se conservan
+        """
+        self.db_path = db_path
+        self.intervalo = intervalo
+        self.dias_retencion = dias_retencion
+        self._detener = threading.Event()
+        self._hilo: Optional[threading.Thread] = None
+
+    def ejecutar_una_vez(self) -> int:
+        """Ejecuta una limpieza y retorna los contadores eliminados."""
+        with obtener_pool(self.db_path).conexion() as conn:
+            eliminados = limpiar_vencidos(conn, dias_retencion=self.dias_retencion)
+        if eliminados:
+            logger.info("Límites diarios vencidos eliminados: %s", eliminados)
+        return eliminados
+
+    def _ejecutar(self) -> None:
+        while not self._detener.wait(self.intervalo):
+            try:
+                self.ejecutar_una_vez()
+            except Exception as e:
+                logger.error("Error al limpiar límites diarios: %s", e, exc_info=True)
+
+    def iniciar(self) -> None:
+        if self._hilo is not None and self._hilo.is_alive():
+            return
+        self._detener.clear()
+        self._hilo = threading.Thread(target=self._ejecutar, name="limpieza-limites-diarios", daemon=True)
+        self._hilo.start()
+
+    def detener(self) -> None:
+        self._detener.set()
+        if self._hilo is not None:
+            self._hilo.join()
+            self._hilo = None
@@ -0,0 +1,304 @@
+# infrastructure/db/migracion_v2.py
+"""
+Migración en línea de los datos SQLite del formato original (cuentas, transacciones)
+al formato compacto v2 (cuentas_v2, transacciones_v2).
+
+La aplicación escribe solo en las tablas v2 desde que existe la migración de esquema 5.
+Los datos anteriores se copian de dos formas complementarias:
+
+- En segundo plano, por lotes cortos recorridos por rowid con un punto de control en
+  `migracion_v2_progreso`, para no bloquear a los escritores.
+- Bajo demanda, cuando un repositorio lee una cuenta o transacción que todavía está solo
+  en el formato anterior. Los listados completos no copian nada (ocuparían el bloqueo de
+  escritura durante toda la copia): ven los datos anteriores a medida que avanza el
+  migrador en segundo plano.
+
+Se usa INSERT OR IGNORE: si una fila ya existe en v2 fue escrita por la aplicación y es
+más reciente que la copia del formato anterior.
+
+Uso: python -m infrastructure.db.migracion_v2 --db database.db [--tamano-lote 5000]
+     python -m infrastructure.db.migracion_v2 --mongo mongodb://localhost:27017/
+"""
+import argparse
+import logging
+import sqlite3
+import time
+from decimal import Decimal
+from datetime import datetime
+from typing import List, Optional, Tuple
+from uuid import UUID
+from infrastructure.db import codificacion
+from infrastructure.db.migraciones import MigradorSQLite
+from infrastructure.registro import configurar_registro
+
+logger = logging.getLogger(__name__)
+
+TABLAS_LEGADO = ("cuentas", "transacciones")
+
+_SQL_INSERTAR = {
+    "cuentas": """
+        INSERT OR IGNORE INTO cuentas_v2 (id, usuario_id, saldo, limite_diario)
+        VALUES (?, ?, ?, ?)
+    """,
+    "transacciones": """
+        INSERT OR IGNORE INTO transacciones_v2 (id, cuenta_id, monto, tipo, estado, fecha)
+        VALUES (?, ?, ?, ?, ?, ?)
+    """,
+}
+
+
+def _convertir_cuenta(row: tuple) -> tuple:
+    return (
+        codificacion.uuid_a_bytes(row[0]),
+        codificacion.uuid_a_bytes(row[1]),
+        codificacion.a_centavos(Decimal(str(row[2]))),
+        codificacion.a_centavos(Decimal(str(row[3]))),
+    )
+
+
+def _convertir_transaccion(row: tuple) -> tuple:
+    return (
+        codificacion.uuid_a_bytes(row[0]),
+        codificacion.uuid_a_bytes(row[1]),
+        codificacion.a_centavos(Decimal(str(row[2]))),
+        codificacion.codigo_tipo(row[3]),
+        codificacion.codigo_estado(row[4]),
+        codificacion.fecha_a_epoch(datetime.fromisoformat(row[5])),
+    )
+
+
+_CONVERTIR = {"cuentas": _convertir_cuenta, "transacciones": _convertir_transaccion}
+
+
+class MigradorDatosV2:
+    """
+    Copia los datos del formato original al formato v2, por lotes o bajo demanda.
+
+    Una vez que detecta que no quedan datos por copiar, todas sus operaciones pasan
+    a ser gratuitas (no vuelven a consultar la base).
+    """
+
+    def __init__(self):
+        self._completada = False
+
+    @property
+    def completada(self) -> bool:
+        return self._completada
+
+    @staticmethod
+    def _tabla_existe(conn: sqlite3.Connection, tabla: str) -> bool:
+        return conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (tabla,)
+        ).fetchone() is not None
+
+    @staticmethod
+    def _punto_control(conn: sqlite3.Connection, tabla: str) -> Tuple[int, bool]:
+        fila = conn.execute(
+            "SELECT ultimo_rowid, completada FROM migracion_v2_progreso WHERE tabla = ?", (tabla,)
+        ).fetchone()
+        return (fila[0], bool(fila[1])) if fila else (0, False)
+
+    @staticmethod
+    def _guardar_punto_control(conn: sqlite3.Connection, tabla: str, ultimo_rowid: int, completada: bool) -> None:
+        conn.execute("""
+            INSERT INTO migracion_v2_progreso (tabla, ultimo_rowid, completada) VALUES (?, ?, ?)
+            ON CONFLICT(tabla) DO UPDATE SET ultimo_rowid = excluded.ultimo_rowid, completada = excluded.completada
+        """, (tabla, ultimo_rowid, int(completada)))
+
+    def pendiente(self, conn: sqlite3.Connection) -> bool:
+        """
+        Indica si quedan filas del formato anterior sin copiar.
+        Marca como completadas las tablas que ya no tienen filas nuevas.
+        """
+        if self._completada:
+            return False
+        pendiente = False
+        for tabla in TABLAS_LEGADO:
+            if not self._tabla_existe(conn, tabla):
+                continue
+            ultimo_rowid, completada = self._punto_control(conn, tabla)
+            if completada:
+                continue
+            hay_filas = conn.execute(
+                f"SELECT 1 FROM {tabla} WHERE rowid > ? LIMIT 1", (ultimo_rowid,)
+            ).fetchone() is not None
+            if hay_filas:
+                pendiente = True
+            else:
+                self._guardar_punto_control(conn, tabla, ultimo_rowid, True)
+        if not pendiente:
+            self._completada = True
+        return pendiente
+
+    def migrar_lote(self, conn: sqlite3.Connection, tabla: str, tamano_lote: int = 5000) -> int:
+        """
+        Copia el siguiente lote de filas de `tabla` y avanza su punto de control.
+        El llamador es responsable del commit (una transacción corta por lote).
+
+        Returns:
+            int: Filas leídas del formato anterior (0 cuando la tabla terminó)
+        """
+        if not self._tabla_existe(conn, tabla):
+            return 0
+        ultimo_rowid, completada = self._punto_control(conn, tabla)
+        if completada:
+            return 0
+        filas = conn.execute(
+            f"SELECT rowid, * FROM {tabla} WHERE rowid > ? ORDER BY rowid LIMIT ?",
+            (ultimo_rowid, tamano_lote)
+        ).fetchall()
+        if not filas:
+            self._guardar_punto_control(conn, tabla, ultimo_rowid, True)
+            return 0
+        convertir = _CONVERTIR[tabla]
+        conn.executemany(_SQL_INSERTAR[tabla], [convertir(fila[1:]) for fila in filas])
+        self._guardar_punto_control(conn, tabla, filas[-1][0], False)
+        return len(filas)
+
+    def asegurar_cuenta(self, conn: sqlite3.Connection, cuenta_id) -> None:
+        """Copia bajo demanda la cuenta y sus transacciones si siguen solo en el formato anterior."""
+        if self._completada:
+            return
+        clave = codificacion.uuid_a_bytes(cuenta_id)
+        if conn.execute("SELECT 1 FROM migracion_v2_cuentas WHERE cuenta_id = ?", (clave,)).fetchone():
+            return
+        if not self.pendiente(conn):
+            return
+        if self._tabla_existe(conn, "cuentas"):
+            filas = conn.execute("SELECT * FROM cuentas WHERE id = ?", (str(cuenta_id),)).fetchall()
+            conn.executemany(_SQL_INSERTAR["cuentas"], [_convertir_cuenta(f) for f in filas])
+        if self._tabla_existe(conn, "transacciones"):
+            filas = conn.execute("SELECT * FROM transacciones WHERE cuenta_id = ?", (str(cuenta_id),)).fetchall()
+            conn.executemany(_SQL_INSERTAR["transacciones"], [_convertir_transaccion(f) for f in filas])
+        conn.execute("INSERT OR IGNORE INTO migracion_v2_cuentas (cuenta_id) VALUES (?)", (clave,))
+
+    def asegurar_usuario(self, conn: sqlite3.Connection, usuario_id) -> None:
+        """Copia bajo demanda las cuentas de un usuario que sigan solo en el formato anterior."""
+        if self._completada or not self.pendiente(conn) or not self._tabla_existe(conn, "cuentas"):
+            return
+        for (cuenta_id,) in conn.execute("SELECT id FROM cuentas WHERE usuario_id = ?", (str(usuario_id),)).fetchall():
+            self.asegurar_cuenta(conn, UUID(cuenta_id))
+
+    def asegurar_transaccion(self, conn: sqlite3.Connection, id) -> None:
+        """Copia bajo demanda una transacción si sigue solo en el formato anterior."""
+        if self._completada or not self.pendiente(conn) or not self._tabla_existe(conn, "transacciones"):
+            return
+        filas = conn.execute("SELECT * FROM transacciones WHERE id = ?", (str(id),)).fetchall()
+        conn.executemany(_SQL_INSERTAR["transacciones"], [_convertir_transaccion(f) for f in filas])
+
+    def asegurar_todo(self, conn: sqlite3.Connection, tamano_lote: int = 5000) -> None:
+        """
+        Copia todo lo pendiente, con un commit por lote para no retener el bloqueo de
+        escritura durante toda la copia (usado por herramientas fuera de línea, no por lecturas).
+        """
+        if self._completada:
+            return
+        for tabla in TABLAS_LEGADO:
+            while self.migrar_lote(conn, tabla, tamano_lote):
+                conn.commit()
+        self.pendiente(conn)
+        conn.commit()
+
+
+def ejecutar(
+    db_path: str,
+    tamano_lote: int = 5000,
+    pausa: float = 0.0,
+    eliminar_legado: bool = False
+) -> dict:
+    """
+    Copia en línea todos los datos del formato anterior al formato v2.
+
+    Cada lote se confirma en su propia transacción corta, por lo que la aplicación puede
+    seguir leyendo y escribiendo mientras la migración avanza.
+
+    Args:
+        db_path: Ruta al archivo de base de datos SQLite
+        tamano_lote: Filas copiadas por transacción
+        pausa: Segundos de espera entre lotes para ceder el bloqueo de escritura
+        eliminar_legado: Elimina las tablas del formato anterior al terminar
+
+    Returns:
+        dict: Filas copiadas por tabla
+    """
+    conn = sqlite3.connect(db_path, timeout=30.0)
+    copiadas = {tabla: 0 for tabla in TABLAS_LEGADO}
+    try:
+        MigradorSQLite().aplicar(conn)
+        migrador = MigradorDatosV2()
+        for tabla in TABLAS_LEGADO:
+            while True:
+                conn.execute("BEGIN IMMEDIATE")
+                try:
+                    leidas = migrador.migrar_lote(conn, tabla, tamano_lote)
+                    conn.commit()
+                except Exception:
+                    conn.rollback()
+                    raise
+                if not leidas:
+                    break
+                copiadas[tabla] += leidas
+                logger.info("Migración v2: %s filas de %s copiadas", copiadas[tabla], tabla)
+                if pausa:
+                    time.sleep(pausa)
+        if eliminar_legado and not migrador.pendiente(conn):
+            for tabla in TABLAS_LEGADO:
+                conn.execute(f"DROP TABLE IF EXISTS {tabla}")
+            conn.commit()
+    finally:
+        conn.close()
+    return copiadas
+
+
+def convertir_mongo(uri: str, tamano_lote: int = 1000) -> dict:
+    """
+    Convierte los documentos MongoDB del formato anterior al formato v2
+    (ver infrastructure/db/codificacion_mongo.py).
+
+    Returns:
+        dict: Documentos convertidos por colección
+    """
+    from infrastructure.db import codificacion_mongo  # Solo necesario para la conversión de MongoDB
+    from infrastructure.db.mongo_clientes import obtener_cliente
+
+    db = obtener_cliente(uri).hsa_db
+    return {
+        "transacciones": codificacion_mongo.convertir_coleccion(
+            db, db.transacciones,
+            codificacion_mongo.transaccion_desde_documento,
+            codificacion_mongo.transaccion_a_documento,
+            tamano_lote
+        ),
+        "accounts": codificacion_mongo.convertir_coleccion(
+            db, db.accounts,
+            codificacion_mongo.cuenta_desde_documento,
+            codificacion_mongo.cuenta_a_documento,
+            tamano_lote
+        ),
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Migra en línea los datos al formato compacto v2.")
+    parser.add_argument("--db", default="database.db", help="Ruta a la base de datos SQLite")
+    parser.add_argument("--tamano-lote", type=int, default=5000, help="Filas copiadas por transacción")
+    parser.add_argument("--pausa", type=float, default=0.0, help="Segundos de espera entre lotes")
+    parser.add_argument("--eliminar-legado", action="store_true",
+                        help="Elimina las tablas del formato anterior al terminar")
+    parser.add_argument("--mongo", help="URI de MongoDB: convierte sus documentos en lugar de la base SQLite")
+    args = parser.parse_args(argv)
+
+    configurar_registro()
+    if args.mongo:
+        from infrastructure.db.mongo_clientes import cerrar_clientes
+        try:
+            print(f"Conversión v2 de MongoDB completada: {convertir_mongo(args.mongo)}")
+        finally:
+            cerrar_clientes()
+        return
+    copiadas = ejecutar(args.db, args.tamano_lote, args.pausa, args.eliminar_legado)
+    print(f"Migración v2 completada: {copiadas}")
+
+
+if __name__ == "__main__":
+    main()
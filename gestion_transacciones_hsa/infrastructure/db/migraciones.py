@@ -0,0 +1,397 @@
+# infrastructure/db/migraciones.py
+import sqlite3                             # Biblioteca para trabajar con SQLite
+import logging
+from datetime import datetime, timezone    # Fecha de aplicación de cada migración
+from typing import Callable, List, Sequence, Union
+
+logger = logging.getLogger(__name__)
+
+
+class Migracion:
+    """
+    Cambio de esquema versionado.
+
+    `pasos` es una lista de sentencias SQL (SQLite) o una función que recibe la
+    conexión/base de datos y aplica el cambio. Cada paso debe ser idempotente.
+    """
+
+    def __init__(self, version: int, descripcion: str, pasos: Union[Sequence[str], Callable]):
+        self.version = version
+        self.descripcion = descripcion
+        self.pasos = pasos
+
+    def aplicar(self, destino) -> None:
+        if callable(self.pasos):
+            self.pasos(destino)
+            return
+        for sentencia in self.pasos:
+            destino.execute(sentencia)
+
+    def __repr__(self):
+        return f"Migracion(version={self.version}, descripcion='{self.descripcion}')"
+
+
+def _ahora() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+def _validar_orden(migraciones: Sequence[Migracion]) -> List[Migracion]:
+    versiones = [m.version for m in migraciones]
+    if len(set(versiones)) != len(versiones):
+        raise ValueError(f"Versiones de migración duplicadas: {versiones}")
+    return sorted(migraciones, key=lambda m: m.version)
+
+
+# Mantenimiento de resumen_cuentas. Los códigos son los de infrastructure/db/codificacion.py:
+# estado 2 = APROBADA, tipo 1 = DEPOSITO, tipo 2 = RETIRO.
+_SQL_RESUMEN_SUMAR = """
+    INSERT INTO resumen_cuentas (cuenta_id, num_transacciones, num_depositos, monto_depositos,
+                                 num_retiros, monto_retiros, saldo_aprobado, primera_fecha, ultima_fecha)
+    VALUES (
+        NEW.cuenta_id, 1,
+        NEW.estado = 2 AND NEW.tipo = 1, CASE WHEN NEW.estado = 2 AND NEW.tipo = 1 THEN NEW.monto ELSE 0 END,
+        NEW.estado = 2 AND NEW.tipo = 2, CASE WHEN NEW.estado = 2 AND NEW.tipo = 2 THEN NEW.monto ELSE 0 END,
+        CASE WHEN NEW.estado = 2 THEN NEW.monto ELSE 0 END,
+        NEW.fecha, NEW.fecha
+    )
+    ON CONFLICT(cuenta_id) DO UPDATE SET
+        num_transacciones = num_transacciones + excluded.num_transacciones,
+        num_depositos = num_depositos + excluded.num_depositos,
+        monto_depositos = monto_depositos + excluded.monto_depositos,
+        num_retiros = num_retiros + excluded.num_retiros,
+        monto_retiros = monto_retiros + excluded.monto_retiros,
+        saldo_aprobado = saldo_aprobado + excluded.saldo_aprobado,
+        primera_fecha = MIN(COALESCE(primera_fecha, excluded.primera_fecha), excluded.primera_fecha),
+        ultima_fecha = MAX(COALESCE(ultima_fecha, excluded.ultima_fecha), excluded.ultima_fecha);
+"""
+
+# Al quitar una fila, la primera y última fecha se recalculan con idx_transacciones_v2_cuenta_fecha
+_SQL_RESUMEN_RESTAR = """
+    UPDATE resumen_cuentas SET
+        num_transacciones = num_transacciones - 1,
+        num_depositos = num_depositos - (OLD.estado = 2 AND OLD.tipo = 1),
+        monto_depositos = monto_depositos - CASE WHEN OLD.estado = 2 AND OLD.tipo = 1 THEN OLD.monto ELSE 0 END,
+        num_retiros = num_retiros - (OLD.estado = 2 AND OLD.tipo = 2),
+        monto_retiros = monto_retiros - CASE WHEN OLD.estado = 2 AND OLD.tipo = 2 THEN OLD.monto ELSE 0 END,
+        saldo_aprobado = saldo_aprobado - CASE WHEN OLD.estado = 2 THEN OLD.monto ELSE 0 END,
+        primera_fecha = (SELECT MIN(fecha) FROM transacciones_v2 WHERE cuenta_id = OLD.cuenta_id),
+        ultima_fecha = (SELECT MAX(fecha) FROM transacciones_v2 WHERE cuenta_id = OLD.cuenta_id)
+    WHERE cuenta_id = OLD.cuenta_id;
+"""
+
+# Resumen calculado desde transacciones_v2, en el orden de columnas de resumen_cuentas;
+# `filtro` restringe las cuentas (WHERE ...)
+SQL_AGREGAR_RESUMEN = """
+    SELECT
+        cuenta_id, COUNT(*),
+        SUM(estado = 2 AND tipo = 1), SUM(CASE WHEN estado = 2 AND tipo = 1 THEN monto ELSE 0 END),
+        SUM(estado = 2 AND tipo = 2), SUM(CASE WHEN estado = 2 AND tipo = 2 THEN monto ELSE 0 END),
+        SUM(CASE WHEN estado = 2 THEN monto ELSE 0 END),
+        MIN(fecha), MAX(fecha)
+    FROM transacciones_v2 {filtro}
+    GROUP BY cuenta_id
+"""
+
+SQL_RECALCULAR_RESUMEN = "INSERT OR REPLACE INTO resumen_cuentas " + SQL_AGREGAR_RESUMEN
+
+# Migraciones de la base SQLite, en orden de aplicación
+MIGRACIONES_SQLITE: List[Migracion] = [
+    Migracion(1, "Crear tabla cuentas", ["""
+        CREATE TABLE IF NOT EXISTS cuentas (
+            id TEXT PRIMARY KEY,
+            usuario_id TEXT NOT NULL,
+            saldo DECIMAL(15,2) NOT NULL,
+            limite_diario DECIMAL(15,2) NOT NULL
+        )
+    """]),
+    Migracion(2, "Crear tabla transacciones", ["""
+        CREATE TABLE IF NOT EXISTS transacciones (
+            id TEXT PRIMARY KEY,
+            cuenta_id TEXT NOT NULL,
+            monto DECIMAL(15,2) NOT NULL,
+            tipo TEXT NOT NULL,
+            estado TEXT NOT NULL,
+            fecha TIMESTAMP NOT NULL
+        )
+    """]),
+    # Filtra por cuenta y entrega las filas ya ordenadas por (fecha, id): sin escaneo ni ordenamiento
+    Migracion(3, "Índice de transacciones por (cuenta_id, fecha, id)", [
+        "CREATE INDEX IF NOT EXISTS idx_transacciones_cuenta_fecha ON transacciones (cuenta_id, fecha, id)"
+    ]),
+    # Cubre por completo SELECT * FROM cuentas WHERE usuario_id = ?
+    Migracion(4, "Índice cubriente de cuentas por usuario_id", [
+        "CREATE INDEX IF NOT EXISTS idx_cuentas_usuario ON cuentas (usuario_id, id, saldo, limite_diario)"
+    ]),
+    # Formato v2 (ver infrastructure/db/codificacion.py): centavos, UUID de 16 bytes,
+    # fechas en microsegundos y códigos enteros. Los datos del formato anterior se copian
+    # en línea con infrastructure/db/migracion_v2.py.
+    Migracion(5, "Tablas compactas cuentas_v2 y transacciones_v2", [
+        """
+        CREATE TABLE IF NOT EXISTS cuentas_v2 (
+            id BLOB PRIMARY KEY,
+            usuario_id BLOB NOT NULL,
+            saldo INTEGER NOT NULL,
+            limite_diario INTEGER NOT NULL
+        ) WITHOUT ROWID
+        """,
+        "CREATE INDEX IF NOT EXISTS idx_cuentas_v2_usuario ON cuentas_v2 (usuario_id, id, saldo, limite_diario)",
+        """
+        CREATE TABLE IF NOT EXISTS transacciones_v2 (
+            id BLOB PRIMARY KEY,
+            cuenta_id BLOB NOT NULL,
+            monto INTEGER NOT NULL,
+            tipo INTEGER NOT NULL,
+            estado INTEGER NOT NULL,
+            fecha INTEGER NOT NULL
+        ) WITHOUT ROWID
+        """,
+        "CREATE INDEX IF NOT EXISTS idx_transacciones_v2_cuenta_fecha ON transacciones_v2 (cuenta_id, fecha, id)",
+        """
+        CREATE TABLE IF NOT EXISTS migracion_v2_progreso (
+            tabla TEXT PRIMARY KEY,
+            ultimo_rowid INTEGER NOT NULL DEFAULT 0,
+            completada INTEGER NOT NULL DEFAULT 0
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS migracion_v2_cuentas (
+            cuenta_id BLOB PRIMARY KEY
+        ) WITHOUT ROWID
+        """,
+    ]),
+    # Cubre por completo el GROUP BY tipo de las transacciones aprobadas de una cuenta
+    Migracion(6, "Índice cubriente de transacciones_v2 por (cuenta_id, estado, tipo, monto)", [
+        "CREATE INDEX IF NOT EXISTS idx_transacciones_v2_cuenta_estado "
+        "ON transacciones_v2 (cuenta_id, estado, tipo, monto)"
+    ]),
+    # Resumen por cuenta mantenido por triggers en la misma transacción de cada escritura.
+    # El índice de la migración 6 deja de usarse: los informes leen resumen_cuentas.
+    Migracion(7, "Tabla resumen_cuentas mantenida por triggers", [
+        """
+        CREATE TABLE IF NOT EXISTS resumen_cuentas (
+            cuenta_id BLOB PRIMARY KEY,
+            num_transacciones INTEGER NOT NULL DEFAULT 0,
+            num_depositos INTEGER NOT NULL DEFAULT 0,
+            monto_depositos INTEGER NOT NULL DEFAULT 0,
+            num_retiros INTEGER NOT NULL DEFAULT 0,
+            monto_retiros INTEGER NOT NULL DEFAULT 0,
+            saldo_aprobado INTEGER NOT NULL DEFAULT 0,
+            primera_fecha INTEGER,
+            ultima_fecha INTEGER
+        ) WITHOUT ROWID
+        """,
+        f"CREATE TRIGGER IF NOT EXISTS trg_resumen_insertar AFTER INSERT ON transacciones_v2 BEGIN {_SQL_RESUMEN_SUMAR} END",
+        f"CREATE TRIGGER IF NOT EXISTS trg_resumen_eliminar AFTER DELETE ON transacciones_v2 BEGIN {_SQL_RESUMEN_RESTAR} END",
+        f"CREATE TRIGGER IF NOT EXISTS trg_resumen_actualizar AFTER UPDATE ON transacciones_v2 "
+        f"BEGIN {_SQL_RESUMEN_RESTAR} {_SQL_RESUMEN_SUMAR} END",
+        "DROP INDEX IF EXISTS idx_transacciones_v2_cuenta_estado",
+        SQL_RECALCULAR_RESUMEN.format(filtro=""),
+    ]),
+    # Versión de la cuenta: cada cambio de saldo la incrementa y el guardado completo de
+    # la cuenta la exige (control optimista). El índice por usuario se rehace para seguir
+    # cubriendo SELECT * FROM cuentas_v2.
+    Migracion(8, "Columna version en cuentas_v2", [
+        "ALTER TABLE cuentas_v2 ADD COLUMN version INTEGER NOT NULL DEFAULT 0",
+        "DROP INDEX IF EXISTS idx_cuentas_v2_usuario",
+        "CREATE INDEX IF NOT EXISTS idx_cuentas_v2_usuario ON cuentas_v2 (usuario_id, id, saldo, limite_diario, version)",
+    ]),
+    # Monto acumulado por cuenta y día (ver infrastructure/db/limites_diarios.py). El índice
+    # por día solo lo usa la limpieza de días vencidos.
+    Migracion(9, "Tabla limites_diarios por (cuenta_id, dia)", [
+        """
+        CREATE TABLE IF NOT EXISTS limites_diarios (
+            cuenta_id BLOB NOT NULL,
+            dia INTEGER NOT NULL,
+            acumulado INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (cuenta_id, dia)
+        ) WITHOUT ROWID
+        """,
+        "CREATE INDEX IF NOT EXISTS idx_limites_diarios_dia ON limites_diarios (dia)",
+    ]),
+    # Outbox de replicación a MongoDB (ver infrastructure/db/replicador_mongo.py): los triggers
+    # encolan la clave de cada fila escrita en la misma transacción que la escritura
+    Migracion(10, "Tabla outbox y triggers de replicación", [
+        """
+        CREATE TABLE IF NOT EXISTS outbox (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            tabla TEXT NOT NULL,
+            clave BLOB NOT NULL
+        )
+        """,
+        *[
+            f"CREATE TRIGGER IF NOT EXISTS trg_outbox_{tabla}_{nombre} AFTER {evento} ON {tabla}_v2 "
+            f"BEGIN INSERT INTO outbox (tabla, clave) VALUES ('{tabla}', {fila}.id); END"
+            for tabla in ("cuentas", "transacciones")
+            for nombre, evento, fila in (
+                ("insertar", "INSERT", "NEW"), ("actualizar", "UPDATE", "NEW"), ("eliminar", "DELETE", "OLD")
+            )
+        ],
+    ]),
+    # La outbox solo la drena ReplicadorMongo: sin él (CLIs, benchmarks, shards, despliegues
+    # sin MongoDB) crecería sin límite. Los triggers encolan solo con la réplica activada, que
+    # activa el replicador al iniciar. Las bases que ya encolaron algo (sqlite_sequence registra
+    # la outbox) la conservan activa para no perder escrituras entre la migración y el replicador.
+    Migracion(11, "Réplica a MongoDB opcional", [
+        """
+        CREATE TABLE IF NOT EXISTS replicacion_mongo (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            activa INTEGER NOT NULL
+        )
+        """,
+        """
+        INSERT OR IGNORE INTO replicacion_mongo (id, activa)
+        SELECT 1, EXISTS (SELECT 1 FROM sqlite_sequence WHERE name = 'outbox')
+        """,
+        *[
+            sentencia
+            for tabla in ("cuentas", "transacciones")
+            for nombre, evento, fila in (
+                ("insertar", "INSERT", "NEW"), ("actualizar", "UPDATE", "NEW"), ("eliminar", "DELETE", "OLD")
+            )
+            for sentencia in (
+                f"DROP TRIGGER IF EXISTS trg_outbox_{tabla}_{nombre}",
+                f"CREATE TRIGGER trg_outbox_{tabla}_{nombre} AFTER {evento} ON {tabla}_v2 "
+                f"WHEN (SELECT activa FROM replicacion_mongo WHERE id = 1) "
+                f"BEGIN INSERT INTO outbox (tabla, clave) VALUES ('{tabla}', {fila}.id); END",
+            )
+        ],
+    ]),
+]
+
+
+class MigradorSQLite:
+    """
+    Aplica en orden las migraciones pendientes y registra cada versión en `schema_version`.
+    """
+
+    def __init__(self, migraciones: Sequence[Migracion] = None):
+        self.migraciones = _validar_orden(MIGRACIONES_SQLITE if migraciones is None else migraciones)
+
+    @staticmethod
+    def _asegurar_tabla_versiones(conn: sqlite3.Connection) -> None:
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS schema_version (
+                version INTEGER PRIMARY KEY,
+                descripcion TEXT NOT NULL,
+                aplicada_en TEXT NOT NULL
+            )
+        """)
+
+    @staticmethod
+    def versiones_aplicadas(conn: sqlite3.Connection) -> set:
+        """Retorna el conjunto de versiones ya registradas."""
+        return {fila[0] for fila in conn.execute("SELECT version FROM schema_version")}
+
+    def version_actual(self, conn: sqlite3.Connection) -> int:
+        """Retorna la versión más alta aplicada (0 si no hay ninguna)."""
+        self._asegurar_tabla_versiones(conn)
+        return max(self.versiones_aplicadas(conn), default=0)
+
+    def aplicar(self, conn: sqlite3.Connection) -> List[int]:
+        """
+        Aplica las migraciones pendientes, cada una en su propia transacción.
+
+        Args:
+            conn: Conexión a la base de datos a migrar
+
+        Returns:
+            List[int]: Versiones aplicadas en esta llamada
+        """
+        if conn.in_transaction:
+            conn.commit()
+        self._asegurar_tabla_versiones(conn)
+        pendientes = [m for m in self.migraciones if m.version not in self.versiones_aplicadas(conn)]
+
+        aplicadas = []
+        for migracion in pendientes:
+            # BEGIN IMMEDIATE serializa migradores concurrentes (varios procesos/workers)
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                if migracion.version in self.versiones_aplicadas(conn):
+                    conn.rollback()
+                    continue
+                migracion.aplicar(conn)
+                conn.execute(
+                    "INSERT INTO schema_version (version, descripcion, aplicada_en) VALUES (?, ?, ?)",
+                    (migracion.version, migracion.descripcion, _ahora())
+                )
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                logger.error("Error aplicando %s", migracion, exc_info=True)
+                raise
+            aplicadas.append(migracion.version)
+            logger.info("Migración SQLite aplicada: %s", migracion)
+        return aplicadas
+
+
+# Migraciones de índices de MongoDB, en orden de aplicación
+MIGRACIONES_MONGO: List[Migracion] = [
+    Migracion(1, "Índice de transacciones por cuenta_id",
+              lambda db: db.transacciones.create_index("cuenta_id")),
+    Migracion(2, "Índice de transacciones por (cuenta_id, fecha, _id)",
+              lambda db: db.transacciones.create_index(
+                  [("cuenta_id", 1), ("fecha", 1), ("_id", 1)],
+                  name="idx_transacciones_cuenta_fecha"
+              )),
+    Migracion(3, "Índice de cuentas por usuario_id",
+              lambda db: db.accounts.create_index(
+                  [("usuario_id", 1), ("_id", 1)],
+                  name="idx_cuentas_usuario"
+              )),
+    Migracion(4, "Índice de transacciones por (cuenta_id, estado, tipo, monto)",
+              lambda db: db.transacciones.create_index(
+                  [("cuenta_id", 1), ("estado", 1), ("tipo", 1), ("monto", 1)],
+                  name="idx_transacciones_cuenta_estado"
+              )),
+    Migracion(5, "Índices de limites_diarios: único por (cuenta_id, dia) y TTL por expira",
+              lambda db: (
+                  db.limites_diarios.create_index(
+                      [("cuenta_id", 1), ("dia", 1)], name="idx_limites_diarios_cuenta_dia", unique=True
+                  ),
+                  db.limites_diarios.create_index(
+                      "expira", name="idx_limites_diarios_expira", expireAfterSeconds=0
+                  ),
+              )),
+]
+
+
+class MigradorMongo:
+    """
+    Aplica en orden las migraciones de índices de MongoDB pendientes.
+
+    Las versiones aplicadas se registran en la colección `schema_version`.
+    """
+
+    def __init__(self, migraciones: Sequence[Migracion] = None):
+        self.migraciones = _validar_orden(MIGRACIONES_MONGO if migraciones is None else migraciones)
+
+    @staticmethod
+    def versiones_aplicadas(db) -> set:
+        """Retorna el conjunto de versiones ya registradas."""
+        return {doc["_id"] for doc in db.schema_version.find({}, {"_id": 1})}
+
+    def aplicar(self, db) -> List[int]:
+        """
+        Aplica las migraciones pendientes.
+
+        Args:
+            db: Base de datos MongoDB a migrar
+
+        Returns:
+            List[int]: Versiones aplicadas en esta llamada
+        """
+        ya_aplicadas = self.versiones_aplicadas(db)
+        aplicadas = []
+        for migracion in self.migraciones:
+            if migracion.version in ya_aplicadas:
+                continue
+            migracion.aplicar(db)  # create_index es idempotente: es seguro si otro proceso se adelantó
+            db.schema_version.update_one(
+                {"_id": migracion.version},
+                {"$setOnInsert": {"descripcion": migracion.descripcion, "aplicada_en": _ahora()}},
+                upsert=True
+            )
+            aplicadas.append(migracion.version)
+            logger.info("Migración MongoDB aplicada: %s", migracion)
+        return aplicadas
@@ -0,0 +1,121 @@
+# infrastructure/db/mongo_clientes.py
+"""
+Registro de clientes MongoDB del proceso: un MongoClient por URI, compartido por todos los
+repositorios (cada cliente mantiene su propio pool de sockets e hilos de monitoreo).
+
+- Conexión perezosa: los clientes se crean con connect=False; la primera operación abre
+  las conexiones.
+- Clientes asíncronos: `obtener_cliente_async` mantiene un AsyncMongoClient por URI con
+  las mismas opciones, para los repositorios asíncronos. Quedan ligados al event loop en
+  el que se usan por primera vez; se cierran con `cerrar_clientes_async`.
+- Seguro ante fork: un MongoClient heredado del proceso padre no debe usarse en el hijo.
+  Tras un fork (p. ej. servidores con varios workers) el registro se vacía y cada worker
+  crea sus propios clientes.
+"""
+import logging
+import os
+import threading
+from typing import Dict, Tuple
+from pymongo import AsyncMongoClient, MongoClient
+
+logger = logging.getLogger(__name__)
+
+URI_DEFECTO = "mongodb://localhost:27017/"
+
+# Opciones de MongoClient usadas si no se indican otras al crear el cliente
+OPCIONES_DEFECTO = {
+    "maxPoolSize": 50,                 # Conexiones simultáneas por servidor
+    "minPoolSize": 0,
+    "maxIdleTimeMS": 60_000,           # Cierra conexiones ociosas
+    "serverSelectionTimeoutMS": 5_000, # Espera máxima por un servidor disponible (pymongo: 30 s)
+    "connectTimeoutMS": 5_000,
+    "socketTimeoutMS": 30_000,
+    "waitQueueTimeoutMS": 10_000,      # Espera máxima por una conexión libre del pool
+}
+
+_clientes: Dict[str, MongoClient] = {}
+_clientes_async: Dict[str, AsyncMongoClient] = {}
+_lock = threading.Lock()
+_pid = os.getpid()
+
+
+def _reiniciar_tras_fork() -> None:
+    """Olvida los clientes heredados sin cerrarlos: pertenecen al proceso padre."""
+    global _lock, _pid
+    _clientes.clear()
+    _clientes_async.clear()
+    _lock = threading.Lock()
+    _pid = os.getpid()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reiniciar_tras_fork)
+
+
+def obtener_cliente(uri: str = URI_DEFECTO, **opciones) -> MongoClient:
+    """
+    Retorna el cliente compartido del proceso para una URI, creándolo si no existe.
+
+    Args:
+        uri: URI de conexión a MongoDB
+        **opciones: Opciones de MongoClient (maxPoolSize, timeouts...) usadas solo al crear
+            el cliente; se combinan con OPCIONES_DEFECTO
+
+    Returns:
+        MongoClient: Cliente compartido por todos los repositorios de esa URI
+    """
+    if os.getpid() != _pid:  # Fork sin register_at_fork
+        _reiniciar_tras_fork()
+    with _lock:
+        cliente = _clientes.get(uri)
+        if cliente is None:
+            cliente = MongoClient(uri, connect=False, **{**OPCIONES_DEFECTO, **opciones})
+            _clientes[uri] = cliente
+            logger.debug("Cliente MongoDB creado para %s", uri)
+        return cliente
+
+
+def obtener_cliente_async(uri: str = URI_DEFECTO, **opciones) -> AsyncMongoClient:
+    """
+    Retorna el cliente asíncrono compartido del proceso para una URI, creándolo si no existe.
+
+    Args:
+        uri: URI de conexión a MongoDB
+        **opciones: Opciones de AsyncMongoClient usadas solo al crear el cliente; se
+            combinan con OPCIONES_DEFECTO
+
+    Returns:
+        AsyncMongoClient: Cliente compartido por todos los repositorios asíncronos de esa URI
+    """
+    if os.getpid() != _pid:
+        _reiniciar_tras_fork()
+    with _lock:
+        cliente = _clientes_async.get(uri)
+        if cliente is None:
+            cliente = AsyncMongoClient(uri, connect=False, **{**OPCIONES_DEFECTO, **opciones})
+            _clientes_async[uri] = cliente
+            logger.debug("Cliente MongoDB asíncrono creado para %s", uri)
+        return cliente
+
+
+def clientes_abiertos() -> Tuple[str, ...]:
+    """Retorna las URI con un cliente en el registro."""
+    with _lock:
+        return tuple(_clientes)
+
+
+def cerrar_clientes() -> None:
+    """Cierra y olvida todos los clientes del proceso."""
+    with _lock:
+        for cliente in _clientes.values():
+            cliente.close()
+        _clientes.clear()
+
+
+async def cerrar_clientes_async() -> None:
+    """Cierra y olvida todos los clientes asíncronos del proceso."""
+    with _lock:
+        clientes = list(_clientes_async.values())
+        _clientes_async.clear()
+    for cliente in clientes:
+        await cliente.close()
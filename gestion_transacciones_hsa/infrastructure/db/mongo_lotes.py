@@ -0,0 +1,53 @@
+# infrastructure/db/mongo_lotes.py
+import logging
+from typing import Any, Callable, List, Optional, Sequence
+from pymongo import ReplaceOne                 # Operación de reemplazo con upsert para bulk_write
+from pymongo.errors import BulkWriteError       # Error con el detalle de cada escritura fallida
+from domain.repositories.resultado_lote import ResultadoLote
+
+logger = logging.getLogger(__name__)
+
+
+def guardar_lote_mongo(
+    coleccion,
+    entidades: Sequence[Any],
+    a_documento: Callable[[Any], dict]
+) -> List[ResultadoLote]:
+    """
+    Reemplaza (o inserta) cada entidad con un único bulk_write no ordenado.
+
+    Args:
+        coleccion: Colección de MongoDB destino
+        entidades: Entidades a guardar
+        a_documento: Función que convierte una entidad en su documento
+
+    Returns:
+        List[ResultadoLote]: Un resultado por entidad, en el mismo orden
+    """
+    resultados: List[Optional[ResultadoLote]] = [None] * len(entidades)
+    operaciones, posiciones = [], []
+    for i, entidad in enumerate(entidades):
+        try:
+            documento = a_documento(entidad)
+        except Exception as e:
+            resultados[i] = ResultadoLote(getattr(entidad, "id", None), False, str(e))
+            continue
+        operaciones.append(ReplaceOne({"_id": documento["_id"]}, documento, upsert=True))
+        posiciones.append(i)
+
+    errores = {}  # índice dentro de `operaciones` -> mensaje de error
+    if operaciones:
+        try:
+            coleccion.bulk_write(operaciones, ordered=False)
+        except BulkWriteError as e:
+            for error in e.details.get("writeErrors", []):
+                errores[error["index"]] = error.get("errmsg", "Error de escritura")
+            logger.error("%s de %s escrituras fallaron en %s", len(errores), len(operaciones), coleccion.name)
+        except Exception as e:
+            logger.error("Error al guardar lote en MongoDB: %s", e, exc_info=True)
+            errores = {j: str(e) for j in range(len(operaciones))}
+
+    for j, i in enumerate(posiciones):
+        error = errores.get(j)
+        resultados[i] = ResultadoLote(entidades[i].id, error is None, error)
+    return resultados
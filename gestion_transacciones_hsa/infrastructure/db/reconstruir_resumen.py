@@ -0,0 +1,135 @@
+# infrastructure/db/reconstruir_resumen.py
+"""
+Reconstruye resumen_cuentas desde transacciones_v2 (el libro de transacciones).
+
+El espacio de cuenta_id se divide en particiones por rango de bytes. Cada hilo recalcula
+particiones en paralelo con su propia conexión:
+
+1. Abre una transacción de lectura y agrega la partición (GROUP BY cuenta_id) sobre esa
+   instantánea; en modo WAL varios lectores avanzan a la vez sin bloquear a la aplicación.
+2. Escribe el resultado en la misma transacción. Si otra conexión escribió desde la
+   instantánea, SQLite rechaza la escritura (SQLITE_BUSY_SNAPSHOT) y la partición se
+   reintenta, así que el resultado siempre corresponde al libro vigente.
+
+Uso: python -m infrastructure.db.reconstruir_resumen --db database.db [--hilos 4] [--particiones 64]
+"""
+import argparse
+import logging
+import os
+import sqlite3
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Tuple
+from infrastructure.db.migraciones import MigradorSQLite, SQL_AGREGAR_RESUMEN
+from infrastructure.registro import configurar_registro
+
+logger = logging.getLogger(__name__)
+
+_COLUMNAS = 9  # Columnas de resumen_cuentas
+
+
+def _particiones(cantidad: int) -> List[Tuple[Optional[bytes], Optional[bytes]]]:
+    """Divide el espacio de UUID de 16 bytes en `cantidad` rangos [desde, hasta)."""
+    cantidad = max(1, min(cantidad, 256))
+    limites = [bytes([256 * i // cantidad]) for i in range(1, cantidad)]
+    return list(zip([None] + limites, limites + [None]))
+
+
+def _filtro(desde: Optional[bytes], hasta: Optional[bytes]) -> Tuple[str, tuple]:
+    condiciones, parametros = [], []
+    if desde is not None:
+        condiciones.append("cuenta_id >= ?")
+        parametros.append(desde)
+    if hasta is not None:
+        condiciones.append("cuenta_id < ?")
+        parametros.append(hasta)
+    return (f"WHERE {' AND '.join(condiciones)}" if condiciones else ""), tuple(parametros)
+
+
+def reconstruir_particion(
+    conn: sqlite3.Connection,
+    desde: Optional[bytes],
+    hasta: Optional[bytes],
+    max_reintentos: int = 20
+) -> Tuple[int, int]:
+    """
+    Recalcula el resumen de las cuentas con cuenta_id en [desde, hasta).
+
+    `conn` debe estar en modo autocommit (isolation_level=None).
+
+    Returns:
+        Tuple[int, int]: (cuentas escritas, reintentos por escrituras concurrentes)
+    """
+    filtro, parametros = _filtro(desde, hasta)
+    consulta = SQL_AGREGAR_RESUMEN.format(filtro=filtro)
+    insertar = f"INSERT OR REPLACE INTO resumen_cuentas VALUES ({', '.join('?' * _COLUMNAS)})"
+
+    for intento in range(max_reintentos + 1):
+        conn.execute("BEGIN")
+        try:
+            filas = conn.execute(consulta, parametros).fetchall()  # Lectura sobre la instantánea
+            # Primera escritura: falla si la instantánea quedó desactualizada
+            conn.execute(f"DELETE FROM resumen_cuentas {filtro}", parametros)
+            conn.executemany(insertar, filas)
+            conn.execute("COMMIT")
+            return len(filas), intento
+        except sqlite3.OperationalError as e:
+            conn.execute("ROLLBACK")
+            if "locked" not in str(e) and "busy" not in str(e):
+                raise
+            time.sleep(min(0.001 * 2 ** intento, 0.1))
+    raise TimeoutError(f"No se pudo reconstruir la partición [{desde!r}, {hasta!r}) por escrituras concurrentes")
+
+
+def reconstruir(db_path: str, hilos: Optional[int] = None, particiones: int = 64) -> dict:
+    """
+    Reconstruye todo resumen_cuentas en paralelo.
+
+    Args:
+        db_path: Ruta al archivo de base de datos SQLite
+        hilos: Hilos de trabajo (por defecto, uno por CPU)
+        particiones: Rangos de cuenta_id en que se divide el trabajo
+
+    Returns:
+        dict: Cuentas reconstruidas, reintentos y segundos transcurridos
+    """
+    conn = sqlite3.connect(db_path, timeout=30.0)
+    try:
+        MigradorSQLite().aplicar(conn)
+    finally:
+        conn.close()
+
+    inicio = time.perf_counter()
+
+    def trabajar(rango):
+        conexion = sqlite3.connect(db_path, timeout=30.0, isolation_level=None)
+        try:
+            return reconstruir_particion(conexion, *rango)
+        finally:
+            conexion.close()
+
+    with ThreadPoolExecutor(max_workers=hilos or os.cpu_count() or 1) as executor:
+        resultados = list(executor.map(trabajar, _particiones(particiones)))
+
+    estadisticas = {
+        "cuentas": sum(cuentas for cuentas, _ in resultados),
+        "reintentos": sum(reintentos for _, reintentos in resultados),
+        "segundos": round(time.perf_counter() - inicio, 3),
+    }
+    logger.info("Resumen de cuentas reconstruido: %s", estadisticas)
+    return estadisticas
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Reconstruye resumen_cuentas desde las transacciones.")
+    parser.add_argument("--db", default="database.db", help="Ruta a la base de datos SQLite")
+    parser.add_argument("--hilos", type=int, default=None, help="Hilos de trabajo (por defecto, uno por CPU)")
+    parser.add_argument("--particiones", type=int, default=64, help="Rangos de cuenta_id a repartir")
+    args = parser.parse_args(argv)
+
+    configurar_registro()
+    print(f"Resumen reconstruido: {reconstruir(args.db, args.hilos, args.particiones)}")
+
+
+if __name__ == "__main__":
+    main()
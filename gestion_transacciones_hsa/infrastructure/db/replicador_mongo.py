@@ -0,0 +1,255 @@
+# infrastructure/db/replicador_mongo.py
+"""
+Replicación asíncrona de SQLite a MongoDB mediante la tabla `outbox`.
+
+Los triggers de la migración 10 encolan (tabla, clave) por cada fila escrita en cuentas_v2 y
+transacciones_v2, dentro de la misma transacción que la escritura: si la escritura se
+confirma, su entrada en la outbox también, y si se revierte, desaparecen ambas. La latencia
+de una petición depende solo del commit local.
+
+El replicador drena la outbox por lotes en orden de id. Por cada clave lee el estado vigente
+de la fila en SQLite y lo escribe en MongoDB con un bulk_write (ReplaceOne con upsert, o
+DeleteOne si la fila ya no existe); varias escrituras de la misma fila dentro de un lote se
+replican una sola vez. Solo después de que MongoDB confirma el lote se eliminan sus entradas
+(el punto de control), así que un fallo deja el lote pendiente y se reintenta con espera
+exponencial. Reaplicar un lote es inocuo: cada operación es idempotente.
+
+Los triggers solo encolan con la réplica activada (migración 11, tabla replicacion_mongo): una
+base nueva no la tiene activada, así que los procesos que nunca replican no llenan la outbox.
+El replicador la activa al iniciar y queda activada en la base: desde entonces hay que
+mantener un replicador en marcha (la aplicación lo inicia salvo con HSA_REPLICACION_MONGO=0,
+o el CLI periódicamente), o desactivarla con --desactivar, que además vacía la outbox.
+
+Uso: python -m infrastructure.db.replicador_mongo --db database.db --mongo mongodb://localhost:27017/
+     python -m infrastructure.db.replicador_mongo --db database.db --desactivar
+"""
+import argparse
+import logging
+import threading
+from typing import Callable, Dict, List, Optional
+from pymongo import DeleteOne, ReplaceOne
+from infrastructure.db import codificacion, codificacion_mongo
+from infrastructure.db.sqlite_pool import SQLitePool, obtener_pool
+from infrastructure.db.mongo_clientes import URI_DEFECTO, cerrar_clientes, obtener_cliente
+from infrastructure.db.migraciones import MigradorSQLite
+from infrastructure.repositories.sqlite_account_repository import SQLiteAccountRepository
+from infrastructure.repositories.sqlite_transaction_repository import SQLiteTransactionRepository
+from infrastructure.registro import configurar_registro
+
+logger = logging.getLogger(__name__)
+
+# Por tabla de la outbox: tabla v2 de origen, colección destino y conversión fila -> documento
+_DESTINOS = {
+    "cuentas": (
+        "cuentas_v2", "accounts",
+        lambda fila: codificacion_mongo.cuenta_a_documento(SQLiteAccountRepository._desde_fila(fila))
+    ),
+    "transacciones": (
+        "transacciones_v2", "transacciones",
+        lambda fila: codificacion_mongo.transaccion_a_documento(SQLiteTransactionRepository._desde_fila(fila))
+    ),
+}
+
+
+def replicacion_activa(conn) -> bool:
+    """Indica si los triggers encolan las escrituras en la outbox."""
+    return bool(conn.execute("SELECT activa FROM replicacion_mongo WHERE id = 1").fetchone()[0])
+
+
+def activar_replicacion(conn) -> None:
+    """Activa el encolado en la outbox (las escrituras anteriores no se encolan)."""
+    conn.execute("UPDATE replicacion_mongo SET activa = 1 WHERE id = 1")
+
+
+def desactivar_replicacion(conn) -> int:
+    """
+    Desactiva el encolado y vacía la outbox (la réplica deja de estar al día).
+
+    Returns:
+        int: Entradas pendientes descartadas
+    """
+    conn.execute("UPDATE replicacion_mongo SET activa = 0 WHERE id = 1")
+    return conn.execute("DELETE FROM outbox").rowcount
+
+
+class ReplicadorMongo:
+    """
+    Drena la outbox de SQLite hacia MongoDB, en un hilo en segundo plano o bajo demanda.
+    """
+
+    def __init__(
+        self,
+        mongo_db,
+        db_path: str = "database.db",
+        pool: Optional[SQLitePool] = None,
+        tamano_lote: int = 500,
+        intervalo: float = 0.5,
+        espera_maxima: float = 60.0,
+        preparar: Optional[Callable[[], None]] = None
+    ):
+        """
+        Args:
+            mongo_db: Base de datos MongoDB destino
+            db_path: Ruta al archivo de base de datos SQLite
+            pool: Pool de conexiones a usar; por defecto el pool compartido de `db_path`
+            tamano_lote: Entradas de la outbox replicadas por bulk_write
+            intervalo: Segundos de espera cuando la outbox está vacía
+            espera_maxima: Tope de la espera exponencial entre reintentos tras un fallo
+            preparar: Acción previa al primer lote (p. ej. aplicar los índices de MongoDB); si
+                falla se reintenta con la misma espera exponencial, sin bloquear el arranque
+        """
+        self.mongo_db = mongo_db
+        self._pool = pool or obtener_pool(db_path)
+        self.tamano_lote = tamano_lote
+        self.intervalo = intervalo
+        self.espera_maxima = espera_maxima
+        self.fallos_consecutivos = 0
+        self._preparar = preparar
+        self._legado: Dict[str, bool] = {}  # ¿La colección aún tiene documentos del formato anterior?
+        self._detener = threading.Event()
+        self._hilo: Optional[threading.Thread] = None
+
+    def activar(self) -> None:
+        """Activa el encolado en la outbox de la base (ver replicacion_activa)."""
+        with self._pool.conexion() as conn:
+            activar_replicacion(conn)
+
+    def pendientes(self) -> int:
+        """Retorna las entradas de la outbox aún no replicadas."""
+        with self._pool.conexion() as conn:
+            return conn.execute("SELECT COUNT(*) FROM outbox").fetchone()[0]
+
+    def _hay_legado(self, coleccion) -> bool:
+        if coleccion.name not in self._legado:
+            self._legado[coleccion.name] = codificacion_mongo.legado_pendiente(self.mongo_db, coleccion)
+        return self._legado[coleccion.name]
+
+    def _operaciones(self, conn, tabla: str, claves: List[bytes], coleccion) -> list:
+        """Construye las operaciones que llevan a MongoDB el estado vigente de cada clave."""
+        origen, _, a_documento = _DESTINOS[tabla]
+        vigentes = {}
+        for i in range(0, len(claves), 500):  # Por debajo del máximo de parámetros de SQLite
+            parte = claves[i:i + 500]
+            for fila in conn.execute(
+                f"SELECT * FROM {origen} WHERE id IN ({','.join('?' * len(parte))})", parte
+            ):
+                vigentes[bytes(fila[0])] = fila
+
+        legado = self._hay_legado(coleccion)
+        operaciones = []
+        for clave in claves:
+            binario = codificacion_mongo.uuid_a_binario(codificacion.bytes_a_uuid(clave))
+            fila = vigentes.get(clave)
+            if fila is None:
+                operaciones.append(DeleteOne({"_id": binario}))
+            else:
+                operaciones.append(ReplaceOne({"_id": binario}, a_documento(fila), upsert=True))
+            if legado:  # Copia en formato anterior del mismo documento
+                operaciones.append(DeleteOne({"_id": str(codificacion.bytes_a_uuid(clave))}))
+        return operaciones
+
+    def drenar_lote(self) -> int:
+        """
+        Replica un lote de la outbox y lo elimina una vez confirmado por MongoDB.
+
+        Returns:
+            int: Entradas de la outbox procesadas (0 si estaba vacía)
+        """
+        if self._preparar is not None:
+            self._preparar()
+            self._preparar = None
+        with self._pool.conexion() as conn:
+            entradas = conn.execute(
+                "SELECT id, tabla, clave FROM outbox ORDER BY id LIMIT ?", (self.tamano_lote,)
+            ).fetchall()
+            if not entradas:
+                return 0
+            claves: Dict[str, Dict[bytes, None]] = {tabla: {} for tabla in _DESTINOS}
+            for _, tabla, clave in entradas:
+                claves[tabla][bytes(clave)] = None  # dict: sin duplicados y en orden de llegada
+            operaciones = {
+                tabla: self._operaciones(conn, tabla, list(pendientes), getattr(self.mongo_db, _DESTINOS[tabla][1]))
+                for tabla, pendientes in claves.items() if pendientes
+            }
+
+        for tabla, ops in operaciones.items():
+            getattr(self.mongo_db, _DESTINOS[tabla][1]).bulk_write(ops, ordered=False)
+
+        ultimo = entradas[-1][0]
+        with self._pool.conexion() as conn:  # Punto de control: solo lo que MongoDB ya confirmó
+            conn.execute("DELETE FROM outbox WHERE id <= ?", (ultimo,))
+        logger.debug("Replicadas %s entradas de la outbox (hasta id %s)", len(entradas), ultimo)
+        return len(entradas)
+
+    def drenar(self) -> int:
+        """Replica lotes hasta vaciar la outbox y retorna las entradas procesadas."""
+        total = 0
+        while True:
+            procesadas = self.drenar_lote()
+            if not procesadas:
+                return total
+            total += procesadas
+
+    def espera(self) -> float:
+        """Segundos hasta el próximo intento: `intervalo` sin fallos, exponencial con fallos."""
+        if not self.fallos_consecutivos:
+            return self.intervalo
+        return min(self.espera_maxima, self.intervalo * 2 ** self.fallos_consecutivos)
+
+    def _ejecutar(self) -> None:
+        while True:
+            try:
+                procesadas = self.drenar_lote()
+                self.fallos_consecutivos = 0
+            except Exception as e:
+                self.fallos_consecutivos += 1
+                procesadas = 0
+                logger.error(
+                    "Error al replicar la outbox a MongoDB (intento %s, reintento en %.1fs): %s", self.fallos_consecutivos, self.espera(), e
+                )
+            # Mientras haya lotes llenos se sigue drenando sin esperar
+            if procesadas < self.tamano_lote and self._detener.wait(self.espera()):
+                return
+            if self._detener.is_set():
+                return
+
+    def iniciar(self) -> None:
+        if self._hilo is not None and self._hilo.is_alive():
+            return
+        self.activar()  # Antes de que la aplicación atienda escrituras
+        self._detener.clear()
+        self._hilo = threading.Thread(target=self._ejecutar, name="replicador-mongo", daemon=True)
+        self._hilo.start()
+
+    def detener(self) -> None:
+        self._detener.set()
+        if self._hilo is not None:
+            self._hilo.join()
+            self._hilo = None
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Replica a MongoDB las escrituras pendientes de la outbox.")
+    parser.add_argument("--db", default="database.db", help="Ruta a la base de datos SQLite")
+    parser.add_argument("--mongo", default=URI_DEFECTO, help="URI de MongoDB")
+    parser.add_argument("--tamano-lote", type=int, default=500, help="Entradas por bulk_write")
+    parser.add_argument("--desactivar", action="store_true",
+                        help="Deja de encolar escrituras y vacía la outbox (sin réplica en MongoDB)")
+    args = parser.parse_args(argv)
+
+    configurar_registro()
+    with obtener_pool(args.db).conexion() as conn:
+        MigradorSQLite().aplicar(conn)
+        if args.desactivar:
+            print(f"Réplica desactivada; entradas descartadas: {desactivar_replicacion(conn)}")
+            return
+    try:
+        replicador = ReplicadorMongo(obtener_cliente(args.mongo).hsa_db, db_path=args.db, tamano_lote=args.tamano_lote)
+        replicador.activar()  # Las siguientes ejecuciones del CLI replican lo escrito desde ahora
+        print(f"Entradas replicadas: {replicador.drenar()}")
+    finally:
+        cerrar_clientes()
+
+
+if __name__ == "__main__":
+    main()
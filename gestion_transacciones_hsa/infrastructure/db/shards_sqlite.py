@@ -0,0 +1,166 @@
+# infrastructure/db/shards_sqlite.py
+"""
+Reparto de los datos SQLite en N archivos (shards) por cuenta_id.
+
+Cada cuenta vive en el shard `indice_shard(cuenta_id, N)`, junto con sus transacciones, su
+resumen y sus acumulados diarios: registrar_con_saldo sigue siendo una sola transacción
+local de un archivo, y escrituras de cuentas en shards distintos no comparten el bloqueo de
+escritura. El índice es un CRC32 de los 16 bytes del UUID, estable entre procesos y
+versiones de Python (a diferencia de hash()).
+
+Los archivos de un conjunto llevan N en el nombre (ver rutas_shards), así que abrir un
+conjunto con otra cantidad de shards no encuentra datos en lugar de enrutar mal.
+
+reparticionar copia una base (un archivo o un conjunto de shards) a un conjunto nuevo de N
+shards, fila por fila, conservando saldos y versiones. Los resúmenes se recalculan con los
+triggers al insertar las transacciones. La outbox de los shards nuevos queda vacía: drenar
+la réplica de MongoDB del origen antes de reparticionar.
+
+Uso: python -m infrastructure.db.shards_sqlite --origen database.db --destino database.db --shards 4
+     python -m infrastructure.db.shards_sqlite --origen database.db --shards-origen 4 --destino nueva.db --shards 8
+"""
+import argparse
+import logging
+import os
+import sqlite3
+import time
+import zlib
+from typing import Dict, List, Optional, Sequence, Union
+from uuid import UUID
+from infrastructure.db.migraciones import MigradorSQLite
+from infrastructure.db.migracion_v2 import MigradorDatosV2
+from infrastructure.registro import configurar_registro
+
+logger = logging.getLogger(__name__)
+
+# Tablas copiadas al reparticionar y la columna con la cuenta que decide su shard
+TABLAS_POR_CUENTA = (("cuentas_v2", "id"), ("transacciones_v2", "cuenta_id"), ("limites_diarios", "cuenta_id"))
+
+
+def indice_shard(cuenta_id: Union[UUID, bytes], shards: int) -> int:
+    """Shard de una cuenta (por su UUID o sus 16 bytes almacenados)."""
+    clave = cuenta_id.bytes if isinstance(cuenta_id, UUID) else cuenta_id
+    return zlib.crc32(clave) % shards
+
+
+def rutas_shards(db_path: str, shards: int) -> List[str]:
+    """
+    Archivos de un conjunto de `shards` shards: database.db -> database.shard0de4.db, ...
+    """
+    if shards < 1:
+        raise ValueError("La cantidad de shards debe ser mayor a 0")
+    raiz, extension = os.path.splitext(db_path)
+    return [f"{raiz}.shard{i}de{shards}{extension or '.db'}" for i in range(shards)]
+
+
+def _abrir(ruta: str) -> sqlite3.Connection:
+    conn = sqlite3.connect(ruta, timeout=30.0)
+    MigradorSQLite().aplicar(conn)
+    return conn
+
+
+def reparticionar(
+    origenes: Sequence[str],
+    destino: str,
+    shards: int,
+    tamano_lote: int = 5000
+) -> Dict[str, object]:
+    """
+    Copia las cuentas, transacciones y acumulados diarios de `origenes` a un conjunto nuevo
+    de `shards` shards con base en `destino`.
+
+    Args:
+        origenes: Archivos de origen (una base o todos los shards de un conjunto)
+        destino: Ruta base del conjunto nuevo (ver rutas_shards)
+        shards: Cantidad de shards del conjunto nuevo
+        tamano_lote: Filas leídas y escritas por vez
+
+    Returns:
+        Dict[str, object]: Filas copiadas por tabla, filas por shard y segundos
+
+    Raises:
+        FileExistsError: Si algún archivo del conjunto nuevo ya existe
+    """
+    rutas = rutas_shards(destino, shards)
+    existentes = [ruta for ruta in rutas if os.path.exists(ruta)]
+    if existentes:
+        raise FileExistsError(f"Los shards de destino ya existen: {existentes}")
+
+    inicio = time.perf_counter()
+    copiadas = {tabla: 0 for tabla, _ in TABLAS_POR_CUENTA}
+    destinos = [_abrir(ruta) for ruta in rutas]
+    try:
+        for origen in origenes:
+            conn = _abrir(origen)
+            try:
+                MigradorDatosV2().asegurar_todo(conn)  # Las filas del formato anterior pasan a v2
+                conn.commit()
+                for tabla, columna in TABLAS_POR_CUENTA:
+                    copiadas[tabla] += _copiar_tabla(conn, destinos, tabla, columna, tamano_lote)
+            finally:
+                conn.close()
+        por_shard = []
+        for conn in destinos:
+            conn.execute("DELETE FROM outbox")  # La copia no se vuelve a replicar
+            conn.commit()
+            por_shard.append({tabla: conn.execute(f"SELECT COUNT(*) FROM {tabla}").fetchone()[0]
+                              for tabla, _ in TABLAS_POR_CUENTA})
+    finally:
+        for conn in destinos:
+            conn.close()
+
+    estadisticas = {
+        "copiadas": copiadas,
+        "por_shard": por_shard,
+        "segundos": round(time.perf_counter() - inicio, 3),
+    }
+    logger.info("Base reparticionada en %s shards: %s", shards, estadisticas)
+    return estadisticas
+
+
+def _copiar_tabla(
+    origen: sqlite3.Connection,
+    destinos: List[sqlite3.Connection],
+    tabla: str,
+    columna: str,
+    tamano_lote: int
+) -> int:
+    """Copia las filas de `tabla` al shard de la cuenta de cada una; retorna las filas copiadas."""
+    columnas = [fila[1] for fila in origen.execute(f"PRAGMA table_info({tabla})")]
+    posicion = columnas.index(columna)
+    insertar = f"INSERT INTO {tabla} ({', '.join(columnas)}) VALUES ({', '.join('?' * len(columnas))})"
+    cursor = origen.execute(f"SELECT {', '.join(columnas)} FROM {tabla}")
+    copiadas = 0
+    try:
+        while True:
+            filas = cursor.fetchmany(tamano_lote)
+            if not filas:
+                break
+            por_shard: Dict[int, list] = {}
+            for fila in filas:
+                por_shard.setdefault(indice_shard(fila[posicion], len(destinos)), []).append(fila)
+            for indice, grupo in por_shard.items():
+                with destinos[indice]:  # Un commit por lote y shard
+                    destinos[indice].executemany(insertar, grupo)
+            copiadas += len(filas)
+    finally:
+        cursor.close()
+    return copiadas
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Reparte una base SQLite en shards por cuenta_id.")
+    parser.add_argument("--origen", default="database.db", help="Base de origen (o ruta base de sus shards)")
+    parser.add_argument("--shards-origen", type=int, default=None, help="Shards del origen, si ya está repartido")
+    parser.add_argument("--destino", default="database.db", help="Ruta base de los shards nuevos")
+    parser.add_argument("--shards", type=int, required=True, help="Cantidad de shards nuevos")
+    parser.add_argument("--tamano-lote", type=int, default=5000)
+    args = parser.parse_args(argv)
+
+    configurar_registro()
+    origenes = rutas_shards(args.origen, args.shards_origen) if args.shards_origen else [args.origen]
+    print(f"Base reparticionada: {reparticionar(origenes, args.destino, args.shards, args.tamano_lote)}")
+
+
+if __name__ == "__main__":
+    main()
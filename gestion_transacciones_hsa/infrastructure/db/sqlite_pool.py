@@ -0,0 +1,252 @@
+# infrastructure/db/sqlite_pool.py
+import asyncio                             # Ejecución de consultas desde corrutinas
+import os                                  # Para normalizar rutas de archivos de base de datos
+import sqlite3                             # Biblioteca para trabajar con SQLite
+import threading                           # Sincronización entre hilos
+import time                                # Medición de tiempos de espera
+import logging
+from concurrent.futures import ThreadPoolExecutor  # Hilo de E/S dedicado del pool
+from contextlib import contextmanager      # Decorador para crear administradores de contexto
+from queue import LifoQueue, Empty         # Cola de conexiones libres
+from typing import Callable, Dict, Generator, Optional, TypeVar
+from infrastructure.db.trazador_sql import TrazadorSQL
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class SQLitePool:
+    """
+    Pool de conexiones SQLite compartido por los repositorios.
+
+    Las conexiones se crean bajo demanda hasta `max_conexiones` y se reutilizan
+    entre llamadas. Los PRAGMA de rendimiento (WAL, synchronous, cache_size,
+    mmap_size) se configuran una sola vez, al crear cada conexión.
+    """
+
+    def __init__(
+        self,
+        db_path: str,
+        max_conexiones: int = 8,
+        timeout: float = 30.0,
+        journal_mode: str = "WAL",
+        synchronous: str = "NORMAL",
+        cache_size: int = -16000,
+        mmap_size: int = 256 * 1024 * 1024,
+        busy_timeout_ms: int = 5000,
+        trazador: Optional[TrazadorSQL] = None
+    ):
+        """
+        Inicializa el pool.
+
+        Args:
+            db_path: Ruta al archivo de base de datos SQLite
+            max_conexiones: Número máximo de conexiones abiertas simultáneamente
+            timeout: Segundos máximos de espera por una conexión libre
+            journal_mode: Modo de journal (WAL permite lectores concurrentes)
+            synchronous: Nivel de sincronización con disco
+            cache_size: Tamaño de caché de páginas (negativo = KiB)
+            mmap_size: Bytes de la base de datos mapeados en memoria
+            busy_timeout_ms: Espera máxima de SQLite ante bloqueos de escritura
+            trazador: Si se indica, las conexiones se abren trazadas (ver trazador_sql.py)
+        """
+        self.db_path = db_path
+        # Una base en memoria solo existe dentro de su conexión: se comparte una única conexión
+        self.en_memoria = db_path == ":memory:"
+        self.max_conexiones = 1 if self.en_memoria else max_conexiones
+        self.timeout = timeout
+        self.trazador = trazador
+        self._pragmas = [
+            ("journal_mode", journal_mode),
+            ("synchronous", synchronous),
+            ("cache_size", cache_size),
+            ("mmap_size", mmap_size),
+            ("busy_timeout", busy_timeout_ms),
+            ("foreign_keys", "ON"),
+        ]
+        self._libres: LifoQueue = LifoQueue()  # LIFO: reutiliza la conexión más "caliente"
+        self._lock = threading.Lock()
+        self._creadas = 0
+        self._cerrado = False
+        self._hilo_io: Optional[ThreadPoolExecutor] = None  # Se crea con la primera llamada a `ejecutar`
+
+        # Métricas del pool
+        self._hits = 0           # Conexión libre reutilizada inmediatamente
+        self._misses = 0         # Fue necesario abrir una conexión nueva
+        self._esperas = 0        # El pool estaba agotado y hubo que esperar
+        self._tiempo_espera = 0.0
+
+    def _crear_conexion(self) -> sqlite3.Connection:
+        """Abre una conexión nueva y aplica los PRAGMA configurados."""
+        conectar = sqlite3.connect if self.trazador is None else self.trazador.conectar
+        conn = conectar(self.db_path, timeout=self.timeout, check_same_thread=False)
+        for nombre, valor in self._pragmas:
+            if nombre == "journal_mode" and self.en_memoria:
+                continue  # WAL no aplica a bases en memoria
+            sqlite3.Connection.execute(conn, f"PRAGMA {nombre} = {valor}")  # Sin trazar
+        return conn
+
+    def _adquirir(self) -> sqlite3.Connection:
+        """Obtiene una conexión libre, crea una nueva o espera a que se libere una."""
+        if self._cerrado:
+            raise RuntimeError(f"El pool de {self.db_path} está cerrado")
+
+        try:
+            conn = self._libres.get_nowait()
+            with self._lock:
+                self._hits += 1
+            return conn
+        except Empty:
+            pass
+
+        with self._lock:
+            puede_crear = self._creadas < self.max_conexiones
+            if puede_crear:
+                self._creadas += 1
+                self._misses += 1
+
+        if puede_crear:
+            try:
+                return self._crear_conexion()
+            except Exception:
+                with self._lock:
+                    self._creadas -= 1
+                raise
+
+        inicio = time.perf_counter()
+        try:
+            conn = self._libres.get(timeout=self.timeout)
+        except Empty:
+            raise TimeoutError(
+                f"No hay conexiones libres en el pool de {self.db_path} tras {self.timeout}s"
+            )
+        with self._lock:
+            self._esperas += 1
+            self._tiempo_espera += time.perf_counter() - inicio
+        return conn
+
+    def _liberar(self, conn: sqlite3.Connection) -> None:
+        """Devuelve la conexión al pool o la cierra si el pool ya fue cerrado."""
+        if self._cerrado:
+            conn.close()
+            with self._lock:
+                self._creadas -= 1
+            return
+        self._libres.put(conn)
+
+    @contextmanager
+    def conexion(self) -> Generator[sqlite3.Connection, None, None]:
+        """
+        Administrador de contexto que presta una conexión del pool.
+
+        Confirma los cambios al salir sin errores y los revierte en caso de excepción.
+
+        Yields:
+            sqlite3.Connection: Conexión prestada por el pool
+        """
+        conn = self._adquirir()
+        try:
+            yield conn
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            self._liberar(conn)
+
+    async def ejecutar(self, funcion: Callable[..., T], *args) -> T:
+        """
+        Ejecuta `funcion(*args)` en el hilo de E/S dedicado del pool y espera su resultado
+        sin bloquear el event loop.
+
+        Todas las llamadas de las corrutinas a esta base comparten ese único hilo: no
+        compiten por el threadpool del servidor ni entre ellas por el bloqueo de escritura
+        de SQLite. Las consultas son cortas y usan índices; el hilo atiende una por vez.
+        """
+        if self._hilo_io is None:
+            with self._lock:
+                if self._hilo_io is None:
+                    self._hilo_io = ThreadPoolExecutor(max_workers=1, thread_name_prefix="sqlite-io")
+        return await asyncio.get_running_loop().run_in_executor(self._hilo_io, funcion, *args)
+
+    def estadisticas(self) -> Dict[str, float]:
+        """
+        Retorna las métricas acumuladas del pool.
+
+        Returns:
+            Dict[str, float]: hits, misses, esperas, tiempo de espera y conexiones
+        """
+        with self._lock:
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "esperas": self._esperas,
+                "tiempo_espera_s": self._tiempo_espera,
+                "conexiones_creadas": self._creadas,
+                "conexiones_libres": self._libres.qsize(),
+                "max_conexiones": self.max_conexiones,
+            }
+
+    def cerrar(self) -> None:
+        """Cierra todas las conexiones libres; las prestadas se cierran al devolverse."""
+        if self._hilo_io is not None:
+            self._hilo_io.shutdown(wait=True)  # Termina lo encolado, que devuelve sus conexiones
+            self._hilo_io = None
+        self._cerrado = True
+        while True:
+            try:
+                conn = self._libres.get_nowait()
+            except Empty:
+                break
+            conn.close()
+            with self._lock:
+                self._creadas -= 1
+
+
+_pools: Dict[str, SQLitePool] = {}
+_pools_lock = threading.Lock()
+_trazador: Optional[TrazadorSQL] = None  # Trazador de los pools que se creen (ver instalar_trazador)
+
+
+def _clave_pool(db_path: str) -> str:
+    return db_path if db_path == ":memory:" else os.path.abspath(db_path)
+
+
+def obtener_pool(db_path: str = "database.db", **opciones) -> SQLitePool:
+    """
+    Retorna el pool compartido del proceso para una base de datos, creándolo si no existe.
+
+    Args:
+        db_path: Ruta al archivo de base de datos SQLite
+        **opciones: Parámetros de SQLitePool usados solo al crear el pool
+
+    Returns:
+        SQLitePool: Pool compartido por todos los repositorios de esa base de datos
+    """
+    clave = _clave_pool(db_path)
+    with _pools_lock:
+        pool = _pools.get(clave)
+        if pool is None or pool._cerrado:
+            opciones.setdefault("trazador", _trazador)
+            pool = SQLitePool(db_path, **opciones)
+            _pools[clave] = pool
+            logger.debug("Pool SQLite creado para %s", clave)
+        return pool
+
+
+def instalar_trazador(trazador: Optional[TrazadorSQL]) -> None:
+    """
+    Traza las conexiones de los pools que `obtener_pool` cree desde ahora (None deja de
+    hacerlo). Los pools ya creados no cambian: se llama en el arranque, antes de usarlos.
+    """
+    global _trazador
+    _trazador = trazador
+
+
+def cerrar_pools() -> None:
+    """Cierra y olvida todos los pools del proceso."""
+    with _pools_lock:
+        for pool in _pools.values():
+            pool.cerrar()
+        _pools.clear()
@@ -0,0 +1,255 @@
+# infrastructure/db/trazador_sql.py
+"""
+Registro de consultas SQLite lentas con su plan de ejecución.
+
+Con un trazador instalado (ver sqlite_pool.instalar_trazador), cada conexión que abre el
+pool es una `ConexionTrazada`: cada `execute`/`executemany` se mide y se acumula por huella
+de la sentencia (el SQL normalizado, sin literales). Además:
+
+- las sentencias que superan el umbral se registran como WARNING con los parámetros
+  redactados (solo tipo y tamaño) y el resultado de EXPLAIN QUERY PLAN;
+- la primera vez que se ve cada huella se obtiene su plan; si filtra recorriendo una
+  tabla completa (SCAN sin índice) se avisa una vez, aunque la consulta sea rápida;
+- `set_trace_callback` cuenta las sentencias que SQLite ejecutó en cada llamada (el BEGIN
+  implícito y los cuerpos de los triggers incluidos).
+
+El tiempo medido es el de la llamada a execute: para las consultas que se leen de a
+poco con fetchmany, cubre solo el primer paso (el de ORDER BY sin índice o agregados).
+
+Habilitación por variables de entorno (ver TrazadorSQL.desde_entorno):
+
+    HSA_SQL_LENTAS_MS=50    # umbral en milisegundos; sin ella no se traza nada
+    HSA_SQL_PLANES=0        # no ejecutar EXPLAIN QUERY PLAN
+"""
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+from functools import lru_cache
+from typing import Dict, List, Mapping, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+# Huellas distintas que se acumulan por separado; las siguientes se agrupan en HUELLA_OTRAS
+MAX_HUELLAS = 1000
+HUELLA_OTRAS = "(otras)"
+
+# Sentencias a las que se les pide el plan
+_CON_PLAN = ("SELECT", "WITH", "INSERT", "UPDATE", "DELETE", "REPLACE")
+
+_DESACTIVADO = ("0", "false", "no", "off")
+
+_ESPACIOS = re.compile(r"\s+")
+_LITERALES = re.compile(r"'(?:[^']|'')*'|\b[xX]'[0-9a-fA-F]*'|(?<![\w.])-?\d+(?:\.\d+)?\b")
+_LISTAS = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_FILAS = re.compile(r"(\(\?\+\)|\(\?\))(?:\s*,\s*(?:\(\?\+\)|\(\?\)))+")
+_ESCANEO = re.compile(r"^SCAN (?:TABLE )?(\w+)$")  # Sin "USING ... INDEX" ni subconsultas
+
+
+@lru_cache(maxsize=1024)
+def huella_sql(sql: str) -> str:
+    """
+    Normaliza una sentencia para agrupar sus ejecuciones: espacios colapsados, literales
+    reemplazados por ? y listas de parámetros (IN, VALUES múltiples) reducidas a una.
+    """
+    huella = _ESPACIOS.sub(" ", sql).strip().rstrip(";")
+    huella = _LITERALES.sub("?", huella)
+    huella = _LISTAS.sub("(?+)", huella)
+    return _FILAS.sub(r"\1", huella)
+
+
+def redactar(parametros) -> str:
+    """Describe los parámetros sin sus valores: tipo y, para textos y blobs, tamaño."""
+    if isinstance(parametros, Mapping):
+        return "{" + ", ".join(f"{nombre}: {_tipo(valor)}" for nombre, valor in parametros.items()) + "}"
+    return "(" + ", ".join(_tipo(valor) for valor in parametros) + ")"
+
+
+def _tipo(valor) -> str:
+    if isinstance(valor, (bytes, bytearray, memoryview, str)):
+        return f"{type(valor).__name__}[{len(valor)}]"
+    return type(valor).__name__
+
+
+class EstadisticaSentencia:
+    """Acumulado de las ejecuciones de una huella."""
+
+    __slots__ = ("huella", "llamadas", "total", "maximo", "lentas", "sentencias", "plan", "escaneo")
+
+    def __init__(self, huella: str):
+        self.huella = huella
+        self.llamadas = 0
+        self.total = 0.0
+        self.maximo = 0.0
+        self.lentas = 0
+        self.sentencias = 0    # Sentencias de SQLite (triggers incluidos) en todas las llamadas
+        self.plan: Optional[str] = None
+        self.escaneo = False   # El plan filtra recorriendo una tabla completa
+
+    def como_dict(self) -> Dict[str, object]:
+        return {
+            "huella": self.huella,
+            "llamadas": self.llamadas,
+            "total_ms": self.total * 1000,
+            "media_ms": self.total * 1000 / self.llamadas if self.llamadas else 0.0,
+            "max_ms": self.maximo * 1000,
+            "lentas": self.lentas,
+            "sentencias_por_llamada": self.sentencias / self.llamadas if self.llamadas else 0.0,
+            "escaneo": self.escaneo,
+            "plan": self.plan,
+        }
+
+
+class TrazadorSQL:
+    """Mide las sentencias de las conexiones trazadas y acumula sus estadísticas por huella."""
+
+    def __init__(self, umbral_ms: float = 100.0, planes: bool = True, max_huellas: int = MAX_HUELLAS):
+        """
+        Args:
+            umbral_ms: Duración a partir de la cual una sentencia se registra como lenta
+            planes: Obtener el plan (EXPLAIN QUERY PLAN) de cada huella nueva
+            max_huellas: Huellas acumuladas por separado
+        """
+        self.umbral = umbral_ms / 1000
+        self.planes = planes
+        self.max_huellas = max_huellas
+        self._lock = threading.Lock()
+        self._estadisticas: Dict[str, EstadisticaSentencia] = {}
+
+    @classmethod
+    def desde_entorno(cls, entorno: Optional[Mapping[str, str]] = None) -> Optional["TrazadorSQL"]:
+        """Retorna el trazador si HSA_SQL_LENTAS_MS está definida; None si no."""
+        entorno = os.environ if entorno is None else entorno
+        umbral = entorno.get("HSA_SQL_LENTAS_MS")
+        if not umbral:
+            return None
+        return cls(umbral_ms=float(umbral), planes=entorno.get("HSA_SQL_PLANES", "1").lower() not in _DESACTIVADO)
+
+    def conectar(self, *args, **kwargs) -> "ConexionTrazada":
+        """sqlite3.connect con una ConexionTrazada asociada a este trazador."""
+        conn = sqlite3.connect(*args, factory=ConexionTrazada, **kwargs)
+        conn._trazador = self
+        conn.set_trace_callback(conn._contar_sentencia)
+        return conn
+
+    def registrar(
+        self,
+        conn: sqlite3.Connection,
+        sql: str,
+        parametros,
+        segundos: float,
+        sentencias: int
+    ) -> None:
+        """Acumula una ejecución; si es lenta o su plan recorre una tabla completa, la registra."""
+        huella = huella_sql(sql)
+        with self._lock:
+            estadistica = self._estadisticas.get(huella)
+            if estadistica is None:
+                clave = huella if len(self._estadisticas) < self.max_huellas else HUELLA_OTRAS
+                estadistica = self._estadisticas.get(clave)
+                if estadistica is None:
+                    estadistica = self._estadisticas[clave] = EstadisticaSentencia(clave)
+            estadistica.llamadas += 1
+            estadistica.total += segundos
+            estadistica.maximo = max(estadistica.maximo, segundos)
+            estadistica.sentencias += sentencias
+            lenta = segundos >= self.umbral
+            if lenta:
+                estadistica.lentas += 1
+            explicar = self.planes and estadistica.plan is None and estadistica.huella != HUELLA_OTRAS
+            if explicar:
+                estadistica.plan = ""  # Otro hilo con la misma huella no lo vuelve a pedir
+
+        if explicar:
+            plan = _explicar(conn, sql, parametros)
+            estadistica.plan = plan
+            estadistica.escaneo = _filtra_sin_indice(huella, plan)
+            if estadistica.escaneo:
+                logger.warning("Sentencia que recorre una tabla completa: %s\n%s", huella, plan)
+        if lenta:
+            logger.warning(
+                "Sentencia lenta (%.1f ms, %s sentencias de SQLite): %s parámetros=%s\n%s",
+                segundos * 1000, sentencias, huella, redactar(parametros),
+                estadistica.plan or "(sin plan)"
+            )
+
+    def volcar(self) -> List[Dict[str, object]]:
+        """Estadísticas por huella, de mayor a menor tiempo total."""
+        with self._lock:
+            filas = [estadistica.como_dict() for estadistica in self._estadisticas.values()]
+        return sorted(filas, key=lambda fila: fila["total_ms"], reverse=True)
+
+    def formatear(self, limite: int = 20) -> str:
+        """Tabla de texto con las `limite` huellas de mayor tiempo total."""
+        lineas = [f"{'llamadas':>9} {'total ms':>10} {'media ms':>9} {'max ms':>9} {'lentas':>7}  sentencia"]
+        for fila in self.volcar()[:limite]:
+            marca = " [SCAN]" if fila["escaneo"] else ""
+            lineas.append(
+                f"{fila['llamadas']:>9} {fila['total_ms']:>10.1f} {fila['media_ms']:>9.2f} "
+                f"{fila['max_ms']:>9.2f} {fila['lentas']:>7}  {fila['huella']}{marca}"
+            )
+        return "\n".join(lineas)
+
+    def reiniciar(self) -> None:
+        """Descarta las estadísticas acumuladas (los planes se vuelven a pedir)."""
+        with self._lock:
+            self._estadisticas.clear()
+
+
+def _explicar(conn: sqlite3.Connection, sql: str, parametros) -> str:
+    """Plan de la sentencia como texto indentado; vacío si no es una consulta o DML."""
+    if not sql.lstrip().upper().startswith(_CON_PLAN):
+        return ""
+    try:
+        filas = sqlite3.Connection.execute(conn, "EXPLAIN QUERY PLAN " + sql, parametros).fetchall()
+    except sqlite3.Error as e:
+        return f"(plan no disponible: {e})"
+    profundidad: Dict[int, int] = {0: 0}
+    lineas = []
+    for id_nodo, padre, _, detalle in filas:
+        profundidad[id_nodo] = profundidad.get(padre, 0) + 1
+        lineas.append("  " * profundidad[id_nodo] + detalle)
+    return "\n".join(lineas)
+
+
+def _filtra_sin_indice(huella: str, plan: str) -> bool:
+    """
+    Indica si la sentencia filtra (WHERE) recorriendo una tabla completa. Los recorridos
+    sin filtro son lecturas completas intencionales; las tablas internas de SQLite no cuentan.
+    """
+    if " WHERE " not in huella.upper():
+        return False
+    for linea in plan.splitlines():
+        escaneo = _ESCANEO.match(linea.strip())
+        if escaneo and not escaneo.group(1).startswith("sqlite_"):
+            return True
+    return False
+
+
+class ConexionTrazada(sqlite3.Connection):
+    """Conexión que informa al trazador la duración de cada execute y executemany."""
+
+    _trazador: TrazadorSQL
+    _sentencias = 0
+
+    def _contar_sentencia(self, _sql: str) -> None:
+        self._sentencias += 1
+
+    def execute(self, sql: str, parametros: Sequence = ()) -> sqlite3.Cursor:
+        self._sentencias = 0
+        inicio = time.perf_counter()
+        try:
+            return super().execute(sql, parametros)
+        finally:
+            self._trazador.registrar(self, sql, parametros, time.perf_counter() - inicio, self._sentencias)
+
+    def executemany(self, sql: str, filas) -> sqlite3.Cursor:
+        filas = filas if isinstance(filas, (list, tuple)) else list(filas)  # El plan usa la primera
+        self._sentencias = 0
+        inicio = time.perf_counter()
+        try:
+            return super().executemany(sql, filas)
+        finally:
+            self._trazador.registrar(self, sql, filas[0] if filas else (), time.perf_counter() - inicio, self._sentencias)
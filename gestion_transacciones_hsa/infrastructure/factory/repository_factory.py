@@ -1,12 +1,20 @@
-from typing import Type  # Importa el tipo Type para anotaciones de tipo
+from typing import Optional, Type  # Importa tipos para anotaciones de tipo
 # Importaciones de interfaces de repositorios
 from domain.repositories.i_transaction_repository import ITransactionRepository  # Interface para repositorio de transacciones
 from domain.repositories.i_account_repository import IAccountRepository  # Interface para repositorio de cuentas
+from domain.repositories.i_async_transaction_repository import IAsyncTransactionRepository  # Interface asíncrona de transacciones
+from domain.repositories.i_async_account_repository import IAsyncAccountRepository  # Interface asíncrona de cuentas
 
 # Importaciones de implementaciones SQLite
 from infrastructure.repositories.sqlite_transaction_repository import SQLiteTransactionRepository  # Implementación SQLite para transacciones
 from infrastructure.repositories.sqlite_account_repository import SQLiteAccountRepository  # Implementación SQLite para cuentas
 
+from infrastructure.repositories.cached_account_repository import CachedAccountRepository  # Caché de lectura de cuentas
+
+# Importaciones de implementaciones SQLite repartidas en shards por cuenta_id
+from infrastructure.repositories.sharded_sqlite_transaction_repository import ShardedSQLiteTransactionRepository
+from infrastructure.repositories.sharded_sqlite_account_repository import ShardedSQLiteAccountRepository
+
 # Importaciones de implementaciones MongoDB
 from infrastructure.repositories.mongo_transaction_repository import MongoTransactionRepository  # Implementación MongoDB para transacciones
 from infrastructure.repositories.mongo_account_repository import MongoAccountRepository  # Implementación MongoDB para cuentas
@@ -17,22 +25,49 @@ class RepositoryFactory:  # Define la clase fábrica de repositorios
     Implementa el patrón Factory para la creación de repositorios.
     """
     
-    def __init__(self, db_type: str = "sqlite"):  # Constructor que acepta el tipo de base de datos
+    def __init__(self, db_type: str = "sqlite", cache_cuentas: bool = False, shards: int = 4, **opciones_cache):  # Constructor que acepta el tipo de base de datos
         """
         Inicializa la fábrica con el tipo de base de datos.
         
         Args:
-            db_type: Tipo de base de datos ('sqlite' o 'mongo')
+            db_type: Tipo de base de datos ('sqlite', 'sqlite-sharded' o 'mongo')
+            cache_cuentas: Si es True, los repositorios de cuentas síncronos se sirven a
+                través de un CachedAccountRepository compartido por la fábrica, y los de
+                transacciones le informan cada saldo confirmado
+            shards: Archivos en que se reparten los datos con 'sqlite-sharded'
+                (ver infrastructure/db/shards_sqlite.py)
+            opciones_cache: tamano_maximo, ttl y ttl_ausentes de CachedAccountRepository
         """
         self.db_type = db_type.lower()  # Almacena el tipo de BD en minúsculas
         self._validate_db_type()  # Valida que el tipo de BD sea válido
+        self.shards = shards
+        self.cache_cuentas = cache_cuentas
+        self._opciones_cache = opciones_cache
+        self._cache: Optional[CachedAccountRepository] = None  # Se crea con el primer repositorio que lo usa
     
     def _validate_db_type(self) -> None:  # Método privado para validación
         """Valida que el tipo de base de datos sea soportado."""
-        valid_types = ['sqlite', 'mongo']  # Define los tipos válidos de BD
+        valid_types = ['sqlite', 'sqlite-sharded', 'mongo']  # Define los tipos válidos de BD
         if self.db_type not in valid_types:  # Verifica si el tipo es válido
             raise ValueError(f"Tipo de base de datos no soportado. Tipos válidos: {valid_types}")  # Lanza error si no es válido
 
+    def _cache_cuentas(self) -> CachedAccountRepository:
+        """Caché de cuentas de la fábrica: uno solo, para que las escrituras lo mantengan al día."""
+        if self._cache is None:
+            self._cache = CachedAccountRepository(self._crear_account_repository(), **self._opciones_cache)
+        return self._cache
+
+    def _crear_account_repository(self) -> IAccountRepository:
+        """Repositorio de cuentas del tipo configurado, sin caché."""
+        if self.db_type == "sqlite":
+            return SQLiteAccountRepository()
+        if self.db_type == "sqlite-sharded":
+            return ShardedSQLiteAccountRepository(shards=self.shards)
+        return MongoAccountRepository()
+
+    def _al_cambiar_saldo(self):
+        return self._cache_cuentas().actualizar_saldo if self.cache_cuentas else None
+
     def obtener_transaction_repository(self) -> ITransactionRepository:  # Método para obtener repositorio de transacciones
         """
         Retorna una instancia de ITransactionRepository según el tipo de base de datos configurado.
@@ -41,8 +76,10 @@ class RepositoryFactory:  # Define la clase fábrica de repositorios
             ITransactionRepository: Una implementación concreta del repositorio de transacciones
         """
         if self.db_type == "sqlite":  # Si el tipo es SQLite
-            return SQLiteTransactionRepository()  # Retorna implementación SQLite
-        return MongoTransactionRepository()  # Si no, retorna implementación MongoDB
+            return SQLiteTransactionRepository(al_cambiar_saldo=self._al_cambiar_saldo())  # Retorna implementación SQLite
+        if self.db_type == "sqlite-sharded":  # SQLite repartido en shards por cuenta_id
+            return ShardedSQLiteTransactionRepository(shards=self.shards, al_cambiar_saldo=self._al_cambiar_saldo())
+        return MongoTransactionRepository(al_cambiar_saldo=self._al_cambiar_saldo())  # Si no, retorna implementación MongoDB
     
     def obtener_account_repository(self) -> IAccountRepository:  # Método para obtener repositorio de cuentas
         """
@@ -50,7 +87,50 @@ class RepositoryFactory:  # Define la clase fábrica de repositorios
         
         Returns:
             IAccountRepository: Una implementación concreta del repositorio de cuentas
+                (el CachedAccountRepository compartido si `cache_cuentas` está activo)
         """
-        if self.db_type == "sqlite":  # Si el tipo es SQLite
-            return SQLiteAccountRepository()  # Retorna implementación SQLite
-        return MongoAccountRepository()  # Si no, retorna implementación MongoDB
\ No newline at end of file
+        if self.cache_cuentas:
+            return self._cache_cuentas()
+        return self._crear_account_repository()
+
+    def _validar_asincrono(self) -> None:
+        # Los repositorios asíncronos SQLite usan el hilo de E/S de un único pool; con shards
+        # habría uno por archivo
+        if self.db_type == "sqlite-sharded":
+            raise ValueError("El tipo 'sqlite-sharded' no tiene repositorios asíncronos")
+
+    def obtener_async_transaction_repository(self) -> IAsyncTransactionRepository:  # Variante asíncrona
+        """
+        Retorna una instancia de IAsyncTransactionRepository según el tipo de base de datos configurado.
+        
+        Returns:
+            IAsyncTransactionRepository: SQLite en el hilo de E/S del pool o MongoDB con AsyncMongoClient
+
+        Raises:
+            ValueError: Con 'sqlite-sharded', que solo tiene repositorios síncronos
+        """
+        self._validar_asincrono()
+        if self.db_type == "sqlite":
+            from infrastructure.repositories.async_sqlite_transaction_repository import AsyncSQLiteTransactionRepository
+            return AsyncSQLiteTransactionRepository(repositorio=self.obtener_transaction_repository())
+        from infrastructure.repositories.async_mongo_transaction_repository import AsyncMongoTransactionRepository
+        return AsyncMongoTransactionRepository()
+
+    def obtener_async_account_repository(self) -> IAsyncAccountRepository:  # Variante asíncrona
+        """
+        Retorna una instancia de IAsyncAccountRepository según el tipo de base de datos configurado.
+        
+        Returns:
+            IAsyncAccountRepository: SQLite en el hilo de E/S del pool (con el caché de cuentas
+                si está activo) o MongoDB con AsyncMongoClient (sin caché)
+
+        Raises:
+            ValueError: Con 'sqlite-sharded', que solo tiene repositorios síncronos
+        """
+        self._validar_asincrono()
+        if self.db_type == "sqlite":
+            from infrastructure.repositories.async_sqlite_account_repository import AsyncSQLiteAccountRepository
+            from infrastructure.db.sqlite_pool import obtener_pool
+            return AsyncSQLiteAccountRepository(pool=obtener_pool(), repositorio=self.obtener_account_repository())
+        from infrastructure.repositories.async_mongo_account_repository import AsyncMongoAccountRepository
+        return AsyncMongoAccountRepository()
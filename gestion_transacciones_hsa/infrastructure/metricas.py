@@ -0,0 +1,302 @@
+# infrastructure/metricas.py
+"""
+Métricas de latencia por capa, en el formato de texto de Prometheus.
+
+- `instrumentar(objeto, capa, metricas)` envuelve un servicio o repositorio: cada llamada a
+  un método público queda medida en un histograma por (capa, Clase.método), y sus
+  excepciones en un contador de errores.
+- Las llamadas medidas dentro de una petición HTTP se acumulan además en la `Traza` de esa
+  petición (tiempo por capa y número de operaciones de repositorio), que el middleware de
+  app/metricas_http.py registra al terminar y puede enviar en la cabecera Server-Timing.
+
+Sin métricas habilitadas no se envuelve nada: los objetos se usan directamente.
+
+Habilitación por variables de entorno (ver Metricas.desde_entorno):
+
+    HSA_METRICAS=1                  # histogramas y GET /metrics
+    HSA_METRICAS_SERVER_TIMING=1    # además, la cabecera Server-Timing en cada respuesta
+"""
+import functools
+import inspect
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterator, List, Mapping, Optional, Sequence, Tuple
+
+# Límites superiores (segundos) de los buckets de latencia
+BUCKETS_SEGUNDOS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Límites de los buckets de operaciones de repositorio por petición
+BUCKETS_CONSULTAS = (1, 2, 3, 5, 10, 20, 50, 100)
+
+# Capa de las operaciones que cuentan como consultas de la petición
+CAPA_REPOSITORIO = "repositorio"
+
+_ACTIVADO = ("1", "true", "si", "sí", "yes", "on")
+
+
+class Histograma:
+    """Histograma de buckets fijos (no acumulados internamente) con suma y total."""
+
+    __slots__ = ("limites", "cuentas", "suma", "total")
+
+    def __init__(self, limites: Sequence[float]):
+        self.limites = tuple(limites)
+        self.cuentas = [0] * (len(self.limites) + 1)  # El último es +Inf
+        self.suma = 0.0
+        self.total = 0
+
+    def observar(self, valor: float) -> None:
+        self.cuentas[bisect_left(self.limites, valor)] += 1
+        self.suma += valor
+        self.total += 1
+
+    def acumulado(self) -> List[Tuple[str, int]]:
+        """Pares (le, cantidad acumulada) como los expone Prometheus."""
+        pares, acumulado = [], 0
+        for limite, cantidad in zip(self.limites + (float("inf"),), self.cuentas):
+            acumulado += cantidad
+            pares.append(("+Inf" if limite == float("inf") else format(limite, "g"), acumulado))
+        return pares
+
+
+class Traza:
+    """Tiempo por capa y operaciones de repositorio de una petición."""
+
+    __slots__ = ("duraciones", "consultas")
+
+    def __init__(self):
+        self.duraciones: Dict[str, float] = {}
+        self.consultas = 0
+
+    def agregar(self, capa: str, segundos: float) -> None:
+        self.duraciones[capa] = self.duraciones.get(capa, 0.0) + segundos
+        if capa == CAPA_REPOSITORIO:
+            self.consultas += 1
+
+    def server_timing(self, total: Optional[float] = None) -> str:
+        """
+        Valor de la cabecera Server-Timing (milisegundos). Los tiempos de cada capa incluyen
+        los de las capas que llama.
+        """
+        partes = [f"{capa};dur={segundos * 1000:.2f}" for capa, segundos in self.duraciones.items()]
+        if total is not None:
+            partes.append(f"total;dur={total * 1000:.2f}")
+        return ", ".join(partes)
+
+
+# Traza de la petición en curso; las tareas y generadores de la petición heredan el contexto
+_traza_actual: ContextVar[Optional[Traza]] = ContextVar("traza_metricas", default=None)
+
+
+class Metricas:
+    """Registro de histogramas y contadores de la aplicación."""
+
+    def __init__(self, server_timing: bool = False):
+        """
+        Args:
+            server_timing: Enviar la cabecera Server-Timing en cada respuesta
+        """
+        self.server_timing = server_timing
+        self._lock = threading.Lock()
+        # (capa, operacion) -> [histograma, errores]
+        self._operaciones: Dict[Tuple[str, str], list] = {}
+        # (metodo, ruta, estado) -> histograma de duración
+        self._peticiones: Dict[Tuple[str, str, str], Histograma] = {}
+        # (metodo, ruta) -> histograma de operaciones de repositorio por petición
+        self._consultas: Dict[Tuple[str, str], Histograma] = {}
+
+    @classmethod
+    def desde_entorno(cls, entorno: Optional[Mapping[str, str]] = None) -> Optional["Metricas"]:
+        """Retorna las métricas si HSA_METRICAS está activada; None si no."""
+        entorno = os.environ if entorno is None else entorno
+        if entorno.get("HSA_METRICAS", "").lower() not in _ACTIVADO:
+            return None
+        return cls(server_timing=entorno.get("HSA_METRICAS_SERVER_TIMING", "").lower() in _ACTIVADO)
+
+    def observar_operacion(self, capa: str, operacion: str, segundos: float, error: bool = False) -> None:
+        with self._lock:
+            entrada = self._operaciones.get((capa, operacion))
+            if entrada is None:
+                entrada = self._operaciones[(capa, operacion)] = [Histograma(BUCKETS_SEGUNDOS), 0]
+            entrada[0].observar(segundos)
+            if error:
+                entrada[1] += 1
+        traza = _traza_actual.get()
+        if traza is not None:
+            traza.agregar(capa, segundos)
+
+    def observar_peticion(self, metodo: str, ruta: str, estado: int, segundos: float, consultas: int) -> None:
+        with self._lock:
+            clave = (metodo, ruta, str(estado))
+            histograma = self._peticiones.get(clave)
+            if histograma is None:
+                histograma = self._peticiones[clave] = Histograma(BUCKETS_SEGUNDOS)
+            histograma.observar(segundos)
+            histograma = self._consultas.get((metodo, ruta))
+            if histograma is None:
+                histograma = self._consultas[(metodo, ruta)] = Histograma(BUCKETS_CONSULTAS)
+            histograma.observar(consultas)
+
+    @contextmanager
+    def medir(self, capa: str, operacion: str) -> Iterator[None]:
+        """Mide un bloque como una operación de la capa."""
+        inicio = time.perf_counter()
+        error = False
+        try:
+            yield
+        except Exception:
+            error = True
+            raise
+        finally:
+            self.observar_operacion(capa, operacion, time.perf_counter() - inicio, error)
+
+    @contextmanager
+    def traza(self) -> Iterator[Traza]:
+        """Abre la traza de una petición: las operaciones medidas dentro se acumulan en ella."""
+        traza = Traza()
+        token = _traza_actual.set(traza)
+        try:
+            yield traza
+        finally:
+            _traza_actual.reset(token)
+
+    def exportar(self) -> str:
+        """Todas las métricas en el formato de texto de Prometheus (versión 0.0.4)."""
+        with self._lock:
+            operaciones = {clave: (_copiar(h), errores) for clave, (h, errores) in self._operaciones.items()}
+            peticiones = {clave: _copiar(h) for clave, h in self._peticiones.items()}
+            consultas = {clave: _copiar(h) for clave, h in self._consultas.items()}
+
+        lineas: List[str] = []
+        _histogramas(lineas, "hsa_operacion_duracion_segundos", "Duración de las operaciones por capa",
+                     ("capa", "operacion"), {clave: h for clave, (h, _) in operaciones.items()})
+        lineas.append("# HELP hsa_operacion_errores_total Operaciones que terminaron con una excepción")
+        lineas.append("# TYPE hsa_operacion_errores_total counter")
+        for clave, (_, errores) in sorted(operaciones.items()):
+            lineas.append(f"hsa_operacion_errores_total{_etiquetas(('capa', 'operacion'), clave)} {errores}")
+        _histogramas(lineas, "hsa_peticion_duracion_segundos", "Duración de las peticiones HTTP",
+                     ("metodo", "ruta", "estado"), peticiones)
+        _histogramas(lineas, "hsa_peticion_consultas", "Operaciones de repositorio por petición HTTP",
+                     ("metodo", "ruta"), consultas)
+        return "\n".join(lineas) + "\n"
+
+
+def _copiar(histograma: Histograma) -> Histograma:
+    copia = Histograma(histograma.limites)
+    copia.cuentas, copia.suma, copia.total = list(histograma.cuentas), histograma.suma, histograma.total
+    return copia
+
+
+def _escapar(valor: str) -> str:
+    return valor.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _etiquetas(nombres: Sequence[str], valores: Sequence[str], extra: str = "") -> str:
+    pares = [f'{nombre}="{_escapar(str(valor))}"' for nombre, valor in zip(nombres, valores)]
+    if extra:
+        pares.append(extra)
+    return "{" + ",".join(pares) + "}"
+
+
+def _histogramas(lineas: List[str], nombre: str, ayuda: str, etiquetas: Sequence[str], series: Dict[tuple, Histograma]) -> None:
+    lineas.append(f"# HELP {nombre} {ayuda}")
+    lineas.append(f"# TYPE {nombre} histogram")
+    for clave, histograma in sorted(series.items()):
+        for limite, cantidad in histograma.acumulado():
+            le = 'le="' + limite + '"'
+            lineas.append(f"{nombre}_bucket{_etiquetas(etiquetas, clave, le)} {cantidad}")
+        lineas.append(f"{nombre}_sum{_etiquetas(etiquetas, clave)} {histograma.suma!r}")
+        lineas.append(f"{nombre}_count{_etiquetas(etiquetas, clave)} {histograma.total}")
+
+
+def instrumentar(objeto, capa: str, metricas: Optional[Metricas]):
+    """
+    Envuelve `objeto` para medir sus métodos públicos; sin métricas lo retorna tal cual.
+
+    Las corrutinas se miden hasta que terminan; los generadores asíncronos, por el tiempo
+    pasado dentro de ellos (sin contar el del consumidor) hasta agotarlos o cerrarlos.
+    Solo cuentan como errores las excepciones: una cancelación (por ejemplo, el cliente
+    que corta la respuesta) o un cierre anticipado no.
+    """
+    if metricas is None:
+        return objeto
+    return _Instrumentado(objeto, capa, metricas)
+
+
+class _Instrumentado:
+    """Proxy que mide los métodos públicos del objeto; el resto de los atributos pasa sin cambios."""
+
+    def __init__(self, objeto, capa: str, metricas: Metricas):
+        self._objeto = objeto
+        self._capa = capa
+        self._metricas = metricas
+        self._clase = type(objeto).__name__
+
+    def __getattr__(self, nombre: str):
+        atributo = getattr(self._objeto, nombre)
+        if nombre.startswith("_") or not callable(atributo):
+            return atributo
+        medido = _medir(atributo, self._capa, f"{self._clase}.{nombre}", self._metricas)
+        self.__dict__[nombre] = medido  # Los siguientes accesos no pasan por __getattr__
+        return medido
+
+    def __repr__(self):
+        return f"Instrumentado({self._objeto!r})"
+
+
+def _medir(funcion, capa: str, operacion: str, metricas: Metricas):
+    if inspect.isasyncgenfunction(funcion):
+        @functools.wraps(funcion)
+        async def generador(*args, **kwargs):
+            recorrido = funcion(*args, **kwargs)
+            dentro, error = 0.0, False
+            try:
+                while True:
+                    inicio = time.perf_counter()
+                    try:
+                        elemento = await recorrido.__anext__()
+                    except StopAsyncIteration:
+                        return
+                    finally:
+                        dentro += time.perf_counter() - inicio
+                    yield elemento
+            except Exception:
+                error = True
+                raise
+            finally:
+                inicio = time.perf_counter()
+                await recorrido.aclose()
+                dentro += time.perf_counter() - inicio
+                metricas.observar_operacion(capa, operacion, dentro, error)
+        return generador
+
+    if inspect.iscoroutinefunction(funcion):
+        @functools.wraps(funcion)
+        async def corrutina(*args, **kwargs):
+            inicio = time.perf_counter()
+            error = False
+            try:
+                return await funcion(*args, **kwargs)
+            except Exception:
+                error = True
+                raise
+            finally:
+                metricas.observar_operacion(capa, operacion, time.perf_counter() - inicio, error)
+        return corrutina
+
+    @functools.wraps(funcion)
+    def llamada(*args, **kwargs):
+        inicio = time.perf_counter()
+        error = False
+        try:
+            return funcion(*args, **kwargs)
+        except Exception:
+            error = True
+            raise
+        finally:
+            metricas.observar_operacion(capa, operacion, time.perf_counter() - inicio, error)
+    return llamada
@@ -0,0 +1,214 @@
+# infrastructure/registro.py
+"""
+Configuración del registro (logging) de la aplicación.
+
+Los módulos solo crean su logger con logging.getLogger(__name__), no fijan niveles ni
+handlers, y pasan los valores como argumentos ("... %s", valor): el mensaje se arma
+solo si el registro supera el nivel configurado. `configurar_registro` instala:
+
+- el nivel global y los niveles por módulo (prefijos de logger);
+- el muestreo de los mensajes DEBUG que se emiten por fila (1 de cada N por prefijo);
+- un QueueHandler en la raíz: el hilo que registra solo encola, y el formateo y la
+  escritura ocurren en el hilo del QueueListener;
+- el formato de salida, texto o JSON (una línea por registro).
+
+La configuración se puede leer de variables de entorno (ver
+ConfiguracionRegistro.desde_entorno):
+
+    HSA_LOG_NIVEL=INFO
+    HSA_LOG_NIVELES=infrastructure.db=DEBUG,app.controllers=WARNING
+    HSA_LOG_MUESTREO=domain.entities.transaction=1000
+    HSA_LOG_FORMATO=json
+"""
+import atexit
+import copy
+import itertools
+import json
+import logging
+import os
+import queue
+import sys
+import threading
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, Mapping, Optional, TextIO
+
+FORMATO_TEXTO = "%(asctime)s %(levelname)s %(name)s: %(message)s"
+
+# Niveles por módulo aplicados siempre, salvo que la configuración los cambie
+NIVELES_DEFECTO = {
+    "pymongo": "WARNING",   # pymongo registra cada comando y evento de conexión en DEBUG
+}
+
+# Atributos propios de LogRecord: el resto (pasados con `extra=`) se agregan al JSON
+_ATRIBUTOS_REGISTRO = set(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime", "taskName"}
+
+
+class ConfiguracionRegistro:
+    """Niveles, muestreo y formato del registro."""
+
+    def __init__(
+        self,
+        nivel: str = "INFO",
+        niveles: Optional[Mapping[str, str]] = None,
+        muestreo: Optional[Mapping[str, int]] = None,
+        formato: str = "texto"
+    ):
+        """
+        Args:
+            nivel: Nivel de la raíz (DEBUG, INFO, WARNING, ...)
+            niveles: Nivel por prefijo de logger; se agregan a NIVELES_DEFECTO
+            muestreo: Por prefijo de logger, se emite 1 de cada N registros DEBUG
+            formato: 'texto' o 'json'
+        """
+        if formato not in ("texto", "json"):
+            raise ValueError(f"Formato de registro no soportado: {formato}. Formatos válidos: ['texto', 'json']")
+        self.nivel = nivel.upper()
+        self.niveles = {**NIVELES_DEFECTO, **{k: v.upper() for k, v in (niveles or {}).items()}}
+        self.muestreo = dict(muestreo or {})
+        self.formato = formato
+
+    @classmethod
+    def desde_entorno(cls, entorno: Optional[Mapping[str, str]] = None, nivel: str = "INFO") -> "ConfiguracionRegistro":
+        """
+        Lee la configuración de HSA_LOG_NIVEL, HSA_LOG_NIVELES, HSA_LOG_MUESTREO y HSA_LOG_FORMATO.
+
+        Args:
+            entorno: Variables a leer; por defecto os.environ
+            nivel: Nivel global si HSA_LOG_NIVEL no está definida
+        """
+        entorno = os.environ if entorno is None else entorno
+        return cls(
+            nivel=entorno.get("HSA_LOG_NIVEL", nivel),
+            niveles=_pares(entorno.get("HSA_LOG_NIVELES", "")),
+            muestreo={k: int(v) for k, v in _pares(entorno.get("HSA_LOG_MUESTREO", "")).items()},
+            formato=entorno.get("HSA_LOG_FORMATO", "texto").lower()
+        )
+
+
+def _pares(texto: str) -> Dict[str, str]:
+    """Convierte 'a=1,b=2' en {'a': '1', 'b': '2'}."""
+    pares = {}
+    for par in filter(None, (p.strip() for p in texto.split(","))):
+        clave, separador, valor = par.partition("=")
+        if not separador:
+            raise ValueError(f"Se esperaba modulo=valor: {par!r}")
+        pares[clave.strip()] = valor.strip()
+    return pares
+
+
+class FiltroMuestreo(logging.Filter):
+    """
+    Deja pasar 1 de cada N registros DEBUG de los loggers configurados (por el prefijo
+    más largo que coincida). Los niveles superiores nunca se descartan.
+    """
+
+    def __init__(self, muestreo: Mapping[str, int]):
+        super().__init__()
+        for prefijo, cada in muestreo.items():
+            if cada < 1:
+                raise ValueError(f"El muestreo de {prefijo} debe ser mayor a 0")
+        # Prefijos más largos primero; un contador por prefijo (next() es atómico con el GIL)
+        self._reglas = [(p, cada, itertools.count()) for p, cada in sorted(muestreo.items(), key=lambda r: -len(r[0]))]
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno > logging.DEBUG:
+            return True
+        for prefijo, cada, contador in self._reglas:
+            if record.name == prefijo or record.name.startswith(prefijo + "."):
+                return next(contador) % cada == 0
+        return True
+
+
+class FormateadorJSON(logging.Formatter):
+    """Un objeto JSON por línea: fecha (UTC), nivel, logger, mensaje, campos extra y excepción."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        documento = {
+            "fecha": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "nivel": record.levelname,
+            "logger": record.name,
+            "mensaje": record.getMessage(),
+            "hilo": record.threadName,
+        }
+        for clave, valor in vars(record).items():
+            if clave not in _ATRIBUTOS_REGISTRO:
+                documento[clave] = valor
+        if record.exc_info:
+            documento["excepcion"] = self.formatException(record.exc_info)
+        return json.dumps(documento, ensure_ascii=False, default=str)
+
+
+class _Encolador(QueueHandler):
+    """
+    QueueHandler que no formatea: QueueHandler.prepare arma el mensaje en el hilo que
+    registra, y aquí ese trabajo se deja al listener. Los argumentos se formatean
+    después, así que conviene pasar valores que no cambien (ids, números, textos).
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return copy.copy(record)
+
+
+_lock = threading.Lock()
+_encolador: Optional[_Encolador] = None
+_listener: Optional[QueueListener] = None
+_atexit_registrado = False
+
+
+def configurar_registro(
+    configuracion: Optional[ConfiguracionRegistro] = None,
+    destino: Optional[TextIO] = None
+) -> ConfiguracionRegistro:
+    """
+    Instala la configuración de registro del proceso, reemplazando la anterior si la había.
+
+    Args:
+        configuracion: Niveles, muestreo y formato; por defecto los de las variables de entorno
+        destino: Flujo de salida; por defecto sys.stderr
+
+    Returns:
+        ConfiguracionRegistro: La configuración aplicada
+    """
+    global _encolador, _listener, _atexit_registrado
+    configuracion = configuracion or ConfiguracionRegistro.desde_entorno()
+    with _lock:
+        _detener()
+        salida = logging.StreamHandler(destino or sys.stderr)
+        salida.setFormatter(FormateadorJSON() if configuracion.formato == "json" else logging.Formatter(FORMATO_TEXTO))
+
+        cola: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+        _encolador = _Encolador(cola)
+        if configuracion.muestreo:
+            _encolador.addFilter(FiltroMuestreo(configuracion.muestreo))
+
+        raiz = logging.getLogger()
+        raiz.addHandler(_encolador)
+        raiz.setLevel(configuracion.nivel)
+        for nombre, nivel in configuracion.niveles.items():
+            logging.getLogger(nombre).setLevel(nivel)
+
+        _listener = QueueListener(cola, salida, respect_handler_level=True)
+        _listener.start()
+        if not _atexit_registrado:  # Al salir se escribe lo que quede en la cola
+            atexit.register(detener_registro)
+            _atexit_registrado = True
+    return configuracion
+
+
+def detener_registro() -> None:
+    """Escribe los registros pendientes, detiene el listener y quita el handler de la raíz."""
+    with _lock:
+        _detener()
+
+
+def _detener() -> None:
+    global _encolador, _listener
+    if _listener is not None:
+        _listener.stop()  # Procesa lo encolado antes de terminar
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+    if _encolador is not None:
+        logging.getLogger().removeHandler(_encolador)
+        _encolador = None
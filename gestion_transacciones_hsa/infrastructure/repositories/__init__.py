@@ -1,5 +1,21 @@
 # infrastructure/repositories/__init__.py
 from .sqlite_transaction_repository import SQLiteTransactionRepository
-from .mongo_transaction_repository import MongoTransactionRepository
 from .sqlite_account_repository import SQLiteAccountRepository
-from .mongo_account_repository import MongoAccountRepository
\ No newline at end of file
+from .async_sqlite_transaction_repository import AsyncSQLiteTransactionRepository
+from .async_sqlite_account_repository import AsyncSQLiteAccountRepository
+from .cached_account_repository import CachedAccountRepository
+
+# Los repositorios MongoDB se importan al pedirlos: importar pymongo cuesta más que el resto del paquete
+_MONGO = {
+    "MongoTransactionRepository": ".mongo_transaction_repository",
+    "MongoAccountRepository": ".mongo_account_repository",
+    "AsyncMongoTransactionRepository": ".async_mongo_transaction_repository",
+    "AsyncMongoAccountRepository": ".async_mongo_account_repository",
+}
+
+
+def __getattr__(nombre):
+    if nombre in _MONGO:
+        from importlib import import_module
+        return getattr(import_module(_MONGO[nombre], __name__), nombre)
+    raise AttributeError(f"module {__name__!r} has no attribute {nombre!r}")
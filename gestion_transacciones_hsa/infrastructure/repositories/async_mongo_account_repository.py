@@ -0,0 +1,64 @@
+# infrastructure/repositories/async_mongo_account_repository.py
+from typing import List  # Tipos para anotaciones
+from uuid import UUID    # Identificadores únicos
+from pymongo.errors import DuplicateKeyError  # Upsert sobre una cuenta con otra versión
+from domain.repositories.i_async_account_repository import IAsyncAccountRepository
+from domain.repositories.conflicto_concurrencia import ConflictoConcurrencia
+from domain.entities.account import Account
+from infrastructure.db import codificacion_mongo  # Formato de documentos v2
+from infrastructure.db.mongo_clientes import URI_DEFECTO, obtener_cliente_async
+
+class AsyncMongoAccountRepository(IAsyncAccountRepository):
+    """
+    Implementación asíncrona MongoDB del repositorio de cuentas (AsyncMongoClient), sobre
+    documentos v2 (ver AsyncMongoTransactionRepository).
+    """
+
+    def __init__(self, connection_string: str = URI_DEFECTO, db=None):
+        """
+        Args:
+            connection_string: URI de conexión a MongoDB
+            db: Base de datos asíncrona a usar en lugar de la del cliente compartido
+        """
+        self.db = db if db is not None else obtener_cliente_async(connection_string).hsa_db
+        self.accounts = self.db.accounts
+        self._verificado = False
+
+    async def _verificar_formato(self) -> None:
+        if self._verificado:
+            return
+        if await codificacion_mongo.legado_pendiente_async(self.db, self.accounts):
+            raise RuntimeError(
+                "La colección accounts tiene documentos del formato anterior; "
+                "conviértalos con python -m infrastructure.db.migracion_v2 --mongo"
+            )
+        self._verificado = True
+
+    async def guardar(self, account: Account) -> None:
+        """Guarda la cuenta con el mismo control optimista de versión que MongoAccountRepository."""
+        await self._verificar_formato()
+        documento = codificacion_mongo.cuenta_a_documento(account)
+        account_id = documento.pop("_id")
+        documento["version"] = account.version + 1
+        version = account.version if account.version else {"$in": [0, None]}
+        try:
+            await self.accounts.update_one({"_id": account_id, "version": version}, {"$set": documento}, upsert=True)
+        except DuplicateKeyError:
+            raise ConflictoConcurrencia("cuenta", account.id, account.version)
+        account.version = documento["version"]
+
+    async def obtener_por_id(self, account_id: UUID) -> Account:
+        await self._verificar_formato()
+        documento = await self.accounts.find_one({"_id": codificacion_mongo.uuid_a_binario(account_id)})
+        if documento is None:
+            raise ValueError(f"Cuenta no encontrada: {account_id}")
+        return codificacion_mongo.cuenta_desde_documento(documento)
+
+    async def obtener_por_usuario(self, usuario_id: UUID) -> List[Account]:
+        await self._verificar_formato()
+        cursor = self.accounts.find({"usuario_id": codificacion_mongo.uuid_a_binario(usuario_id)})
+        return [codificacion_mongo.cuenta_desde_documento(c) async for c in cursor]
+
+    async def listar_todos(self) -> List[Account]:
+        await self._verificar_formato()
+        return [codificacion_mongo.cuenta_desde_documento(c) async for c in self.accounts.find()]
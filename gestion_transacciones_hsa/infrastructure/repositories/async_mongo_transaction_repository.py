@@ -0,0 +1,153 @@
+# infrastructure/repositories/async_mongo_transaction_repository.py
+import asyncio                                  # Migraciones de índices fuera del event loop
+from typing import AsyncIterator, List, Optional, Tuple  # Tipos para anotaciones
+from uuid import UUID                           # Identificadores únicos
+from decimal import Decimal                     # Saldos
+from datetime import datetime                   # Fechas de la clave de paginación
+from pymongo import ReturnDocument              # Documento retornado por find_one_and_update
+from domain.repositories.i_async_transaction_repository import IAsyncTransactionRepository
+from domain.entities.transaction import Transaction, TransactionState
+from domain.entities.resumen_cuenta import ResumenCuenta
+from infrastructure.db import codificacion, codificacion_mongo, limites_diarios
+from infrastructure.db.migraciones import MigradorMongo
+from infrastructure.db.mongo_clientes import URI_DEFECTO, obtener_cliente, obtener_cliente_async
+from infrastructure.repositories.mongo_transaction_repository import (
+    MongoTransactionRepository, ORDEN_CUENTA, ORDEN_PAGINA, PROYECCION_SALDO, TAMANO_LOTE_LECTURA
+)
+
+class AsyncMongoTransactionRepository(IAsyncTransactionRepository):
+    """
+    Implementación asíncrona MongoDB del repositorio de transacciones (AsyncMongoClient).
+
+    Mismas consultas que MongoTransactionRepository sobre documentos v2. No lee el formato
+    anterior: si las transacciones o las cuentas aún tienen documentos sin convertir, las
+    operaciones fallan con RuntimeError hasta ejecutar
+    python -m infrastructure.db.migracion_v2 --mongo.
+    """
+
+    def __init__(self, connection_string: str = URI_DEFECTO, db=None):
+        """
+        Inicializa el repositorio. No abre conexiones: el cliente es el compartido del
+        proceso para la URI y las verificaciones se hacen al primer uso.
+
+        Args:
+            connection_string: URI de conexión a MongoDB
+            db: Base de datos asíncrona a usar en lugar de la del cliente compartido; sus
+                migraciones de índices quedan a cargo de quien la provee
+        """
+        self.connection_string = connection_string
+        self._migrar = db is None
+        self.db = db if db is not None else obtener_cliente_async(connection_string).hsa_db
+        self.collection = self.db.transacciones
+        self._preparado = False
+
+    async def _preparar(self) -> None:
+        """Aplica las migraciones de índices y verifica que los documentos estén en formato v2."""
+        if self._preparado:
+            return
+        if self._migrar:
+            # MigradorMongo es síncrono y se ejecuta una vez: usa el cliente síncrono en otro hilo
+            await asyncio.to_thread(MigradorMongo().aplicar, obtener_cliente(self.connection_string).hsa_db)
+        for coleccion in (self.collection, self.db.accounts):
+            if await codificacion_mongo.legado_pendiente_async(self.db, coleccion):
+                raise RuntimeError(
+                    f"La colección {coleccion.name} tiene documentos del formato anterior; "
+                    "conviértalos con python -m infrastructure.db.migracion_v2 --mongo"
+                )
+        self._preparado = True
+
+    def _filtro_cuenta(self, cuenta_id: UUID) -> dict:
+        return {"cuenta_id": codificacion_mongo.uuid_a_binario(cuenta_id)}
+
+    async def guardar(self, transaccion: Transaction) -> None:
+        await self._preparar()
+        documento = codificacion_mongo.transaccion_a_documento(transaccion)
+        await self.collection.replace_one({"_id": documento["_id"]}, documento, upsert=True)
+
+    async def obtener_por_id(self, id: UUID) -> Transaction:
+        await self._preparar()
+        documento = await self.collection.find_one({"_id": codificacion_mongo.uuid_a_binario(id)})
+        if not documento:
+            raise ValueError(f"No se encontró la transacción con id {id}")
+        return codificacion_mongo.transaccion_desde_documento(documento)
+
+    async def listar_por_cuenta(self, cuenta_id: UUID) -> List[Transaction]:
+        return [t async for t in self.iterar_por_cuenta(cuenta_id)]
+
+    async def iterar_por_cuenta(self, cuenta_id: UUID, tamano_lote: int = TAMANO_LOTE_LECTURA) -> AsyncIterator[Transaction]:
+        await self._preparar()
+        cursor = self.collection.find(self._filtro_cuenta(cuenta_id), sort=ORDEN_CUENTA, batch_size=tamano_lote)
+        async for documento in cursor:
+            yield codificacion_mongo.transaccion_desde_documento(documento)
+
+    async def listar_pagina_por_cuenta(
+        self,
+        cuenta_id: UUID,
+        limite: int,
+        despues: Optional[Tuple[datetime, UUID]] = None
+    ) -> List[Transaction]:
+        await self._preparar()
+        cursor = self.collection.find(
+            MongoTransactionRepository._filtro_pagina(self._filtro_cuenta(cuenta_id), despues),
+            sort=ORDEN_PAGINA,
+            limit=limite
+        )
+        return [codificacion_mongo.transaccion_desde_documento(t) async for t in cursor]
+
+    async def resumir_aprobadas_por_cuenta(self, cuenta_id: UUID) -> ResumenCuenta:
+        await self._preparar()
+        filtro = self._filtro_cuenta(cuenta_id)
+        filtro["estado"] = codificacion.CODIGOS_ESTADO[TransactionState.APROBADA]
+        cursor = await self.collection.aggregate(MongoTransactionRepository._pipeline_resumen(filtro, "$monto"))
+        return MongoTransactionRepository._resumen_desde_grupos(await cursor.to_list())
+
+    async def registrar_con_saldo(self, transaccion: Transaction) -> Tuple[Decimal, int]:
+        """
+        Actualiza el saldo de la cuenta y guarda la transacción, con las mismas operaciones
+        atómicas y compensaciones que MongoTransactionRepository.registrar_con_saldo. Las
+        pendientes y rechazadas se guardan sin cambiar saldo ni versión.
+
+        Raises:
+            ValueError: Si la cuenta no existe, no tiene fondos suficientes o se supera el límite diario
+        """
+        if not isinstance(transaccion.monto, Decimal):
+            raise ValueError("El monto debe ser de tipo Decimal.")
+        await self._preparar()
+        centavos = codificacion.a_centavos(transaccion.monto)
+        dia = codificacion.fecha_a_dia(transaccion.fecha)
+        cuentas = self.db.accounts
+        filtro = MongoTransactionRepository._filtro_saldo(transaccion, centavos)
+        aprobada = codificacion.es_aprobada(transaccion.estado)
+
+        if aprobada:
+            cuenta = await cuentas.find_one_and_update(
+                filtro,
+                {"$inc": {"saldo": centavos, "version": 1}},
+                projection=PROYECCION_SALDO,
+                return_document=ReturnDocument.AFTER
+            )
+        else:  # Pendiente o rechazada: solo se lee el saldo vigente
+            cuenta = await cuentas.find_one(filtro, PROYECCION_SALDO)
+        if cuenta is None:
+            if await cuentas.find_one({"_id": filtro["_id"]}, {"_id": 1}) is None:
+                raise ValueError(f"La cuenta con ID {transaccion.cuenta_id} no existe.")
+            raise ValueError("Fondos insuficientes para realizar la transacción.")
+
+        if aprobada:  # Solo las aprobadas mueven el saldo y cuentan para el límite
+            try:
+                await limites_diarios.acumular_mongo_async(
+                    self.db.limites_diarios, filtro["_id"], dia, abs(centavos), cuenta["limite_diario"]
+                )
+            except Exception:
+                await cuentas.update_one({"_id": filtro["_id"]}, {"$inc": {"saldo": -centavos, "version": 1}})
+                raise
+        try:
+            await self.guardar(transaccion)
+        except Exception:
+            if aprobada:
+                await cuentas.update_one({"_id": filtro["_id"]}, {"$inc": {"saldo": -centavos, "version": 1}})
+                await self.db.limites_diarios.update_one(
+                    {"cuenta_id": filtro["_id"], "dia": dia}, {"$inc": {"acumulado": -abs(centavos)}}
+                )
+            raise
+        return codificacion.desde_centavos(cuenta["saldo"]), cuenta["version"]
@@ -0,0 +1,45 @@
+# infrastructure/repositories/async_sqlite_account_repository.py
+from typing import List, Optional  # Tipos para anotaciones
+from uuid import UUID              # Identificadores únicos
+from domain.repositories.i_async_account_repository import IAsyncAccountRepository
+from domain.repositories.i_account_repository import IAccountRepository
+from domain.entities.account import Account
+from infrastructure.db.sqlite_pool import SQLitePool
+from infrastructure.repositories.sqlite_account_repository import SQLiteAccountRepository
+
+class AsyncSQLiteAccountRepository(IAsyncAccountRepository):
+    """
+    Implementación asíncrona SQLite del repositorio de cuentas: ejecuta las operaciones del
+    repositorio síncrono en el hilo de E/S dedicado del pool (ver SQLitePool.ejecutar).
+    """
+
+    def __init__(
+        self,
+        db_path: str = "database.db",
+        pool: Optional[SQLitePool] = None,
+        repositorio: Optional[IAccountRepository] = None
+    ):
+        """
+        Args:
+            db_path: Ruta al archivo de base de datos SQLite
+            pool: Pool de conexiones a usar; por defecto el pool compartido de `db_path`
+            repositorio: Repositorio síncrono a envolver; por defecto se crea uno sobre el pool.
+                Si no es un SQLiteAccountRepository (por ejemplo, un CachedAccountRepository
+                sobre uno), se debe pasar también su `pool`
+        """
+        self._repositorio = repositorio or SQLiteAccountRepository(db_path=db_path, pool=pool)
+        self._pool = pool or getattr(self._repositorio, "_pool", None)
+        if self._pool is None:
+            raise ValueError("El repositorio asíncrono necesita un repositorio con pool de conexiones")
+
+    async def obtener_por_id(self, id: UUID) -> Account:
+        return await self._pool.ejecutar(self._repositorio.obtener_por_id, id)
+
+    async def obtener_por_usuario(self, usuario_id: UUID) -> List[Account]:
+        return await self._pool.ejecutar(self._repositorio.obtener_por_usuario, usuario_id)
+
+    async def listar_todos(self) -> List[Account]:
+        return await self._pool.ejecutar(self._repositorio.listar_todos)
+
+    async def guardar(self, cuenta: Account) -> None:
+        await self._pool.ejecutar(self._repositorio.guardar, cuenta)
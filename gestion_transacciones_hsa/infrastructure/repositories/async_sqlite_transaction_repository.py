@@ -0,0 +1,99 @@
+# infrastructure/repositories/async_sqlite_transaction_repository.py
+from typing import AsyncIterator, Callable, List, Optional, Tuple  # Tipos para anotaciones
+from uuid import UUID                           # Identificadores únicos
+from datetime import datetime                   # Fechas de la clave de paginación
+from decimal import Decimal                     # Saldos
+from domain.repositories.i_async_transaction_repository import IAsyncTransactionRepository
+from domain.repositories.proyeccion_transaccion import ProyeccionTransaccion
+from domain.entities.transaction import Transaction
+from domain.entities.resumen_cuenta import ResumenCuenta
+from infrastructure.db.sqlite_pool import SQLitePool
+from infrastructure.repositories.sqlite_transaction_repository import SQLiteTransactionRepository, TAMANO_LOTE_LECTURA
+
+class AsyncSQLiteTransactionRepository(IAsyncTransactionRepository):
+    """
+    Implementación asíncrona SQLite del repositorio de transacciones.
+
+    Cada operación ejecuta la del repositorio SQLite síncrono (mismas consultas, índices
+    y transacciones) en el hilo de E/S dedicado del pool (ver SQLitePool.ejecutar), así
+    que la corrutina espera sin ocupar un hilo del servidor.
+    """
+
+    def __init__(
+        self,
+        db_path: str = "database.db",
+        pool: Optional[SQLitePool] = None,
+        repositorio: Optional[SQLiteTransactionRepository] = None
+    ):
+        """
+        Args:
+            db_path: Ruta al archivo de base de datos SQLite
+            pool: Pool de conexiones a usar; por defecto el pool compartido de `db_path`
+            repositorio: Repositorio síncrono a envolver; por defecto se crea uno sobre el pool
+        """
+        self._repositorio = repositorio or SQLiteTransactionRepository(db_path=db_path, pool=pool)
+        if self._repositorio._pool is None:
+            raise ValueError("El repositorio asíncrono necesita un repositorio con pool de conexiones")
+        self._pool = self._repositorio._pool
+
+    async def guardar(self, transaccion: Transaction) -> None:
+        await self._pool.ejecutar(self._repositorio.guardar, transaccion)
+
+    async def obtener_por_id(self, id: UUID) -> Transaction:
+        return await self._pool.ejecutar(self._repositorio.obtener_por_id, id)
+
+    async def listar_por_cuenta(self, cuenta_id: UUID) -> List[Transaction]:
+        return await self._pool.ejecutar(self._repositorio.listar_por_cuenta, cuenta_id)
+
+    async def registrar_con_saldo(self, transaccion: Transaction) -> Tuple[Decimal, int]:
+        return await self._pool.ejecutar(self._repositorio.registrar_con_saldo, transaccion)
+
+    async def registrar_lote_con_saldo(self, transacciones: List[Transaction]) -> List[Tuple[Decimal, int]]:
+        return await self._pool.ejecutar(self._repositorio.registrar_lote_con_saldo, transacciones)
+
+    async def iterar_por_cuenta(self, cuenta_id: UUID, tamano_lote: int = TAMANO_LOTE_LECTURA) -> AsyncIterator[Transaction]:
+        """
+        Recorre las transacciones de una cuenta leyendo un lote por vez en el hilo de E/S.
+
+        Cada lote es una consulta aparte (ver SQLiteTransactionRepository.leer_lote_por_cuenta)
+        que devuelve la conexión al pool antes de entregarse: entre lotes el recorrido no
+        retiene conexiones, así que puede haber más recorridos abiertos que conexiones y el
+        hilo de E/S nunca queda esperando una conexión que solo un recorrido pausado liberaría.
+        Las transacciones escritas durante el recorrido aparecen si van después del último lote leído.
+        """
+        async for transaccion in self._recorrer(self._repositorio.leer_lote_por_cuenta, cuenta_id, tamano_lote):
+            yield transaccion
+
+    async def iterar_proyecciones_por_cuenta(
+        self,
+        cuenta_id: UUID,
+        tamano_lote: int = TAMANO_LOTE_LECTURA
+    ) -> AsyncIterator[ProyeccionTransaccion]:
+        """
+        Recorre las transacciones de una cuenta como proyecciones, sin construir entidades
+        (ver SQLiteTransactionRepository.iterar_proyecciones_por_cuenta), un lote por vez y
+        sin retener conexiones entre lotes, como iterar_por_cuenta.
+        """
+        async for proyeccion in self._recorrer(self._repositorio.leer_lote_proyecciones_por_cuenta, cuenta_id, tamano_lote):
+            yield proyeccion
+
+    async def _recorrer(self, leer_lote: Callable, cuenta_id: UUID, tamano_lote: int) -> AsyncIterator:
+        """Pide lotes al repositorio síncrono en el hilo de E/S, cada uno desde la clave del anterior."""
+        despues = None
+        while True:
+            lote, despues = await self._pool.ejecutar(leer_lote, cuenta_id, tamano_lote, despues)
+            for elemento in lote:
+                yield elemento
+            if despues is None:
+                return
+
+    async def listar_pagina_por_cuenta(
+        self,
+        cuenta_id: UUID,
+        limite: int,
+        despues: Optional[Tuple[datetime, UUID]] = None
+    ) -> List[Transaction]:
+        return await self._pool.ejecutar(self._repositorio.listar_pagina_por_cuenta, cuenta_id, limite, despues)
+
+    async def resumir_aprobadas_por_cuenta(self, cuenta_id: UUID) -> ResumenCuenta:
+        return await self._pool.ejecutar(self._repositorio.resumir_aprobadas_por_cuenta, cuenta_id)
@@ -0,0 +1,209 @@
+# infrastructure/repositories/cached_account_repository.py
+import copy                                     # Las cuentas se entregan como copias
+import threading                                # El caché se comparte entre hilos
+import time                                     # Reloj monotónico para el TTL
+from collections import OrderedDict             # Orden de uso para el desalojo LRU
+from decimal import Decimal                     # Saldos
+from typing import Callable, Dict, List, Optional  # Tipos para anotaciones
+from uuid import UUID                           # Identificadores únicos
+from domain.repositories.i_account_repository import IAccountRepository
+from domain.repositories.resultado_lote import ResultadoLote
+from domain.entities.account import Account
+
+# Cuentas en caché como máximo; al superarlo se desaloja la usada hace más tiempo
+TAMANO_MAXIMO_DEFECTO = 10_000
+
+# Segundos que una cuenta leída se sirve desde el caché
+TTL_DEFECTO = 5.0
+
+# Segundos que se recuerda que un ID no existe (una cuenta recién creada en otro proceso
+# tarda como máximo esto en verse)
+TTL_AUSENTES_DEFECTO = 1.0
+
+class CachedAccountRepository(IAccountRepository):
+    """
+    Caché de lectura (read-through) de cuentas que envuelve a cualquier IAccountRepository.
+
+    obtener_por_id se sirve desde memoria mientras la entrada no venza (TTL); las
+    entradas se desalojan por LRU al superar `tamano_maximo`. También se recuerdan los ID
+    inexistentes (caché negativo, con su propio TTL). guardar y guardar_lote invalidan
+    las cuentas escritas.
+
+    El saldo cambia sobre todo en registrar_con_saldo de los repositorios de
+    transacciones, que no pasan por aquí: estos reciben `actualizar_saldo` como
+    `al_cambiar_saldo` y el caché queda con el saldo y la versión confirmados. Las
+    escrituras de otros procesos solo se ven al vencer el TTL; el saldo se vuelve a
+    verificar de forma atómica al registrar cada transacción.
+    """
+
+    def __init__(
+        self,
+        repositorio: IAccountRepository,
+        tamano_maximo: int = TAMANO_MAXIMO_DEFECTO,
+        ttl: float = TTL_DEFECTO,
+        ttl_ausentes: float = TTL_AUSENTES_DEFECTO,
+        reloj: Callable[[], float] = time.monotonic
+    ):
+        """
+        Args:
+            repositorio: Repositorio de cuentas a envolver (SQLite o MongoDB)
+            tamano_maximo: Número máximo de entradas (cuentas y ausentes)
+            ttl: Segundos de vigencia de una cuenta leída
+            ttl_ausentes: Segundos de vigencia de un ID inexistente
+            reloj: Fuente de tiempo en segundos (inyectable en pruebas)
+        """
+        if tamano_maximo < 1:
+            raise ValueError("El tamaño máximo del caché debe ser mayor a 0")
+        self.repositorio = repositorio
+        self.tamano_maximo = tamano_maximo
+        self.ttl = ttl
+        self.ttl_ausentes = ttl_ausentes
+        self._reloj = reloj
+        # id -> (vence, cuenta o None si no existe, mensaje del ValueError del repositorio)
+        self._entradas: "OrderedDict[UUID, tuple[float, Optional[Account], Optional[str]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        # id -> [lecturas en curso, generación]; solo para las cuentas con lecturas en curso. Cada
+        # escritura de la cuenta aumenta su generación: una lectura que se cruzó con una no se
+        # guarda, y las escrituras de otras cuentas no la afectan
+        self._lecturas: Dict[UUID, List[int]] = {}
+
+        # Métricas del caché
+        self._hits = 0           # Cuenta (o ausencia) servida desde memoria
+        self._misses = 0         # Hubo que leer del repositorio
+        self._desalojos = 0      # Entradas descartadas por LRU
+        self._vencidas = 0       # Entradas descartadas por TTL
+        self._invalidaciones = 0 # Entradas descartadas por escrituras
+
+    def obtener_por_id(self, id: UUID) -> Account:
+        """
+        Obtiene una cuenta por su ID, desde el caché si está vigente.
+
+        Returns:
+            Account: Copia de la cuenta (modificarla no altera el caché)
+
+        Raises:
+            ValueError: Si la cuenta no existe (también cuando la ausencia está en caché)
+        """
+        with self._lock:
+            entrada = self._entradas.get(id)
+            if entrada is not None:
+                vence, cuenta, ausente = entrada
+                if vence > self._reloj():
+                    self._entradas.move_to_end(id)
+                    self._hits += 1
+                    if ausente is not None:
+                        raise ValueError(ausente)
+                    return copy.copy(cuenta) if cuenta is not None else None
+                del self._entradas[id]
+                self._vencidas += 1
+            self._misses += 1
+            lectura = self._lecturas.setdefault(id, [0, 0])
+            lectura[0] += 1
+            generacion = lectura[1]
+
+        # La lectura se hace fuera del lock: una lectura lenta no bloquea los aciertos
+        leida, cuenta, ausente = False, None, None
+        try:
+            cuenta = self.repositorio.obtener_por_id(id)
+            leida = True
+        except ValueError as e:
+            leida, ausente = True, str(e)
+            raise
+        finally:
+            self._terminar_lectura(id, generacion, leida, cuenta, ausente)
+        return cuenta
+
+    def _terminar_lectura(
+        self,
+        id: UUID,
+        generacion: int,
+        leida: bool,
+        cuenta: Optional[Account],
+        ausente: Optional[str]
+    ) -> None:
+        """Guarda el resultado de una lectura si terminó y la cuenta no se escribió mientras tanto."""
+        ttl = self.ttl if cuenta is not None else self.ttl_ausentes
+        with self._lock:
+            lectura = self._lecturas[id]
+            lectura[0] -= 1
+            if not lectura[0]:
+                del self._lecturas[id]
+            if not leida or generacion != lectura[1]:  # Error, o escrituras durante la lectura: puede estar vieja
+                return
+            self._entradas[id] = (self._reloj() + ttl, copy.copy(cuenta), ausente)
+            self._entradas.move_to_end(id)
+            while len(self._entradas) > self.tamano_maximo:
+                self._entradas.popitem(last=False)
+                self._desalojos += 1
+
+    def _escrita(self, id: UUID) -> None:
+        """Descarta las lecturas en curso de la cuenta (llamar con el lock tomado)."""
+        lectura = self._lecturas.get(id)
+        if lectura is not None:
+            lectura[1] += 1
+
+    def invalidar(self, id: UUID) -> None:
+        """Descarta la entrada de la cuenta, si existe."""
+        with self._lock:
+            self._escrita(id)
+            if self._entradas.pop(id, None) is not None:
+                self._invalidaciones += 1
+
+    def limpiar(self) -> None:
+        """Descarta todas las entradas."""
+        with self._lock:
+            for lectura in self._lecturas.values():
+                lectura[1] += 1
+            self._invalidaciones += len(self._entradas)
+            self._entradas.clear()
+
+    def actualizar_saldo(self, id: UUID, saldo: Decimal, version: int) -> None:
+        """
+        Aplica a la entrada en caché un saldo confirmado por un repositorio de transacciones.
+        Si la entrada no está o tiene una versión posterior, no hace nada.
+        """
+        with self._lock:
+            self._escrita(id)
+            entrada = self._entradas.get(id)
+            if entrada is None or entrada[1] is None or entrada[1].version >= version:
+                return
+            entrada[1].saldo, entrada[1].version = saldo, version
+
+    def guardar(self, cuenta: Account) -> None:
+        try:
+            self.repositorio.guardar(cuenta)
+        finally:  # También si falla: un ConflictoConcurrencia indica que la copia en caché es vieja
+            self.invalidar(cuenta.id)
+
+    def guardar_lote(self, cuentas: List[Account]) -> List[ResultadoLote]:
+        try:
+            return self.repositorio.guardar_lote(cuentas)
+        finally:
+            for cuenta in cuentas:
+                self.invalidar(getattr(cuenta, "id", None))
+
+    def listar_todos(self) -> List[Account]:
+        return self.repositorio.listar_todos()
+
+    def obtener_por_usuario(self, usuario_id: UUID) -> List[Account]:
+        return self.repositorio.obtener_por_usuario(usuario_id)
+
+    def estadisticas(self) -> Dict[str, float]:
+        """
+        Retorna las métricas acumuladas del caché.
+
+        Returns:
+            Dict[str, float]: hits, misses, tasa de aciertos, desalojos, vencidas, invalidaciones y entradas
+        """
+        with self._lock:
+            consultas = self._hits + self._misses
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "tasa_aciertos": self._hits / consultas if consultas else 0.0,
+                "desalojos": self._desalojos,
+                "vencidas": self._vencidas,
+                "invalidaciones": self._invalidaciones,
+                "entradas": len(self._entradas),
+                "tamano_maximo": self.tamano_maximo,
+            }
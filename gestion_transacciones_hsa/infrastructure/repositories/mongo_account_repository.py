@@ -1,55 +1,71 @@
 # infrastructure/repositories/mongo_account_repository.py
 from typing import List  # Importa el tipo List para tipar listas
 from uuid import UUID   # Importa UUID para manejar identificadores únicos
-from pymongo import MongoClient  # Cliente para conectar con MongoDB
+from pymongo.errors import DuplicateKeyError  # Upsert sobre una cuenta con otra versión
 from domain.repositories.i_account_repository import IAccountRepository  # Interfaz del repositorio
 from domain.entities.account import Account  # Entidad Account
-from decimal import Decimal  # Para manejar números decimales con precisión
+from domain.repositories.resultado_lote import ResultadoLote  # Resultado por elemento de un lote
+from domain.repositories.conflicto_concurrencia import ConflictoConcurrencia  # Versión desactualizada
+from infrastructure.db.mongo_lotes import guardar_lote_mongo  # Escritura por lotes con bulk_write
+from infrastructure.db import codificacion_mongo  # Formato de documentos v2
+from infrastructure.db.mongo_clientes import URI_DEFECTO, obtener_cliente  # Cliente compartido por URI
 
 class MongoAccountRepository(IAccountRepository):  # Implementación de repositorio con MongoDB
-    def __init__(self):
-        self.client = MongoClient('mongodb://localhost:27017/')  # Conecta a MongoDB local
+    def __init__(self, connection_string: str = URI_DEFECTO):
+        self.client = obtener_cliente(connection_string)  # Cliente compartido del proceso (conexión perezosa)
         self.db = self.client.hsa_db  # Selecciona la base de datos
         self.accounts = self.db.accounts  # Selecciona la colección de cuentas
+        # Mientras queden documentos del formato anterior, las búsquedas aceptan ambos formatos
+        self._legado = None  # Se consulta al primer uso
 
-    def __del__(self):
-        self.client.close()  # Cierra la conexión al destruir el objeto
+    @staticmethod
+    def _a_documento(account: Account) -> dict:
+        return codificacion_mongo.cuenta_a_documento(account)  # UUID binario y centavos enteros
+
+    def _hay_legado(self) -> bool:
+        if self._legado is None:
+            self._legado = codificacion_mongo.legado_pendiente(self.db, self.accounts)
+        return self._legado
+
+    def _eliminar_legado(self, ids: List[UUID]) -> None:
+        if ids and self._hay_legado():  # Borra la copia en formato anterior de lo recién reescrito
+            self.accounts.delete_many({"_id": {"$in": [str(id) for id in ids]}})
 
     def guardar(self, account: Account) -> None:
-        account_dict = {  # Convierte la cuenta a diccionario para MongoDB
-            "_id": str(account.id),  # ID como string
-            "usuario_id": str(account.usuario_id),  # ID de usuario como string
-            "saldo": float(account.saldo),  # Saldo como float
-            "limite_diario": float(account.limite_diario)  # Límite como float
-        }
+        account_dict = self._a_documento(account)
+        account_id = account_dict.pop("_id")
+        account_dict["version"] = account.version + 1
+        # Control optimista: solo se reescribe si sigue en la versión leída (sin campo si nunca cambió).
+        # Si otra operación la cambió, el upsert intenta insertar el mismo _id y falla.
+        version = account.version if account.version else {"$in": [0, None]}
         try:
-            self.accounts.replace_one(  # Actualiza o inserta el documento
-                {"_id": account_dict["_id"]},  # Busca por ID
-                account_dict,  # Nuevo documento
+            self.accounts.update_one(  # Actualiza o inserta el documento
+                {"_id": account_id, "version": version},  # Busca por ID y versión
+                {"$set": account_dict},  # Nuevo contenido
                 upsert=True  # Crea si no existe
             )
+            self._eliminar_legado([account.id])
+        except DuplicateKeyError:
+            raise ConflictoConcurrencia("cuenta", account.id, account.version)
         except Exception as e:
             raise RuntimeError(f"Error al guardar la cuenta: {e}")
+        account.version = account_dict["version"]
+
+    def guardar_lote(self, accounts: List[Account]) -> List[ResultadoLote]:
+        """Guarda varias cuentas con un único bulk_write no ordenado."""
+        resultados = guardar_lote_mongo(self.accounts, accounts, self._a_documento)
+        self._eliminar_legado([r.id for r in resultados if r.exito])
+        return resultados
 
     def obtener_por_id(self, account_id: UUID) -> Account:
         try:
-            account_dict = self.accounts.find_one({"_id": str(account_id)})  # Busca una cuenta por ID
+            account_dict = self.accounts.find_one(  # Busca una cuenta por ID
+                {"_id": codificacion_mongo.filtro_uuid(account_id, self._hay_legado())}
+            )
             if account_dict is None:
                 raise ValueError(f"Cuenta no encontrada: {account_id}")
             
-            # Procesa el documento para convertirlo en objeto Account
-            account_dict["id"] = account_dict["_id"]  # Copia _id a id
-            del account_dict["_id"]  # Elimina _id para evitar duplicados
-            account_dict["id"] = str(account_dict["id"])  # Convierte ID a string
-            account_dict["usuario_id"] = str(account_dict["usuario_id"])  # Convierte usuario_id a string
-            
-            # Convierte valores numéricos a Decimal
-            if not isinstance(account_dict["saldo"], Decimal):
-                account_dict["saldo"] = Decimal(account_dict["saldo"])
-            if not isinstance(account_dict["limite_diario"], Decimal):
-                account_dict["limite_diario"] = Decimal(account_dict["limite_diario"])
-            
-            return Account.from_dict(account_dict)  # Crea objeto Account desde diccionario
+            return codificacion_mongo.cuenta_desde_documento(account_dict)  # Documento v2 o anterior
         except ValueError as ve:
             raise ve
         except Exception as e:
@@ -57,13 +73,15 @@ class MongoAccountRepository(IAccountRepository):  # Implementación de reposito
 
     def listar_todos(self) -> List[Account]:
         try:
-            return [Account.from_dict(account) for account in self.accounts.find()]  # Lista todas las cuentas
+            return [codificacion_mongo.cuenta_desde_documento(account) for account in self.accounts.find()]  # Lista todas las cuentas
         except Exception as e:
             raise RuntimeError(f"Error al listar todas las cuentas: {e}")
     
     def obtener_por_usuario(self, usuario_id: UUID) -> List[Account]:
         try:
-            accounts = self.accounts.find({"usuario_id": str(usuario_id)})  # Busca cuentas por ID de usuario
-            return [Account.from_dict(account) for account in accounts]  # Convierte resultados a objetos Account
+            accounts = self.accounts.find(  # Busca cuentas por ID de usuario
+                {"usuario_id": codificacion_mongo.filtro_uuid(usuario_id, self._hay_legado())}
+            )
+            return [codificacion_mongo.cuenta_desde_documento(account) for account in accounts]  # Convierte resultados a objetos Account
         except Exception as e:
             raise RuntimeError(f"Error al obtener cuentas por usuario: {e}")
\ No newline at end of file
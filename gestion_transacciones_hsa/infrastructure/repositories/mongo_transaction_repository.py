@@ -1,66 +1,217 @@
 # infrastructure/repositories/mongo_transaction_repository.py
-from typing import List                          # Importa el tipo List para tipar listas
+from typing import Callable, Iterator, List, Optional, Tuple  # Importa tipos para listas e iteradores
 from uuid import UUID                           # Importa UUID para identificadores únicos
 from decimal import Decimal                     # Importa Decimal para manejo preciso de números decimales
 from datetime import datetime                   # Importa datetime para manejo de fechas
-from pymongo import MongoClient                 # Cliente para conectar con MongoDB
+from bson.decimal128 import Decimal128          # Sumas de montos del formato anterior
+from pymongo import ASCENDING, DESCENDING, ReturnDocument  # Orden y documento retornado por find_one_and_update
 from pymongo.database import Database           # Tipo Database de MongoDB
 from domain.repositories.i_transaction_repository import ITransactionRepository  # Interfaz base
-from domain.entities.transaction import Transaction  # Entidad de transacción
+from domain.entities.transaction import Transaction, TransactionState  # Entidad de transacción
+from domain.entities.transaction_type import TransactionType  # Tipos del formato anterior (texto)
+from domain.entities.resumen_cuenta import ResumenCuenta  # Totales de transacciones aprobadas
+from infrastructure.db.migraciones import MigradorMongo  # Migraciones versionadas de índices
+from infrastructure.db.mongo_clientes import URI_DEFECTO, obtener_cliente  # Cliente compartido por URI
+from infrastructure.db import codificacion, codificacion_mongo  # Formato de documentos v2
+from infrastructure.db.mongo_lotes import guardar_lote_mongo  # Escritura por lotes con bulk_write
+from infrastructure.db import limites_diarios  # Acumulado por (cuenta_id, dia)
+from domain.repositories.resultado_lote import ResultadoLote
 import logging
 
-# Configurar logging para silenciar mensajes de pymongo
-logging.getLogger('pymongo').setLevel(logging.WARNING)
-logging.getLogger('mongodb').setLevel(logging.WARNING)
 logger = logging.getLogger(__name__)
 
+# Documentos pedidos al servidor por cada lote del cursor en los recorridos perezosos
+TAMANO_LOTE_LECTURA = 500
+
+# Intentos de registrar_con_saldo (el segundo ocurre tras convertir una cuenta del formato anterior)
+MAX_REINTENTOS_REGISTRO = 3
+
+# Campos de la cuenta retornados por registrar_con_saldo
+PROYECCION_SALDO = {"saldo": 1, "version": 1, "limite_diario": 1}
+
+# Orden de las páginas: recorre idx_transacciones_cuenta_fecha hacia atrás
+ORDEN_PAGINA = [("fecha", DESCENDING), ("_id", DESCENDING)]
+
+# Orden de los listados por cuenta: igual que ORDER BY fecha, id en SQLite (idx_transacciones_cuenta_fecha)
+ORDEN_CUENTA = [("fecha", ASCENDING), ("_id", ASCENDING)]
+
 class MongoTransactionRepository(ITransactionRepository):  # Implementación MongoDB del repositorio
     """
     Implementación MongoDB del repositorio de transacciones.
+
+    Escribe documentos v2 (ver infrastructure/db/codificacion_mongo.py). Mientras queden
+    documentos del formato anterior, las búsquedas por id y cuenta aceptan ambos formatos
+    y cada escritura elimina la copia anterior del documento.
     """
     
-    def __init__(self, connection_string: str = "mongodb://localhost:27017/"):  # Constructor con URL de conexión
+    def __init__(
+        self,
+        connection_string: str = URI_DEFECTO,
+        al_cambiar_saldo: Optional[Callable[[UUID, Decimal, int], None]] = None
+    ):  # Constructor con URL de conexión
         """
-        Inicializa el repositorio MongoDB.
+        Inicializa el repositorio MongoDB. No abre conexiones: el cliente es el compartido
+        del proceso para la URI y las migraciones de índices se aplican al primer uso.
         
         Args:
             connection_string: URI de conexión a MongoDB
+            al_cambiar_saldo: Se llama con (cuenta_id, saldo, versión) tras cada registro
+                con saldo (por ejemplo, CachedAccountRepository.actualizar_saldo)
         """
-        self.client = MongoClient(connection_string)    # Crea conexión a MongoDB
+        self.client = obtener_cliente(connection_string)  # Cliente compartido (conexión perezosa)
         self.db: Database = self.client.hsa_db         # Selecciona la base de datos
-        self.collection = self.db.transacciones        # Selecciona la colección
-        self._crear_indices()                          # Crea índices al inicializar
+        self._transacciones = self.db.transacciones    # Colección; se expone con `collection`
+        self._indices_creados = False                  # Migraciones de índices pendientes de verificar
+        self._legado = None                            # ¿Quedan documentos del formato anterior? (se consulta al primer uso)
+        self._al_cambiar_saldo = al_cambiar_saldo      # Aviso de saldo confirmado (caché de cuentas)
+
+    @property
+    def collection(self):
+        """Colección de transacciones; el primer acceso aplica las migraciones de índices."""
+        if not self._indices_creados:
+            self.asegurar_indices()
+        return self._transacciones
+
+    def asegurar_indices(self) -> None:
+        """Aplica las migraciones de índices pendientes (ver infrastructure/db/migraciones.py)."""
+        MigradorMongo().aplicar(self.db)
+        self._indices_creados = True
+
+    @staticmethod
+    def _a_documento(transaccion: Transaction) -> dict:
+        """Convierte una transacción en el documento v2 almacenado en MongoDB."""
+        return codificacion_mongo.transaccion_a_documento(transaccion)
+
+    def _hay_legado(self) -> bool:
+        if self._legado is None:
+            self._legado = codificacion_mongo.legado_pendiente(self.db, self.collection)
+        return self._legado
 
-    def _crear_indices(self) -> None:
-        """Crea los índices necesarios en la colección."""
-        self.collection.create_index("cuenta_id")      # Crea índice para búsquedas rápidas por cuenta_id
+    def _eliminar_legado(self, ids: List[UUID]) -> None:
+        """Elimina las copias en formato anterior de documentos recién reescritos."""
+        if ids and self._hay_legado():
+            self.collection.delete_many({"_id": {"$in": [str(id) for id in ids]}})
 
     def guardar(self, transaccion: Transaction) -> None:
         """
         Guarda una transacción en MongoDB.
         """
         try:
-            transaction_dict = {
-                "_id": str(transaccion.id),
-                "cuenta_id": str(transaccion.cuenta_id),
-                "monto": str(transaccion.monto),
-                "tipo": transaccion.tipo.value if hasattr(transaccion.tipo, 'value') else str(transaccion.tipo),
-                "estado": transaccion.estado.value if hasattr(transaccion.estado, 'value') else str(transaccion.estado),
-                "fecha": transaccion.fecha.isoformat()
-            }
+            transaction_dict = self._a_documento(transaccion)
             
-            logger.debug(f"Guardando transacción en MongoDB: {transaction_dict}")
+            logger.debug("Guardando transacción en MongoDB: %s", transaction_dict)
             self.collection.replace_one(
                 {"_id": transaction_dict["_id"]},
                 transaction_dict,
                 upsert=True
             )
+            self._eliminar_legado([transaccion.id])
             logger.debug("Transacción guardada exitosamente en MongoDB")
             
         except Exception as e:
-            logger.error(f"Error al guardar en MongoDB: {str(e)}", exc_info=True)
+            logger.error("Error al guardar en MongoDB: %s", e, exc_info=True)
             raise
 
+    def registrar_con_saldo(self, transaccion: Transaction) -> Tuple[Decimal, int]:
+        """
+        Actualiza el saldo de la cuenta y guarda la transacción. Las transacciones pendientes
+        y rechazadas se guardan sin cambiar saldo ni versión.
+
+        El saldo se aplica con un find_one_and_update atómico: en los retiros el filtro exige
+        saldo suficiente, así que retiros concurrentes nunca lo dejan en negativo. Luego, si la
+        transacción está aprobada, se suma |monto| al acumulado del día en limites_diarios,
+        también con una operación atómica que verifica el límite. Sin transacciones multi-documento, si un paso falla
+        los anteriores se revierten con la operación inversa.
+
+        Args:
+            transaccion: Transacción a registrar
+
+        Returns:
+            Tuple[Decimal, int]: Saldo y versión de la cuenta tras la transacción
+
+        Raises:
+            ValueError: Si la cuenta no existe, no tiene fondos suficientes o se supera el límite diario
+        """
+        if not isinstance(transaccion.monto, Decimal):
+            raise ValueError("El monto debe ser de tipo Decimal.")
+        centavos = codificacion.a_centavos(transaccion.monto)
+        dia = codificacion.fecha_a_dia(transaccion.fecha)
+        if not self._indices_creados:  # El índice único de limites_diarios debe existir antes de acumular
+            self.asegurar_indices()
+        cuentas = self.db.accounts
+        filtro = self._filtro_saldo(transaccion, centavos)
+        aprobada = codificacion.es_aprobada(transaccion.estado)
+
+        cuenta = None
+        for _ in range(MAX_REINTENTOS_REGISTRO):
+            if aprobada:
+                cuenta = cuentas.find_one_and_update(
+                    filtro,
+                    {"$inc": {"saldo": centavos, "version": 1}},
+                    projection=PROYECCION_SALDO,
+                    return_document=ReturnDocument.AFTER
+                )
+            else:  # Pendiente o rechazada: solo se lee el saldo vigente
+                cuenta = cuentas.find_one(filtro, PROYECCION_SALDO)
+            if cuenta is not None:
+                break
+            # Sin coincidencia: la cuenta no existe, no tiene fondos o sigue en el formato anterior
+            actual = cuentas.find_one({"_id": codificacion_mongo.filtro_uuid(transaccion.cuenta_id, True)})
+            if actual is None:
+                raise ValueError(f"La cuenta con ID {transaccion.cuenta_id} no existe.")
+            if actual.get("v") == codificacion_mongo.VERSION_DOCUMENTO:
+                raise ValueError("Fondos insuficientes para realizar la transacción.")
+            codificacion_mongo.convertir_documento(
+                cuentas, actual, codificacion_mongo.cuenta_desde_documento, codificacion_mongo.cuenta_a_documento
+            )
+        if cuenta is None:
+            raise RuntimeError(f"No se pudo actualizar el saldo de la cuenta {transaccion.cuenta_id}")
+
+        if aprobada:  # Solo las aprobadas mueven el saldo y cuentan para el límite
+            try:
+                limites_diarios.acumular_mongo(self.db.limites_diarios, filtro["_id"], dia, abs(centavos), cuenta["limite_diario"])
+            except Exception:
+                cuentas.update_one({"_id": filtro["_id"]}, {"$inc": {"saldo": -centavos, "version": 1}})
+                raise
+        try:
+            self.guardar(transaccion)
+        except Exception:
+            if aprobada:
+                cuentas.update_one({"_id": filtro["_id"]}, {"$inc": {"saldo": -centavos, "version": 1}})
+                self.db.limites_diarios.update_one(
+                    {"cuenta_id": filtro["_id"], "dia": dia}, {"$inc": {"acumulado": -abs(centavos)}}
+                )
+            raise
+        saldo = codificacion.desde_centavos(cuenta["saldo"])
+        if self._al_cambiar_saldo is not None:
+            self._al_cambiar_saldo(transaccion.cuenta_id, saldo, cuenta["version"])
+        return saldo, cuenta["version"]
+
+    @staticmethod
+    def _filtro_saldo(transaccion: Transaction, centavos: int) -> dict:
+        """Filtro de la cuenta v2 a actualizar; en los retiros aprobados exige saldo suficiente."""
+        filtro = {"_id": codificacion_mongo.uuid_a_binario(transaccion.cuenta_id), "v": codificacion_mongo.VERSION_DOCUMENTO}
+        if (codificacion.es_aprobada(transaccion.estado)
+                and codificacion.codigo_tipo(transaccion.tipo) == codificacion.codigo_tipo(TransactionType.RETIRO)):
+            filtro["saldo"] = {"$gte": -centavos}
+        return filtro
+
+    def guardar_lote(self, transacciones: List[Transaction]) -> List[ResultadoLote]:
+        """
+        Guarda varias transacciones con un único bulk_write no ordenado.
+
+        Un documento inválido o rechazado por MongoDB no detiene al resto del lote.
+
+        Args:
+            transacciones: Transacciones a guardar
+
+        Returns:
+            List[ResultadoLote]: Un resultado por transacción, en el mismo orden
+        """
+        resultados = guardar_lote_mongo(self.collection, transacciones, self._a_documento)
+        self._eliminar_legado([r.id for r in resultados if r.exito])
+        return resultados
+
     def obtener_por_id(self, id: UUID) -> Transaction:
         """
         Obtiene una transacción por su ID.
@@ -74,18 +225,21 @@ class MongoTransactionRepository(ITransactionRepository):  # Implementación Mon
         Raises:
             ValueError: Si no se encuentra la transacción
         """
-        transaction_dict = self.collection.find_one({"_id": str(id)})  # Busca documento por ID
+        transaction_dict = self.collection.find_one(  # Busca documento por ID
+            {"_id": codificacion_mongo.filtro_uuid(id, self._hay_legado())}
+        )
         if not transaction_dict:
             raise ValueError(f"No se encontró la transacción con id {id}")
             
-        return Transaction(                          # Convierte diccionario a Transaction
-            id=UUID(transaction_dict["_id"]),       # Convierte string a UUID
-            cuenta_id=UUID(transaction_dict["cuenta_id"]),  # Convierte string a UUID
-            monto=Decimal(transaction_dict["monto"]),       # Convierte string a Decimal
-            tipo=transaction_dict["tipo"],
-            estado=transaction_dict["estado"],
-            fecha=datetime.fromisoformat(transaction_dict["fecha"])  # Convierte ISO a datetime
-        )
+        return self._desde_documento(transaction_dict)
+
+    @staticmethod
+    def _desde_documento(t: dict) -> Transaction:
+        """Convierte un documento de MongoDB (v2 o formato anterior) en una entidad Transaction."""
+        return codificacion_mongo.transaccion_desde_documento(t)
+
+    def _filtro_cuenta(self, cuenta_id: UUID) -> dict:
+        return {"cuenta_id": codificacion_mongo.filtro_uuid(cuenta_id, self._hay_legado())}
 
     def listar_por_cuenta(self, cuenta_id: UUID) -> List[Transaction]:
         """
@@ -95,20 +249,10 @@ class MongoTransactionRepository(ITransactionRepository):  # Implementación Mon
             cuenta_id: UUID de la cuenta
             
         Returns:
-            List[Transaction]: Lista de transacciones de la cuenta
-        """
-        transactions = self.collection.find({"cuenta_id": str(cuenta_id)})  # Busca todas las transacciones de una cuenta
-        return [                                    # Convierte cada documento a Transaction
-            Transaction(
-                id=UUID(t["_id"]),
-                cuenta_id=UUID(t["cuenta_id"]),
-                monto=Decimal(t["monto"]),
-                tipo=t["tipo"],
-                estado=t["estado"],
-                fecha=datetime.fromisoformat(t["fecha"])
-            )
-            for t in transactions                   # Itera sobre los resultados
-        ]
+            List[Transaction]: Lista de transacciones de la cuenta, ordenadas por (fecha, id)
+        """
+        transactions = self.collection.find(self._filtro_cuenta(cuenta_id), sort=ORDEN_CUENTA)  # Busca todas las transacciones de una cuenta
+        return [self._desde_documento(t) for t in transactions]  # Convierte cada documento a Transaction
 
     def listar_todos(self) -> List[Transaction]:
         """
@@ -117,19 +261,124 @@ class MongoTransactionRepository(ITransactionRepository):  # Implementación Mon
         Returns:
             List[Transaction]: Lista de todas las transacciones
         """
-        transactions = self.collection.find()
+        return [self._desde_documento(t) for t in self.collection.find()]
+
+    def iterar_por_cuenta(self, cuenta_id: UUID, tamano_lote: int = TAMANO_LOTE_LECTURA) -> Iterator[Transaction]:
+        """
+        Recorre las transacciones de una cuenta sin materializarlas en una lista.
+        
+        Args:
+            cuenta_id: UUID de la cuenta
+            tamano_lote: Documentos pedidos al servidor por cada lote del cursor
+            
+        Yields:
+            Transaction: Transacciones de la cuenta, ordenadas por (fecha, id)
+        """
+        cursor = self.collection.find(self._filtro_cuenta(cuenta_id), sort=ORDEN_CUENTA, batch_size=tamano_lote)
+        return (self._desde_documento(t) for t in cursor)
+
+    def listar_pagina_por_cuenta(
+        self,
+        cuenta_id: UUID,
+        limite: int,
+        despues: Optional[Tuple[datetime, UUID]] = None
+    ) -> List[Transaction]:
+        """
+        Retorna una página de transacciones de la cuenta, de la más reciente a la más antigua.
+        
+        Paginación por clave sobre idx_transacciones_cuenta_fecha: el filtro (fecha, _id)
+        anterior a la clave y el sort descendente se resuelven recorriendo el índice hacia atrás.
+        El orden es exacto sobre documentos v2 (fecha entera, _id binario); los documentos del
+        formato anterior deben convertirse antes (python -m infrastructure.db.migracion_v2 --mongo).
+        
+        Args:
+            cuenta_id: UUID de la cuenta
+            limite: Máximo de transacciones a retornar
+            despues: Clave (fecha, id) de la última transacción de la página anterior
+            
+        Returns:
+            List[Transaction]: Transacciones ordenadas por (fecha, _id) descendente
+        """
+        cursor = self.collection.find(
+            self._filtro_pagina(self._filtro_cuenta(cuenta_id), despues),
+            sort=ORDEN_PAGINA,
+            limit=limite
+        )
+        return [self._desde_documento(t) for t in cursor]
+
+    @staticmethod
+    def _filtro_pagina(filtro: dict, despues: Optional[Tuple[datetime, UUID]]) -> dict:
+        """Agrega al filtro de la cuenta la condición de clave (fecha, _id) anterior a `despues`."""
+        if despues is not None:
+            fecha = codificacion.fecha_a_epoch(despues[0])
+            ultimo_id = codificacion_mongo.uuid_a_binario(despues[1])
+            filtro["$or"] = [
+                {"fecha": {"$lt": fecha}},
+                {"fecha": fecha, "_id": {"$lt": ultimo_id}},
+            ]
+        return filtro
+
+    def resumir_aprobadas_por_cuenta(self, cuenta_id: UUID) -> ResumenCuenta:
+        """
+        Cuenta y suma las transacciones APROBADAS de la cuenta con un pipeline $match + $group.
+        
+        El $match usa idx_transacciones_cuenta_estado y solo viajan al cliente los totales
+        por tipo. Mientras queden documentos del formato anterior, su estado y su monto
+        (texto) también se reconocen.
+        
+        Args:
+            cuenta_id: UUID de la cuenta
+            
+        Returns:
+            ResumenCuenta: Cantidades y montos de depósitos y retiros aprobados
+        """
+        aprobada = codificacion.CODIGOS_ESTADO[TransactionState.APROBADA]
+        filtro = self._filtro_cuenta(cuenta_id)
+        if self._hay_legado():
+            filtro["estado"] = {"$in": [aprobada, TransactionState.APROBADA.value]}
+            monto = {"$cond": [
+                {"$eq": ["$v", codificacion_mongo.VERSION_DOCUMENTO]},
+                "$monto",
+                {"$multiply": [{"$toDecimal": "$monto"}, 100]}
+            ]}
+        else:
+            filtro["estado"] = aprobada
+            monto = "$monto"
+        return self._resumen_desde_grupos(self.collection.aggregate(self._pipeline_resumen(filtro, monto)))
+
+    @staticmethod
+    def _pipeline_resumen(filtro: dict, monto) -> list:
         return [
-            Transaction(
-                id=UUID(t["_id"]),
-                cuenta_id=UUID(t["cuenta_id"]),
-                monto=Decimal(t["monto"]),
-                tipo=t["tipo"],
-                estado=t["estado"],
-                fecha=datetime.fromisoformat(t["fecha"])
-            )
-            for t in transactions
+            {"$match": filtro},
+            {"$group": {"_id": "$tipo", "cantidad": {"$sum": 1}, "centavos": {"$sum": monto}}},
         ]
 
+    @staticmethod
+    def _resumen_desde_grupos(grupos) -> ResumenCuenta:
+        """Convierte los grupos por tipo del pipeline de resumen en un ResumenCuenta."""
+        resumen = ResumenCuenta()
+        for grupo in grupos:
+            tipo = grupo["_id"]
+            tipo = codificacion.TIPOS_POR_CODIGO[tipo] if isinstance(tipo, int) else TransactionType.from_string(tipo)
+            centavos = grupo["centavos"]
+            if isinstance(centavos, Decimal128):  # Suma que incluyó montos del formato anterior
+                centavos = centavos.to_decimal()
+            resumen.agregar(tipo, grupo["cantidad"], (Decimal(centavos) / 100).quantize(Decimal("0.01")))
+        return resumen
+
+    def iterar_todos(self, tamano_lote: int = TAMANO_LOTE_LECTURA) -> Iterator[Transaction]:
+        """
+        Recorre todas las transacciones sin materializarlas en una lista.
+        
+        Args:
+            tamano_lote: Documentos pedidos al servidor por cada lote del cursor
+            
+        Yields:
+            Transaction: Todas las transacciones
+        """
+        cursor = self.collection.find({}, batch_size=tamano_lote)
+        return (self._desde_documento(t) for t in cursor)
+
     def save(self, transaction: Transaction) -> None:
         """
         Implementación del método abstracto save.
@@ -150,7 +399,3 @@ class MongoTransactionRepository(ITransactionRepository):  # Implementación Mon
         Delega al método listar_por_cuenta.
         """
         return self.listar_por_cuenta(account_id)
-
-    def __del__(self):                             # Destructor
-        """Cierra la conexión al eliminar la instancia."""
-        self.client.close()                        # Cierra la conexión a MongoDB
\ No newline at end of file
@@ -0,0 +1,73 @@
+# infrastructure/repositories/sharded_sqlite_account_repository.py
+from typing import Dict, List  # Importa tipos para anotaciones
+from uuid import UUID  # Importa UUID para identificadores únicos
+
+# Importa interfaces y entidades del dominio
+from domain.repositories.i_account_repository import IAccountRepository
+from domain.repositories.resultado_lote import ResultadoLote
+from domain.entities.account import Account
+from infrastructure.db.shards_sqlite import indice_shard, rutas_shards  # Enrutamiento por cuenta_id
+from infrastructure.repositories.sqlite_account_repository import SQLiteAccountRepository
+
+class ShardedSQLiteAccountRepository(IAccountRepository):
+    """
+    Repositorio de cuentas repartido en varios archivos SQLite (ver infrastructure/db/shards_sqlite.py).
+
+    Cada cuenta se lee y escribe en el SQLiteAccountRepository de su shard; las consultas
+    que no son por ID (listar_todos, obtener_por_usuario) recorren todos los shards.
+    """
+
+    def __init__(self, db_path: str = "database.db", shards: int = 4):
+        """
+        Args:
+            db_path: Ruta base de los archivos de los shards (ver rutas_shards)
+            shards: Cantidad de shards
+        """
+        self.db_path = db_path
+        self.shards = [SQLiteAccountRepository(db_path=ruta) for ruta in rutas_shards(db_path, shards)]
+
+    def _shard(self, cuenta_id: UUID) -> SQLiteAccountRepository:
+        return self.shards[indice_shard(cuenta_id, len(self.shards))]
+
+    def guardar(self, cuenta: Account) -> None:
+        """
+        Guarda una cuenta en su shard.
+
+        Raises:
+            ConflictoConcurrencia: Si la cuenta almacenada cambió desde que se leyó
+        """
+        self._shard(cuenta.id).guardar(cuenta)
+
+    def guardar_lote(self, cuentas: List[Account]) -> List[ResultadoLote]:
+        """
+        Guarda varias cuentas con un guardar_lote por shard (una transacción por shard).
+
+        Returns:
+            List[ResultadoLote]: Un resultado por cuenta, en el mismo orden
+        """
+        posiciones: Dict[int, List[int]] = {}
+        for i, cuenta in enumerate(cuentas):
+            posiciones.setdefault(indice_shard(cuenta.id, len(self.shards)), []).append(i)
+        resultados: List[ResultadoLote] = [None] * len(cuentas)
+        for indice, grupo in posiciones.items():
+            for i, resultado in zip(grupo, self.shards[indice].guardar_lote([cuentas[i] for i in grupo])):
+                resultados[i] = resultado
+        return resultados
+
+    def obtener_por_id(self, id: UUID) -> Account:
+        """
+        Obtiene una cuenta por su ID desde su shard.
+
+        Raises:
+            ValueError: Si no se encuentra la cuenta
+        """
+        return self._shard(id).obtener_por_id(id)
+
+    def listar_todos(self) -> List[Account]:
+        """Lista las cuentas de todos los shards, shard por shard."""
+        return [cuenta for shard in self.shards for cuenta in shard.listar_todos()]
+
+    def obtener_por_usuario(self, usuario_id: UUID) -> List[Account]:
+        """Obtiene las cuentas de un usuario de todos los shards, ordenadas por id como en SQLite."""
+        cuentas = [cuenta for shard in self.shards for cuenta in shard.obtener_por_usuario(usuario_id)]
+        return sorted(cuentas, key=lambda cuenta: cuenta.id.bytes)
@@ -0,0 +1,157 @@
+# infrastructure/repositories/sharded_sqlite_transaction_repository.py
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple, TypeVar  # Tipos para anotaciones
+from uuid import UUID  # Importa UUID para identificadores únicos
+from datetime import datetime  # Fechas de la clave de paginación
+from decimal import Decimal  # Saldos
+from itertools import chain  # Recorridos encadenados de los shards
+
+# Importa interfaces y entidades del dominio
+from domain.repositories.i_transaction_repository import ITransactionRepository
+from domain.repositories.resultado_lote import ResultadoLote
+from domain.repositories.proyeccion_transaccion import ProyeccionTransaccion
+from domain.entities.transaction import Transaction
+from domain.entities.resumen_cuenta import ResumenCuenta
+from infrastructure.db.shards_sqlite import indice_shard, rutas_shards  # Enrutamiento por cuenta_id
+from infrastructure.repositories.sqlite_transaction_repository import SQLiteTransactionRepository, TAMANO_LOTE_LECTURA
+
+R = TypeVar("R")  # Resultado por transacción de una operación por lotes
+
+class ShardedSQLiteTransactionRepository(ITransactionRepository):
+    """
+    Repositorio de transacciones repartido en varios archivos SQLite por cuenta_id (ver
+    infrastructure/db/shards_sqlite.py).
+
+    Una cuenta y sus transacciones están en el mismo shard, así que las operaciones por
+    cuenta (registrar_con_saldo, listados, páginas y resúmenes) son las de
+    SQLiteTransactionRepository sobre un solo archivo, con sus mismas garantías. Cada shard
+    tiene su propio pool y su propio bloqueo de escritura: las escrituras de cuentas en
+    shards distintos no se esperan entre sí.
+
+    Las consultas sin cuenta recorren todos los shards: obtener_por_id los prueba de a uno
+    (búsqueda por clave primaria en cada uno) y listar_todos/iterar_todos los encadenan.
+    """
+
+    def __init__(
+        self,
+        db_path: str = "database.db",
+        shards: int = 4,
+        al_cambiar_saldo: Optional[Callable[[UUID, Decimal, int], None]] = None
+    ):
+        """
+        Args:
+            db_path: Ruta base de los archivos de los shards (ver rutas_shards)
+            shards: Cantidad de shards
+            al_cambiar_saldo: Se pasa al repositorio de cada shard (ver SQLiteTransactionRepository)
+        """
+        self.db_path = db_path
+        self.shards = [
+            SQLiteTransactionRepository(db_path=ruta, al_cambiar_saldo=al_cambiar_saldo)
+            for ruta in rutas_shards(db_path, shards)
+        ]
+
+    def _shard(self, cuenta_id: UUID) -> SQLiteTransactionRepository:
+        return self.shards[indice_shard(cuenta_id, len(self.shards))]
+
+    def _por_shard(
+        self,
+        transacciones: Sequence[Transaction],
+        operacion: Callable[[SQLiteTransactionRepository, List[Transaction]], List[R]]
+    ) -> List[R]:
+        """Aplica `operacion` a las transacciones de cada shard y reúne los resultados en el orden original."""
+        posiciones: Dict[int, List[int]] = {}
+        for i, transaccion in enumerate(transacciones):
+            posiciones.setdefault(indice_shard(transaccion.cuenta_id, len(self.shards)), []).append(i)
+        resultados: List[R] = [None] * len(transacciones)
+        for indice, grupo in posiciones.items():
+            for i, resultado in zip(grupo, operacion(self.shards[indice], [transacciones[i] for i in grupo])):
+                resultados[i] = resultado
+        return resultados
+
+    def save(self, transaction: Transaction) -> None:
+        self._shard(transaction.cuenta_id).save(transaction)
+
+    def guardar_lote(self, transacciones: List[Transaction]) -> List[ResultadoLote]:
+        """
+        Guarda varias transacciones con un guardar_lote por shard (un commit por shard).
+
+        Returns:
+            List[ResultadoLote]: Un resultado por transacción, en el mismo orden
+        """
+        return self._por_shard(transacciones, SQLiteTransactionRepository.guardar_lote)
+
+    def registrar_con_saldo(self, transaccion: Transaction) -> Tuple[Decimal, int]:
+        """
+        Registra la transacción y actualiza el saldo en el shard de la cuenta
+        (ver SQLiteTransactionRepository.registrar_con_saldo).
+
+        Raises:
+            ValueError: Si la cuenta no existe, no tiene fondos suficientes o se supera el límite diario
+        """
+        return self._shard(transaccion.cuenta_id).registrar_con_saldo(transaccion)
+
+    def registrar_lote_con_saldo(self, transacciones: List[Transaction]) -> List[Tuple[Decimal, int]]:
+        """
+        Registra varias transacciones con saldo. Las de un mismo shard se aplican todas o
+        ninguna, en orden; entre shards no hay transacción común, así que si falla un shard
+        los anteriores ya quedaron confirmados.
+
+        Returns:
+            List[Tuple[Decimal, int]]: Saldo y versión de la cuenta tras cada transacción, en el mismo orden
+        """
+        return self._por_shard(transacciones, SQLiteTransactionRepository.registrar_lote_con_saldo)
+
+    def get_by_id(self, id: UUID) -> Transaction:
+        """
+        Busca la transacción en cada shard (por clave primaria).
+
+        Raises:
+            ValueError: Si no se encuentra en ningún shard
+        """
+        for shard in self.shards:
+            try:
+                return shard.get_by_id(id)
+            except ValueError:
+                continue
+        raise ValueError(f"No se encontró la transacción con id {id}")
+
+    def get_by_account(self, account_id: UUID) -> List[Transaction]:
+        return self._shard(account_id).get_by_account(account_id)
+
+    def iterar_por_cuenta(self, cuenta_id: UUID, tamano_lote: int = TAMANO_LOTE_LECTURA) -> Iterator[Transaction]:
+        return self._shard(cuenta_id).iterar_por_cuenta(cuenta_id, tamano_lote)
+
+    def iterar_proyecciones_por_cuenta(
+        self,
+        cuenta_id: UUID,
+        tamano_lote: int = TAMANO_LOTE_LECTURA
+    ) -> Iterator[ProyeccionTransaccion]:
+        return self._shard(cuenta_id).iterar_proyecciones_por_cuenta(cuenta_id, tamano_lote)
+
+    def listar_pagina_por_cuenta(
+        self,
+        cuenta_id: UUID,
+        limite: int,
+        despues: Optional[Tuple[datetime, UUID]] = None
+    ) -> List[Transaction]:
+        return self._shard(cuenta_id).listar_pagina_por_cuenta(cuenta_id, limite, despues)
+
+    def resumir_aprobadas_por_cuenta(self, cuenta_id: UUID) -> ResumenCuenta:
+        return self._shard(cuenta_id).resumir_aprobadas_por_cuenta(cuenta_id)
+
+    def iterar_todos(self, tamano_lote: int = TAMANO_LOTE_LECTURA) -> Iterator[Transaction]:
+        """Recorre las transacciones de todos los shards, uno tras otro, sin materializarlas."""
+        return chain.from_iterable(shard.iterar_todos(tamano_lote) for shard in self.shards)
+
+    def listar_todos(self) -> List[Transaction]:
+        """Lista las transacciones de todos los shards, shard por shard."""
+        return list(self.iterar_todos())
+
+    # Los métodos en español son alias de los métodos en inglés, como en SQLiteTransactionRepository
+    def guardar(self, transaccion: Transaction) -> None:
+        return self.save(transaccion)
+
+    def obtener_por_id(self, id: UUID) -> Transaction:
+        return self.get_by_id(id)
+
+    def listar_por_cuenta(self, cuenta_id: UUID) -> List[Transaction]:
+        return self.get_by_account(cuenta_id)
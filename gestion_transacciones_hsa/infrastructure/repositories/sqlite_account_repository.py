@@ -1,18 +1,31 @@
 from typing import List, Optional  # Importa tipos para anotaciones tipadas
 from uuid import UUID  # Importa clase UUID para identificadores únicos
-from decimal import Decimal  # Importa Decimal para manejo preciso de números decimales
 from contextlib import contextmanager  # Importa decorador para manejar contextos
 import sqlite3  # Importa el módulo para trabajar con SQLite
 
 # Importa interfaces y entidades del dominio
 from domain.repositories.i_account_repository import IAccountRepository
+from domain.repositories.resultado_lote import ResultadoLote
+from domain.repositories.conflicto_concurrencia import ConflictoConcurrencia
 from domain.entities.account import Account
+from infrastructure.db import codificacion  # Formato compacto v2 (centavos, UUID binario)
+from infrastructure.db.sqlite_pool import SQLitePool, obtener_pool
+from infrastructure.db.migraciones import MigradorSQLite
+from infrastructure.db.migracion_v2 import MigradorDatosV2
 
 class SQLiteAccountRepository(IAccountRepository):  # Define clase que implementa la interfaz IAccountRepository
     
-    def __init__(self, db_path: str = "database.db", connection: Optional[sqlite3.Connection] = None):
+    def __init__(
+        self,
+        db_path: str = "database.db",
+        connection: Optional[sqlite3.Connection] = None,
+        pool: Optional[SQLitePool] = None
+    ):
         self.db_path = db_path  # Almacena la ruta de la base de datos
         self._test_connection = connection  # Guarda conexión de prueba si se proporciona
+        # Pool compartido por todos los repositorios de la misma base de datos
+        self._pool = pool or (obtener_pool(db_path) if connection is None else None)
+        self._migrador_v2 = MigradorDatosV2()  # Copia bajo demanda del formato anterior
         self._create_tables()  # Inicializa las tablas
 
     @contextmanager  # Decorador para manejar el contexto de conexión
@@ -21,46 +34,110 @@ class SQLiteAccountRepository(IAccountRepository):  # Define clase que implement
             yield self._test_connection  # Usa la conexión de prueba
             return
             
-        conn = sqlite3.connect(self.db_path)  # Crea nueva conexión a la BD
-        try:
-            yield conn  # Proporciona la conexión
-            conn.commit()  # Confirma cambios si todo está bien
-        except Exception:
-            conn.rollback()  # Revierte cambios si hay error
-            raise
-        finally:
-            conn.close()  # Cierra la conexión en cualquier caso
+        with self._pool.conexion() as conn:  # Toma prestada una conexión del pool (commit/rollback incluidos)
+            yield conn
 
     def _create_tables(self) -> None:
-        """Crea la tabla de cuentas si no existe."""
+        """Aplica las migraciones de esquema pendientes (tablas e índices)."""
         with self._get_connection() as conn:
-            conn.execute("""
-                CREATE TABLE IF NOT EXISTS cuentas (
-                    id TEXT PRIMARY KEY,
-                    usuario_id TEXT NOT NULL,
-                    saldo DECIMAL(15,2) NOT NULL,
-                    limite_diario DECIMAL(15,2) NOT NULL
-                )
-            """)
+            MigradorSQLite().aplicar(conn)
+
+    # Control optimista: la fila solo se reescribe si sigue en la versión que se leyó, así
+    # un guardado con datos viejos no pisa los saldos que registrar_con_saldo aplicó después
+    _SQL_GUARDAR = """
+        INSERT INTO cuentas_v2
+        (id, usuario_id, saldo, limite_diario, version)
+        VALUES (?, ?, ?, ?, ?)
+        ON CONFLICT(id) DO UPDATE SET
+            usuario_id = excluded.usuario_id,
+            saldo = excluded.saldo,
+            limite_diario = excluded.limite_diario,
+            version = excluded.version
+        WHERE cuentas_v2.version = excluded.version - 1
+        RETURNING version
+    """
+
+    # Carga por lotes: sobrescribe sin comparar versiones, pero las incrementa
+    _SQL_GUARDAR_LOTE = """
+        INSERT INTO cuentas_v2
+        (id, usuario_id, saldo, limite_diario, version)
+        VALUES (?, ?, ?, ?, ?)
+        ON CONFLICT(id) DO UPDATE SET
+            usuario_id = excluded.usuario_id,
+            saldo = excluded.saldo,
+            limite_diario = excluded.limite_diario,
+            version = cuentas_v2.version + 1
+    """
+
+    @staticmethod
+    def _a_fila(cuenta: Account) -> tuple:
+        """Convierte una cuenta en la tupla de parámetros de _SQL_GUARDAR (con la versión siguiente)."""
+        return (
+            codificacion.uuid_a_bytes(cuenta.id),
+            codificacion.uuid_a_bytes(cuenta.usuario_id),
+            codificacion.a_centavos(cuenta.saldo),  # Centavos enteros
+            codificacion.a_centavos(cuenta.limite_diario),  # Centavos enteros
+            cuenta.version + 1
+        )
+
+    @staticmethod
+    def _desde_fila(row: tuple) -> Account:
+        """Convierte una fila de cuentas_v2 en una entidad Account (siempre con 2 decimales)."""
+        return Account.desde_almacenamiento(
+            id=codificacion.bytes_a_uuid(row[0]),
+            usuario_id=codificacion.bytes_a_uuid(row[1]),
+            saldo=codificacion.desde_centavos(row[2]),
+            limite_diario=codificacion.desde_centavos(row[3]),
+            version=row[4]
+        )
 
     def guardar(self, cuenta: Account) -> None:
         """
         Guarda una cuenta en la base de datos.
         
         Args:
-            cuenta: Objeto Account a guardar
+            cuenta: Objeto Account a guardar; al guardarse se actualiza su versión
+            
+        Raises:
+            ConflictoConcurrencia: Si la cuenta almacenada cambió desde que se leyó
         """
         with self._get_connection() as conn:
-            conn.execute("""
-                INSERT OR REPLACE INTO cuentas 
-                (id, usuario_id, saldo, limite_diario)
-                VALUES (?, ?, ?, ?)
-            """, (
-                str(cuenta.id),
-                str(cuenta.usuario_id),
-                f"{cuenta.saldo:.2f}",  # Formatear con 2 decimales
-                f"{cuenta.limite_diario:.2f}"  # Formatear con 2 decimales
-            ))
+            row = conn.execute(self._SQL_GUARDAR, self._a_fila(cuenta)).fetchone()
+        if row is None:
+            raise ConflictoConcurrencia("cuenta", cuenta.id, cuenta.version)
+        cuenta.version = row[0]
+
+    def guardar_lote(self, cuentas: List[Account]) -> List[ResultadoLote]:
+        """
+        Guarda varias cuentas con un único executemany y un único commit.
+        Pensado para cargas masivas: no compara versiones.
+
+        Args:
+            cuentas: Cuentas a guardar
+            
+        Returns:
+            List[ResultadoLote]: Un resultado por cuenta, en el mismo orden
+        """
+        resultados: List[Optional[ResultadoLote]] = [None] * len(cuentas)
+        filas, posiciones = [], []
+        for i, cuenta in enumerate(cuentas):
+            try:
+                filas.append(self._a_fila(cuenta))
+                posiciones.append(i)
+            except Exception as e:
+                resultados[i] = ResultadoLote(getattr(cuenta, "id", None), False, str(e))
+
+        error = None
+        if filas:
+            try:
+                with self._get_connection() as conn:
+                    conn.executemany(self._SQL_GUARDAR_LOTE, filas)  # Todo el lote en una sola transacción
+            except Exception as e:
+                error = str(e)
+
+        for i in posiciones:
+            resultados[i] = ResultadoLote(cuentas[i].id, error is None, error)
+        return resultados
 
     def obtener_por_id(self, id: UUID) -> Account:
         """
@@ -75,41 +152,29 @@ class SQLiteAccountRepository(IAccountRepository):  # Define clase que implement
         Raises:
             ValueError: Si no se encuentra la cuenta
         """
+        clave = codificacion.uuid_a_bytes(id)
         with self._get_connection() as conn:
-            cursor = conn.execute(
-                "SELECT * FROM cuentas WHERE id = ?",
-                (str(id),)
-            )
-            row = cursor.fetchone()
+            row = conn.execute("SELECT * FROM cuentas_v2 WHERE id = ?", (clave,)).fetchone()
+            if not row and not self._migrador_v2.completada:
+                self._migrador_v2.asegurar_cuenta(conn, id)  # Puede seguir en el formato anterior
+                row = conn.execute("SELECT * FROM cuentas_v2 WHERE id = ?", (clave,)).fetchone()
             
             if not row:
                 raise ValueError(f"No se encontró la cuenta con id {id}")
             
-            return Account(
-                id=UUID(row[0]),
-                usuario_id=UUID(row[1]),
-                saldo=Decimal(f"{Decimal(str(row[2])):.2f}"),  # Forzar 2 decimales
-                limite_diario=Decimal(f"{Decimal(str(row[3])):.2f}")  # Forzar 2 decimales
-            )
+            return self._desde_fila(row)
 
     def listar_todos(self) -> List[Account]:
         """
-        Lista todas las cuentas en la base de datos.
+        Lista todas las cuentas en la base de datos (las del formato anterior, a medida
+        que las copia el migrador; ver migracion_v2).
         
         Returns:
             List[Account]: Lista de todas las cuentas
         """
         with self._get_connection() as conn:
-            cursor = conn.execute("SELECT * FROM cuentas")
-            return [
-                Account(
-                    id=UUID(row[0]),
-                    usuario_id=UUID(row[1]),
-                    saldo=Decimal(f"{Decimal(str(row[2])):.2f}"),  # Forzar 2 decimales
-                    limite_diario=Decimal(f"{Decimal(str(row[3])):.2f}")  # Forzar 2 decimales
-                )
-                for row in cursor.fetchall()
-            ]
+            cursor = conn.execute("SELECT * FROM cuentas_v2")
+            return [self._desde_fila(row) for row in cursor.fetchall()]
 
     def obtener_por_usuario(self, usuario_id: UUID) -> List[Account]:
         """
@@ -122,16 +187,9 @@ class SQLiteAccountRepository(IAccountRepository):  # Define clase que implement
             List[Account]: Lista de cuentas del usuario
         """
         with self._get_connection() as conn:
+            self._migrador_v2.asegurar_usuario(conn, usuario_id)
             cursor = conn.execute(
-                "SELECT * FROM cuentas WHERE usuario_id = ?",
-                (str(usuario_id),)
+                "SELECT * FROM cuentas_v2 WHERE usuario_id = ? ORDER BY id",  # Usa idx_cuentas_v2_usuario
+                (codificacion.uuid_a_bytes(usuario_id),)
             )
-            return [
-                Account(
-                    id=UUID(row[0]),
-                    usuario_id=UUID(row[1]),
-                    saldo=Decimal(f"{Decimal(str(row[2])):.2f}"),  # Forzar 2 decimales
-                    limite_diario=Decimal(f"{Decimal(str(row[3])):.2f}")  # Forzar 2 decimales
-                )
-                for row in cursor.fetchall()
-            ]
\ No newline at end of file
+            return [self._desde_fila(row) for row in cursor.fetchall()]
\ No newline at end of file
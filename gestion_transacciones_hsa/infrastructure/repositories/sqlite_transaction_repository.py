@@ -1,34 +1,79 @@
 # infrastructure/repositories/sqlite_transaction_repository.py
-from typing import List, Optional  # Importa tipos para anotaciones de tipo
+from typing import Callable, Dict, Iterator, List, Optional, Tuple  # Importa tipos para anotaciones de tipo
 from uuid import UUID  # Importa UUID para identificadores únicos
-from decimal import Decimal  # Importa Decimal para manejo preciso de números decimales
 from datetime import datetime  # Importa datetime para manejo de fechas y tiempo
+from decimal import Decimal  # Importa Decimal para montos y saldos
 from contextlib import contextmanager  # Importa decorador para manejar contextos
 import sqlite3  # Importa el módulo para trabajar con SQLite
 import logging  # Importa el módulo para logging
+import threading  # Protege las métricas de bloqueo, compartidas entre hilos
+import time  # Importa time para la espera entre reintentos y la medición del bloqueo
 
 # Importa interfaces y entidades del dominio
 from domain.repositories.i_transaction_repository import ITransactionRepository
-from domain.entities.transaction import Transaction, TransactionType, TransactionState
+from domain.repositories.resultado_lote import ResultadoLote
+from domain.repositories.proyeccion_transaccion import ProyeccionTransaccion
+from domain.entities.transaction import Transaction
+from domain.entities.transaction_type import TransactionType
+from domain.entities.resumen_cuenta import ResumenCuenta
+from infrastructure.db import codificacion  # Formato compacto v2 (centavos, UUID binario, epoch)
+from infrastructure.db.sqlite_pool import SQLitePool, obtener_pool
+from infrastructure.db.migraciones import MigradorSQLite
+from infrastructure.db.migracion_v2 import MigradorDatosV2
+from infrastructure.db import limites_diarios  # Acumulado por (cuenta_id, dia)
 
 # Configuración del logger
 logger = logging.getLogger(__name__)
-logger.setLevel(logging.DEBUG)
+
+# Filas leídas por cada fetchmany en los recorridos perezosos
+TAMANO_LOTE_LECTURA = 500
+
+# Reintentos de registrar_con_saldo si la base sigue bloqueada después de busy_timeout
+MAX_REINTENTOS_REGISTRO = 3
+
+# Un BEGIN IMMEDIATE sin competencia tarda microsegundos; por encima de esto, esperó el bloqueo
+UMBRAL_ESPERA_BLOQUEO_S = 0.001
 
 class SQLiteTransactionRepository(ITransactionRepository):
     """
     Implementación SQLite del repositorio de transacciones.
+
+    Lee y escribe en transacciones_v2. Mientras queden datos del formato anterior sin
+    migrar, las lecturas por cuenta o por ID los copian bajo demanda; los recorridos
+    completos solo ven lo ya copiado por el migrador (ver infrastructure/db/migracion_v2.py).
     """
     
-    def __init__(self, db_path: str = "database.db", connection: Optional[sqlite3.Connection] = None):
+    def __init__(
+        self,
+        db_path: str = "database.db",
+        connection: Optional[sqlite3.Connection] = None,
+        pool: Optional[SQLitePool] = None,
+        al_cambiar_saldo: Optional[Callable[[UUID, Decimal, int], None]] = None
+    ):
         """
         Inicializa el repositorio SQLite.
         
         Args:
             db_path: Ruta al archivo de base de datos SQLite
+            connection: Conexión fija (usada en pruebas); desactiva el pool
+            pool: Pool de conexiones a usar; por defecto el pool compartido de `db_path`
+            al_cambiar_saldo: Se llama con (cuenta_id, saldo, versión) tras confirmar cada
+                registro con saldo (por ejemplo, CachedAccountRepository.actualizar_saldo)
         """
         self.db_path = db_path  # Almacena la ruta de la base de datos
         self._test_connection = connection  # Almacena conexión de prueba si se proporciona
+        # Pool compartido por todos los repositorios de la misma base de datos
+        self._pool = pool or (obtener_pool(db_path) if connection is None else None)
+        self._al_cambiar_saldo = al_cambiar_saldo
+        self._migrador_v2 = MigradorDatosV2()  # Copia bajo demanda del formato anterior
+
+        # Métricas del bloqueo de escritura (BEGIN IMMEDIATE de registrar_con_saldo): la espera
+        # ocurre dentro de busy_timeout, así que no aparece como reintento ni como espera del pool
+        self._lock_metricas = threading.Lock()
+        self._bloqueos = 0             # BEGIN IMMEDIATE ejecutados
+        self._esperas_bloqueo = 0      # Los que tardaron más de UMBRAL_ESPERA_BLOQUEO_S
+        self._tiempo_bloqueo = 0.0
+        self._max_bloqueo = 0.0
         self._create_tables()  # Crea las tablas necesarias
 
     @contextmanager
@@ -40,53 +85,266 @@ class SQLiteTransactionRepository(ITransactionRepository):
             yield self._test_connection  # Usa la conexión de prueba
             return
             
-        conn = sqlite3.connect(self.db_path)  # Crea una nueva conexión a la base de datos
-        try:
-            yield conn  # Proporciona la conexión
-            conn.commit()  # Confirma los cambios si todo está bien
-        except Exception:
-            conn.rollback()  # Revierte cambios si hay error
-            raise
-        finally:
-            conn.close()  # Cierra la conexión en cualquier caso
+        with self._pool.conexion() as conn:  # Toma prestada una conexión del pool (commit/rollback incluidos)
+            yield conn
 
     def _create_tables(self):
+        """Aplica las migraciones de esquema pendientes (tablas e índices)."""
         with self._get_connection() as conn:  # Obtiene una conexión usando el context manager
-            conn.execute("""
-                CREATE TABLE IF NOT EXISTS transacciones (
-                    id TEXT PRIMARY KEY,
-                    cuenta_id TEXT NOT NULL,
-                    monto DECIMAL(15,2) NOT NULL,
-                    tipo TEXT NOT NULL,
-                    estado TEXT NOT NULL,
-                    fecha TIMESTAMP NOT NULL
-                )
-            """)
+            MigradorSQLite().aplicar(conn)
+
+    # UPSERT (y no INSERT OR REPLACE): un cambio de estado debe disparar el trigger de
+    # UPDATE que mantiene resumen_cuentas; REPLACE borra la fila sin disparar triggers
+    _SQL_GUARDAR = """
+        INSERT INTO transacciones_v2
+        (id, cuenta_id, monto, tipo, estado, fecha)
+        VALUES (?, ?, ?, ?, ?, ?)
+        ON CONFLICT(id) DO UPDATE SET
+            cuenta_id = excluded.cuenta_id,
+            monto = excluded.monto,
+            tipo = excluded.tipo,
+            estado = excluded.estado,
+            fecha = excluded.fecha
+    """
+
+    @staticmethod
+    def _a_fila(transaction: Transaction) -> tuple:
+        """Convierte una transacción en la tupla de parámetros de _SQL_GUARDAR."""
+        return (
+            codificacion.uuid_a_bytes(transaction.id),
+            codificacion.uuid_a_bytes(transaction.cuenta_id),
+            codificacion.a_centavos(transaction.monto),
+            codificacion.codigo_tipo(transaction.tipo),
+            codificacion.codigo_estado(transaction.estado),
+            codificacion.fecha_a_epoch(transaction.fecha)
+        )
 
     def save(self, transaction: Transaction) -> None:
         """
         Guarda una transacción en la base de datos.
         """
         try:
-            logger.debug(f"Estado de transacción al guardar: {transaction.estado}")
+            logger.debug("Estado de transacción al guardar: %s", transaction.estado)
             with self._get_connection() as conn:
-                conn.execute("""
-                    INSERT OR REPLACE INTO transacciones 
-                    (id, cuenta_id, monto, tipo, estado, fecha)
-                    VALUES (?, ?, ?, ?, ?, ?)
-                """, (
-                    str(transaction.id),
-                    str(transaction.cuenta_id),
-                    f"{transaction.monto:.2f}",
-                    transaction.tipo.value if hasattr(transaction.tipo, 'value') else str(transaction.tipo),
-                    transaction.estado.value if hasattr(transaction.estado, 'value') else str(transaction.estado),
-                    transaction.fecha.isoformat()
-                ))
+                conn.execute(self._SQL_GUARDAR, self._a_fila(transaction))
                 logger.debug("Transacción guardada exitosamente en BD")
         except Exception as e:
-            logger.error(f"Error crítico al guardar en BD: {str(e)}", exc_info=True)
+            logger.error("Error crítico al guardar en BD: %s", e, exc_info=True)
+            raise
+
+    # Aplica el monto solo si la cuenta tiene fondos (cuando se verifican); sin fila devuelta,
+    # la cuenta no existe o no alcanza el saldo
+    _SQL_APLICAR_SALDO = """
+        UPDATE cuentas_v2 SET saldo = saldo + ?, version = version + 1
+        WHERE id = ? AND (? = 0 OR saldo + ? >= 0)
+        RETURNING saldo, version, limite_diario
+    """
+
+    # Las transacciones pendientes o rechazadas se guardan sin mover el saldo ni la versión
+    _SQL_SALDO_ACTUAL = "SELECT saldo, version, limite_diario FROM cuentas_v2 WHERE id = ?"
+
+    @contextmanager
+    def _transaccion_inmediata(self, conn: sqlite3.Connection):
+        """
+        Abre una transacción con BEGIN IMMEDIATE: el bloqueo de escritura se toma al inicio,
+        así que la verificación de fondos y la escritura ven el mismo saldo. El tiempo hasta
+        obtenerlo queda en estadisticas_bloqueo.
+        """
+        if conn.in_transaction:  # Conexión fija con escrituras pendientes (pruebas): basta un savepoint
+            conn.execute("SAVEPOINT registrar_con_saldo")
+            try:
+                yield conn
+                conn.execute("RELEASE registrar_con_saldo")
+            except Exception:
+                conn.execute("ROLLBACK TO registrar_con_saldo")
+                conn.execute("RELEASE registrar_con_saldo")
+                raise
+            return
+
+        inicio = time.perf_counter()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+        finally:  # También si vence busy_timeout: ese tiempo se esperó igual
+            self._medir_bloqueo(time.perf_counter() - inicio)
+        try:
+            yield conn
+            conn.commit()
+        except Exception:
+            conn.rollback()
             raise
 
+    def _medir_bloqueo(self, segundos: float) -> None:
+        with self._lock_metricas:
+            self._bloqueos += 1
+            self._tiempo_bloqueo += segundos
+            self._max_bloqueo = max(self._max_bloqueo, segundos)
+            if segundos > UMBRAL_ESPERA_BLOQUEO_S:
+                self._esperas_bloqueo += 1
+
+    def estadisticas_bloqueo(self) -> Dict[str, float]:
+        """
+        Retorna las métricas acumuladas de la toma del bloqueo de escritura.
+
+        Returns:
+            Dict[str, float]: bloqueos tomados, esperas (más de UMBRAL_ESPERA_BLOQUEO_S),
+                tiempo de espera total y máximo en segundos
+        """
+        with self._lock_metricas:
+            return {
+                "bloqueos": self._bloqueos,
+                "esperas": self._esperas_bloqueo,
+                "tiempo_espera_s": self._tiempo_bloqueo,
+                "max_espera_s": self._max_bloqueo,
+            }
+
+    def registrar_con_saldo(self, transaccion: Transaction) -> Tuple[Decimal, int]:
+        """
+        Guarda la transacción y, si está aprobada, actualiza el saldo de la cuenta en una
+        única transacción. Las pendientes y rechazadas se guardan sin cambiar saldo ni versión.
+
+        La verificación de fondos va en el WHERE del UPDATE, que se ejecuta con el bloqueo de
+        escritura tomado, por lo que retiros concurrentes desde otras conexiones no pueden
+        dejar el saldo en negativo. Si la transacción está aprobada, en la misma transacción se
+        suma |monto| al acumulado del día (infrastructure/db/limites_diarios.py) y se verifica
+        el límite diario. Si la
+        base sigue ocupada tras busy_timeout, se reintenta hasta MAX_REINTENTOS_REGISTRO veces.
+
+        Args:
+            transaccion: Transacción a registrar
+
+        Returns:
+            Tuple[Decimal, int]: Saldo y versión de la cuenta tras la transacción
+
+        Raises:
+            ValueError: Si la cuenta no existe, no tiene fondos suficientes o se supera el límite diario
+        """
+        return self.registrar_lote_con_saldo([transaccion])[0]
+
+    def registrar_lote_con_saldo(self, transacciones: List[Transaction]) -> List[Tuple[Decimal, int]]:
+        """
+        Registra varias transacciones como registrar_con_saldo, todas en una sola transacción
+        de SQLite: se aplican en orden y, si una falla, no se aplica ninguna.
+
+        Args:
+            transacciones: Transacciones a registrar
+
+        Returns:
+            List[Tuple[Decimal, int]]: Saldo y versión de la cuenta tras cada transacción, en el mismo orden
+
+        Raises:
+            ValueError: Si alguna cuenta no existe, no tiene fondos suficientes o se supera el límite diario
+        """
+        for transaccion in transacciones:
+            if not isinstance(transaccion.monto, Decimal):
+                raise ValueError("El monto debe ser de tipo Decimal.")
+        for cuenta_id in {t.cuenta_id for t in transacciones}:
+            self._asegurar_cuenta(cuenta_id)
+
+        for intento in range(MAX_REINTENTOS_REGISTRO + 1):
+            try:
+                with self._get_connection() as conn, self._transaccion_inmediata(conn):
+                    resultados = [self._registrar_en(conn, t) for t in transacciones]
+                break
+            except sqlite3.OperationalError as e:
+                if ("locked" not in str(e) and "busy" not in str(e)) or intento == MAX_REINTENTOS_REGISTRO:
+                    logger.error("Error al registrar transacción con saldo: %s", e, exc_info=True)
+                    raise
+                logger.warning("Base ocupada al registrar transacción, reintento %s", intento + 1)
+                time.sleep(min(0.01 * 2 ** intento, 0.2))
+
+        if self._al_cambiar_saldo is not None:
+            for transaccion, (saldo, version) in zip(transacciones, resultados):
+                self._al_cambiar_saldo(transaccion.cuenta_id, saldo, version)
+        return resultados
+
+    def _registrar_en(self, conn: sqlite3.Connection, transaccion: Transaction) -> Tuple[Decimal, int]:
+        """Aplica saldo, acumulado diario y fila de una transacción dentro de la transacción abierta."""
+        dia = codificacion.fecha_a_dia(transaccion.fecha)
+        fila = self._a_fila(transaccion)
+        centavos = fila[2]
+        verificar_fondos = 1 if fila[3] == codificacion.codigo_tipo(TransactionType.RETIRO) else 0
+
+        aprobada = codificacion.es_aprobada(transaccion.estado)
+        if aprobada:
+            cuenta = conn.execute(self._SQL_APLICAR_SALDO, (centavos, fila[1], verificar_fondos, centavos)).fetchone()
+        else:
+            cuenta = conn.execute(self._SQL_SALDO_ACTUAL, (fila[1],)).fetchone()
+        if cuenta is None:
+            existe = conn.execute("SELECT 1 FROM cuentas_v2 WHERE id = ?", (fila[1],)).fetchone()
+            if not existe:
+                raise ValueError(f"La cuenta con ID {transaccion.cuenta_id} no existe.")
+            raise ValueError("Fondos insuficientes para realizar la transacción.")
+        if aprobada:  # Solo las aprobadas cuentan para el límite
+            limites_diarios.acumular(conn, fila[1], dia, abs(centavos), cuenta[2])
+        conn.execute(self._SQL_GUARDAR, fila)
+        return codificacion.desde_centavos(cuenta[0]), cuenta[1]
+
+    def guardar_lote(self, transacciones: List[Transaction]) -> List[ResultadoLote]:
+        """
+        Guarda varias transacciones con un único executemany y un único commit.
+
+        Las transacciones que no se pueden convertir a fila se reportan como fallidas
+        sin afectar al resto. Si la escritura falla, se revierte el lote completo.
+
+        Args:
+            transacciones: Transacciones a guardar
+
+        Returns:
+            List[ResultadoLote]: Un resultado por transacción, en el mismo orden
+        """
+        resultados: List[Optional[ResultadoLote]] = [None] * len(transacciones)
+        filas, posiciones = [], []
+        for i, transaccion in enumerate(transacciones):
+            try:
+                filas.append(self._a_fila(transaccion))
+                posiciones.append(i)
+            except Exception as e:
+                resultados[i] = ResultadoLote(getattr(transaccion, "id", None), False, str(e))
+
+        error = None
+        if filas:
+            try:
+                with self._get_connection() as conn:
+                    conn.executemany(self._SQL_GUARDAR, filas)
+            except Exception as e:
+                logger.error("Error al guardar lote de %s transacciones: %s", len(filas), e, exc_info=True)
+                error = str(e)
+
+        for i in posiciones:
+            resultados[i] = ResultadoLote(transacciones[i].id, error is None, error)
+        return resultados
+
+    @staticmethod
+    def _desde_fila(row: tuple) -> Transaction:
+        """Convierte una fila de transacciones_v2 en una entidad Transaction (sin parsear texto)."""
+        return Transaction.desde_almacenamiento(
+            id=codificacion.bytes_a_uuid(row[0]),
+            cuenta_id=codificacion.bytes_a_uuid_compartido(row[1]),
+            monto=codificacion.desde_centavos(row[2]),
+            tipo=codificacion.TIPOS_POR_CODIGO[row[3]],
+            estado=codificacion.ESTADOS_POR_CODIGO[row[4]],
+            fecha=codificacion.epoch_a_fecha(row[5])
+        )
+
+    def _iterar_consulta(self, sql: str, parametros: tuple, tamano_lote: int) -> Iterator[Transaction]:
+        """
+        Ejecuta una consulta y entrega las transacciones de a una, leyendo con fetchmany.
+
+        La conexión queda prestada mientras el generador está abierto; se devuelve al
+        pool al agotarlo o cerrarlo.
+        """
+        with self._get_connection() as conn:
+            cursor = conn.execute(sql, parametros)
+            try:
+                while True:
+                    filas = cursor.fetchmany(tamano_lote)
+                    if not filas:
+                        break
+                    for row in filas:
+                        yield self._desde_fila(row)
+            finally:
+                cursor.close()
+
     def get_by_id(self, id: UUID) -> Transaction:
         """
         Obtiene una transacción por su ID.
@@ -100,48 +358,256 @@ class SQLiteTransactionRepository(ITransactionRepository):
         Raises:
             ValueError: Si no se encuentra la transacción
         """
+        clave = codificacion.uuid_a_bytes(id)
         with self._get_connection() as conn:
-            cursor = conn.execute(
-                "SELECT * FROM transacciones WHERE id = ?",
-                (str(id),)
-            )
-            row = cursor.fetchone()
+            row = conn.execute("SELECT * FROM transacciones_v2 WHERE id = ?", (clave,)).fetchone()
+            if not row and not self._migrador_v2.completada:
+                self._migrador_v2.asegurar_transaccion(conn, id)  # Puede seguir en el formato anterior
+                row = conn.execute("SELECT * FROM transacciones_v2 WHERE id = ?", (clave,)).fetchone()
             
             if not row:
                 raise ValueError(f"No se encontró la transacción con id {id}")
             
-            return Transaction(
-                id=UUID(row[0]),
-                cuenta_id=UUID(row[1]),
-                monto=Decimal(str(row[2])),
-                tipo=TransactionType(row[3]),
-                estado=TransactionState(row[4]),
-                fecha=datetime.fromisoformat(row[5])
-            )
+            return self._desde_fila(row)
+
+    def _asegurar_cuenta(self, cuenta_id: UUID) -> None:
+        """Copia las transacciones de la cuenta que sigan en el formato anterior."""
+        if self._migrador_v2.completada:
+            return
+        with self._get_connection() as conn:
+            self._migrador_v2.asegurar_cuenta(conn, cuenta_id)
 
     def get_by_account(self, account_id: UUID) -> List[Transaction]:
         try:
-            with self._get_connection() as conn:
-                cursor = conn.execute(
-                    "SELECT * FROM transacciones WHERE cuenta_id = ?",
-                    (str(account_id),)
-                )
-                rows = cursor.fetchall()
-                return [
-                    Transaction(
-                        id=UUID(row[0]),
-                        cuenta_id=UUID(row[1]),
-                        monto=Decimal(str(row[2])),
-                        tipo=TransactionType(row[3]),
-                        estado=TransactionState.from_string(row[4]),  # Usar el método seguro
-                        fecha=datetime.fromisoformat(row[5])
-                    )
-                    for row in rows
-                ]
+            return list(self.iterar_por_cuenta(account_id))
         except Exception as e:
-            logger.error(f"Error al recuperar transacciones: {str(e)}", exc_info=True)
+            logger.error("Error al recuperar transacciones: %s", e, exc_info=True)
             raise
 
+    def iterar_por_cuenta(self, cuenta_id: UUID, tamano_lote: int = TAMANO_LOTE_LECTURA) -> Iterator[Transaction]:
+        """
+        Recorre las transacciones de una cuenta sin materializarlas en una lista.
+        
+        Args:
+            cuenta_id: UUID de la cuenta
+            tamano_lote: Filas leídas por cada fetchmany
+            
+        Yields:
+            Transaction: Transacciones ordenadas por (fecha, id)
+        """
+        self._asegurar_cuenta(cuenta_id)
+        # Recorre idx_transacciones_v2_cuenta_fecha: filas ya ordenadas, sin escaneo completo
+        return self._iterar_consulta(
+            "SELECT * FROM transacciones_v2 WHERE cuenta_id = ? ORDER BY fecha, id",
+            (codificacion.uuid_a_bytes(cuenta_id),),
+            tamano_lote
+        )
+
+    def iterar_proyecciones_por_cuenta(
+        self,
+        cuenta_id: UUID,
+        tamano_lote: int = TAMANO_LOTE_LECTURA
+    ) -> Iterator[ProyeccionTransaccion]:
+        """
+        Recorre las transacciones de una cuenta como proyecciones, en el orden de
+        iterar_por_cuenta, sin construir entidades: cada fila se convierte directamente
+        en la tupla de texto y números que muestra la API.
+        
+        Args:
+            cuenta_id: UUID de la cuenta
+            tamano_lote: Filas leídas por cada fetchmany
+        """
+        self._asegurar_cuenta(cuenta_id)
+        return self._iterar_proyecciones(cuenta_id, tamano_lote)
+
+    def _iterar_proyecciones(self, cuenta_id: UUID, tamano_lote: int) -> Iterator[ProyeccionTransaccion]:
+        texto_cuenta = str(cuenta_id)  # Igual en todas las filas
+        with self._get_connection() as conn:
+            cursor = conn.execute(
+                f"SELECT {self._COLUMNAS_PROYECCION} FROM transacciones_v2 WHERE cuenta_id = ? ORDER BY fecha, id",
+                (codificacion.uuid_a_bytes(cuenta_id),)
+            )
+            try:
+                while True:
+                    filas = cursor.fetchmany(tamano_lote)
+                    if not filas:
+                        break
+                    yield from self._a_proyecciones(texto_cuenta, filas)
+            finally:
+                cursor.close()
+
+    # Columnas de las proyecciones: id primero y fecha al final, como en SELECT * (ver _leer_lote)
+    _COLUMNAS_PROYECCION = "id, monto, tipo, estado, fecha"
+
+    @staticmethod
+    def _a_proyecciones(texto_cuenta: str, filas: List[tuple]) -> List[ProyeccionTransaccion]:
+        a_texto = codificacion.bytes_a_texto_uuid
+        a_dia = codificacion.epoch_a_dia_iso
+        tipos = codificacion.NOMBRES_TIPO_POR_CODIGO
+        estados = codificacion.NOMBRES_ESTADO_POR_CODIGO
+        # centavos / 100 es el mismo float que float(Decimal) de desde_centavos
+        return [
+            (a_texto(id), texto_cuenta, centavos / 100, tipos[tipo], estados[estado], a_dia(fecha))
+            for id, centavos, tipo, estado, fecha in filas
+        ]
+
+    def leer_lote_por_cuenta(
+        self,
+        cuenta_id: UUID,
+        tamano_lote: int = TAMANO_LOTE_LECTURA,
+        despues: Optional[Tuple[int, bytes]] = None
+    ) -> Tuple[List[Transaction], Optional[Tuple[int, bytes]]]:
+        """
+        Lee un lote de transacciones de la cuenta en el orden de iterar_por_cuenta y
+        devuelve la conexión al pool antes de retornar.
+        
+        Los recorridos que esperan entre lotes (como los asíncronos) usan este método en
+        lugar de iterar_por_cuenta para no retener una conexión mientras esperan: cada lote
+        retoma el anterior por clave, con (fecha, id) > (?, ?) sobre idx_transacciones_v2_cuenta_fecha.
+        
+        Args:
+            cuenta_id: UUID de la cuenta
+            tamano_lote: Máximo de transacciones del lote
+            despues: Clave retornada por el lote anterior (None para el primero)
+            
+        Returns:
+            Tuple[List[Transaction], Optional[Tuple[int, bytes]]]: Transacciones ordenadas por
+                (fecha, id) y la clave del lote siguiente, o None si este fue el último
+        """
+        filas, siguiente = self._leer_lote("*", cuenta_id, tamano_lote, despues)
+        return [self._desde_fila(row) for row in filas], siguiente
+
+    def leer_lote_proyecciones_por_cuenta(
+        self,
+        cuenta_id: UUID,
+        tamano_lote: int = TAMANO_LOTE_LECTURA,
+        despues: Optional[Tuple[int, bytes]] = None
+    ) -> Tuple[List[ProyeccionTransaccion], Optional[Tuple[int, bytes]]]:
+        """
+        Como leer_lote_por_cuenta, pero con las proyecciones de iterar_proyecciones_por_cuenta.
+        """
+        filas, siguiente = self._leer_lote(self._COLUMNAS_PROYECCION, cuenta_id, tamano_lote, despues)
+        return self._a_proyecciones(str(cuenta_id), filas), siguiente
+
+    def _leer_lote(
+        self,
+        columnas: str,
+        cuenta_id: UUID,
+        tamano_lote: int,
+        despues: Optional[Tuple[int, bytes]]
+    ) -> Tuple[List[tuple], Optional[Tuple[int, bytes]]]:
+        """Filas de un lote ordenado por (fecha, id) y la clave (fecha, id) de su última fila."""
+        clave = codificacion.uuid_a_bytes(cuenta_id)
+        if despues is None:
+            self._asegurar_cuenta(cuenta_id)
+            sql = f"SELECT {columnas} FROM transacciones_v2 WHERE cuenta_id = ? ORDER BY fecha, id LIMIT ?"
+            parametros = (clave, tamano_lote)
+        else:
+            sql = f"""
+                SELECT {columnas} FROM transacciones_v2 WHERE cuenta_id = ? AND (fecha, id) > (?, ?)
+                ORDER BY fecha, id LIMIT ?
+            """
+            parametros = (clave, despues[0], despues[1], tamano_lote)
+        with self._get_connection() as conn:
+            filas = conn.execute(sql, parametros).fetchall()
+        # Un lote incompleto es el último: no hace falta otra consulta para saberlo
+        siguiente = (filas[-1][-1], filas[-1][0]) if len(filas) == tamano_lote else None
+        return filas, siguiente
+
+    def listar_pagina_por_cuenta(
+        self,
+        cuenta_id: UUID,
+        limite: int,
+        despues: Optional[Tuple[datetime, UUID]] = None
+    ) -> List[Transaction]:
+        """
+        Retorna una página de transacciones de la cuenta, de la más reciente a la más antigua.
+        
+        La paginación es por clave (keyset): la condición (fecha, id) < (?, ?) es un rango
+        sobre idx_transacciones_v2_cuenta_fecha recorrido hacia atrás y cortado con LIMIT, por
+        lo que el costo no depende de la profundidad de la página ni del tamaño del historial.
+        
+        Args:
+            cuenta_id: UUID de la cuenta
+            limite: Máximo de transacciones a retornar
+            despues: Clave (fecha, id) de la última transacción de la página anterior
+            
+        Returns:
+            List[Transaction]: Transacciones ordenadas por (fecha, id) descendente
+        """
+        self._asegurar_cuenta(cuenta_id)
+        clave = codificacion.uuid_a_bytes(cuenta_id)
+        if despues is None:
+            sql = """
+                SELECT * FROM transacciones_v2 WHERE cuenta_id = ?
+                ORDER BY fecha DESC, id DESC LIMIT ?
+            """
+            parametros = (clave, limite)
+        else:
+            sql = """
+                SELECT * FROM transacciones_v2 WHERE cuenta_id = ? AND (fecha, id) < (?, ?)
+                ORDER BY fecha DESC, id DESC LIMIT ?
+            """
+            parametros = (
+                clave,
+                codificacion.fecha_a_epoch(despues[0]),
+                codificacion.uuid_a_bytes(despues[1]),
+                limite
+            )
+        with self._get_connection() as conn:
+            return [self._desde_fila(row) for row in conn.execute(sql, parametros)]
+
+    def resumir_aprobadas_por_cuenta(self, cuenta_id: UUID) -> ResumenCuenta:
+        """
+        Retorna el resumen de la cuenta con una búsqueda por clave primaria en resumen_cuentas.
+        
+        Los triggers de transacciones_v2 mantienen el resumen en la misma transacción de cada
+        escritura, por lo que el costo no depende del tamaño del historial. Si se desalinea,
+        se reconstruye con python -m infrastructure.db.reconstruir_resumen.
+        
+        Args:
+            cuenta_id: UUID de la cuenta
+            
+        Returns:
+            ResumenCuenta: Cantidades y montos aprobados por tipo, total y rango de fechas
+        """
+        self._asegurar_cuenta(cuenta_id)
+        with self._get_connection() as conn:
+            row = conn.execute(
+                """
+                SELECT num_transacciones, num_depositos, monto_depositos, num_retiros, monto_retiros,
+                       primera_fecha, ultima_fecha
+                FROM resumen_cuentas WHERE cuenta_id = ?
+                """,
+                (codificacion.uuid_a_bytes(cuenta_id),)
+            ).fetchone()
+        if not row:
+            return ResumenCuenta(num_transacciones=0)
+        return ResumenCuenta(
+            num_depositos=row[1],
+            monto_depositos=codificacion.desde_centavos(row[2]),
+            num_retiros=row[3],
+            monto_retiros=codificacion.desde_centavos(row[4]),
+            num_transacciones=row[0],
+            primera_fecha=codificacion.epoch_a_fecha(row[5]) if row[5] is not None else None,
+            ultima_fecha=codificacion.epoch_a_fecha(row[6]) if row[6] is not None else None
+        )
+
+    def iterar_todos(self, tamano_lote: int = TAMANO_LOTE_LECTURA) -> Iterator[Transaction]:
+        """
+        Recorre todas las transacciones sin materializarlas en una lista.
+
+        No copia los datos del formato anterior: eso lo hace por lotes cortos el migrador
+        (python -m infrastructure.db.migracion_v2), no una lectura.
+        
+        Args:
+            tamano_lote: Filas leídas por cada fetchmany
+            
+        Yields:
+            Transaction: Todas las transacciones
+        """
+        return self._iterar_consulta("SELECT * FROM transacciones_v2", (), tamano_lote)
+
     def listar_todos(self) -> List[Transaction]:
         """
         Lista todas las transacciones.
@@ -149,19 +615,7 @@ class SQLiteTransactionRepository(ITransactionRepository):
         Returns:
             List[Transaction]: Lista de todas las transacciones
         """
-        with self._get_connection() as conn:
-            cursor = conn.execute("SELECT * FROM transacciones")
-            return [
-                Transaction(
-                    id=UUID(row[0]),
-                    cuenta_id=UUID(row[1]),
-                    monto=Decimal(str(row[2])),
-                    tipo=TransactionType(row[3]),
-                    estado=TransactionState(row[4]),
-                    fecha=datetime.fromisoformat(row[5])
-                )
-                for row in cursor.fetchall()
-            ]
+        return list(self.iterar_todos())
 
     # Los métodos en español ahora son alias de los métodos en inglés
     def guardar(self, transaccion: Transaction) -> None:
@@ -171,4 +625,4 @@ class SQLiteTransactionRepository(ITransactionRepository):
         return self.get_by_id(id)
 
     def listar_por_cuenta(self, cuenta_id: UUID) -> List[Transaction]:
-        return self.get_by_account(cuenta_id)
\ No newline at end of file
+        return self.get_by_account(cuenta_id)
@@ -1,14 +1,13 @@
 import unittest
-from unittest.mock import Mock
+from unittest.mock import AsyncMock
 from decimal import Decimal
 from app.controllers.account_controller import crear_cuenta
 
-class TestAccountController(unittest.TestCase):
+class TestAccountController(unittest.IsolatedAsyncioTestCase):
     def setUp(self):
-        self.sqlite_repository = Mock()
-        self.mongo_repository = Mock()
+        self.sqlite_repository = AsyncMock()
 
-    def test_crear_cuenta(self):
+    async def test_crear_cuenta(self):
         # Arrange
         cuenta_data = {
             "saldo": 1000.00,
@@ -16,10 +15,9 @@ class TestAccountController(unittest.TestCase):
         }
 
         # Act
-        result = crear_cuenta(
+        result = await crear_cuenta(
             cuenta_json=cuenta_data,
-            sqlite_repository=self.sqlite_repository,
-            mongo_repository=self.mongo_repository
+            sqlite_repository=self.sqlite_repository
         )
 
         # Assert
@@ -27,8 +25,7 @@ class TestAccountController(unittest.TestCase):
         self.assertIn("cuenta_id", result)
         self.assertIn("usuario_id", result)
         self.assertIn("message", result)
-        self.sqlite_repository.guardar.assert_called_once()
-        self.mongo_repository.guardar.assert_called_once()
+        self.sqlite_repository.guardar.assert_awaited_once()
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,84 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import Mock
+from uuid import uuid4
+from app.arranque import InformeArranque, analizar_importtime, costo_por_paquete, costo_total
+from app.contenedor import Contenedor
+from application.services.async_transaction_application_service import AsyncTransactionApplicationService
+from infrastructure.metricas import Metricas
+from app.controllers.account_controller import get_account_repository
+from infrastructure.db.sqlite_pool import cerrar_pools
+
+class TestContenedor(unittest.TestCase):
+    def setUp(self):
+        self.directorio = tempfile.TemporaryDirectory()
+        self.contenedor = Contenedor(db_path=os.path.join(self.directorio.name, "app.db"))
+
+    def tearDown(self):
+        self.contenedor.detener()
+        cerrar_pools()
+        self.directorio.cleanup()
+
+    def test_crear_el_contenedor_no_construye_dependencias(self):
+        self.assertFalse(self.contenedor.construida("account_repository"))
+        self.assertFalse(os.path.exists(self.contenedor.db_path))
+
+    def test_dependencias_se_construyen_una_vez(self):
+        servicio = self.contenedor.transaction_app_service
+
+        self.assertIs(self.contenedor.transaction_app_service, servicio)
+        self.assertIs(servicio.account_repository, self.contenedor.account_repository)
+        self.assertFalse(self.contenedor.construida("mongo_transaction_repository"))
+
+    def test_cache_de_cuentas(self):
+        cache = self.contenedor.account_repository
+
+        self.assertEqual(self.contenedor.transaction_repository._al_cambiar_saldo, cache.actualizar_saldo)
+        self.assertIs(self.contenedor.async_account_repository._repositorio, cache)
+        self.assertFalse(hasattr(Contenedor(self.contenedor.db_path, cache_cuentas=False).account_repository, "estadisticas"))
+
+    def test_metricas_instrumentan_servicios_y_repositorios(self):
+        metricas = Metricas()
+        contenedor = Contenedor(self.contenedor.db_path, metricas=metricas)
+        with self.assertRaises(ValueError):
+            contenedor.account_repository.obtener_por_id(uuid4())
+
+        self.assertIn(("repositorio", "CachedAccountRepository.obtener_por_id"), metricas._operaciones)
+        self.assertIsInstance(contenedor.async_transaction_app_service._objeto, AsyncTransactionApplicationService)
+        self.assertIsInstance(self.contenedor.async_transaction_app_service, AsyncTransactionApplicationService)
+        contenedor.detener()
+
+    def test_getter_lee_el_contenedor_del_estado_de_la_app(self):
+        request = Mock()
+        request.app.state.contenedor = self.contenedor
+
+        self.assertIs(get_account_repository(request), self.contenedor.async_account_repository)
+
+class TestInformeArranque(unittest.TestCase):
+    def test_fases_en_orden(self):
+        informe = InformeArranque()
+        informe.registrar("importar", 0.25)
+        with informe.fase("sqlite"):
+            pass
+
+        self.assertEqual([nombre for nombre, _ in informe.fases], ["importar", "sqlite"])
+        self.assertGreaterEqual(informe.total(), 0.25)
+        self.assertIn("total", informe.formatear())
+
+    def test_analizar_importtime(self):
+        salida = (
+            "import time: self [us] | cumulative | imported package\n"
+            "import time:       120 |        120 |     pymongo.errors\n"
+            "import time:      3000 |       3120 |   pymongo\n"
+            "import time:       500 |       3620 | app.main\n"
+        )
+
+        importaciones = analizar_importtime(salida)
+
+        self.assertEqual(importaciones[1], ("pymongo", 3000, 3120, 1))
+        self.assertEqual(costo_por_paquete(importaciones), {"pymongo": 3120, "app": 500})
+        self.assertEqual(costo_total(importaciones, "app.main"), 3620)
+
+if __name__ == '__main__':
+    unittest.main()
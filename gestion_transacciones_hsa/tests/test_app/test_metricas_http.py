@@ -0,0 +1,72 @@
+# tests/test_app/test_metricas_http.py
+import unittest
+from fastapi import FastAPI
+from app.metricas_http import MiddlewareMetricas, TIPO_PROMETHEUS, router
+from infrastructure.metricas import Metricas
+
+def _aplicacion(metricas):
+    app = FastAPI()
+    app.state.metricas = metricas
+    app.add_middleware(MiddlewareMetricas)
+    app.include_router(router)
+
+    @app.get("/cuentas/{cuenta_id}")
+    async def leer(cuenta_id: str):
+        metricas and metricas.observar_operacion("repositorio", "Repo.leer", 0.001)
+        return {"id": cuenta_id}
+
+    return app
+
+async def _llamar(app, ruta: str):
+    """Ejecuta una petición GET contra la aplicación ASGI y retorna los mensajes enviados."""
+    scope = {
+        "type": "http", "method": "GET", "path": ruta, "raw_path": ruta.encode(), "query_string": b"",
+        "headers": [(b"host", b"prueba")], "scheme": "http", "server": ("prueba", 80), "client": ("cliente", 1),
+        "http_version": "1.1", "root_path": "", "asgi": {"version": "3.0"}
+    }
+    pendientes = [{"type": "http.request", "body": b"", "more_body": False}]
+    enviados = []
+
+    async def recibir():
+        return pendientes.pop(0)
+
+    async def enviar(mensaje):
+        enviados.append(mensaje)
+
+    await app(scope, recibir, enviar)
+    return enviados
+
+class TestMetricasHttp(unittest.IsolatedAsyncioTestCase):
+    async def test_registra_la_peticion_por_plantilla_de_ruta(self):
+        metricas = Metricas(server_timing=True)
+        app = _aplicacion(metricas)
+
+        enviados = await _llamar(app, "/cuentas/abc")
+
+        cabeceras = dict(enviados[0]["headers"])
+        self.assertRegex(cabeceras[b"server-timing"].decode(), r"^repositorio;dur=1\.00, total;dur=\d+\.\d\d$")
+        self.assertEqual(metricas._peticiones[("GET", "/cuentas/{cuenta_id}", "200")].total, 1)
+        self.assertEqual(metricas._consultas[("GET", "/cuentas/{cuenta_id}")].suma, 1)
+
+        exportadas = await _llamar(app, "/metrics")
+        self.assertEqual(dict(exportadas[0]["headers"])[b"content-type"].decode(), TIPO_PROMETHEUS)
+        self.assertIn(b'ruta="/cuentas/{cuenta_id}"', exportadas[1]["body"])
+
+    async def test_sin_server_timing_ni_ruta(self):
+        metricas = Metricas()
+        app = _aplicacion(metricas)
+
+        enviados = await _llamar(app, "/no-existe")
+
+        self.assertEqual(enviados[0]["status"], 404)
+        self.assertNotIn(b"server-timing", dict(enviados[0]["headers"]))
+        self.assertIn(("GET", "sin_ruta", "404"), metricas._peticiones)
+
+    async def test_deshabilitadas(self):
+        app = _aplicacion(None)
+
+        self.assertEqual((await _llamar(app, "/cuentas/abc"))[0]["status"], 200)
+        self.assertEqual((await _llamar(app, "/metrics"))[0]["status"], 404)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,19 +1,32 @@
+import asyncio
+import json
+import os
+import tempfile
 import unittest
-from unittest.mock import Mock
-from datetime import datetime
+from unittest.mock import AsyncMock
+from datetime import datetime, timedelta
 from decimal import Decimal
 from uuid import uuid4
 from app.controllers.transaction_controller import realizar_transaccion, listar_transacciones, generar_informe_financiero, TransactionRequest
+from fastapi import HTTPException
+from app.mappers.transaction_mapper import TransactionMapper
 from application.dtos.transaction_dto import TransactionDTO
 from application.dtos.informe_dto import InformeDTO
+from application.dtos.pagina_dto import PaginaDTO
 from domain.entities.transaction_type import TransactionType
+from domain.entities.account import Account
+from domain.entities.transaction import Transaction, TransactionState
+from application.services.async_transaction_application_service import AsyncTransactionApplicationService
+from infrastructure.db.sqlite_pool import SQLitePool
+from infrastructure.repositories.async_sqlite_account_repository import AsyncSQLiteAccountRepository
+from infrastructure.repositories.async_sqlite_transaction_repository import AsyncSQLiteTransactionRepository
+from infrastructure.repositories.sqlite_transaction_repository import SQLiteTransactionRepository, TAMANO_LOTE_LECTURA
 
-class TestTransactionController(unittest.TestCase):
+class TestTransactionController(unittest.IsolatedAsyncioTestCase):
     def setUp(self):
-        self.transaction_app_service = Mock()
-        self.mongo_service = Mock()
+        self.transaction_app_service = AsyncMock()
 
-    def test_realizar_transaccion(self):
+    async def test_realizar_transaccion(self):
         # Arrange
         cuenta_id = uuid4()
         transaction_request = TransactionRequest(
@@ -25,45 +38,95 @@ class TestTransactionController(unittest.TestCase):
         )
 
         # Act
-        result = realizar_transaccion(
+        result = await realizar_transaccion(
             transaction_request=transaction_request,
-            transaction_app_service=self.transaction_app_service,
-            mongo_service=self.mongo_service
+            transaction_app_service=self.transaction_app_service
         )
 
         # Assert
         self.assertIsNotNone(result)
         self.assertIn("message", result)
         self.assertIn("transaction_id", result)
-        self.transaction_app_service.realizar_transaccion.assert_called_once()
+        self.transaction_app_service.realizar_transaccion.assert_awaited_once()
 
-    def test_listar_transacciones(self):
+    async def test_listar_transacciones(self):
         # Arrange
         cuenta_id = uuid4()
-        mock_transactions = [
-            TransactionDTO(
-                id=uuid4(),
-                cuenta_id=cuenta_id,
-                monto=Decimal("100.00"),
-                tipo=TransactionType.DEPOSITO,
-                estado="APROBADA",
-                fecha=datetime.now()
-            )
-        ]
-        self.transaction_app_service.listar_transacciones.return_value = mock_transactions
+        transaccion = TransactionDTO(
+            id=uuid4(),
+            cuenta_id=cuenta_id,
+            monto=Decimal("100.25"),
+            tipo=TransactionType.DEPOSITO,
+            estado="APROBADA",
+            fecha=datetime(2024, 3, 1, 12, 30)
+        )
+
+        async def proyecciones():
+            yield (str(transaccion.id), str(cuenta_id), 100.25, "DEPOSITO", "APROBADA", "2024-03-01")
+
+        self.transaction_app_service.iterar_proyecciones.return_value = proyecciones()
 
         # Act
-        result = listar_transacciones(
+        result = await listar_transacciones(
             cuenta_id=cuenta_id,
             transaction_app_service=self.transaction_app_service
         )
+        cuerpo = b"".join([fragmento async for fragmento in result.body_iterator])
+
+        # Assert: el mismo JSON que produce dto_to_json
+        self.assertEqual(result.media_type, "application/json")
+        self.assertEqual(json.loads(cuerpo), [TransactionMapper.dto_to_json(transaccion)])
+        self.assertEqual(cuerpo, json.dumps([TransactionMapper.dto_to_json(transaccion)], separators=(",", ":")).encode())
+        self.transaction_app_service.iterar_proyecciones.assert_awaited_once_with(cuenta_id)
+        self.transaction_app_service.listar_transacciones.assert_not_awaited()
+
+    async def test_listado_json_por_fragmentos(self):
+        async def proyecciones(n):
+            for i in range(n):
+                yield (str(uuid4()), str(uuid4()), i + 0.5, "RETIRO", "PENDIENTE", "2024-01-01")
+
+        for n in (0, 1, 2, 4, 5):
+            fragmentos = [f async for f in TransactionMapper.proyecciones_a_json(proyecciones(n), filas_por_fragmento=2)]
+            listado = json.loads(b"".join(fragmentos))
+            self.assertEqual([t["monto"] for t in listado], [i + 0.5 for i in range(n)])
+            self.assertEqual(len(fragmentos), n // 2 + 1)
+
+    async def test_listar_transacciones_cuenta_inexistente(self):
+        self.transaction_app_service.iterar_proyecciones.side_effect = ValueError("La cuenta no existe")
+
+        with self.assertRaises(HTTPException) as contexto:
+            await listar_transacciones(cuenta_id=uuid4(), transaction_app_service=self.transaction_app_service)
+
+        self.assertEqual(contexto.exception.status_code, 400)
+
+    async def test_listar_transacciones_paginado(self):
+        # Arrange
+        cuenta_id = uuid4()
+        transaccion = TransactionDTO(
+            id=uuid4(),
+            cuenta_id=cuenta_id,
+            monto=Decimal("100.00"),
+            tipo=TransactionType.DEPOSITO,
+            estado="APROBADA",
+            fecha=datetime.now()
+        )
+        self.transaction_app_service.listar_transacciones_paginado.return_value = PaginaDTO([transaccion], "cursor-siguiente")
+
+        # Act
+        result = await listar_transacciones(
+            cuenta_id=cuenta_id,
+            transaction_app_service=self.transaction_app_service,
+            limit=1,
+            after="cursor-actual"
+        )
 
         # Assert
-        self.assertIsNotNone(result)
-        self.assertEqual(len(result), 1)
-        self.transaction_app_service.listar_transacciones.assert_called_once_with(cuenta_id)
+        self.assertEqual(len(result["items"]), 1)
+        self.assertEqual(result["next_cursor"], "cursor-siguiente")
+        self.transaction_app_service.listar_transacciones_paginado.assert_awaited_once_with(cuenta_id, 1, "cursor-actual")
+        self.transaction_app_service.listar_transacciones.assert_not_awaited()
 
-    def test_generar_informe_financiero(self):
+    async def test_generar_informe_financiero(self):
         # Arrange
         cuenta_id = uuid4()
         mock_informe = InformeDTO(
@@ -75,7 +138,7 @@ class TestTransactionController(unittest.TestCase):
         self.transaction_app_service.generar_informe_financiero.return_value = mock_informe
 
         # Act
-        result = generar_informe_financiero(
+        result = await generar_informe_financiero(
             cuenta_id=cuenta_id,
             transaction_app_service=self.transaction_app_service
         )
@@ -86,7 +149,63 @@ class TestTransactionController(unittest.TestCase):
         self.assertIn("total_retiros", result)
         self.assertIn("saldo_promedio", result)
         self.assertIn("transacciones", result)
-        self.transaction_app_service.generar_informe_financiero.assert_called_once_with(cuenta_id)
+        self.transaction_app_service.generar_informe_financiero.assert_awaited_once_with(cuenta_id, False)
+
+    async def test_generar_informe_sin_transacciones(self):
+        # Sin incluir_transacciones el informe solo trae los totales
+        cuenta_id = uuid4()
+        self.transaction_app_service.generar_informe_financiero.return_value = InformeDTO(
+            total_depositos=2, total_retiros=1, saldo_promedio=Decimal("50.00")
+        )
+
+        result = await generar_informe_financiero(
+            cuenta_id=cuenta_id,
+            transaction_app_service=self.transaction_app_service
+        )
+
+        self.assertIsNone(result["transacciones"])
+        self.assertEqual(result["total_depositos"], 2)
+
+class TestListadoConcurrente(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        """Se ejecuta antes de cada prueba: servicio real sobre un pool de dos conexiones."""
+        self.directorio = tempfile.TemporaryDirectory()
+        self.pool = SQLitePool(os.path.join(self.directorio.name, "listado.db"), max_conexiones=2, timeout=1)
+        self.cuentas = AsyncSQLiteAccountRepository(pool=self.pool)
+        self.repositorio = SQLiteTransactionRepository(pool=self.pool)
+        self.transacciones = AsyncSQLiteTransactionRepository(repositorio=self.repositorio)
+        self.service = AsyncTransactionApplicationService(self.transacciones, self.cuentas)
+
+    def tearDown(self):
+        """Se ejecuta después de cada prueba."""
+        self.pool.cerrar()
+        self.directorio.cleanup()
+
+    async def test_mas_listados_en_curso_que_conexiones(self):
+        # Más filas que un lote: cada respuesta queda a mitad del historial tras su primer fragmento
+        cuenta = Account(uuid4(), uuid4(), Decimal('0.00'), Decimal('1000.00'))
+        await self.cuentas.guardar(cuenta)
+        total = TAMANO_LOTE_LECTURA + 100
+        self.repositorio.guardar_lote([
+            Transaction(uuid4(), cuenta.id, Decimal('1.00'), TransactionType.DEPOSITO, TransactionState.APROBADA,
+                        datetime(2024, 1, 1) + timedelta(seconds=i))
+            for i in range(total)
+        ])
+
+        respuestas = [
+            (await listar_transacciones(cuenta_id=cuenta.id, transaction_app_service=self.service)).body_iterator
+            for _ in range(3)
+        ]
+        primeros = [await cuerpo.__anext__() for cuerpo in respuestas]  # Las tres respuestas quedan abiertas
+
+        async def resto(cuerpo):
+            return b"".join([fragmento async for fragmento in cuerpo])
+        restos = await asyncio.gather(*(resto(cuerpo) for cuerpo in respuestas))
+
+        for primero, final in zip(primeros, restos):
+            self.assertEqual(len(json.loads(primero + final)), total)
+        estadisticas = self.pool.estadisticas()
+        self.assertEqual(estadisticas["conexiones_libres"], estadisticas["conexiones_creadas"])
 
 if __name__ == '__main__':
     unittest.main()
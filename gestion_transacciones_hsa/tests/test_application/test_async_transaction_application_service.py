@@ -0,0 +1,90 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+from uuid import uuid4
+from datetime import datetime
+from decimal import Decimal
+from application.services.async_transaction_application_service import AsyncTransactionApplicationService
+from application.dtos.transaction_dto import TransactionDTO
+from domain.entities.account import Account
+from domain.entities.transaction_type import TransactionType
+from infrastructure.db import codificacion, limites_diarios
+from infrastructure.db.sqlite_pool import SQLitePool
+from infrastructure.repositories.async_sqlite_account_repository import AsyncSQLiteAccountRepository
+from infrastructure.repositories.async_sqlite_transaction_repository import AsyncSQLiteTransactionRepository
+
+class TestAsyncTransactionApplicationService(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        """Se ejecuta antes de cada prueba: repositorios SQLite reales sobre una base temporal."""
+        self.directorio = tempfile.TemporaryDirectory()
+        self.pool = SQLitePool(os.path.join(self.directorio.name, "servicio.db"))
+        self.cuentas = AsyncSQLiteAccountRepository(pool=self.pool)
+        self.transacciones = AsyncSQLiteTransactionRepository(pool=self.pool)
+        self.service = AsyncTransactionApplicationService(self.transacciones, self.cuentas)
+
+    def tearDown(self):
+        """Se ejecuta después de cada prueba."""
+        self.pool.cerrar()
+        self.directorio.cleanup()
+
+    async def _cuenta(self, saldo: str) -> Account:
+        cuenta = Account(uuid4(), uuid4(), Decimal(saldo), Decimal('1000.00'))
+        await self.cuentas.guardar(cuenta)
+        return cuenta
+
+    def _dto(self, cuenta: Account, monto: str, tipo=TransactionType.DEPOSITO) -> TransactionDTO:
+        return TransactionDTO(uuid4(), cuenta.id, Decimal(monto), tipo, "APROBADA", datetime.now())
+
+    def _contar_llamadas(self):
+        """Cuenta las llamadas al hilo de E/S del pool (una por viaje a la base)."""
+        return patch.object(self.pool, "ejecutar", wraps=self.pool.ejecutar)
+
+    async def test_realizar_transaccion_en_dos_viajes(self):
+        cuenta = await self._cuenta('100.00')
+
+        with self._contar_llamadas() as ejecutar:
+            await self.service.realizar_transaccion(self._dto(cuenta, '25.00'))
+
+        self.assertEqual(ejecutar.await_count, 2)  # Lectura de la cuenta y confirmación
+        self.assertEqual((await self.cuentas.obtener_por_id(cuenta.id)).saldo, Decimal('125.00'))
+
+    async def test_realizar_transaccion_acumula_el_limite_diario(self):
+        cuenta = await self._cuenta('100.00')
+        dto = self._dto(cuenta, '25.00')  # Estado en texto, como llega de la API
+
+        await self.service.realizar_transaccion(dto)
+
+        with self.pool.conexion() as conn:
+            acumulado = limites_diarios.acumulado_del_dia(
+                conn, codificacion.uuid_a_bytes(cuenta.id), codificacion.fecha_a_dia(dto.fecha)
+            )
+        self.assertEqual(acumulado, 2500)
+
+    async def test_retiro_sin_fondos_no_escribe(self):
+        cuenta = await self._cuenta('10.00')
+
+        with self._contar_llamadas() as ejecutar:
+            with self.assertRaises(ValueError):
+                await self.service.realizar_transaccion(self._dto(cuenta, '-25.00', TransactionType.RETIRO))
+
+        self.assertEqual(ejecutar.await_count, 1)
+        self.assertEqual(await self.transacciones.listar_por_cuenta(cuenta.id), [])
+
+    async def test_informe_lee_la_cuenta_una_vez(self):
+        cuenta = await self._cuenta('0.00')
+        await self.service.realizar_transaccion(self._dto(cuenta, '25.00'))
+
+        with patch.object(self.cuentas, "obtener_por_id", wraps=self.cuentas.obtener_por_id) as obtener:
+            informe = await self.service.generar_informe_financiero(cuenta.id, incluir_transacciones=True)
+
+        obtener.assert_awaited_once_with(cuenta.id)
+        self.assertEqual(informe.total_depositos, 1)
+        self.assertEqual(len(informe.transacciones), 1)
+
+    async def test_cuenta_inexistente(self):
+        with self.assertRaises(ValueError):
+            await self.service.listar_transacciones(uuid4())
+
+if __name__ == '__main__':
+    unittest.main()
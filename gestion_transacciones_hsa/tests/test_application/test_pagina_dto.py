@@ -0,0 +1,22 @@
+import unittest
+from datetime import datetime
+from uuid import uuid4
+from application.dtos.pagina_dto import PaginaDTO
+
+class TestPaginaDTO(unittest.TestCase):
+    def test_cursor_ida_y_vuelta(self):
+        fecha = datetime(2024, 3, 15, 10, 30, 0, 123456)
+        id = uuid4()
+
+        cursor = PaginaDTO.codificar_cursor(fecha, id)
+
+        self.assertEqual(PaginaDTO.decodificar_cursor(cursor), (fecha, id))
+        self.assertNotIn("=", cursor)  # Apto para query string sin escapar
+
+    def test_cursor_invalido(self):
+        for cursor in ["no-es-un-cursor", "e30", PaginaDTO.codificar_cursor(datetime.now(), uuid4())[:-4]]:
+            with self.assertRaises(ValueError):
+                PaginaDTO.decodificar_cursor(cursor)
+
+if __name__ == '__main__':
+    unittest.main()
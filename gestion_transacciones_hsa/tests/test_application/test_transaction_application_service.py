@@ -6,9 +6,12 @@ from decimal import Decimal
 from application.services.transaction_application_service import TransactionApplicationService
 from application.dtos.transaction_dto import TransactionDTO
 from application.dtos.informe_dto import InformeDTO
+from application.dtos.pagina_dto import PaginaDTO
+from domain.entities.transaction import Transaction, TransactionState
 from domain.repositories.i_transaction_service import ITransactionService
 from domain.repositories.i_account_repository import IAccountRepository
 from domain.entities.transaction_type import TransactionType
+from domain.entities.resumen_cuenta import ResumenCuenta
 
 class TestTransactionApplicationService(unittest.TestCase):
     def setUp(self):
@@ -63,5 +66,74 @@ class TestTransactionApplicationService(unittest.TestCase):
         with self.assertRaises(ValueError):
             self.service.realizar_transaccion(dto)
 
+    def test_listar_transacciones_no_materializa_el_historial(self):
+        cuenta_id = uuid4()
+        self.account_repository.obtener_por_usuario.return_value = Mock()
+        leidas = []
+
+        def iterar(cuenta):
+            for dia in (1, 2, 3):
+                leidas.append(dia)
+                yield Transaction(uuid4(), cuenta, Decimal('10.00'), TransactionType.DEPOSITO,
+                                  TransactionState.APROBADA, datetime(2024, 1, dia))
+        self.transaction_service.iterar_transacciones_por_cuenta = Mock(side_effect=iterar)
+
+        dtos = self.service.listar_transacciones(cuenta_id)
+
+        self.assertEqual(leidas, [])  # Nada se lee hasta recorrer el resultado
+        self.assertEqual(next(dtos).fecha, datetime(2024, 1, 1))
+        self.assertEqual(leidas, [1])
+        self.assertEqual(len(list(dtos)), 2)
+
+    def test_listar_transacciones_cuenta_inexistente(self):
+        self.account_repository.obtener_por_usuario.return_value = None
+        with self.assertRaises(ValueError):  # Se valida antes de devolver el iterador
+            self.service.listar_transacciones(uuid4())
+
+    def test_listar_transacciones_paginado(self):
+        # Arrange: el servicio de dominio devuelve limite + 1 transacciones
+        cuenta_id = uuid4()
+        transacciones = [
+            Transaction(uuid4(), cuenta_id, Decimal('10.00'), TransactionType.DEPOSITO,
+                        TransactionState.APROBADA, datetime(2024, 1, dia))
+            for dia in (3, 2, 1)
+        ]
+        self.transaction_service.listar_pagina_por_cuenta = Mock(return_value=transacciones)
+
+        # Act
+        pagina = self.service.listar_transacciones_paginado(cuenta_id, 2)
+
+        # Assert: se pide un elemento extra y el cursor apunta a la última entregada
+        self.transaction_service.listar_pagina_por_cuenta.assert_called_once_with(cuenta_id, 3, None)
+        self.assertEqual(len(pagina.items), 2)
+        self.assertEqual(PaginaDTO.decodificar_cursor(pagina.next_cursor), (transacciones[1].fecha, transacciones[1].id))
+
+    def test_listar_transacciones_paginado_ultima_pagina(self):
+        cuenta_id = uuid4()
+        self.transaction_service.listar_pagina_por_cuenta = Mock(return_value=[])
+        pagina = self.service.listar_transacciones_paginado(cuenta_id, 2)
+        self.assertEqual(pagina.items, [])
+        self.assertIsNone(pagina.next_cursor)
+
+    def test_generar_informe_financiero_usa_agregacion(self):
+        # Arrange: el repositorio entrega los totales ya agregados
+        cuenta_id = uuid4()
+        self.account_repository.obtener_por_usuario.return_value = Mock()
+        self.transaction_service.resumir_transacciones_aprobadas = Mock(return_value=ResumenCuenta(
+            num_depositos=3, monto_depositos=Decimal('300.00'),
+            num_retiros=1, monto_retiros=Decimal('-100.00')
+        ))
+        self.transaction_service.iterar_transacciones_por_cuenta = Mock()
+
+        # Act
+        informe = self.service.generar_informe_financiero(cuenta_id)
+
+        # Assert: no se recorren las transacciones
+        self.assertEqual(informe.total_depositos, 3)
+        self.assertEqual(informe.total_retiros, 1)
+        self.assertEqual(informe.saldo_promedio, Decimal('100.00'))
+        self.assertIsNone(informe.transacciones)
+        self.transaction_service.iterar_transacciones_por_cuenta.assert_not_called()
+
 if __name__ == '__main__':
     unittest.main()
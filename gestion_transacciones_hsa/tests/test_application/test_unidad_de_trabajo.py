@@ -0,0 +1,71 @@
+import unittest
+from unittest.mock import AsyncMock
+from uuid import uuid4
+from datetime import datetime
+from decimal import Decimal
+from application.services.unidad_de_trabajo import UnidadDeTrabajo
+from domain.entities.account import Account
+from domain.entities.transaction import Transaction, TransactionState
+from domain.entities.transaction_type import TransactionType
+
+class TestUnidadDeTrabajo(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.account_repository = AsyncMock()
+        self.transaction_repository = AsyncMock()
+        self.cuenta = Account(uuid4(), uuid4(), Decimal('100.00'), Decimal('1000.00'))
+        self.account_repository.obtener_por_id.return_value = self.cuenta
+        self.uow = UnidadDeTrabajo(self.account_repository, self.transaction_repository)
+
+    def _deposito(self, monto: str) -> Transaction:
+        return Transaction(uuid4(), self.cuenta.id, Decimal(monto), TransactionType.DEPOSITO,
+                           TransactionState.APROBADA, datetime.now())
+
+    async def test_cada_cuenta_se_lee_una_vez(self):
+        primera = await self.uow.obtener_cuenta(self.cuenta.id)
+        segunda = await self.uow.cuentas.obtener_por_id(self.cuenta.id)
+
+        self.assertIs(primera, segunda)
+        self.account_repository.obtener_por_id.assert_awaited_once_with(self.cuenta.id)
+
+    async def test_cuenta_inexistente_se_recuerda(self):
+        self.account_repository.obtener_por_id.side_effect = ValueError("No se encontró la cuenta")
+        cuenta_id = uuid4()
+
+        for _ in range(2):
+            with self.assertRaises(ValueError):
+                await self.uow.cuentas.obtener_por_id(cuenta_id)
+        self.account_repository.obtener_por_id.assert_awaited_once()
+
+    async def test_confirmar_escribe_todo_en_una_llamada(self):
+        self.transaction_repository.registrar_lote_con_saldo.return_value = [
+            (Decimal('110.00'), 2), (Decimal('130.00'), 3)
+        ]
+        await self.uow.obtener_cuenta(self.cuenta.id)
+
+        async with self.uow as uow:
+            uow.registrar(self._deposito('10.00'))
+            uow.registrar(self._deposito('20.00'))
+            self.transaction_repository.registrar_lote_con_saldo.assert_not_awaited()
+
+        self.transaction_repository.registrar_lote_con_saldo.assert_awaited_once()
+        self.assertEqual(len(self.transaction_repository.registrar_lote_con_saldo.call_args[0][0]), 2)
+        self.assertEqual((self.cuenta.saldo, self.cuenta.version), (Decimal('130.00'), 3))
+        self.assertEqual(self.uow.pendientes, [])
+
+    async def test_sin_cambios_no_escribe(self):
+        async with self.uow:
+            await self.uow.obtener_cuenta(self.cuenta.id)
+
+        self.transaction_repository.registrar_lote_con_saldo.assert_not_awaited()
+
+    async def test_una_excepcion_descarta_lo_pendiente(self):
+        with self.assertRaises(RuntimeError):
+            async with self.uow as uow:
+                uow.registrar(self._deposito('10.00'))
+                raise RuntimeError("falla")
+
+        self.transaction_repository.registrar_lote_con_saldo.assert_not_awaited()
+        self.assertEqual(self.uow.pendientes, [])
+
+if __name__ == '__main__':
+    unittest.main()
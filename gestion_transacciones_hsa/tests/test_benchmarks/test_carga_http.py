@@ -0,0 +1,100 @@
+# tests/test_benchmarks/test_carga_http.py
+import asyncio
+import unittest
+from contextlib import asynccontextmanager
+from uuid import uuid4
+from fastapi import FastAPI, HTTPException
+from benchmarks.carga_http import ClienteASGI, ClienteHTTP, PruebaCarga, ejecutar, interpretar_mezcla
+
+def _aplicacion(eventos: list):
+    @asynccontextmanager
+    async def lifespan(app):
+        eventos.append("inicio")
+        yield
+        eventos.append("fin")
+
+    app = FastAPI(lifespan=lifespan)
+
+    @app.post("/cuentas/")
+    async def crear_cuenta(cuenta: dict):
+        return {"cuenta_id": str(uuid4())}
+
+    @app.post("/transacciones/")
+    async def crear_transaccion(transaccion: dict):
+        if transaccion["tipo"] == "RETIRO":
+            raise HTTPException(status_code=400, detail="Fondos insuficientes")
+        return {"transaction_id": str(uuid4())}
+
+    @app.get("/informes/{cuenta_id}")
+    async def informe(cuenta_id: str):
+        raise HTTPException(status_code=500, detail="Error interno del servidor")
+
+    return app
+
+class TestCargaHttp(unittest.IsolatedAsyncioTestCase):
+    def test_interpretar_mezcla(self):
+        self.assertEqual(interpretar_mezcla("crear_transaccion=70, informe=30,listar"),
+                         {"crear_transaccion": 70.0, "informe": 30.0, "listar": 1.0})
+        with self.assertRaises(ValueError):
+            interpretar_mezcla("borrar=10")
+        with self.assertRaises(ValueError):
+            interpretar_mezcla("informe=0")
+
+    async def test_ciclo_cerrado_en_proceso(self):
+        eventos = []
+        documento = await ejecutar(
+            ClienteASGI(_aplicacion(eventos)), modo="cerrado", concurrencia=4, duracion=0.3, calentamiento=0.1,
+            mezcla={"crear_transaccion": 2, "informe": 1}, cuentas=5
+        )
+
+        self.assertEqual(eventos, ["inicio", "fin"])
+        resultados = {r["operacion"]: r for r in documento["resultados"]}
+        self.assertEqual(set(resultados), {"crear_transaccion", "informe", "total"})
+        transacciones, informes, total = resultados["crear_transaccion"], resultados["informe"], resultados["total"]
+        self.assertGreater(transacciones["operaciones"], 0)
+        self.assertEqual((transacciones["errores"], informes["rechazos"]), (0, 0))
+        self.assertEqual(transacciones["rechazos"], transacciones["estados"].get("400", 0))
+        self.assertEqual(informes["tasa_errores"], 1.0)
+        self.assertEqual(total["operaciones"], transacciones["operaciones"] + informes["operaciones"])
+        self.assertEqual(documento["metadatos"]["modo"], "cerrado")
+
+    async def test_ciclo_abierto_sigue_la_tasa(self):
+        prueba = PruebaCarga(ClienteASGI(_aplicacion([])), mezcla={"listar": 1}, cuentas=3)
+        await prueba.preparar()
+
+        segundos = await prueba.ciclo_abierto(tasa=200, duracion=0.5, max_en_curso=8)
+
+        llegadas = len(prueba.latencias["listar"])
+        self.assertAlmostEqual(llegadas, 100, delta=40)
+        self.assertEqual(prueba.estados["listar"][404], llegadas)  # La aplicación de prueba no lista
+        self.assertGreaterEqual(segundos, 0.4)
+
+    async def test_cliente_http_reutiliza_la_conexion(self):
+        conexiones = []
+
+        async def atender(lector, escritor):
+            conexiones.append(escritor)
+            respuestas = [
+                b"HTTP/1.1 200 OK\r\nTransfer-Encoding: chunked\r\n\r\n3\r\n[1,\r\n2\r\n2]\r\n0\r\n\r\n",
+                b"HTTP/1.1 404 Not Found\r\nContent-Length: 2\r\n\r\n{}",
+            ]
+            while await lector.readline():
+                while await lector.readline() not in (b"\r\n", b""):
+                    pass
+                escritor.write(respuestas.pop(0))
+                await escritor.drain()
+
+        servidor = await asyncio.start_server(atender, "127.0.0.1", 0)
+        puerto = servidor.sockets[0].getsockname()[1]
+        cliente = ClienteHTTP(f"http://127.0.0.1:{puerto}")
+        try:
+            self.assertEqual(await cliente.peticion("GET", "/informes/x"), (200, b"[1,2]"))
+            self.assertEqual(await cliente.peticion("GET", "/informes/y"), (404, b"{}"))
+            self.assertEqual(len(conexiones), 1)
+        finally:
+            await cliente.detener()
+            servidor.close()
+            await servidor.wait_closed()
+
+if __name__ == "__main__":
+    unittest.main()
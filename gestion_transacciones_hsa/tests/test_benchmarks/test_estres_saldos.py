@@ -0,0 +1,66 @@
+# tests/test_benchmarks/test_estres_saldos.py
+import tempfile
+import unittest
+from collections import Counter
+from benchmarks import estres_saldos
+from benchmarks.repositorios import backend_sqlite
+
+class TestEstresSaldos(unittest.TestCase):
+    def setUp(self):
+        """Se ejecuta antes de cada prueba."""
+        self.directorio = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        """Se ejecuta después de cada prueba."""
+        self.directorio.cleanup()
+
+    def test_hilos_mantienen_los_saldos(self):
+        documento = estres_saldos.ejecutar(operaciones=600, cuentas=2, hilos=8, directorio=self.directorio.name)
+
+        resultado = documento["resultado"]
+        self.assertEqual(resultado["divergencias"], 0)
+        self.assertEqual(sum(resultado["resultados"].values()), 600)
+        self.assertEqual(resultado["resultados"].get("error", 0), 0)
+        self.assertIn("esperas_pool", resultado)
+        self.assertGreater(resultado["tiempo_espera_bloqueo_s"], 0)  # Cada registro toma el bloqueo de escritura
+        self.assertGreaterEqual(resultado["esperas_bloqueo"], 0)
+        self.assertEqual(sum(fila["transacciones"] for fila in documento["cuentas"]),
+                         resultado["resultados"]["aprobada"] + 2)  # Más el depósito inicial de cada cuenta
+
+    def test_procesos_mantienen_los_saldos(self):
+        documento = estres_saldos.ejecutar(operaciones=200, cuentas=2, hilos=2, procesos=2,
+                                           directorio=self.directorio.name)
+
+        self.assertEqual(documento["resultado"]["divergencias"], 0)
+        self.assertEqual(sum(documento["resultado"]["resultados"].values()), 200)
+
+    def test_shards_mantienen_los_saldos(self):
+        documento = estres_saldos.ejecutar(backend="sqlite-sharded", shards=3, operaciones=300, cuentas=6, hilos=4,
+                                           directorio=self.directorio.name)
+
+        resultado = documento["resultado"]
+        self.assertEqual(resultado["divergencias"], 0)
+        self.assertEqual(sum(resultado["resultados"].values()), 300)
+        self.assertIn("esperas_pool", resultado)
+        self.assertEqual(documento["metadatos"]["shards"], 3)
+
+    def test_detecta_saldos_divergentes(self):
+        backend = backend_sqlite(self.directorio.name)
+        try:
+            versiones, aprobadas = estres_saldos._preparar(backend, 2)
+            alterada, intacta = list(versiones)
+            with backend.cuentas._pool.conexion() as conn:
+                conn.execute("UPDATE cuentas_v2 SET saldo = saldo + 1 WHERE id = ?", (alterada.bytes,))
+
+            filas = estres_saldos.verificar_saldos(backend.cuentas, backend.transacciones, versiones,
+                                                   Counter({alterada: 1, intacta: 2}))
+        finally:
+            backend.cerrar()
+
+        por_cuenta = {fila["cuenta_id"]: fila["divergencias"] for fila in filas}
+        self.assertEqual(len(por_cuenta[str(alterada)]), 1)
+        self.assertIn("saldo", por_cuenta[str(alterada)][0])
+        self.assertEqual(por_cuenta[str(intacta)], ["1 transacciones registradas != 2 aprobadas"])
+
+if __name__ == '__main__':
+    unittest.main()
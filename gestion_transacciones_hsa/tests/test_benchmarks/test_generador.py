@@ -0,0 +1,54 @@
+# tests/test_benchmarks/test_generador.py
+import unittest
+from collections import Counter
+from domain.entities.transaction import TransactionState
+from domain.entities.transaction_type import TransactionType
+from benchmarks.generador import GeneradorHSA, saldos_por_cuenta
+
+class TestGeneradorHSA(unittest.TestCase):
+    def _generar(self, n: int = 5000, **opciones):
+        generador = GeneradorHSA(200, **opciones)
+        transacciones = [t for lote in generador.transacciones(n, tamano_lote=1000) for t in lote]
+        return generador, transacciones
+
+    def test_misma_semilla_mismos_datos(self):
+        _, primeras = self._generar(500, semilla=7)
+        _, segundas = self._generar(500, semilla=7)
+        _, otras = self._generar(500, semilla=8)
+
+        clave = lambda t: (t.id, t.cuenta_id, t.monto, t.estado, t.fecha)
+        self.assertEqual([clave(t) for t in primeras], [clave(t) for t in segundas])
+        self.assertNotEqual([t.id for t in primeras], [t.id for t in otras])
+
+    def test_saldos_de_las_cuentas_coinciden_con_las_aprobadas(self):
+        generador, transacciones = self._generar()
+        esperados = saldos_por_cuenta(transacciones)
+
+        for cuenta in generador.cuentas():
+            self.assertEqual(cuenta.saldo, esperados.get(cuenta.id, 0))
+            self.assertGreaterEqual(cuenta.saldo, 0)
+        self.assertTrue(any(t.estado == TransactionState.RECHAZADA for t in transacciones))
+
+    def test_mezcla_de_depositos_y_retiros(self):
+        _, transacciones = self._generar(proporcion_depositos=0.4)
+        depositos = [t for t in transacciones if t.tipo == TransactionType.DEPOSITO]
+
+        self.assertAlmostEqual(len(depositos) / len(transacciones), 0.4, delta=0.03)
+        self.assertTrue(all(t.monto > 0 for t in depositos))
+        self.assertTrue(all(t.monto < 0 for t in transacciones if t.tipo == TransactionType.RETIRO))
+
+    def test_actividad_sesgada(self):
+        generador, transacciones = self._generar(20_000, zipf=1.0)
+        por_cuenta = Counter(t.cuenta_id for t in transacciones)
+        mas_activas = sum(cantidad for _, cantidad in por_cuenta.most_common(20)) / len(transacciones)
+
+        self.assertAlmostEqual(mas_activas, generador.participacion_mas_activas(0.1), delta=0.05)
+        self.assertGreater(mas_activas, 0.4)
+        self.assertAlmostEqual(GeneradorHSA(200, zipf=0).participacion_mas_activas(0.1), 0.1)
+
+    def test_muestra_de_ids_generados(self):
+        generador, transacciones = self._generar(2000)
+        self.assertEqual(generador.muestra_transacciones, [t.id for t in transacciones])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,25 @@
+# tests/test_benchmarks/test_hidratacion.py
+import unittest
+from benchmarks import hidratacion
+from infrastructure.repositories.sqlite_transaction_repository import SQLiteTransactionRepository
+
+class TestHidratacion(unittest.TestCase):
+    def test_referencia_y_entidades_hidratan_lo_mismo(self):
+        for row in hidratacion.filas_transacciones(50):
+            antes = hidratacion._transaccion_anterior(row)
+            despues = SQLiteTransactionRepository._desde_fila(row)
+            self.assertEqual(
+                (antes.id, antes.cuenta_id, antes.monto, antes.tipo, antes.estado, antes.fecha),
+                (despues.id, despues.cuenta_id, despues.monto, despues.tipo, despues.estado, despues.fecha)
+            )
+
+    def test_comparar(self):
+        medidas = hidratacion.comparar(n=2000, repeticiones=1)
+
+        self.assertEqual(len(medidas), 4)
+        memoria = medidas[0]
+        self.assertLess(memoria[2], memoria[1])  # Las entidades con __slots__ ocupan menos
+        self.assertTrue(all(antes > 0 and despues > 0 for _, antes, despues in medidas))
+
+if __name__ == '__main__':
+    unittest.main()
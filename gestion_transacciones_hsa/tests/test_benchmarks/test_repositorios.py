@@ -0,0 +1,76 @@
+# tests/test_benchmarks/test_repositorios.py
+import json
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from io import StringIO
+from unittest.mock import patch
+from benchmarks import repositorios
+
+class TestBenchmarkRepositorios(unittest.TestCase):
+    def setUp(self):
+        """Se ejecuta antes de cada prueba."""
+        self.directorio = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        """Se ejecuta después de cada prueba."""
+        self.directorio.cleanup()
+
+    def test_medir_backend_sqlite(self):
+        backend = repositorios.backend_sqlite(self.directorio.name)
+        try:
+            resultados = repositorios.medir_backend(backend, filas=1000, operaciones=20)
+        finally:
+            backend.cerrar()
+
+        por_operacion = {r["operacion"]: r for r in resultados}
+        self.assertEqual(set(por_operacion), {
+            "carga", "guardar", "obtener_por_id", "cuentas.obtener_por_id", "listar_por_cuenta",
+            "generar_informe_financiero", "cuentas.listar_todos", "listar_todos"
+        })
+        self.assertEqual(por_operacion["obtener_por_id"]["operaciones"], 20)
+        self.assertEqual(por_operacion["listar_todos"]["filas_leidas"], 1020)
+        self.assertGreater(por_operacion["carga"]["filas_s"], 0)
+
+    def test_comparar_con_linea_base(self):
+        base = [
+            {"backend": "sqlite", "filas": 10, "operacion": "guardar", "ops_s": 1000.0, "p95_ms": 2.0},
+            {"backend": "sqlite", "filas": 10, "operacion": "obtener_por_id", "ops_s": 1000.0, "p95_ms": 0.02},
+        ]
+        actuales = [
+            {"backend": "sqlite", "filas": 10, "operacion": "guardar", "ops_s": 700.0, "p95_ms": 3.0},
+            {"backend": "sqlite", "filas": 10, "operacion": "obtener_por_id", "ops_s": 950.0, "p95_ms": 0.05},
+            {"backend": "sqlite", "filas": 10, "operacion": "nueva", "ops_s": 1.0, "p95_ms": 1.0},
+        ]
+        comparacion = repositorios.comparar_con_linea_base(actuales, base, tolerancia=0.2)
+
+        regresiones = {(c["operacion"], c["metrica"]) for c in comparacion if c["regresion"]}
+        self.assertEqual(regresiones, {("guardar", "ops_s"), ("guardar", "p95_ms")})
+        self.assertNotIn("nueva", {c["operacion"] for c in comparacion})
+
+    def test_main_escribe_resultados_y_detecta_regresiones(self):
+        salida = os.path.join(self.directorio.name, "resultados.json")
+        argumentos = ["--filas", "500", "--operaciones", "10", "--directorio", self.directorio.name]
+        with redirect_stdout(StringIO()), patch("infrastructure.registro.configurar_registro"):
+            self.assertEqual(repositorios.main(argumentos + ["--salida", salida]), 0)
+            with open(salida, encoding="utf-8") as archivo:
+                documento = json.load(archivo)
+            for resultado in documento["resultados"]:
+                if "ops_s" in resultado:
+                    resultado["ops_s"] *= 100
+            with open(salida, "w", encoding="utf-8") as archivo:
+                json.dump(documento, archivo)
+
+            self.assertEqual(repositorios.main(argumentos + ["--linea-base", salida]), 1)
+        self.assertEqual(documento["metadatos"]["operaciones"], 10)
+
+    def test_backend_mongo_no_disponible_se_omite(self):
+        with patch.object(repositorios, "backend_mongo", side_effect=RuntimeError("sin instancia")):
+            documento = repositorios.ejecutar([100], backends=("mongo",), directorio=self.directorio.name)
+
+        self.assertEqual(documento["resultados"], [])
+        self.assertEqual(documento["omitidos"], {"mongo": "sin instancia"})
+
+if __name__ == '__main__':
+    unittest.main()
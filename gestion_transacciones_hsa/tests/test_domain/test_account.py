@@ -1,5 +1,5 @@
 import unittest
-from uuid import uuid4
+from uuid import uuid1, uuid4
 from decimal import Decimal
 from domain.entities.account import Account
 
@@ -78,5 +78,22 @@ class TestAccount(unittest.TestCase):
         with self.assertRaises(ValueError) as context:
             self.account.verificar_limite_diario(Decimal("-600.00"))  # Excede el límite
         self.assertEqual(str(context.exception), "El monto excede el límite diario permitido.")
+
+    def test_valida_uuid_sin_convertir_a_texto(self):
+        self.assertTrue(Account._is_valid_uuid(uuid4()))
+        self.assertTrue(Account._is_valid_uuid(str(uuid4())))
+        self.assertFalse(Account._is_valid_uuid(uuid1()))
+        self.assertFalse(Account._is_valid_uuid("no-es-un-uuid"))
+        with self.assertRaises(ValueError):
+            Account(id=uuid1(), usuario_id=uuid4(), saldo=Decimal("0.00"), limite_diario=Decimal("1.00"))
+
+    def test_desde_almacenamiento(self):
+        id, usuario_id = uuid4(), uuid4()
+
+        cuenta = Account.desde_almacenamiento(id, usuario_id, Decimal("10.00"), Decimal("500.00"), 3)
+
+        self.assertEqual((cuenta.id, cuenta.usuario_id, cuenta.saldo, cuenta.version), (id, usuario_id, Decimal("10.00"), 3))
+        self.assertFalse(hasattr(cuenta, "__dict__"))  # __slots__: sin diccionario por instancia
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,77 @@
+import uuid
+import unittest
+from datetime import datetime
+from decimal import Decimal
+from domain.entities.account import Account
+from domain.entities.transaction import Transaction, TransactionState
+from domain.entities.transaction_type import TransactionType
+from domain.services.async_transaction_service import AsyncTransactionService
+
+
+class FakeAsyncAccountRepository:
+    def __init__(self):
+        self.accounts = {}
+
+    async def obtener_por_id(self, account_id):
+        return self.accounts.get(account_id)
+
+
+class FakeAsyncTransactionRepository:
+    def __init__(self, account_repo):
+        self.transactions = []
+        self.account_repo = account_repo
+
+    async def registrar_con_saldo(self, transaction):
+        """Aplica el monto sobre la cuenta almacenada, como lo haría la base de datos."""
+        account = self.account_repo.accounts[transaction.cuenta_id]
+        if transaction.tipo == TransactionType.RETIRO and account.saldo + transaction.monto < 0:
+            raise ValueError("Fondos insuficientes para realizar la transacción.")
+        account.saldo += transaction.monto
+        account.version += 1
+        self.transactions.append(transaction)
+        return account.saldo, account.version
+
+    async def iterar_por_cuenta(self, cuenta_id):
+        for t in self.transactions:
+            if t.cuenta_id == cuenta_id:
+                yield t
+
+
+class TestAsyncTransactionService(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.account_repo = FakeAsyncAccountRepository()
+        self.transaction_repo = FakeAsyncTransactionRepository(self.account_repo)
+        self.service = AsyncTransactionService(self.transaction_repo, self.account_repo)
+        self.account = Account(uuid.uuid4(), uuid.uuid4(), Decimal("100.00"), Decimal("1000.00"))
+        self.account_repo.accounts[self.account.id] = self.account
+
+    def _transaccion(self, monto, tipo):
+        return Transaction(uuid.uuid4(), self.account.id, Decimal(monto), tipo, TransactionState.PENDIENTE, datetime.now())
+
+    async def test_procesar_deposito_actualiza_saldo(self):
+        await self.service.procesar_transaccion(self._transaccion("50.00", TransactionType.DEPOSITO))
+
+        self.assertEqual(self.account.saldo, Decimal("150.00"))
+        self.assertEqual(len(self.transaction_repo.transactions), 1)
+
+    async def test_retiro_sin_fondos(self):
+        with self.assertRaises(ValueError):
+            await self.service.procesar_transaccion(self._transaccion("-150.00", TransactionType.RETIRO))
+        self.assertEqual(self.transaction_repo.transactions, [])
+
+    async def test_cuenta_inexistente(self):
+        transaccion = Transaction(uuid.uuid4(), uuid.uuid4(), Decimal("10.00"), TransactionType.DEPOSITO,
+                                  TransactionState.PENDIENTE, datetime.now())
+        with self.assertRaises(ValueError):
+            await self.service.procesar_transaccion(transaccion)
+
+    async def test_iterar_transacciones_por_cuenta(self):
+        await self.service.procesar_transaccion(self._transaccion("10.00", TransactionType.DEPOSITO))
+
+        recorrido = await self.service.iterar_transacciones_por_cuenta(self.account.id)
+
+        self.assertEqual([t.monto async for t in recorrido], [Decimal("10.00")])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -39,5 +39,14 @@ class TestITransactionRepository(unittest.TestCase):
         self.assertEqual(resultado, transacciones_esperadas)
         self.repositorio.listar_por_cuenta.assert_called_once_with(self.cuenta_id)
 
+    def test_registrar_con_saldo_es_abstracto(self):
+        """Una implementación sin registrar_con_saldo no se puede instanciar"""
+        metodos = {nombre: lambda self, *args: None
+                   for nombre in ITransactionRepository.__abstractmethods__ - {"registrar_con_saldo"}}
+        SinSaldo = type("SinSaldo", (ITransactionRepository,), metodos)
+        with self.assertRaises(TypeError):
+            SinSaldo()
+        type("ConSaldo", (SinSaldo,), {"registrar_con_saldo": lambda self, t: None})()
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
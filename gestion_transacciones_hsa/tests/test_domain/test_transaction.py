@@ -0,0 +1,42 @@
+import unittest
+from datetime import datetime
+from decimal import Decimal
+from uuid import uuid4
+from domain.entities.transaction import Transaction, TransactionState
+from domain.entities.transaction_type import TransactionType
+
+class TestTransaction(unittest.TestCase):
+    def test_tipo_desde_texto(self):
+        self.assertIs(TransactionType.from_string("DEPOSITO"), TransactionType.DEPOSITO)
+        self.assertIs(TransactionType.from_string("retiro"), TransactionType.RETIRO)
+        for invalido in ("TRANSFERENCIA", "", None, 1):
+            with self.assertRaises(ValueError):
+                TransactionType.from_string(invalido)
+
+    def test_estado_desde_texto(self):
+        self.assertIs(TransactionState.from_string("APROBADA"), TransactionState.APROBADA)
+        self.assertIs(TransactionState.from_string("pendiente"), TransactionState.PENDIENTE)
+        with self.assertRaises(ValueError) as contexto:
+            TransactionState.from_string("ANULADA")
+        self.assertIn("Estados válidos", str(contexto.exception))
+
+    def test_constructor_convierte_texto(self):
+        transaccion = Transaction(uuid4(), uuid4(), Decimal("5.00"), "deposito", "aprobada")
+
+        self.assertIs(transaccion.tipo, TransactionType.DEPOSITO)
+        self.assertIs(transaccion.estado, TransactionState.APROBADA)
+        self.assertIsNotNone(transaccion.fecha)
+
+    def test_desde_almacenamiento(self):
+        id, cuenta_id, fecha = uuid4(), uuid4(), datetime(2024, 1, 1)
+
+        transaccion = Transaction.desde_almacenamiento(
+            id, cuenta_id, Decimal("5.00"), TransactionType.RETIRO, TransactionState.RECHAZADA, fecha
+        )
+
+        self.assertEqual((transaccion.id, transaccion.cuenta_id, transaccion.fecha), (id, cuenta_id, fecha))
+        self.assertIs(transaccion.estado, TransactionState.RECHAZADA)
+        self.assertFalse(hasattr(transaccion, "__dict__"))  # __slots__: sin diccionario por instancia
+
+if __name__ == '__main__':
+    unittest.main()
@@ -8,12 +8,25 @@ from decimal import Decimal
 
 
 class FakeTransactionRepository:
-    def __init__(self):
+    def __init__(self, account_repo=None):
         self.transactions = []
+        self.account_repo = account_repo
 
     def guardar(self, transaction):
         self.transactions.append(transaction)
 
+    def registrar_con_saldo(self, transaction):
+        """Aplica el monto sobre la cuenta almacenada, como lo haría la base de datos."""
+        account = self.account_repo.accounts.get(transaction.cuenta_id)
+        if account is None:
+            raise ValueError(f"La cuenta con ID {transaction.cuenta_id} no existe.")
+        if transaction.tipo == TransactionType.RETIRO and account.saldo + transaction.monto < 0:
+            raise ValueError("Fondos insuficientes para realizar la transacción.")
+        account.saldo += transaction.monto
+        account.version += 1
+        self.guardar(transaction)
+        return account.saldo, account.version
+
     def get_all_by_account_id(self, account_id):
         return [t for t in self.transactions if t.account_id == account_id]
 
@@ -39,8 +52,8 @@ class FakeAccountRepository:
 
 class TestTransactionService(unittest.TestCase):
     def setUp(self):
-        self.transaction_repo = FakeTransactionRepository()
         self.account_repo = FakeAccountRepository()
+        self.transaction_repo = FakeTransactionRepository(self.account_repo)
         self.transaction_service = TransactionService(self.transaction_repo, self.account_repo)
 
         valid_user_id = uuid.uuid4()
@@ -95,6 +108,21 @@ class TestTransactionService(unittest.TestCase):
             self.transaction_service.procesar_transaccion(transaction)
         self.assertEqual(str(context.exception), "Fondos insuficientes para realizar la transacción.")
 
+    def test_saldo_y_version_vienen_del_repositorio(self):
+        """
+        Prueba que la cuenta leída queda con el saldo y la versión persistidos por el repositorio.
+        """
+        leida = Account(self.valid_account_id, self.valid_user_id, Decimal(500.0), Decimal(1000.0))
+        self.account_repo.obtener_por_id = lambda account_id: leida  # Copia leída antes de otro retiro
+        self.account_repo.accounts[self.valid_account_id].saldo = Decimal(100.0)
+
+        transaction = Transaction("tx129", self.valid_account_id, Decimal(-50.0), TransactionType.RETIRO, TransactionState.PENDIENTE)
+        self.transaction_service.procesar_transaccion(transaction)
+
+        self.assertEqual(leida.saldo, Decimal(50.0))
+        self.assertEqual(leida.version, 1)
+        self.assertEqual(len(self.transaction_repo.transactions), 1)
+
     def test_transaccion_con_cuenta_inexistente(self):
         """
         Prueba que procesar_transaccion lanza un error si la cuenta no existe.
@@ -0,0 +1,123 @@
+# Importación de módulos necesarios para las pruebas
+import unittest  # Framework de pruebas unitarias
+from unittest.mock import MagicMock  # Herramientas para crear mocks
+from datetime import datetime  # Para manejar fechas
+from decimal import Decimal  # Para manejar números decimales precisos
+from uuid import uuid4  # Para generar IDs únicos
+from bson.binary import Binary  # UUID binario del formato v2
+from pymongo import ASCENDING  # Orden de los listados por cuenta
+from pymongo.asynchronous.collection import AsyncCollection  # Tipo de colección asíncrona
+from infrastructure.db import codificacion_mongo  # Documentos v2 de prueba
+from infrastructure.repositories.async_mongo_transaction_repository import AsyncMongoTransactionRepository  # Clase a probar
+from domain.entities.transaction import Transaction, TransactionType, TransactionState  # Entidades
+
+def _coleccion(nombre: str) -> MagicMock:
+    """Colección asíncrona simulada: find_one, update_one, etc. quedan como AsyncMock."""
+    coleccion = MagicMock(spec=AsyncCollection)
+    coleccion.name = nombre
+    return coleccion
+
+def _cursor(documentos: list) -> MagicMock:
+    """Cursor asíncrono simulado que recorre los documentos dados."""
+    cursor = MagicMock()
+    cursor.__aiter__.return_value = documentos
+    return cursor
+
+class TestAsyncMongoTransactionRepository(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        """Se ejecuta antes de cada prueba: base inyectada, sin migraciones de índices."""
+        self.db = MagicMock()
+        self.db.transacciones = _coleccion("transacciones")
+        self.db.accounts = _coleccion("accounts")
+        self.db.limites_diarios = _coleccion("limites_diarios")
+        self.db.schema_version = _coleccion("schema_version")
+        self.db.schema_version.find_one.return_value = {"_id": "v2"}  # Ambas colecciones ya en formato v2
+        self.repository = AsyncMongoTransactionRepository(db=self.db)
+
+    def _transaccion(self, monto: str, tipo=TransactionType.DEPOSITO, estado=TransactionState.APROBADA) -> Transaction:
+        return Transaction(uuid4(), uuid4(), Decimal(monto), tipo, estado, datetime(2024, 1, 1))
+
+    async def test_guardar_transaccion(self):
+        transaccion = self._transaccion('100.50')
+
+        await self.repository.guardar(transaccion)
+
+        self.db.transacciones.replace_one.assert_awaited_once()
+        args = self.db.transacciones.replace_one.call_args[0]
+        self.assertEqual(args[0], {"_id": Binary.from_uuid(transaccion.id)})
+        self.assertEqual(args[1]["monto"], 10050)  # Centavos enteros
+
+    async def test_iterar_por_cuenta(self):
+        transaccion = self._transaccion('10.00')
+        self.db.transacciones.find.return_value = _cursor([codificacion_mongo.transaccion_a_documento(transaccion)])
+
+        resultado = await self.repository.listar_por_cuenta(transaccion.cuenta_id)
+
+        self.assertEqual(len(resultado), 1)
+        self.assertEqual(resultado[0].id, transaccion.id)
+        self.assertEqual(self.db.transacciones.find.call_args[0][0], {"cuenta_id": Binary.from_uuid(transaccion.cuenta_id)})
+        self.assertEqual(self.db.transacciones.find.call_args[1]["sort"], [("fecha", ASCENDING), ("_id", ASCENDING)])
+
+    async def test_documentos_legados_pendientes(self):
+        self.db.schema_version.find_one.return_value = None
+        self.db.transacciones.find_one.return_value = {"_id": "legado"}
+
+        with self.assertRaises(RuntimeError):
+            await self.repository.obtener_por_id(uuid4())
+
+    async def test_registrar_con_saldo(self):
+        transaccion = self._transaccion('25.00')
+        self.db.accounts.find_one_and_update.return_value = {"saldo": 12500, "version": 3, "limite_diario": 100000}
+        self.db.limites_diarios.find_one_and_update.return_value = {"acumulado": 2500}
+
+        saldo, version = await self.repository.registrar_con_saldo(transaccion)
+
+        self.assertEqual((saldo, version), (Decimal('125.00'), 3))
+        self.db.transacciones.replace_one.assert_awaited_once()
+        self.db.accounts.update_one.assert_not_awaited()
+
+    async def test_registrar_con_saldo_rechazada_no_acumula(self):
+        transaccion = self._transaccion('25.00', estado=TransactionState.RECHAZADA)
+        self.db.accounts.find_one.return_value = {"saldo": 12500, "version": 3, "limite_diario": 100000}
+
+        await self.repository.registrar_con_saldo(transaccion)
+
+        self.db.limites_diarios.find_one_and_update.assert_not_awaited()
+        self.db.transacciones.replace_one.assert_awaited_once()
+
+    async def test_registrar_con_saldo_pendiente_y_rechazada(self):
+        self.db.accounts.find_one.return_value = {"saldo": 1000, "version": 3, "limite_diario": 100000}
+
+        for estado in (TransactionState.PENDIENTE, TransactionState.RECHAZADA):
+            transaccion = self._transaccion('-25.00', TransactionType.RETIRO, estado)
+            # Se guarda sin mover saldo ni versión, aunque el retiro supere los fondos
+            self.assertEqual(await self.repository.registrar_con_saldo(transaccion), (Decimal('10.00'), 3))
+
+        self.db.accounts.find_one_and_update.assert_not_awaited()
+        self.db.accounts.update_one.assert_not_awaited()
+        self.assertEqual(self.db.transacciones.replace_one.await_count, 2)
+
+    async def test_registrar_con_saldo_sin_fondos(self):
+        transaccion = self._transaccion('-25.00', TransactionType.RETIRO)
+        self.db.accounts.find_one_and_update.return_value = None
+        self.db.accounts.find_one.return_value = {"_id": Binary.from_uuid(transaccion.cuenta_id)}
+
+        with self.assertRaises(ValueError):
+            await self.repository.registrar_con_saldo(transaccion)
+        self.db.transacciones.replace_one.assert_not_awaited()
+
+    async def test_registrar_con_saldo_compensa_si_falla_el_guardado(self):
+        transaccion = self._transaccion('25.00')
+        self.db.accounts.find_one_and_update.return_value = {"saldo": 12500, "version": 3, "limite_diario": 100000}
+        self.db.limites_diarios.find_one_and_update.return_value = {"acumulado": 2500}
+        self.db.transacciones.replace_one.side_effect = RuntimeError("sin conexión")
+
+        with self.assertRaises(RuntimeError):
+            await self.repository.registrar_con_saldo(transaccion)
+
+        self.db.accounts.update_one.assert_awaited_once()
+        self.assertEqual(self.db.accounts.update_one.call_args[0][1], {"$inc": {"saldo": -2500, "version": 1}})
+        self.db.limites_diarios.update_one.assert_awaited_once()
+
+if __name__ == '__main__':
+    unittest.main()
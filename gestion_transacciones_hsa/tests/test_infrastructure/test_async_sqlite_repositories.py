@@ -0,0 +1,138 @@
+# tests/test_infrastructure/test_async_sqlite_repositories.py
+import asyncio
+import os
+import tempfile
+import threading
+import unittest
+from datetime import datetime, timedelta
+from decimal import Decimal
+from uuid import uuid4
+from infrastructure.db.sqlite_pool import SQLitePool
+from infrastructure.repositories.async_sqlite_account_repository import AsyncSQLiteAccountRepository
+from infrastructure.repositories.async_sqlite_transaction_repository import AsyncSQLiteTransactionRepository
+from domain.entities.account import Account
+from domain.entities.transaction import Transaction, TransactionType, TransactionState
+
+class TestAsyncSQLiteRepositories(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        """Se ejecuta antes de cada prueba: base en archivo con WAL, como en producción."""
+        self.directorio = tempfile.TemporaryDirectory()
+        self.pool = SQLitePool(os.path.join(self.directorio.name, "async.db"))
+        self.cuentas = AsyncSQLiteAccountRepository(pool=self.pool)
+        self.repository = AsyncSQLiteTransactionRepository(pool=self.pool)
+
+    def tearDown(self):
+        """Se ejecuta después de cada prueba."""
+        self.pool.cerrar()
+        self.directorio.cleanup()
+
+    async def _cuenta(self, saldo: str, limite: str = '10000.00') -> Account:
+        cuenta = Account(uuid4(), uuid4(), Decimal(saldo), Decimal(limite))
+        await self.cuentas.guardar(cuenta)
+        return cuenta
+
+    def _transaccion(self, cuenta: Account, monto: str, tipo=TransactionType.DEPOSITO, fecha=None) -> Transaction:
+        return Transaction(uuid4(), cuenta.id, Decimal(monto), tipo, TransactionState.APROBADA,
+                           fecha or datetime(2024, 1, 1))
+
+    async def test_guardar_y_obtener(self):
+        cuenta = await self._cuenta('50.00')
+        transaccion = self._transaccion(cuenta, '10.00')
+
+        await self.repository.guardar(transaccion)
+
+        self.assertEqual((await self.cuentas.obtener_por_id(cuenta.id)).saldo, Decimal('50.00'))
+        self.assertEqual((await self.repository.obtener_por_id(transaccion.id)).monto, Decimal('10.00'))
+
+    async def test_retiros_concurrentes_no_dejan_saldo_negativo(self):
+        cuenta = await self._cuenta('100.00')
+        retiros = [self._transaccion(cuenta, '-3.00', TransactionType.RETIRO) for _ in range(40)]
+
+        resultados = await asyncio.gather(
+            *(self.repository.registrar_con_saldo(t) for t in retiros), return_exceptions=True
+        )
+
+        exitosos = [r for r in resultados if not isinstance(r, Exception)]
+        self.assertEqual(len(exitosos), 33)
+        self.assertTrue(all(isinstance(r, ValueError) for r in resultados if isinstance(r, Exception)))
+        self.assertEqual((await self.cuentas.obtener_por_id(cuenta.id)).saldo, Decimal('1.00'))
+
+    async def test_operaciones_corren_en_el_hilo_de_e_s_del_pool(self):
+        hilos = await asyncio.gather(*(self.pool.ejecutar(lambda: threading.current_thread().name) for _ in range(5)))
+
+        self.assertEqual(len(set(hilos)), 1)
+        self.assertTrue(hilos[0].startswith("sqlite-io"))
+        self.assertNotEqual(hilos[0], threading.current_thread().name)
+
+    async def test_iterar_por_cuenta_por_lotes(self):
+        cuenta = await self._cuenta('0.00')
+        inicio = datetime(2024, 1, 1)
+        for i in range(7):
+            await self.repository.guardar(self._transaccion(cuenta, f'{i + 1}.00', fecha=inicio + timedelta(minutes=i)))
+
+        montos = [t.monto async for t in self.repository.iterar_por_cuenta(cuenta.id, tamano_lote=3)]
+
+        self.assertEqual(montos, [Decimal(f'{i + 1}.00') for i in range(7)])
+        self.assertEqual(self.pool.estadisticas()["conexiones_libres"], self.pool.estadisticas()["conexiones_creadas"])
+
+    async def test_cerrar_el_recorrido_devuelve_la_conexion(self):
+        cuenta = await self._cuenta('0.00')
+        for _ in range(5):
+            await self.repository.guardar(self._transaccion(cuenta, '1.00'))
+
+        recorrido = self.repository.iterar_por_cuenta(cuenta.id, tamano_lote=2)
+        await recorrido.__anext__()
+        await recorrido.aclose()
+
+        estadisticas = self.pool.estadisticas()
+        self.assertEqual(estadisticas["conexiones_libres"], estadisticas["conexiones_creadas"])
+
+    async def test_iterar_proyecciones_por_lotes(self):
+        cuenta = await self._cuenta('0.00')
+        for i in range(5):
+            await self.repository.guardar(self._transaccion(cuenta, f'{i + 1}.50', fecha=datetime(2024, 1, 1) + timedelta(days=i)))
+
+        proyecciones = [p async for p in self.repository.iterar_proyecciones_por_cuenta(cuenta.id, tamano_lote=2)]
+
+        self.assertEqual([p[2] for p in proyecciones], [1.5, 2.5, 3.5, 4.5, 5.5])
+        self.assertEqual(proyecciones[0][1:], (str(cuenta.id), 1.5, "DEPOSITO", "APROBADA", "2024-01-01"))
+        estadisticas = self.pool.estadisticas()
+        self.assertEqual(estadisticas["conexiones_libres"], estadisticas["conexiones_creadas"])
+
+    async def test_mas_recorridos_abiertos_que_conexiones(self):
+        # Cada lote devuelve su conexión: tres recorridos abiertos a la vez no agotan un pool de dos
+        pool = SQLitePool(os.path.join(self.directorio.name, "pequeno.db"), max_conexiones=2, timeout=1)
+        self.addCleanup(pool.cerrar)
+        cuentas = AsyncSQLiteAccountRepository(pool=pool)
+        repository = AsyncSQLiteTransactionRepository(pool=pool)
+        cuenta = Account(uuid4(), uuid4(), Decimal('0.00'), Decimal('10000.00'))
+        await cuentas.guardar(cuenta)
+        for i in range(30):
+            await repository.guardar(self._transaccion(cuenta, f'{i + 1}.00', fecha=datetime(2024, 1, 1) + timedelta(minutes=i)))
+
+        recorridos = [repository.iterar_proyecciones_por_cuenta(cuenta.id, tamano_lote=10) for _ in range(3)]
+        primeras = [await recorrido.__anext__() for recorrido in recorridos]  # Los tres quedan abiertos
+        async def consumir(recorrido):
+            return [p async for p in recorrido]
+        restantes = await asyncio.gather(*(consumir(recorrido) for recorrido in recorridos))
+
+        for primera, resto in zip(primeras, restantes):
+            self.assertEqual([p[2] for p in [primera] + resto], [float(i + 1) for i in range(30)])
+        self.assertEqual(pool.estadisticas()["conexiones_libres"], pool.estadisticas()["conexiones_creadas"])
+
+    async def test_resumen_y_pagina(self):
+        cuenta = await self._cuenta('0.00')
+        for i in range(3):
+            await self.repository.registrar_con_saldo(
+                self._transaccion(cuenta, '10.00', fecha=datetime(2024, 1, 1) + timedelta(minutes=i))
+            )
+
+        resumen = await self.repository.resumir_aprobadas_por_cuenta(cuenta.id)
+        pagina = await self.repository.listar_pagina_por_cuenta(cuenta.id, 2)
+
+        self.assertEqual(resumen.num_depositos, 3)
+        self.assertEqual(len(pagina), 2)
+        self.assertGreater(pagina[0].fecha, pagina[1].fecha)
+
+if __name__ == '__main__':
+    unittest.main()
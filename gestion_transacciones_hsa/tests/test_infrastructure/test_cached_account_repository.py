@@ -0,0 +1,188 @@
+# tests/test_infrastructure/test_cached_account_repository.py
+import unittest  # Framework de pruebas unitarias
+import sqlite3  # Base en memoria para la prueba con SQLite
+from unittest.mock import Mock  # Repositorio envuelto simulado
+from datetime import datetime  # Fecha de las transacciones
+from decimal import Decimal  # Saldos
+from uuid import uuid4  # IDs únicos
+from infrastructure.repositories.cached_account_repository import CachedAccountRepository  # Clase a probar
+from infrastructure.repositories.sqlite_account_repository import SQLiteAccountRepository
+from infrastructure.repositories.sqlite_transaction_repository import SQLiteTransactionRepository
+from domain.entities.account import Account  # Entidad de cuenta
+from domain.entities.transaction import Transaction, TransactionType, TransactionState
+
+class RelojFalso:
+    """Reloj controlado por la prueba."""
+    def __init__(self):
+        self.ahora = 0.0
+
+    def __call__(self) -> float:
+        return self.ahora
+
+class TestCachedAccountRepository(unittest.TestCase):
+    def setUp(self):
+        """Se ejecuta antes de cada prueba."""
+        self.repositorio = Mock()
+        self.cuentas = {}
+        self.repositorio.obtener_por_id.side_effect = self._obtener
+        self.reloj = RelojFalso()
+        self.cache = CachedAccountRepository(self.repositorio, tamano_maximo=2, ttl=10, ttl_ausentes=1, reloj=self.reloj)
+
+    def _obtener(self, id):
+        if id not in self.cuentas:
+            raise ValueError(f"No se encontró la cuenta con id {id}")
+        return self.cuentas[id]
+
+    def _cuenta(self, saldo: str = '100.00') -> Account:
+        cuenta = Account(uuid4(), uuid4(), Decimal(saldo), Decimal('1000.00'), version=1)
+        self.cuentas[cuenta.id] = cuenta
+        return cuenta
+
+    def test_lecturas_repetidas_se_sirven_desde_memoria(self):
+        cuenta = self._cuenta()
+
+        for _ in range(3):
+            self.assertEqual(self.cache.obtener_por_id(cuenta.id).saldo, Decimal('100.00'))
+
+        self.repositorio.obtener_por_id.assert_called_once_with(cuenta.id)
+        estadisticas = self.cache.estadisticas()
+        self.assertEqual((estadisticas["hits"], estadisticas["misses"]), (2, 1))
+
+    def test_modificar_la_copia_no_altera_el_cache(self):
+        cuenta = self._cuenta()
+
+        self.cache.obtener_por_id(cuenta.id).saldo = Decimal('0.00')
+
+        self.assertEqual(self.cache.obtener_por_id(cuenta.id).saldo, Decimal('100.00'))
+
+    def test_vence_por_ttl(self):
+        cuenta = self._cuenta()
+        self.cache.obtener_por_id(cuenta.id)
+
+        self.reloj.ahora = 11
+        self.cache.obtener_por_id(cuenta.id)
+
+        self.assertEqual(self.repositorio.obtener_por_id.call_count, 2)
+        self.assertEqual(self.cache.estadisticas()["vencidas"], 1)
+
+    def test_desaloja_la_menos_usada(self):
+        a, b, c = self._cuenta(), self._cuenta(), self._cuenta()
+        self.cache.obtener_por_id(a.id)
+        self.cache.obtener_por_id(b.id)
+        self.cache.obtener_por_id(a.id)  # b pasa a ser la menos usada
+
+        self.cache.obtener_por_id(c.id)
+        self.cache.obtener_por_id(a.id)
+        self.cache.obtener_por_id(b.id)
+
+        self.assertEqual([llamada.args[0] for llamada in self.repositorio.obtener_por_id.call_args_list], [a.id, b.id, c.id, b.id])
+        self.assertEqual(self.cache.estadisticas()["desalojos"], 2)
+
+    def test_cache_negativo(self):
+        cuenta_id = uuid4()
+        for _ in range(2):
+            with self.assertRaises(ValueError):
+                self.cache.obtener_por_id(cuenta_id)
+        self.repositorio.obtener_por_id.assert_called_once()
+
+        self.reloj.ahora = 2  # Vence antes que las cuentas existentes
+        with self.assertRaises(ValueError):
+            self.cache.obtener_por_id(cuenta_id)
+        self.assertEqual(self.repositorio.obtener_por_id.call_count, 2)
+
+    def test_guardar_invalida(self):
+        cuenta = self._cuenta()
+        self.cache.obtener_por_id(cuenta.id)
+
+        self.cache.guardar(cuenta)
+        self.cache.obtener_por_id(cuenta.id)
+
+        self.repositorio.guardar.assert_called_once_with(cuenta)
+        self.assertEqual(self.repositorio.obtener_por_id.call_count, 2)
+        self.assertEqual(self.cache.estadisticas()["invalidaciones"], 1)
+
+    def test_guardar_fallido_tambien_invalida(self):
+        cuenta = self._cuenta()
+        self.cache.obtener_por_id(cuenta.id)
+        self.repositorio.guardar.side_effect = RuntimeError("conflicto")
+
+        with self.assertRaises(RuntimeError):
+            self.cache.guardar(cuenta)
+
+        self.assertEqual(self.cache.estadisticas()["entradas"], 0)
+
+    def test_actualizar_saldo_solo_con_version_posterior(self):
+        cuenta = self._cuenta()
+        self.cache.obtener_por_id(cuenta.id)
+
+        self.cache.actualizar_saldo(cuenta.id, Decimal('150.00'), 3)
+        self.cache.actualizar_saldo(cuenta.id, Decimal('120.00'), 2)  # Llega tarde: se ignora
+
+        en_cache = self.cache.obtener_por_id(cuenta.id)
+        self.assertEqual((en_cache.saldo, en_cache.version), (Decimal('150.00'), 3))
+        self.repositorio.obtener_por_id.assert_called_once()
+
+    def test_lectura_cruzada_con_una_escritura_no_se_guarda(self):
+        cuenta = self._cuenta()
+
+        def leer_mientras_se_escribe(id):
+            self.cache.actualizar_saldo(id, Decimal('0.00'), 5)  # Confirmada durante la lectura
+            return cuenta
+        self.repositorio.obtener_por_id.side_effect = leer_mientras_se_escribe
+
+        self.cache.obtener_por_id(cuenta.id)
+
+        self.assertEqual(self.cache.estadisticas()["entradas"], 0)
+
+    def test_escrituras_de_otra_cuenta_no_descartan_la_lectura(self):
+        cuenta, otra = self._cuenta(), self._cuenta()
+
+        def leer_mientras_se_escribe_otra(id):
+            self.cache.actualizar_saldo(otra.id, Decimal('0.00'), 5)
+            self.cache.invalidar(otra.id)
+            return cuenta
+        self.repositorio.obtener_por_id.side_effect = leer_mientras_se_escribe_otra
+
+        self.cache.obtener_por_id(cuenta.id)
+
+        self.assertEqual(self.cache.estadisticas()["entradas"], 1)
+        self.assertEqual(self.cache._lecturas, {})  # Sin lecturas en curso no queda estado por cuenta
+
+    def test_lectura_fallida_no_se_guarda(self):
+        cuenta = self._cuenta()
+        self.repositorio.obtener_por_id.side_effect = ConnectionError("sin base")
+
+        with self.assertRaises(ConnectionError):
+            self.cache.obtener_por_id(cuenta.id)
+
+        self.assertEqual(self.cache.estadisticas()["entradas"], 0)
+        self.assertEqual(self.cache._lecturas, {})
+
+class TestCacheConSQLite(unittest.TestCase):
+    def setUp(self):
+        """Se ejecuta antes de cada prueba: el caché se mantiene con los saldos confirmados."""
+        self.connection = sqlite3.connect(':memory:')
+        self.cache = CachedAccountRepository(SQLiteAccountRepository(connection=self.connection))
+        self.transacciones = SQLiteTransactionRepository(
+            connection=self.connection, al_cambiar_saldo=self.cache.actualizar_saldo
+        )
+
+    def tearDown(self):
+        """Se ejecuta después de cada prueba."""
+        self.connection.close()
+
+    def test_registrar_con_saldo_actualiza_la_cuenta_en_cache(self):
+        cuenta = Account(uuid4(), uuid4(), Decimal('100.00'), Decimal('1000.00'))
+        self.cache.guardar(cuenta)
+        self.cache.obtener_por_id(cuenta.id)
+
+        self.transacciones.registrar_con_saldo(Transaction(
+            uuid4(), cuenta.id, Decimal('-40.00'), TransactionType.RETIRO, TransactionState.APROBADA, datetime.now()
+        ))
+
+        en_cache = self.cache.obtener_por_id(cuenta.id)
+        self.assertEqual((en_cache.saldo, en_cache.version), (Decimal('60.00'), 2))
+        self.assertEqual(self.cache.estadisticas()["misses"], 1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,64 @@
+# tests/test_infrastructure/test_codificacion.py
+import unittest
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from uuid import uuid4
+from infrastructure.db import codificacion
+from domain.entities.transaction import TransactionType, TransactionState
+
+class TestCodificacion(unittest.TestCase):
+    def test_centavos(self):
+        self.assertEqual(codificacion.a_centavos(Decimal('100.50')), 10050)
+        self.assertEqual(codificacion.a_centavos(Decimal('-25.00')), -2500)
+        self.assertEqual(codificacion.a_centavos(1000.5), 100050)  # float del formato anterior de MongoDB
+        self.assertEqual(codificacion.a_centavos('0.125'), 12)      # Redondeo igual que f"{monto:.2f}"
+        self.assertEqual(str(codificacion.desde_centavos(10050)), '100.50')
+        self.assertEqual(str(codificacion.desde_centavos(0)), '0.00')
+
+    def test_uuid(self):
+        id = uuid4()
+        self.assertEqual(len(codificacion.uuid_a_bytes(id)), 16)
+        self.assertEqual(codificacion.uuid_a_bytes(str(id)), id.bytes)
+        self.assertEqual(codificacion.bytes_a_uuid(id.bytes), id)
+        self.assertEqual(codificacion.bytes_a_uuid(memoryview(id.bytes)), id)
+
+    def test_uuid_compartido(self):
+        id = uuid4()
+
+        primero = codificacion.bytes_a_uuid_compartido(bytes(id.bytes))
+        segundo = codificacion.bytes_a_uuid_compartido(bytes(id.bytes))
+
+        self.assertEqual(primero, id)
+        self.assertIs(primero, segundo)
+
+    def test_textos_de_proyeccion(self):
+        id = uuid4()
+        self.assertEqual(codificacion.bytes_a_texto_uuid(id.bytes), str(id))
+        fecha = datetime(1969, 12, 31, 23, 59)
+        self.assertEqual(codificacion.epoch_a_dia_iso(codificacion.fecha_a_epoch(fecha)), "1969-12-31")
+        self.assertEqual(codificacion.epoch_a_dia_iso(codificacion.fecha_a_epoch(datetime(2024, 2, 29, 12))), "2024-02-29")
+
+    def test_fechas(self):
+        fecha = datetime(2024, 1, 2, 10, 30, 0, 123456)
+        epoch = codificacion.fecha_a_epoch(fecha)
+        self.assertEqual(epoch, 1704191400123456)
+        self.assertEqual(codificacion.epoch_a_fecha(epoch), fecha)
+        # Las fechas con zona horaria se normalizan a UTC
+        con_zona = datetime(2024, 1, 2, 5, 30, 0, 123456, tzinfo=timezone(timedelta(hours=-5)))
+        self.assertEqual(codificacion.fecha_a_epoch(con_zona), epoch)
+
+    def test_codigos(self):
+        for tipo in TransactionType:
+            self.assertIs(codificacion.TIPOS_POR_CODIGO[codificacion.codigo_tipo(tipo)], tipo)
+        for estado in TransactionState:
+            self.assertIs(codificacion.ESTADOS_POR_CODIGO[codificacion.codigo_estado(estado)], estado)
+        self.assertEqual(codificacion.codigo_estado('pendiente'), 1)
+
+    def test_es_aprobada(self):
+        self.assertTrue(codificacion.es_aprobada(TransactionState.APROBADA))
+        self.assertTrue(codificacion.es_aprobada("APROBADA"))  # Estado en texto de los DTO
+        self.assertFalse(codificacion.es_aprobada(TransactionState.RECHAZADA))
+        self.assertFalse(codificacion.es_aprobada("pendiente"))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,83 @@
+# tests/test_infrastructure/test_limites_diarios.py
+import sqlite3
+import unittest
+from datetime import datetime, timedelta
+from decimal import Decimal
+from uuid import uuid4
+from infrastructure.db import codificacion, limites_diarios
+from infrastructure.repositories.sqlite_account_repository import SQLiteAccountRepository
+from infrastructure.repositories.sqlite_transaction_repository import SQLiteTransactionRepository
+from domain.entities.account import Account
+from domain.entities.transaction import Transaction, TransactionType, TransactionState
+
+class TestLimitesDiarios(unittest.TestCase):
+    def setUp(self):
+        """Se ejecuta antes de cada prueba: una cuenta con límite diario de 100.00."""
+        self.connection = sqlite3.connect(':memory:')
+        self.cuentas = SQLiteAccountRepository(connection=self.connection)
+        self.repository = SQLiteTransactionRepository(connection=self.connection)
+        self.cuenta = Account(uuid4(), uuid4(), Decimal('500.00'), Decimal('100.00'))
+        self.cuentas.guardar(self.cuenta)
+        self.hoy = datetime(2024, 3, 10, 12, 0)
+
+    def tearDown(self):
+        """Se ejecuta después de cada prueba."""
+        self.connection.close()
+
+    def _registrar(self, monto: str, fecha: datetime, tipo=TransactionType.DEPOSITO, estado=TransactionState.APROBADA):
+        transaccion = Transaction(uuid4(), self.cuenta.id, Decimal(monto), tipo, estado, fecha)
+        return self.repository.registrar_con_saldo(transaccion), transaccion
+
+    def _acumulado(self, fecha: datetime) -> int:
+        return limites_diarios.acumulado_del_dia(
+            self.connection, codificacion.uuid_a_bytes(self.cuenta.id), codificacion.fecha_a_dia(fecha)
+        )
+
+    def test_acumula_depositos_y_retiros_del_dia(self):
+        self._registrar('60.00', self.hoy)
+        self._registrar('-30.00', self.hoy + timedelta(hours=1), TransactionType.RETIRO)
+        self.assertEqual(self._acumulado(self.hoy), 9000)
+
+    def test_rechaza_lo_que_supera_el_acumulado(self):
+        self._registrar('70.00', self.hoy)
+
+        with self.assertRaises(ValueError) as contexto:
+            self._registrar('40.00', self.hoy + timedelta(hours=2))
+
+        self.assertEqual(str(contexto.exception), "El monto excede el límite diario permitido.")
+        # El rechazo revierte saldo, transacción y acumulado
+        self.assertEqual(self.cuentas.obtener_por_id(self.cuenta.id).saldo, Decimal('570.00'))
+        self.assertEqual(len(self.repository.listar_por_cuenta(self.cuenta.id)), 1)
+        self.assertEqual(self._acumulado(self.hoy), 7000)
+
+    def test_pendientes_y_rechazadas_no_acumulan(self):
+        self._registrar('60.00', self.hoy)
+        self._registrar('90.00', self.hoy, estado=TransactionState.RECHAZADA)
+        self._registrar('80.00', self.hoy, estado=TransactionState.PENDIENTE)
+
+        # Ni cuentan para el acumulado ni se rechazan por el límite
+        self.assertEqual(self._acumulado(self.hoy), 6000)
+
+    def test_cada_dia_tiene_su_propio_acumulado(self):
+        self._registrar('90.00', self.hoy)
+        self._registrar('90.00', self.hoy + timedelta(days=1))
+        self.assertEqual(self._acumulado(self.hoy + timedelta(days=1)), 9000)
+
+    def test_limpiar_vencidos(self):
+        for dias in range(5):
+            self._registrar('10.00', self.hoy - timedelta(days=dias))
+
+        eliminados = limites_diarios.limpiar_vencidos(self.connection, hoy=codificacion.fecha_a_dia(self.hoy))
+
+        self.assertEqual(eliminados, 2)
+        self.assertEqual(self._acumulado(self.hoy - timedelta(days=3)), 0)
+        self.assertEqual(self._acumulado(self.hoy - timedelta(days=2)), 1000)
+
+    def test_verificacion_es_busqueda_por_clave(self):
+        plan = " ".join(str(fila[-1]) for fila in self.connection.execute(
+            "EXPLAIN QUERY PLAN SELECT acumulado FROM limites_diarios WHERE cuenta_id = ? AND dia = ?", (b"x", 1)
+        ))
+        self.assertIn("PRIMARY KEY", plan)
+
+if __name__ == '__main__':
+    unittest.main()
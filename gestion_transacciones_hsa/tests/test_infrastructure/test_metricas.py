@@ -0,0 +1,100 @@
+# tests/test_infrastructure/test_metricas.py
+import asyncio
+import unittest
+from infrastructure.metricas import Histograma, Metricas, instrumentar
+
+class _Repositorio:
+    def leer(self, valor):
+        return valor * 2
+
+    def fallar(self):
+        raise ValueError("fallo")
+
+    async def leer_async(self, valor):
+        await asyncio.sleep(0)
+        return valor
+
+    async def recorrer(self, n):
+        for i in range(n):
+            yield i
+
+    def _interno(self):
+        return "interno"
+
+class TestMetricas(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        """Se ejecuta antes de cada prueba."""
+        self.metricas = Metricas()
+        self.repositorio = instrumentar(_Repositorio(), "repositorio", self.metricas)
+
+    def _serie(self, operacion: str):
+        return self.metricas._operaciones[("repositorio", f"_Repositorio.{operacion}")]
+
+    def test_sin_metricas_retorna_el_objeto(self):
+        objeto = _Repositorio()
+
+        self.assertIs(instrumentar(objeto, "repositorio", None), objeto)
+
+    def test_desde_entorno(self):
+        self.assertIsNone(Metricas.desde_entorno({}))
+        self.assertFalse(Metricas.desde_entorno({"HSA_METRICAS": "1"}).server_timing)
+        self.assertTrue(Metricas.desde_entorno({"HSA_METRICAS": "true", "HSA_METRICAS_SERVER_TIMING": "1"}).server_timing)
+
+    def test_histograma_acumulado(self):
+        histograma = Histograma((0.1, 1.0))
+        for valor in (0.05, 0.1, 0.5, 3.0):
+            histograma.observar(valor)
+
+        self.assertEqual(histograma.acumulado(), [("0.1", 2), ("1", 3), ("+Inf", 4)])
+        self.assertEqual(histograma.total, 4)
+
+    async def test_mide_llamadas_sincronas_asincronas_y_recorridos(self):
+        self.assertEqual(self.repositorio.leer(2), 4)
+        self.assertEqual(await self.repositorio.leer_async(3), 3)
+        self.assertEqual([i async for i in self.repositorio.recorrer(3)], [0, 1, 2])
+
+        for operacion in ("leer", "leer_async", "recorrer"):
+            histograma, errores = self._serie(operacion)
+            self.assertEqual((histograma.total, errores), (1, 0))
+        self.assertEqual(self.repositorio._interno(), "interno")
+        self.assertEqual(len(self.metricas._operaciones), 3)
+
+    async def test_cuenta_excepciones_pero_no_cierres_anticipados(self):
+        with self.assertRaises(ValueError):
+            self.repositorio.fallar()
+        recorrido = self.repositorio.recorrer(5)
+        await recorrido.__anext__()
+        await recorrido.aclose()
+
+        self.assertEqual(self._serie("fallar")[1], 1)
+        self.assertEqual(self._serie("recorrer")[0].total, 1)
+        self.assertEqual(self._serie("recorrer")[1], 0)
+
+    async def test_traza_acumula_solo_dentro_de_la_peticion(self):
+        self.repositorio.leer(1)
+        with self.metricas.traza() as traza:
+            self.repositorio.leer(1)
+            await self.repositorio.leer_async(1)
+            with self.metricas.medir("servicio", "operacion"):
+                pass
+
+        self.assertEqual(traza.consultas, 2)
+        self.assertEqual(set(traza.duraciones), {"repositorio", "servicio"})
+        self.assertRegex(traza.server_timing(0.01), r"^repositorio;dur=\d+\.\d\d, servicio;dur=\d+\.\d\d, total;dur=10\.00$")
+
+    def test_exportar_formato_prometheus(self):
+        self.repositorio.leer(1)
+        self.metricas.observar_peticion("GET", '/ruta/"x"', 200, 0.02, 3)
+
+        texto = self.metricas.exportar()
+
+        self.assertIn("# TYPE hsa_operacion_duracion_segundos histogram", texto)
+        self.assertIn('hsa_operacion_duracion_segundos_count{capa="repositorio",operacion="_Repositorio.leer"} 1', texto)
+        self.assertIn('hsa_operacion_errores_total{capa="repositorio",operacion="_Repositorio.leer"} 0', texto)
+        self.assertIn('hsa_peticion_duracion_segundos_bucket{metodo="GET",ruta="/ruta/\\"x\\"",estado="200",le="0.025"} 1', texto)
+        self.assertIn('hsa_peticion_consultas_bucket{metodo="GET",ruta="/ruta/\\"x\\"",le="2"} 0', texto)
+        self.assertIn('hsa_peticion_consultas_bucket{metodo="GET",ruta="/ruta/\\"x\\"",le="3"} 1', texto)
+        self.assertTrue(texto.endswith("\n"))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,115 @@
+# tests/test_infrastructure/test_migracion_v2.py
+import os
+import sqlite3
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+from decimal import Decimal
+from uuid import uuid4
+from infrastructure.db import migracion_v2
+from infrastructure.db.migraciones import MigradorSQLite, MIGRACIONES_SQLITE
+from infrastructure.repositories.sqlite_account_repository import SQLiteAccountRepository
+from infrastructure.repositories.sqlite_transaction_repository import SQLiteTransactionRepository
+from domain.entities.transaction import TransactionState
+
+class TestMigracionV2(unittest.TestCase):
+    def setUp(self):
+        """Se ejecuta antes de cada prueba: una base con datos en el formato anterior."""
+        self.directorio = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.directorio.name, "legado.db")
+        self.connection = sqlite3.connect(self.db_path)
+        MigradorSQLite([m for m in MIGRACIONES_SQLITE if m.version < 5]).aplicar(self.connection)  # Esquema anterior a v2
+
+        self.cuenta_id, self.usuario_id = uuid4(), uuid4()
+        self.connection.execute(
+            "INSERT INTO cuentas VALUES (?, ?, ?, ?)",
+            (str(self.cuenta_id), str(self.usuario_id), "1000.50", "500.00")
+        )
+        inicio = datetime(2024, 1, 1)
+        self.transacciones = [
+            (str(uuid4()), str(self.cuenta_id), f"{10 + i}.25", "DEPOSITO", "APROBADA",
+             (inicio + timedelta(hours=i)).isoformat())
+            for i in range(50)
+        ]
+        self.connection.executemany("INSERT INTO transacciones VALUES (?, ?, ?, ?, ?, ?)", self.transacciones)
+        self.connection.commit()
+
+    def tearDown(self):
+        """Se ejecuta después de cada prueba."""
+        self.connection.close()
+        self.directorio.cleanup()
+
+    def test_migra_bajo_demanda_al_leer(self):
+        # Los repositorios sobre una base sin migrar encuentran los datos anteriores
+        cuentas = SQLiteAccountRepository(connection=self.connection)
+        transacciones = SQLiteTransactionRepository(connection=self.connection)
+
+        cuenta = cuentas.obtener_por_id(self.cuenta_id)
+        listadas = transacciones.listar_por_cuenta(self.cuenta_id)
+
+        self.assertEqual(str(cuenta.saldo), "1000.50")
+        self.assertEqual([str(t.id) for t in listadas], [fila[0] for fila in self.transacciones])
+        self.assertEqual(listadas[3].monto, Decimal("13.25"))
+        self.assertEqual(listadas[3].estado, TransactionState.APROBADA)
+
+    def test_listados_completos_no_copian_el_formato_anterior(self):
+        # Un listado no toma el bloqueo de escritura para copiar todo: lo hace el migrador
+        transacciones = SQLiteTransactionRepository(connection=self.connection)
+        self.assertEqual(transacciones.listar_todos(), [])
+        self.assertEqual(SQLiteAccountRepository(connection=self.connection).listar_todos(), [])
+        self.assertFalse(self.connection.in_transaction)
+
+        migracion_v2.ejecutar(self.db_path, tamano_lote=7)
+
+        self.assertEqual(len(transacciones.listar_todos()), 50)
+
+    def test_asegurar_todo_confirma_cada_lote(self):
+        MigradorSQLite().aplicar(self.connection)  # Esquema v2 sobre la base anterior
+        confirmados = []
+        self.connection.set_trace_callback(lambda sql: confirmados.append(sql) if sql == "COMMIT" else None)
+
+        migracion_v2.MigradorDatosV2().asegurar_todo(self.connection, tamano_lote=7)
+
+        self.assertGreaterEqual(len(confirmados), 50 // 7)
+        self.assertFalse(self.connection.in_transaction)
+        self.assertEqual(self.connection.execute("SELECT COUNT(*) FROM transacciones_v2").fetchone()[0], 50)
+
+    def test_no_sobrescribe_escrituras_nuevas(self):
+        # Una cuenta actualizada por la aplicación antes de la copia conserva su valor nuevo
+        cuentas = SQLiteAccountRepository(connection=self.connection)
+        cuenta = cuentas.obtener_por_id(self.cuenta_id)
+        cuenta.saldo = Decimal("1.00")
+        cuentas.guardar(cuenta)
+        self.connection.commit()
+
+        migracion_v2.ejecutar(self.db_path, tamano_lote=7)
+
+        self.assertEqual(cuentas.obtener_por_id(self.cuenta_id).saldo, Decimal("1.00"))
+
+    def test_ejecutar_por_lotes_y_eliminar_legado(self):
+        self.connection.close()
+        copiadas = migracion_v2.ejecutar(self.db_path, tamano_lote=7, eliminar_legado=True)
+        self.connection = sqlite3.connect(self.db_path)
+
+        self.assertEqual(copiadas, {"cuentas": 1, "transacciones": 50})
+        self.assertEqual(self.connection.execute("SELECT COUNT(*) FROM transacciones_v2").fetchone()[0], 50)
+        self.assertIsNone(self.connection.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'transacciones'"
+        ).fetchone())
+        # Sin datos anteriores, el migrador queda en su camino rápido
+        migrador = migracion_v2.MigradorDatosV2()
+        self.assertFalse(migrador.pendiente(self.connection))
+        self.assertTrue(migrador.completada)
+
+    def test_reduce_tamano_de_filas_e_indices(self):
+        migracion_v2.ejecutar(self.db_path)
+        tamano = lambda nombres: self.connection.execute(
+            f"SELECT SUM(payload) FROM dbstat WHERE name IN ({','.join('?' * len(nombres))})", nombres
+        ).fetchone()[0]
+
+        anterior = tamano(("transacciones", "sqlite_autoindex_transacciones_1", "idx_transacciones_cuenta_fecha"))
+        v2 = tamano(("transacciones_v2", "idx_transacciones_v2_cuenta_fecha"))
+        self.assertLess(v2, anterior / 2)
+
+if __name__ == '__main__':
+    unittest.main()
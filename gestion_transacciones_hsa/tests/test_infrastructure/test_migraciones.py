@@ -0,0 +1,76 @@
+# tests/test_infrastructure/test_migraciones.py
+import unittest
+import sqlite3
+from unittest.mock import MagicMock
+from infrastructure.db.migraciones import Migracion, MigradorSQLite, MigradorMongo, MIGRACIONES_SQLITE, MIGRACIONES_MONGO
+
+class TestMigradorSQLite(unittest.TestCase):
+    def setUp(self):
+        """Se ejecuta antes de cada prueba."""
+        self.connection = sqlite3.connect(':memory:')
+        self.migrador = MigradorSQLite()
+
+    def tearDown(self):
+        """Se ejecuta después de cada prueba."""
+        self.connection.close()
+
+    def test_aplica_todas_las_migraciones_en_orden(self):
+        aplicadas = self.migrador.aplicar(self.connection)
+        self.assertEqual(aplicadas, sorted(m.version for m in MIGRACIONES_SQLITE))
+        self.assertEqual(self.migrador.version_actual(self.connection), MIGRACIONES_SQLITE[-1].version)
+
+    def test_es_idempotente(self):
+        self.migrador.aplicar(self.connection)
+        self.assertEqual(self.migrador.aplicar(self.connection), [])
+
+    def test_respeta_tablas_existentes(self):
+        # Una base creada antes del migrador ya tiene las tablas: solo se agregan los índices
+        self.connection.execute("CREATE TABLE cuentas (id TEXT PRIMARY KEY, usuario_id TEXT NOT NULL, saldo DECIMAL(15,2) NOT NULL, limite_diario DECIMAL(15,2) NOT NULL)")
+        self.connection.execute("INSERT INTO cuentas VALUES ('a', 'u', '1.00', '2.00')")
+        self.migrador.aplicar(self.connection)
+        self.assertEqual(self.connection.execute("SELECT COUNT(*) FROM cuentas").fetchone()[0], 1)
+
+    def test_listado_por_cuenta_usa_indice(self):
+        self.migrador.aplicar(self.connection)
+        plan = " ".join(str(fila[-1]) for fila in self.connection.execute(
+            "EXPLAIN QUERY PLAN SELECT * FROM transacciones WHERE cuenta_id = ? ORDER BY fecha, id", ("x",)
+        ))
+        self.assertIn("idx_transacciones_cuenta_fecha", plan)
+        self.assertNotIn("TEMP B-TREE", plan)
+
+    def test_cuentas_por_usuario_usa_indice_cubriente(self):
+        self.migrador.aplicar(self.connection)
+        plan = " ".join(str(fila[-1]) for fila in self.connection.execute(
+            "EXPLAIN QUERY PLAN SELECT * FROM cuentas WHERE usuario_id = ? ORDER BY id", ("x",)
+        ))
+        self.assertIn("COVERING INDEX idx_cuentas_usuario", plan)
+
+    def test_migracion_fallida_se_revierte(self):
+        migrador = MigradorSQLite([
+            Migracion(1, "Tabla t", ["CREATE TABLE t (valor INTEGER)"]),
+            Migracion(2, "Sentencia inválida", ["CREATE TABLA rota"]),
+        ])
+        with self.assertRaises(sqlite3.OperationalError):
+            migrador.aplicar(self.connection)
+        self.assertEqual(migrador.version_actual(self.connection), 1)
+
+    def test_versiones_duplicadas(self):
+        with self.assertRaises(ValueError):
+            MigradorSQLite([Migracion(1, "a", []), Migracion(1, "b", [])])
+
+class TestMigradorMongo(unittest.TestCase):
+    def test_aplica_solo_pendientes(self):
+        db = MagicMock()
+        db.schema_version.find.return_value = [{"_id": m.version} for m in MIGRACIONES_MONGO if m.version != 2]
+
+        aplicadas = MigradorMongo().aplicar(db)
+
+        self.assertEqual(aplicadas, [2])
+        db.transacciones.create_index.assert_called_once_with(
+            [("cuenta_id", 1), ("fecha", 1), ("_id", 1)],
+            name="idx_transacciones_cuenta_fecha"
+        )
+        self.assertEqual(db.schema_version.update_one.call_count, len(aplicadas))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -3,14 +3,19 @@ import unittest                                     # Importa el módulo de prue
 from unittest.mock import patch, MagicMock          # Importa herramientas para crear objetos simulados
 from decimal import Decimal                         # Para manejar números decimales con precisión
 from uuid import uuid4, UUID                        # Para generar y manejar identificadores únicos
+from bson.binary import Binary                      # UUID binario del formato v2
 from pymongo.collection import Collection           # Para tipar la colección de MongoDB
+from pymongo.errors import DuplicateKeyError        # Upsert rechazado por versión desactualizada
 from infrastructure.repositories.mongo_account_repository import MongoAccountRepository  # Clase a probar
+from infrastructure.db.mongo_clientes import cerrar_clientes  # Registro de clientes compartidos
 from domain.entities.account import Account         # Entidad de cuenta que se va a usar
+from domain.repositories.conflicto_concurrencia import ConflictoConcurrencia
 
 class TestMongoAccountRepository(unittest.TestCase):
     def setUp(self):                               # Método que se ejecuta antes de cada prueba
         self.mock_collection = MagicMock(spec=Collection)  # Crea una colección simulada de MongoDB
-        self.patcher = patch('infrastructure.repositories.mongo_account_repository.MongoClient')  # Prepara el parche para MongoClient
+        cerrar_clientes()  # El repositorio debe crear su cliente con el MongoClient simulado
+        self.patcher = patch('infrastructure.db.mongo_clientes.MongoClient')  # Prepara el parche para MongoClient
         self.mock_client = self.patcher.start()    # Inicia el parche
         
         mock_db = MagicMock()                      # Crea una base de datos simulada
@@ -21,6 +26,7 @@ class TestMongoAccountRepository(unittest.TestCase):
 
     def tearDown(self):
         """Se ejecuta después de cada prueba."""
+        cerrar_clientes()
         self.patcher.stop()
 
     def test_guardar_cuenta(self):                 # Prueba el método de guardar cuenta
@@ -31,16 +37,28 @@ class TestMongoAccountRepository(unittest.TestCase):
             limite_diario=Decimal('500.0')        # Establece límite diario
         )
         self.repository.guardar(cuenta)            # Intenta guardar la cuenta
-        self.mock_collection.replace_one.assert_called_once_with(  # Verifica que se llamó al método correcto de MongoDB
-            {"_id": str(cuenta.id)},               # Criterio de búsqueda
-            {                                      # Datos a guardar
-                "_id": str(cuenta.id),
-                "usuario_id": str(cuenta.usuario_id),
-                "saldo": cuenta.saldo,
-                "limite_diario": cuenta.limite_diario
-            },
+        self.mock_collection.update_one.assert_called_once_with(  # Verifica que se llamó al método correcto de MongoDB
+            {"_id": Binary.from_uuid(cuenta.id), "version": {"$in": [0, None]}},  # Criterio de búsqueda
+            {"$set": {                             # Datos a guardar (formato v2)
+                "usuario_id": Binary.from_uuid(cuenta.usuario_id),
+                "saldo": 100000,                   # Centavos enteros
+                "limite_diario": 50000,
+                "version": 1,
+                "v": 2
+            }},
             upsert=True                           # Permite insertar si no existe
         )
+        self.assertEqual(cuenta.version, 1)        # La entidad queda con la versión guardada
+
+    def test_guardar_con_version_desactualizada(self):  # Prueba el control optimista
+        cuenta = Account(id=uuid4(), usuario_id=uuid4(), saldo=Decimal('10.00'),
+                         limite_diario=Decimal('500.00'), version=3)
+        self.mock_collection.update_one.side_effect = DuplicateKeyError("E11000")  # Otra versión en la base
+
+        with self.assertRaises(ConflictoConcurrencia):
+            self.repository.guardar(cuenta)
+        self.assertEqual(self.mock_collection.update_one.call_args[0][0]["version"], 3)
+        self.assertEqual(cuenta.version, 3)
 
     def test_obtener_por_id(self):                # Prueba el método de obtener cuenta por ID
         cuenta_id = uuid4()                        # Genera ID de prueba
@@ -56,7 +74,7 @@ class TestMongoAccountRepository(unittest.TestCase):
         cuenta = self.repository.obtener_por_id(cuenta_id)  # Ejecuta el método a probar
         
         # Verificaciones
-        self.mock_collection.find_one.assert_called_once_with({"_id": str(cuenta_id)})  # Verifica la llamada correcta
+        self.mock_collection.find_one.assert_called_once_with({"_id": Binary.from_uuid(cuenta_id)})  # Verifica la llamada correcta
         self.assertEqual(str(cuenta.id), mock_account["_id"])                           # Verifica ID
         self.assertEqual(str(cuenta.usuario_id), mock_account["usuario_id"])            # Verifica ID de usuario
         self.assertEqual(cuenta.saldo, Decimal(mock_account["saldo"]))                  # Verifica saldo
@@ -69,7 +87,7 @@ class TestMongoAccountRepository(unittest.TestCase):
     def test_obtener_por_usuario(self):           # Prueba obtener cuentas por usuario
         usuario_id = UUID('61c8fd7a-948b-4aef-b0fd-74baf22a4624')  # ID de usuario de prueba
         self.repository.obtener_por_usuario(usuario_id)  # Ejecuta el método
-        self.mock_collection.find.assert_called_with({"usuario_id": str(usuario_id)})  # Verifica la llamada
+        self.mock_collection.find.assert_called_with({"usuario_id": Binary.from_uuid(usuario_id)})  # Verifica la llamada
 
     def test_obtener_cuenta_inexistente(self):    # Prueba el caso de cuenta no existente
         self.mock_collection.find_one.return_value = None  # Simula que no se encontró la cuenta
@@ -77,5 +95,19 @@ class TestMongoAccountRepository(unittest.TestCase):
         with self.assertRaises(ValueError):        # Verifica que se lance ValueError
             self.repository.obtener_por_id(uuid4())
 
+    def test_obtener_documento_v2(self):          # Prueba la lectura de un documento v2
+        cuenta_id = uuid4()
+        self.mock_collection.find_one.return_value = {
+            "_id": Binary.from_uuid(cuenta_id),
+            "usuario_id": Binary.from_uuid(uuid4()),
+            "saldo": 100050,
+            "limite_diario": 50025,
+            "v": 2
+        }
+        cuenta = self.repository.obtener_por_id(cuenta_id)
+        self.assertEqual(cuenta.id, cuenta_id)
+        self.assertEqual(str(cuenta.saldo), "1000.50")          # Siempre con 2 decimales
+        self.assertEqual(str(cuenta.limite_diario), "500.25")
+
 if __name__ == '__main__':                        # Permite ejecutar las pruebas directamente
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,77 @@
+# tests/test_infrastructure/test_mongo_clientes.py
+import gc
+import unittest
+from unittest.mock import patch, MagicMock
+from infrastructure.db import mongo_clientes
+from infrastructure.db.mongo_clientes import obtener_cliente, cerrar_clientes, clientes_abiertos
+from infrastructure.repositories.mongo_account_repository import MongoAccountRepository
+from infrastructure.repositories.mongo_transaction_repository import MongoTransactionRepository
+
+class TestMongoClientes(unittest.TestCase):
+    def setUp(self):
+        """Se ejecuta antes de cada prueba."""
+        cerrar_clientes()
+        self.patcher = patch('infrastructure.db.mongo_clientes.MongoClient')
+        self.mock_client = self.patcher.start()
+        self.mock_client.side_effect = lambda *args, **kwargs: MagicMock()
+
+    def tearDown(self):
+        """Se ejecuta después de cada prueba."""
+        cerrar_clientes()
+        self.patcher.stop()
+
+    def test_un_cliente_por_uri(self):
+        a = obtener_cliente("mongodb://a:27017/")
+        self.assertIs(obtener_cliente("mongodb://a:27017/"), a)
+        self.assertIsNot(obtener_cliente("mongodb://b:27017/"), a)
+        self.assertEqual(self.mock_client.call_count, 2)
+
+    def test_conexion_perezosa_y_opciones(self):
+        obtener_cliente("mongodb://a:27017/", maxPoolSize=10, serverSelectionTimeoutMS=1000)
+
+        args, kwargs = self.mock_client.call_args
+        self.assertEqual(args, ("mongodb://a:27017/",))
+        self.assertFalse(kwargs["connect"])
+        self.assertEqual(kwargs["maxPoolSize"], 10)
+        self.assertEqual(kwargs["serverSelectionTimeoutMS"], 1000)
+        self.assertEqual(kwargs["connectTimeoutMS"], mongo_clientes.OPCIONES_DEFECTO["connectTimeoutMS"])
+
+    def test_repositorios_comparten_el_cliente_sin_consultar(self):
+        cuentas = MongoAccountRepository()
+        transacciones = MongoTransactionRepository()
+
+        self.assertIs(cuentas.client, transacciones.client)
+        self.assertEqual(self.mock_client.call_count, 1)
+        # Crear el repositorio no aplica migraciones: no hay operaciones sobre la base
+        self.assertEqual(transacciones.db.schema_version.find.call_count, 0)
+
+    def test_descartar_un_repositorio_no_cierra_el_cliente(self):
+        repositorio = MongoTransactionRepository()
+        cliente = repositorio.client
+
+        del repositorio
+        gc.collect()
+
+        cliente.close.assert_not_called()
+        self.assertIs(MongoAccountRepository().client, cliente)
+
+    def test_cerrar_clientes(self):
+        cliente = obtener_cliente()
+
+        cerrar_clientes()
+
+        cliente.close.assert_called_once()
+        self.assertEqual(clientes_abiertos(), ())
+
+    def test_proceso_hijo_no_reutiliza_clientes_del_padre(self):
+        cliente = obtener_cliente()
+
+        with patch('infrastructure.db.mongo_clientes.os.getpid', return_value=mongo_clientes._pid + 1):
+            nuevo = obtener_cliente()
+        mongo_clientes._reiniciar_tras_fork()  # Vuelve al pid real
+
+        self.assertIsNot(nuevo, cliente)
+        cliente.close.assert_not_called()  # Los sockets heredados pertenecen al padre
+
+if __name__ == '__main__':
+    unittest.main()
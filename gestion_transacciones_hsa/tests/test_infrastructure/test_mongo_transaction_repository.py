@@ -4,15 +4,20 @@ from unittest.mock import patch, MagicMock  # Herramientas para crear mocks
 from datetime import datetime  # Para manejar fechas
 from decimal import Decimal  # Para manejar números decimales precisos
 from uuid import uuid4  # Para generar IDs únicos
+from bson.binary import Binary  # UUID binario del formato v2
 from pymongo.collection import Collection  # Tipo de colección de MongoDB
+from pymongo import ASCENDING, ReturnDocument  # Orden y documento retornado por find_one_and_update
+from pymongo.errors import BulkWriteError, DuplicateKeyError  # Errores de escritura
 from infrastructure.repositories.mongo_transaction_repository import MongoTransactionRepository  # Clase a probar
-from domain.entities.transaction import Transaction  # Entidad de transacción
+from infrastructure.db.mongo_clientes import cerrar_clientes  # Registro de clientes compartidos
+from domain.entities.transaction import Transaction, TransactionType, TransactionState  # Entidades
 
 class TestMongoTransactionRepository(unittest.TestCase):
     def setUp(self):
         """Se ejecuta antes de cada prueba."""
         self.mock_collection = MagicMock(spec=Collection)  # Crea un mock de la colección MongoDB
-        self.patcher = patch('infrastructure.repositories.mongo_transaction_repository.MongoClient')  # Prepara el mock del cliente MongoDB
+        cerrar_clientes()  # El repositorio debe crear su cliente con el MongoClient simulado
+        self.patcher = patch('infrastructure.db.mongo_clientes.MongoClient')  # Prepara el mock del cliente MongoDB
         self.mock_client = self.patcher.start()  # Inicia el mock
         
         # Configura la estructura simulada de MongoDB
@@ -24,6 +29,7 @@ class TestMongoTransactionRepository(unittest.TestCase):
 
     def tearDown(self):
         """Se ejecuta después de cada prueba."""
+        cerrar_clientes()
         self.patcher.stop()
 
     def test_guardar_transaccion(self):
@@ -40,8 +46,9 @@ class TestMongoTransactionRepository(unittest.TestCase):
 
         self.mock_collection.replace_one.assert_called_once()
         args = self.mock_collection.replace_one.call_args[0]
-        self.assertEqual(args[0], {"_id": str(transaction.id)})
-        self.assertEqual(args[1]["monto"], str(transaction.monto))
+        self.assertEqual(args[0], {"_id": Binary.from_uuid(transaction.id)})
+        self.assertEqual(args[1]["monto"], 10050)  # Centavos enteros
+        self.assertEqual(args[1]["v"], 2)
 
     def test_obtener_por_id(self):
         transaction_id = uuid4()
@@ -56,7 +63,7 @@ class TestMongoTransactionRepository(unittest.TestCase):
         self.mock_collection.find_one.return_value = mock_transaction
 
         transaction = self.repository.obtener_por_id(transaction_id)
-        self.mock_collection.find_one.assert_called_with({"_id": str(transaction_id)})
+        self.mock_collection.find_one.assert_called_with({"_id": Binary.from_uuid(transaction_id)})
         self.assertEqual(str(transaction.id), mock_transaction["_id"])
         self.assertEqual(transaction.monto, Decimal(mock_transaction["monto"]))
 
@@ -92,7 +99,10 @@ class TestMongoTransactionRepository(unittest.TestCase):
 
         transactions = self.repository.listar_por_cuenta(cuenta_id)
 
-        self.mock_collection.find.assert_called_with({"cuenta_id": str(cuenta_id)})
+        # Mismo orden que SQLite (ORDER BY fecha, id), servido por el índice (cuenta_id, fecha, _id)
+        self.mock_collection.find.assert_called_with(
+            {"cuenta_id": Binary.from_uuid(cuenta_id)}, sort=[("fecha", ASCENDING), ("_id", ASCENDING)]
+        )
         self.assertEqual(len(transactions), 2)
         montos = [t.monto for t in transactions]
         self.assertIn(Decimal('100.00'), montos)
@@ -118,5 +128,242 @@ class TestMongoTransactionRepository(unittest.TestCase):
         # Assert
         self.assertEqual(str(transaction.monto), monto_exacto)
 
+    def test_iterar_por_cuenta(self):
+        cuenta_id = uuid4()
+        self.mock_collection.find.return_value = iter([{
+            "_id": str(uuid4()),
+            "cuenta_id": str(cuenta_id),
+            "monto": "10.00",
+            "tipo": "deposito",
+            "estado": "APROBADA",
+            "fecha": datetime.now().isoformat()
+        }])
+
+        transacciones = self.repository.iterar_por_cuenta(cuenta_id, tamano_lote=250)
+
+        # La consulta se hace por lotes y las entidades se crean al consumir el iterador
+        self.mock_collection.find.assert_called_with(
+            {"cuenta_id": Binary.from_uuid(cuenta_id)}, sort=[("fecha", ASCENDING), ("_id", ASCENDING)], batch_size=250
+        )
+        self.assertEqual([t.monto for t in transacciones], [Decimal('10.00')])
+
+    def test_listar_pagina_por_cuenta(self):
+        cuenta_id = uuid4()
+        ultimo_id = uuid4()
+        fecha = datetime(2024, 1, 2, 10, 30)
+        self.mock_collection.find.return_value = []
+
+        self.repository.listar_pagina_por_cuenta(cuenta_id, 20, (fecha, ultimo_id))
+
+        # Rango por clave (fecha, _id) con orden descendente y límite en el servidor
+        self.mock_collection.find.assert_called_once_with(
+            {
+                "cuenta_id": Binary.from_uuid(cuenta_id),
+                "$or": [
+                    {"fecha": {"$lt": 1704191400000000}},  # Microsegundos desde la época
+                    {"fecha": 1704191400000000, "_id": {"$lt": Binary.from_uuid(ultimo_id)}},
+                ]
+            },
+            sort=[("fecha", -1), ("_id", -1)],
+            limit=20
+        )
+
+    def test_guardar_lote(self):
+        # Arrange: MongoDB rechaza el segundo documento del lote
+        transacciones = [
+            Transaction(id=uuid4(), cuenta_id=uuid4(), monto=Decimal('10.00'),
+                        tipo='deposito', estado='pendiente', fecha=datetime.now())
+            for _ in range(3)
+        ]
+        self.mock_collection.bulk_write.side_effect = BulkWriteError({
+            "writeErrors": [{"index": 1, "errmsg": "documento inválido"}]
+        })
+
+        # Act
+        resultados = self.repository.guardar_lote(transacciones)
+
+        # Assert: una sola llamada no ordenada y un resultado por elemento
+        self.mock_collection.bulk_write.assert_called_once()
+        operaciones = self.mock_collection.bulk_write.call_args[0][0]
+        self.assertEqual(len(operaciones), 3)
+        self.assertFalse(self.mock_collection.bulk_write.call_args[1]["ordered"])
+        self.assertEqual([r.exito for r in resultados], [True, False, True])
+        self.assertEqual(resultados[1].error, "documento inválido")
+
+    def test_obtener_documento_v2(self):
+        # Un documento v2 se hidrata sin parsear texto
+        transaction_id, cuenta_id = uuid4(), uuid4()
+        self.mock_collection.find_one.return_value = {
+            "_id": Binary.from_uuid(transaction_id),
+            "cuenta_id": Binary.from_uuid(cuenta_id),
+            "monto": 10057,
+            "tipo": 2,
+            "estado": 2,
+            "fecha": 1704191400000000,
+            "v": 2
+        }
+
+        transaction = self.repository.obtener_por_id(transaction_id)
+
+        self.assertEqual(transaction.id, transaction_id)
+        self.assertEqual(transaction.cuenta_id, cuenta_id)
+        self.assertEqual(str(transaction.monto), "100.57")
+        self.assertEqual(transaction.tipo, TransactionType.RETIRO)
+        self.assertEqual(transaction.estado, TransactionState.APROBADA)
+        self.assertEqual(transaction.fecha, datetime(2024, 1, 2, 10, 30))
+
+    def test_formato_anterior_pendiente(self):
+        # Con documentos del formato anterior, se busca en ambos formatos y se limpia la copia vieja
+        self.repository._legado = True
+        transaction = Transaction(id=uuid4(), cuenta_id=uuid4(), monto=Decimal('5.00'),
+                                  tipo='deposito', estado='pendiente', fecha=datetime.now())
+        self.mock_collection.find.return_value = []
+
+        self.repository.guardar(transaction)
+        self.repository.listar_por_cuenta(transaction.cuenta_id)
+
+        self.mock_collection.delete_many.assert_called_once_with({"_id": {"$in": [str(transaction.id)]}})
+        self.mock_collection.find.assert_called_with({
+            "cuenta_id": {"$in": [Binary.from_uuid(transaction.cuenta_id), str(transaction.cuenta_id)]}
+        }, sort=[("fecha", ASCENDING), ("_id", ASCENDING)])
+
+    def test_resumir_aprobadas_por_cuenta(self):
+        cuenta_id = uuid4()
+        self.mock_collection.aggregate.return_value = [
+            {"_id": 1, "cantidad": 2, "centavos": 15025},
+            {"_id": 2, "cantidad": 1, "centavos": -3000},
+        ]
+
+        resumen = self.repository.resumir_aprobadas_por_cuenta(cuenta_id)
+
+        # Filtro por cuenta y estado APROBADA, agrupado por tipo en el servidor
+        self.mock_collection.aggregate.assert_called_once_with([
+            {"$match": {"cuenta_id": Binary.from_uuid(cuenta_id), "estado": 2}},
+            {"$group": {"_id": "$tipo", "cantidad": {"$sum": 1}, "centavos": {"$sum": "$monto"}}},
+        ])
+        self.assertEqual((resumen.num_depositos, resumen.monto_depositos), (2, Decimal('150.25')))
+        self.assertEqual((resumen.num_retiros, resumen.monto_retiros), (1, Decimal('-30.00')))
+
+    def test_registrar_con_saldo(self):
+        cuentas = MagicMock(spec=Collection)
+        self.repository.db.accounts = cuentas
+        cuentas.find_one_and_update.return_value = {"saldo": 7000, "version": 4, "limite_diario": 50000}
+        retiro = Transaction(id=uuid4(), cuenta_id=uuid4(), monto=Decimal('-30.00'),
+                             tipo='retiro', estado='aprobada', fecha=datetime.now())
+
+        self.assertEqual(self.repository.registrar_con_saldo(retiro), (Decimal('70.00'), 4))
+
+        # Fondos verificados en el mismo $inc atómico que actualiza el saldo
+        cuentas.find_one_and_update.assert_called_once_with(
+            {"_id": Binary.from_uuid(retiro.cuenta_id), "v": 2, "saldo": {"$gte": 3000}},
+            {"$inc": {"saldo": -3000, "version": 1}},
+            projection={"saldo": 1, "version": 1, "limite_diario": 1},
+            return_document=ReturnDocument.AFTER
+        )
+        self.assertEqual(self.mock_collection.replace_one.call_args[0][1]["monto"], -3000)
+        # Acumulado del día: admite el monto solo si no supera el límite
+        filtro_limite = self.repository.db.limites_diarios.find_one_and_update.call_args[0][0]
+        self.assertEqual(filtro_limite["acumulado"], {"$lte": 47000})
+
+    def test_registrar_con_saldo_sin_fondos(self):
+        cuentas = MagicMock(spec=Collection)
+        self.repository.db.accounts = cuentas
+        cuentas.find_one_and_update.return_value = None
+        cuentas.find_one.return_value = {"_id": "x", "saldo": 100, "v": 2}
+        retiro = Transaction(id=uuid4(), cuenta_id=uuid4(), monto=Decimal('-30.00'),
+                             tipo='retiro', estado='aprobada', fecha=datetime.now())
+
+        with self.assertRaises(ValueError) as contexto:
+            self.repository.registrar_con_saldo(retiro)
+
+        self.assertEqual(str(contexto.exception), "Fondos insuficientes para realizar la transacción.")
+        self.mock_collection.replace_one.assert_not_called()
+
+    def test_registrar_con_saldo_revierte_si_falla_el_guardado(self):
+        cuentas = MagicMock(spec=Collection)
+        self.repository.db.accounts = cuentas
+        cuentas.find_one_and_update.return_value = {"saldo": 15000, "version": 2, "limite_diario": 50000}
+        self.mock_collection.replace_one.side_effect = RuntimeError("sin conexión")
+        deposito = Transaction(id=uuid4(), cuenta_id=uuid4(), monto=Decimal('50.00'),
+                               tipo='deposito', estado='aprobada', fecha=datetime.now())
+
+        with self.assertRaises(RuntimeError):
+            self.repository.registrar_con_saldo(deposito)
+
+        cuentas.update_one.assert_called_once_with(
+            {"_id": Binary.from_uuid(deposito.cuenta_id)},
+            {"$inc": {"saldo": -5000, "version": 1}}
+        )
+
+    def test_registrar_con_saldo_limite_diario_excedido(self):
+        cuentas = MagicMock(spec=Collection)
+        self.repository.db.accounts = cuentas
+        cuentas.find_one_and_update.return_value = {"saldo": 15000, "version": 2, "limite_diario": 50000}
+        # El acumulado del día no admite el monto: el upsert choca con el índice único y el
+        # reintento sin upsert tampoco coincide
+        self.repository.db.limites_diarios.find_one_and_update.side_effect = [DuplicateKeyError("E11000"), None]
+        deposito = Transaction(id=uuid4(), cuenta_id=uuid4(), monto=Decimal('50.00'),
+                               tipo='deposito', estado='aprobada', fecha=datetime.now())
+
+        with self.assertRaises(ValueError) as contexto:
+            self.repository.registrar_con_saldo(deposito)
+
+        self.assertEqual(str(contexto.exception), "El monto excede el límite diario permitido.")
+        cuentas.update_one.assert_called_once_with(
+            {"_id": Binary.from_uuid(deposito.cuenta_id)},
+            {"$inc": {"saldo": -5000, "version": 1}}
+        )
+        self.mock_collection.replace_one.assert_not_called()
+
+    def test_registrar_con_saldo_rechazada_no_acumula(self):
+        cuentas = MagicMock(spec=Collection)
+        self.repository.db.accounts = cuentas
+        cuentas.find_one.return_value = {"saldo": 15000, "version": 2, "limite_diario": 50000}
+        rechazada = Transaction(id=uuid4(), cuenta_id=uuid4(), monto=Decimal('50.00'),
+                                tipo='deposito', estado='rechazada', fecha=datetime.now())
+
+        self.repository.registrar_con_saldo(rechazada)
+
+        # El acumulado del día no cambia: solo las aprobadas cuentan para el límite
+        self.repository.db.limites_diarios.find_one_and_update.assert_not_called()
+        self.repository.db.limites_diarios.update_one.assert_not_called()
+        self.mock_collection.replace_one.assert_called_once()
+
+    def test_registrar_con_saldo_pendiente_y_rechazada(self):
+        cuentas = MagicMock(spec=Collection)
+        self.repository.db.accounts = cuentas
+        cuentas.find_one.return_value = {"saldo": 2000, "version": 5, "limite_diario": 50000}
+
+        for estado in ('pendiente', 'rechazada'):
+            retiro = Transaction(id=uuid4(), cuenta_id=uuid4(), monto=Decimal('-30.00'),
+                                 tipo='retiro', estado=estado, fecha=datetime.now())
+
+            # Se guarda sin mover saldo ni versión, aunque el retiro supere los fondos
+            self.assertEqual(self.repository.registrar_con_saldo(retiro), (Decimal('20.00'), 5))
+            cuentas.find_one.assert_called_with(
+                {"_id": Binary.from_uuid(retiro.cuenta_id), "v": 2},
+                {"saldo": 1, "version": 1, "limite_diario": 1}
+            )
+
+        cuentas.find_one_and_update.assert_not_called()
+        cuentas.update_one.assert_not_called()
+        self.assertEqual(self.mock_collection.replace_one.call_count, 2)
+
+    def test_registrar_con_saldo_primer_upsert_del_dia_concurrente(self):
+        cuentas = MagicMock(spec=Collection)
+        self.repository.db.accounts = cuentas
+        cuentas.find_one_and_update.return_value = {"saldo": 15000, "version": 2, "limite_diario": 50000}
+        # Otro upsert creó el documento del día al mismo tiempo: el reintento sin upsert lo actualiza
+        limites = self.repository.db.limites_diarios
+        limites.find_one_and_update.side_effect = [DuplicateKeyError("E11000"), {"acumulado": 7000}]
+        deposito = Transaction(id=uuid4(), cuenta_id=uuid4(), monto=Decimal('50.00'),
+                               tipo='deposito', estado='aprobada', fecha=datetime.now())
+
+        self.assertEqual(self.repository.registrar_con_saldo(deposito), (Decimal('150.00'), 2))
+
+        self.assertNotIn("upsert", limites.find_one_and_update.call_args.kwargs)
+        cuentas.update_one.assert_not_called()
+        self.mock_collection.replace_one.assert_called_once()
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,86 @@
+# tests/test_infrastructure/test_reconstruir_resumen.py
+import os
+import sqlite3
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+from decimal import Decimal
+from uuid import uuid4
+from infrastructure.db import reconstruir_resumen
+from infrastructure.db.sqlite_pool import SQLitePool
+from infrastructure.repositories.sqlite_transaction_repository import SQLiteTransactionRepository
+from domain.entities.transaction import Transaction, TransactionType, TransactionState
+
+class TestReconstruirResumen(unittest.TestCase):
+    def setUp(self):
+        """Se ejecuta antes de cada prueba: un libro con varias cuentas."""
+        self.directorio = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.directorio.name, "resumen.db")
+        self.pool = SQLitePool(self.db_path)
+        self.repository = SQLiteTransactionRepository(db_path=self.db_path, pool=self.pool)
+
+        self.cuentas = [uuid4() for _ in range(20)]
+        inicio = datetime(2024, 1, 1)
+        self.repository.guardar_lote([
+            Transaction(uuid4(), cuenta_id, Decimal(f"{i + 1}.50"),
+                        TransactionType.DEPOSITO if i % 3 else TransactionType.RETIRO,
+                        TransactionState.APROBADA if i % 2 else TransactionState.PENDIENTE,
+                        inicio + timedelta(days=i))
+            for cuenta_id in self.cuentas for i in range(6)
+        ])
+
+    def tearDown(self):
+        """Se ejecuta después de cada prueba."""
+        self.pool.cerrar()
+        self.directorio.cleanup()
+
+    def _resumenes(self):
+        return {c: vars(self.repository.resumir_aprobadas_por_cuenta(c)) for c in self.cuentas}
+
+    def test_reconstruye_en_paralelo(self):
+        esperado = self._resumenes()
+        # Desalinea el resumen: filas perdidas y filas con totales incorrectos
+        with self.pool.conexion() as conn:
+            conn.execute("DELETE FROM resumen_cuentas WHERE cuenta_id < ?", (bytes([128]),))
+            conn.execute("UPDATE resumen_cuentas SET num_depositos = 999, saldo_aprobado = 0")
+
+        estadisticas = reconstruir_resumen.reconstruir(self.db_path, hilos=4, particiones=16)
+
+        self.assertEqual(estadisticas["cuentas"], len(self.cuentas))
+        self.assertEqual(self._resumenes(), esperado)
+
+    def test_particiones_cubren_todo_el_espacio(self):
+        particiones = reconstruir_resumen._particiones(7)
+        self.assertEqual(len(particiones), 7)
+        self.assertIsNone(particiones[0][0])
+        self.assertIsNone(particiones[-1][1])
+        for (_, hasta), (desde, _) in zip(particiones, particiones[1:]):
+            self.assertEqual(hasta, desde)
+
+    def test_reintenta_si_la_instantanea_cambia(self):
+        # Una escritura concurrente entre la lectura y la escritura obliga a repetir la partición
+        conn = sqlite3.connect(self.db_path, isolation_level=None)
+        original = conn.execute
+        escrito = []
+
+        class ConexionInterceptada:
+            def execute(self, sql, *args):
+                if sql.lstrip().startswith("DELETE FROM resumen_cuentas") and not escrito:
+                    escrito.append(True)
+                    self.escritor.guardar(Transaction(uuid4(), uuid4(), Decimal("1.00"), TransactionType.DEPOSITO,
+                                                      TransactionState.APROBADA, datetime(2024, 2, 1)))
+                return original(sql, *args)
+
+            def executemany(self, sql, filas):
+                return conn.executemany(sql, filas)
+
+        interceptada = ConexionInterceptada()
+        interceptada.escritor = self.repository
+        cuentas, reintentos = reconstruir_resumen.reconstruir_particion(interceptada, None, None)
+        conn.close()
+
+        self.assertEqual(reintentos, 1)
+        self.assertEqual(cuentas, len(self.cuentas) + 1)
+
+if __name__ == '__main__':
+    unittest.main()
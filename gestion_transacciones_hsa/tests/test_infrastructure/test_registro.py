@@ -0,0 +1,108 @@
+# tests/test_infrastructure/test_registro.py
+import io
+import json
+import logging
+import sys
+import threading
+import unittest
+from infrastructure.registro import (
+    ConfiguracionRegistro, FiltroMuestreo, FormateadorJSON, configurar_registro, detener_registro
+)
+
+def _registro(nombre: str, nivel: int = logging.DEBUG, mensaje: str = "fila %s", args=(1,)) -> logging.LogRecord:
+    return logging.LogRecord(nombre, nivel, __file__, 1, mensaje, args, None)
+
+class TestRegistro(unittest.TestCase):
+    def setUp(self):
+        """Se ejecuta antes de cada prueba: guarda los niveles que configurar_registro modifica."""
+        self.niveles = {nombre: logging.getLogger(nombre).level for nombre in ("", "pymongo", "prueba.registro")}
+
+    def tearDown(self):
+        """Se ejecuta después de cada prueba."""
+        detener_registro()
+        for nombre, nivel in self.niveles.items():
+            logging.getLogger(nombre).setLevel(nivel)
+
+    def test_muestreo_por_prefijo_mas_largo(self):
+        filtro = FiltroMuestreo({"a": 2, "a.b": 5})
+
+        pasan_ab = sum(filtro.filter(_registro("a.b.c")) for _ in range(10))
+        pasan_a = sum(filtro.filter(_registro("a.x")) for _ in range(10))
+        pasan_otro = sum(filtro.filter(_registro("ab")) for _ in range(10))
+
+        self.assertEqual((pasan_ab, pasan_a, pasan_otro), (2, 5, 10))
+
+    def test_muestreo_no_descarta_niveles_superiores(self):
+        filtro = FiltroMuestreo({"a": 1000})
+
+        self.assertTrue(all(filtro.filter(_registro("a", logging.INFO)) for _ in range(5)))
+
+    def test_formato_json_con_campos_extra_y_excepcion(self):
+        registro = _registro("prueba", logging.ERROR, "cuenta %s", ("c-1",))
+        registro.cuenta_id = "c-1"
+        try:
+            raise ValueError("sin fondos")
+        except ValueError:
+            registro.exc_info = sys.exc_info()
+
+        documento = json.loads(FormateadorJSON().format(registro))
+
+        self.assertEqual(documento["mensaje"], "cuenta c-1")
+        self.assertEqual(documento["nivel"], "ERROR")
+        self.assertEqual(documento["cuenta_id"], "c-1")
+        self.assertIn("sin fondos", documento["excepcion"])
+
+    def test_escribe_desde_el_hilo_del_listener(self):
+        hilos = []
+
+        class Destino(io.StringIO):
+            def write(self, texto):
+                hilos.append(threading.current_thread())
+                return super().write(texto)
+
+        destino = Destino()
+        configurar_registro(ConfiguracionRegistro(nivel="INFO", formato="json"), destino)
+        logger = logging.getLogger("prueba.registro")
+        logger.info("hola %s", "mundo", extra={"peticion": 7})
+        logger.debug("no se emite %s", "nunca")
+        detener_registro()
+
+        lineas = [json.loads(l) for l in destino.getvalue().splitlines()]
+        self.assertEqual([l["mensaje"] for l in lineas], ["hola mundo"])
+        self.assertEqual(lineas[0]["peticion"], 7)
+        self.assertTrue(hilos)
+        self.assertNotIn(threading.current_thread(), hilos)
+
+    def test_niveles_por_modulo(self):
+        destino = io.StringIO()
+
+        configurar_registro(ConfiguracionRegistro(nivel="WARNING", niveles={"prueba.registro": "debug"}), destino)
+        logging.getLogger("prueba.registro.sub").debug("detalle")
+        logging.getLogger("prueba.otro").info("omitido")
+        detener_registro()
+
+        self.assertIn("detalle", destino.getvalue())
+        self.assertNotIn("omitido", destino.getvalue())
+        self.assertEqual(logging.getLogger("pymongo").level, logging.WARNING)
+
+    def test_desde_entorno(self):
+        configuracion = ConfiguracionRegistro.desde_entorno({
+            "HSA_LOG_NIVEL": "warning",
+            "HSA_LOG_NIVELES": "infrastructure.db=DEBUG, pymongo=ERROR",
+            "HSA_LOG_MUESTREO": "domain.entities.transaction=100",
+            "HSA_LOG_FORMATO": "JSON",
+        })
+
+        self.assertEqual(configuracion.nivel, "WARNING")
+        self.assertEqual(configuracion.niveles, {"infrastructure.db": "DEBUG", "pymongo": "ERROR"})
+        self.assertEqual(configuracion.muestreo, {"domain.entities.transaction": 100})
+        self.assertEqual(configuracion.formato, "json")
+
+    def test_entorno_invalido(self):
+        with self.assertRaises(ValueError):
+            ConfiguracionRegistro.desde_entorno({"HSA_LOG_NIVELES": "sin-igual"})
+        with self.assertRaises(ValueError):
+            ConfiguracionRegistro(formato="xml")
+
+if __name__ == '__main__':
+    unittest.main()
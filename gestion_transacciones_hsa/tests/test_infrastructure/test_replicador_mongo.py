@@ -0,0 +1,155 @@
+# tests/test_infrastructure/test_replicador_mongo.py
+import sqlite3
+import unittest
+from datetime import datetime
+from decimal import Decimal
+from unittest.mock import MagicMock
+from uuid import uuid4
+from bson.binary import Binary
+from pymongo import DeleteOne, ReplaceOne
+from pymongo.collection import Collection
+from infrastructure.db.migraciones import MigradorSQLite, MIGRACIONES_SQLITE
+from infrastructure.db.replicador_mongo import ReplicadorMongo, desactivar_replicacion, replicacion_activa
+from infrastructure.db.sqlite_pool import SQLitePool
+from infrastructure.repositories.sqlite_account_repository import SQLiteAccountRepository
+from infrastructure.repositories.sqlite_transaction_repository import SQLiteTransactionRepository
+from domain.entities.account import Account
+from domain.entities.transaction import Transaction, TransactionType, TransactionState
+
+class TestReplicadorMongo(unittest.TestCase):
+    def setUp(self):
+        """Se ejecuta antes de cada prueba."""
+        self.pool = SQLitePool(":memory:")
+        self.cuentas = SQLiteAccountRepository(db_path=":memory:", pool=self.pool)
+        self.transacciones = SQLiteTransactionRepository(db_path=":memory:", pool=self.pool)
+        self.mongo_db = MagicMock()
+        self.mongo_db.accounts = MagicMock(spec=Collection)
+        self.mongo_db.transacciones = MagicMock(spec=Collection)
+        self.replicador = ReplicadorMongo(self.mongo_db, pool=self.pool, tamano_lote=10)
+        self.replicador.activar()  # Una base nueva no encola hasta que el replicador activa la réplica
+
+        self.cuenta = Account(uuid4(), uuid4(), Decimal('100.00'), Decimal('1000.00'))
+        self.cuentas.guardar(self.cuenta)
+
+    def tearDown(self):
+        """Se ejecuta después de cada prueba."""
+        self.pool.cerrar()
+
+    def _registrar(self, monto: str) -> Transaction:
+        transaccion = Transaction(uuid4(), self.cuenta.id, Decimal(monto), TransactionType.DEPOSITO,
+                                  TransactionState.APROBADA, datetime(2024, 1, 1))
+        self.transacciones.registrar_con_saldo(transaccion)
+        return transaccion
+
+    def _operaciones(self, coleccion) -> list:
+        return [op for llamada in coleccion.bulk_write.call_args_list for op in llamada[0][0]]
+
+    def test_la_escritura_encola_en_la_misma_transaccion(self):
+        self._registrar('10.00')
+        # Alta de la cuenta + actualización del saldo + transacción
+        self.assertEqual(self.replicador.pendientes(), 3)
+
+    def test_una_escritura_revertida_no_se_encola(self):
+        with self.assertRaises(ValueError):
+            self.transacciones.registrar_con_saldo(Transaction(
+                uuid4(), self.cuenta.id, Decimal('-500.00'), TransactionType.RETIRO,
+                TransactionState.APROBADA, datetime(2024, 1, 1)
+            ))
+        self.assertEqual(self.replicador.pendientes(), 1)
+
+    def test_replica_el_estado_vigente_y_vacia_la_outbox(self):
+        transaccion = self._registrar('10.00')
+        self._registrar('5.00')
+
+        self.assertEqual(self.replicador.drenar(), 5)
+
+        # La cuenta se escribió tres veces en SQLite pero se replica una vez, con el saldo final
+        cuentas = self._operaciones(self.mongo_db.accounts)
+        self.assertEqual(len(cuentas), 1)
+        self.assertEqual(cuentas[0]._doc["saldo"], 11500)
+        self.assertEqual(cuentas[0]._filter, {"_id": Binary.from_uuid(self.cuenta.id)})
+        replicadas = self._operaciones(self.mongo_db.transacciones)
+        self.assertEqual(len(replicadas), 2)
+        self.assertIsInstance(replicadas[0], ReplaceOne)
+        self.assertEqual(replicadas[0]._doc["_id"], Binary.from_uuid(transaccion.id))
+        self.assertEqual(self.replicador.pendientes(), 0)
+
+    def test_un_fallo_de_mongo_deja_el_lote_pendiente(self):
+        self._registrar('10.00')
+        self.mongo_db.transacciones.bulk_write.side_effect = ConnectionError("sin servidor")
+
+        with self.assertRaises(ConnectionError):
+            self.replicador.drenar_lote()
+        self.assertEqual(self.replicador.pendientes(), 3)
+
+        self.mongo_db.transacciones.bulk_write.side_effect = None
+        self.assertEqual(self.replicador.drenar(), 3)
+        self.assertEqual(self.replicador.pendientes(), 0)
+
+    def test_preparar_se_reintenta_hasta_completarse(self):
+        self._registrar('10.00')
+        preparar = MagicMock(side_effect=[ConnectionError("sin servidor"), None])
+        replicador = ReplicadorMongo(self.mongo_db, pool=self.pool, preparar=preparar)
+
+        with self.assertRaises(ConnectionError):
+            replicador.drenar_lote()
+        self.assertEqual(replicador.pendientes(), 3)
+
+        self.assertEqual(replicador.drenar(), 3)
+        replicador.drenar()
+        self.assertEqual(preparar.call_count, 2)  # Una vez completado no se repite
+
+    def test_fila_eliminada_se_elimina_en_mongo(self):
+        transaccion = self._registrar('10.00')
+        with self.pool.conexion() as conn:
+            conn.execute("DELETE FROM transacciones_v2")
+
+        self.replicador.drenar()
+
+        eliminadas = self._operaciones(self.mongo_db.transacciones)
+        self.assertEqual(len(eliminadas), 1)
+        self.assertIsInstance(eliminadas[0], DeleteOne)
+        self.assertEqual(eliminadas[0]._filter, {"_id": Binary.from_uuid(transaccion.id)})
+
+    def test_sin_replicador_no_se_encola(self):
+        pool = SQLitePool(":memory:")
+        try:
+            cuentas = SQLiteAccountRepository(db_path=":memory:", pool=pool)
+            cuentas.guardar(Account(uuid4(), uuid4(), Decimal('1.00'), Decimal('1.00')))
+            with pool.conexion() as conn:
+                self.assertFalse(replicacion_activa(conn))
+                self.assertEqual(conn.execute("SELECT COUNT(*) FROM outbox").fetchone()[0], 0)
+        finally:
+            pool.cerrar()
+
+    def test_desactivar_vacia_la_outbox_y_deja_de_encolar(self):
+        self._registrar('10.00')
+        with self.pool.conexion() as conn:
+            self.assertEqual(desactivar_replicacion(conn), 3)
+
+        self._registrar('5.00')
+
+        self.assertEqual(self.replicador.pendientes(), 0)
+
+    def test_bases_que_ya_encolaban_conservan_la_replica(self):
+        conn = sqlite3.connect(":memory:")
+        try:
+            MigradorSQLite([m for m in MIGRACIONES_SQLITE if m.version <= 10]).aplicar(conn)
+            conn.execute("INSERT INTO cuentas_v2 (id, usuario_id, saldo, limite_diario) VALUES (x'01', x'02', 0, 0)")
+            conn.execute("DELETE FROM outbox")  # Ya replicada: la outbox vacía no basta para saberlo
+            MigradorSQLite().aplicar(conn)
+
+            self.assertTrue(replicacion_activa(conn))
+        finally:
+            conn.close()
+
+    def test_espera_exponencial_acotada(self):
+        self.replicador.intervalo, self.replicador.espera_maxima = 0.5, 10.0
+        esperas = []
+        for fallos in range(7):
+            self.replicador.fallos_consecutivos = fallos
+            esperas.append(self.replicador.espera())
+        self.assertEqual(esperas, [0.5, 1.0, 2.0, 4.0, 8.0, 10.0, 10.0])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,4 +1,6 @@
 # tests/test_infrastructure/test_repository_factory.py
+import os  # Directorio de trabajo de las pruebas
+import tempfile  # Las bases SQLite por defecto se crean en un directorio temporal
 import unittest  # Importa el módulo de pruebas unitarias
 from infrastructure.factory.repository_factory import RepositoryFactory  # Importa la fábrica de repositorios
 # Importaciones de los repositorios SQLite y MongoDB
@@ -6,8 +8,20 @@ from infrastructure.repositories.sqlite_transaction_repository import SQLiteTran
 from infrastructure.repositories.sqlite_account_repository import SQLiteAccountRepository
 from infrastructure.repositories.mongo_transaction_repository import MongoTransactionRepository
 from infrastructure.repositories.mongo_account_repository import MongoAccountRepository
+from infrastructure.repositories.cached_account_repository import CachedAccountRepository
+from infrastructure.repositories.sharded_sqlite_account_repository import ShardedSQLiteAccountRepository
+from infrastructure.repositories.sharded_sqlite_transaction_repository import ShardedSQLiteTransactionRepository
+from infrastructure.db.sqlite_pool import cerrar_pools
 
 class TestRepositoryFactory(unittest.TestCase):  # Define la clase de pruebas
+    def setUp(self):
+        """La fábrica usa database.db relativo: las pruebas corren en un directorio temporal."""
+        self.directorio = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directorio.cleanup)
+        self.addCleanup(os.chdir, os.getcwd())
+        self.addCleanup(cerrar_pools)
+        os.chdir(self.directorio.name)
+
     def test_crear_factory_con_sqlite_por_defecto(self):  # Prueba la creación por defecto
         factory = RepositoryFactory()  # Crea una instancia de la fábrica sin parámetros
         self.assertEqual(factory.db_type, "sqlite")  # Verifica que el tipo por defecto sea SQLite
@@ -36,5 +50,24 @@ class TestRepositoryFactory(unittest.TestCase):  # Define la clase de pruebas
         repo = factory.obtener_account_repository()
         self.assertIsInstance(repo, MongoAccountRepository)
 
+    def test_crear_account_repository_con_cache(self):  # El caché se comparte y lo actualizan las transacciones
+        factory = RepositoryFactory("sqlite", cache_cuentas=True, ttl=30)
+        repo = factory.obtener_account_repository()
+        self.assertIsInstance(repo, CachedAccountRepository)
+        self.assertIsInstance(repo.repositorio, SQLiteAccountRepository)
+        self.assertEqual(repo.ttl, 30)
+        self.assertIs(factory.obtener_account_repository(), repo)
+        self.assertEqual(factory.obtener_transaction_repository()._al_cambiar_saldo, repo.actualizar_saldo)
+
+    def test_crear_repositorios_sqlite_sharded(self):  # Los repositorios reparten por cuenta en `shards` archivos
+        factory = RepositoryFactory("sqlite-sharded", shards=2)
+        cuentas = factory.obtener_account_repository()
+        transacciones = factory.obtener_transaction_repository()
+        self.assertIsInstance(cuentas, ShardedSQLiteAccountRepository)
+        self.assertIsInstance(transacciones, ShardedSQLiteTransactionRepository)
+        self.assertEqual((len(cuentas.shards), len(transacciones.shards)), (2, 2))
+        with self.assertRaises(ValueError):  # Sin repositorios asíncronos repartidos
+            factory.obtener_async_transaction_repository()
+
 if __name__ == '__main__':  # Permite ejecutar las pruebas directamente
     unittest.main()  # Ejecuta todas las pruebas de la clase
\ No newline at end of file
@@ -0,0 +1,111 @@
+# tests/test_infrastructure/test_shards_sqlite.py
+import os
+import sqlite3
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+from decimal import Decimal
+from uuid import uuid4
+from infrastructure.db import shards_sqlite
+from infrastructure.db.sqlite_pool import cerrar_pools
+from infrastructure.repositories.sqlite_account_repository import SQLiteAccountRepository
+from infrastructure.repositories.sqlite_transaction_repository import SQLiteTransactionRepository
+from infrastructure.repositories.sharded_sqlite_account_repository import ShardedSQLiteAccountRepository
+from infrastructure.repositories.sharded_sqlite_transaction_repository import ShardedSQLiteTransactionRepository
+from domain.entities.account import Account
+from domain.entities.transaction import Transaction, TransactionType, TransactionState
+
+class TestShardsSQLite(unittest.TestCase):
+    def setUp(self):
+        """Se ejecuta antes de cada prueba."""
+        self.directorio = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.directorio.name, "hsa.db")
+        self.hoy = datetime(2024, 3, 10, 12, 0)
+
+    def tearDown(self):
+        """Se ejecuta después de cada prueba."""
+        cerrar_pools()
+        self.directorio.cleanup()
+
+    def _transaccion(self, cuenta_id, monto: str, horas: int = 0) -> Transaction:
+        return Transaction(uuid4(), cuenta_id, Decimal(monto), TransactionType.DEPOSITO,
+                           TransactionState.APROBADA, self.hoy + timedelta(hours=horas))
+
+    def test_indice_estable_por_uuid_o_bytes(self):
+        cuenta_id = uuid4()
+        indice = shards_sqlite.indice_shard(cuenta_id, 4)
+        self.assertEqual(shards_sqlite.indice_shard(cuenta_id.bytes, 4), indice)
+        self.assertIn(indice, range(4))
+        self.assertEqual(len({shards_sqlite.indice_shard(uuid4(), 4) for _ in range(200)}), 4)
+
+    def test_rutas_llevan_la_cantidad_de_shards(self):
+        self.assertEqual(shards_sqlite.rutas_shards("datos/hsa.db", 2),
+                         ["datos/hsa.shard0de2.db", "datos/hsa.shard1de2.db"])
+        with self.assertRaises(ValueError):
+            shards_sqlite.rutas_shards("hsa.db", 0)
+
+    def test_cuenta_y_transacciones_en_el_mismo_shard(self):
+        cuentas = ShardedSQLiteAccountRepository(self.db_path, shards=3)
+        transacciones = ShardedSQLiteTransactionRepository(self.db_path, shards=3)
+        lote = [Account(uuid4(), uuid4(), Decimal("0"), Decimal("1000.00")) for _ in range(12)]
+        self.assertTrue(all(r.exito for r in cuentas.guardar_lote(lote)))
+
+        for cuenta in lote:
+            saldo, version = transacciones.registrar_con_saldo(self._transaccion(cuenta.id, "25.00"))
+            self.assertEqual((saldo, version), (Decimal("25.00"), 2))  # Guardar la cuenta nueva deja la versión 1
+            shard = shards_sqlite.indice_shard(cuenta.id, 3)
+            self.assertEqual(len(transacciones.shards[shard].listar_por_cuenta(cuenta.id)), 1)
+            self.assertEqual(cuentas.shards[shard].obtener_por_id(cuenta.id).saldo, Decimal("25.00"))
+
+        self.assertEqual(len(cuentas.listar_todos()), 12)
+        self.assertEqual(len(transacciones.listar_todos()), 12)
+        self.assertEqual(transacciones.resumir_aprobadas_por_cuenta(lote[0].id).monto_depositos, Decimal("25.00"))
+
+    def test_lotes_conservan_el_orden_y_busqueda_por_id(self):
+        cuentas = ShardedSQLiteAccountRepository(self.db_path, shards=4)
+        transacciones = ShardedSQLiteTransactionRepository(self.db_path, shards=4)
+        usuario_id = uuid4()
+        lote = [Account(uuid4(), usuario_id, Decimal("100.00"), Decimal("1000.00")) for _ in range(8)]
+        cuentas.guardar_lote(lote)
+        movimientos = [self._transaccion(lote[i % 8].id, f"{i + 1}.00", i) for i in range(16)]
+
+        resultados = transacciones.registrar_lote_con_saldo(movimientos)
+
+        self.assertEqual(resultados[0], (Decimal("101.00"), 2))
+        self.assertEqual(resultados[8], (Decimal("110.00"), 3))  # 100 + 1 + 9
+        self.assertEqual(transacciones.obtener_por_id(movimientos[5].id).monto, Decimal("6.00"))
+        with self.assertRaises(ValueError):
+            transacciones.obtener_por_id(uuid4())
+        self.assertEqual([c.id for c in cuentas.obtener_por_usuario(usuario_id)],
+                         sorted((c.id for c in lote), key=lambda id: id.bytes))
+
+    def test_reparticionar_conserva_saldos_y_versiones(self):
+        origen_cuentas = SQLiteAccountRepository(db_path=self.db_path)
+        origen = SQLiteTransactionRepository(db_path=self.db_path)
+        lote = [Account(uuid4(), uuid4(), Decimal("0"), Decimal("1000.00")) for _ in range(6)]
+        origen_cuentas.guardar_lote(lote)
+        for i in range(30):
+            origen.registrar_con_saldo(self._transaccion(lote[i % 6].id, "10.00", i))
+        cerrar_pools()
+
+        destino = os.path.join(self.directorio.name, "nuevo.db")
+        estadisticas = shards_sqlite.reparticionar([self.db_path], destino, 3, tamano_lote=7)
+
+        self.assertEqual(estadisticas["copiadas"]["cuentas_v2"], 6)
+        self.assertEqual(estadisticas["copiadas"]["transacciones_v2"], 30)
+        self.assertEqual(sum(s["transacciones_v2"] for s in estadisticas["por_shard"]), 30)
+        cuentas = ShardedSQLiteAccountRepository(destino, shards=3)
+        transacciones = ShardedSQLiteTransactionRepository(destino, shards=3)
+        for cuenta in lote:
+            copia = cuentas.obtener_por_id(cuenta.id)
+            self.assertEqual((copia.saldo, copia.version), (Decimal("50.00"), 6))
+            self.assertEqual(transacciones.resumir_aprobadas_por_cuenta(cuenta.id).monto_depositos, Decimal("50.00"))
+        for ruta in shards_sqlite.rutas_shards(destino, 3):
+            with sqlite3.connect(ruta) as conn:
+                self.assertEqual(conn.execute("SELECT COUNT(*) FROM outbox").fetchone()[0], 0)
+
+        with self.assertRaises(FileExistsError):
+            shards_sqlite.reparticionar([self.db_path], destino, 3)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -6,6 +6,7 @@ from decimal import Decimal       # Para manejar números decimales con precisi
 from uuid import UUID, uuid4      # Para generar identificadores únicos
 from infrastructure.repositories.sqlite_account_repository import SQLiteAccountRepository
 from domain.entities.account import Account
+from domain.repositories.conflicto_concurrencia import ConflictoConcurrencia
 
 class TestSQLiteAccountRepository(unittest.TestCase):
     def setUp(self):
@@ -116,6 +117,20 @@ class TestSQLiteAccountRepository(unittest.TestCase):
         cuenta_actualizada = self.repository.obtener_por_id(cuenta.id)
         self.assertEqual(cuenta_actualizada.saldo, Decimal('1500.00'))
 
+    def test_guardar_con_version_desactualizada(self):
+        # Prueba que un guardado con datos viejos no pise un cambio posterior
+        cuenta = self._crear_cuenta_prueba()
+        self.repository.guardar(cuenta)
+        otra_copia = self.repository.obtener_por_id(cuenta.id)
+        otra_copia.saldo = Decimal('1200.00')
+        self.repository.guardar(otra_copia)
+
+        cuenta.saldo = Decimal('0.00')
+        with self.assertRaises(ConflictoConcurrencia):
+            self.repository.guardar(cuenta)
+        self.assertEqual(self.repository.obtener_por_id(cuenta.id).saldo, Decimal('1200.00'))
+        self.assertEqual(self.repository.obtener_por_id(cuenta.id).version, 2)
+
     def test_validar_precision_decimal(self):
         # Prueba que los números decimales mantengan su precisión
         cuenta = Account(
@@ -132,5 +147,13 @@ class TestSQLiteAccountRepository(unittest.TestCase):
         self.assertEqual(str(cuenta_recuperada.saldo), '1000.50')
         self.assertEqual(str(cuenta_recuperada.limite_diario), '500.25')
 
+    def test_guardar_lote(self):
+        # Prueba que un lote se guarde completo y reporte un resultado por cuenta
+        cuentas = [self._crear_cuenta_prueba() for _ in range(3)]
+        resultados = self.repository.guardar_lote(cuentas)
+        self.assertTrue(all(r.exito for r in resultados))
+        self.assertEqual([r.id for r in resultados], [c.id for c in cuentas])
+        self.assertEqual(len(self.repository.listar_todos()), 3)
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,87 @@
+# tests/test_infrastructure/test_sqlite_pool.py
+import os
+import tempfile
+import threading
+import time
+import unittest
+from infrastructure.db.sqlite_pool import SQLitePool, obtener_pool, cerrar_pools
+
+class TestSQLitePool(unittest.TestCase):
+    def setUp(self):
+        """Se ejecuta antes de cada prueba."""
+        self.directorio = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.directorio.name, "pool.db")
+        self.pool = SQLitePool(self.db_path, max_conexiones=2, timeout=2.0)
+
+    def tearDown(self):
+        """Se ejecuta después de cada prueba."""
+        self.pool.cerrar()
+        cerrar_pools()
+        self.directorio.cleanup()
+
+    def test_reutiliza_conexiones(self):
+        # La segunda petición debe reutilizar la conexión devuelta por la primera
+        with self.pool.conexion() as primera:
+            pass
+        with self.pool.conexion() as segunda:
+            pass
+        self.assertIs(primera, segunda)
+        stats = self.pool.estadisticas()
+        self.assertEqual(stats["misses"], 1)
+        self.assertEqual(stats["hits"], 1)
+        self.assertEqual(stats["conexiones_creadas"], 1)
+
+    def test_configura_pragmas_una_vez(self):
+        with self.pool.conexion() as conn:
+            self.assertEqual(conn.execute("PRAGMA journal_mode").fetchone()[0], "wal")
+            self.assertEqual(conn.execute("PRAGMA synchronous").fetchone()[0], 1)  # NORMAL
+            self.assertEqual(conn.execute("PRAGMA cache_size").fetchone()[0], -16000)
+
+    def test_confirma_y_revierte(self):
+        with self.pool.conexion() as conn:
+            conn.execute("CREATE TABLE t (valor INTEGER)")
+            conn.execute("INSERT INTO t VALUES (1)")
+
+        with self.assertRaises(RuntimeError):
+            with self.pool.conexion() as conn:
+                conn.execute("INSERT INTO t VALUES (2)")
+                raise RuntimeError("fallo simulado")
+
+        with self.pool.conexion() as conn:
+            self.assertEqual(conn.execute("SELECT COUNT(*) FROM t").fetchone()[0], 1)
+
+    def test_registra_esperas_con_pool_agotado(self):
+        pool = SQLitePool(self.db_path, max_conexiones=1, timeout=2.0)
+        prestada = threading.Event()
+
+        def retener():
+            with pool.conexion():
+                prestada.set()
+                time.sleep(0.1)
+
+        hilo = threading.Thread(target=retener)
+        hilo.start()
+        prestada.wait()
+        with pool.conexion():
+            pass
+        hilo.join()
+
+        stats = pool.estadisticas()
+        self.assertEqual(stats["esperas"], 1)
+        self.assertGreater(stats["tiempo_espera_s"], 0)
+        self.assertEqual(stats["conexiones_creadas"], 1)
+        pool.cerrar()
+
+    def test_timeout_sin_conexiones_libres(self):
+        pool = SQLitePool(self.db_path, max_conexiones=1, timeout=0.05)
+        with pool.conexion():
+            with self.assertRaises(TimeoutError):
+                with pool.conexion():
+                    pass
+        pool.cerrar()
+
+    def test_obtener_pool_compartido(self):
+        self.assertIs(obtener_pool(self.db_path), obtener_pool(self.db_path))
+
+if __name__ == '__main__':
+    unittest.main()
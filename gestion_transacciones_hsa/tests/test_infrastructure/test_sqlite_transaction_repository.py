@@ -1,11 +1,19 @@
 # tests/test_infrastructure/test_sqlite_transaction_repository.py
+import os  # Para la ruta de la base de datos temporal
+import tempfile  # Directorio temporal para la prueba concurrente
+import threading  # Retiros concurrentes
+import types  # Para verificar que los recorridos sean generadores
 import unittest  # Importa el módulo de pruebas unitarias
 import sqlite3   # Importa el módulo para trabajar con SQLite
 from decimal import Decimal  # Para manejar números decimales con precisión
-from datetime import datetime  # Para manejar fechas y tiempos
+from datetime import datetime, timedelta  # Para manejar fechas y tiempos
 from uuid import UUID, uuid4  # Para generar identificadores únicos
 from infrastructure.repositories.sqlite_transaction_repository import SQLiteTransactionRepository  # Importa el repositorio a probar
+from infrastructure.repositories.sqlite_account_repository import SQLiteAccountRepository  # Cuentas para el saldo
+from infrastructure.db.sqlite_pool import SQLitePool  # Pool para la prueba concurrente
+from domain.entities.account import Account  # Entidad de cuenta
 from domain.entities.transaction import Transaction, TransactionType, TransactionState  # Importa las entidades del dominio
+from domain.repositories.proyeccion_transaccion import proyectar  # Proyección de referencia
 
 class TestSQLiteTransactionRepository(unittest.TestCase):  # Define la clase de pruebas
     def setUp(self):  # Método que se ejecuta antes de cada prueba
@@ -127,5 +135,322 @@ class TestSQLiteTransactionRepository(unittest.TestCase):  # Define la clase de
         updated_transaction = self.repository.obtener_por_id(transaction_id)
         self.assertEqual(updated_transaction.estado, TransactionState.APROBADA)
 
+    def test_guardar_lote(self):  # Prueba el guardado por lotes
+        # Arrange: un lote válido con una transacción imposible de serializar
+        transacciones = [self._crear_transaccion_prueba() for _ in range(3)]
+        invalida = self._crear_transaccion_prueba()
+        invalida.monto = None
+        lote = transacciones[:2] + [invalida] + transacciones[2:]
+
+        # Act
+        resultados = self.repository.guardar_lote(lote)
+
+        # Assert: un resultado por elemento, en orden, y solo las válidas persistidas
+        self.assertEqual([r.exito for r in resultados], [True, True, False, True])
+        self.assertEqual(resultados[2].id, invalida.id)
+        for transaccion in transacciones:
+            self.assertEqual(self.repository.obtener_por_id(transaccion.id).monto, transaccion.monto)
+        with self.assertRaises(ValueError):
+            self.repository.obtener_por_id(invalida.id)
+
+    def test_iterar_por_cuenta(self):  # Prueba el recorrido perezoso por cuenta
+        # Arrange: cinco transacciones de la misma cuenta con fechas crecientes
+        cuenta_id = uuid4()
+        inicio = datetime(2024, 1, 1)
+        transacciones = []
+        for dia in range(5):
+            transaccion = self._crear_transaccion_prueba()
+            transaccion.cuenta_id = cuenta_id
+            transaccion.fecha = inicio + timedelta(days=dia)
+            transacciones.append(transaccion)
+        self.repository.guardar_lote(list(reversed(transacciones)))
+        self.repository.guardar(self._crear_transaccion_prueba())  # Otra cuenta
+
+        # Act: lotes de 2 filas para forzar varios fetchmany
+        iterador = self.repository.iterar_por_cuenta(cuenta_id, tamano_lote=2)
+
+        # Assert: es un generador y entrega las transacciones ordenadas por fecha
+        self.assertIsInstance(iterador, types.GeneratorType)
+        self.assertEqual([t.id for t in iterador], [t.id for t in transacciones])
+
+    def test_iterar_proyecciones_por_cuenta(self):  # Proyecciones iguales a las de las entidades
+        # Arrange: montos y estados variados, fechas que cruzan la medianoche
+        cuenta_id = uuid4()
+        inicio = datetime(2024, 1, 1, 23, 59, 59, 999999)
+        for i, monto in enumerate(['0.10', '19.99', '-7.05', '1234567.89', '0.01']):
+            transaccion = self._crear_transaccion_prueba()
+            transaccion.cuenta_id = cuenta_id
+            transaccion.monto = Decimal(monto)
+            transaccion.estado = list(TransactionState)[i % 3]
+            transaccion.fecha = inicio + timedelta(microseconds=i)
+            self.repository.guardar(transaccion)
+
+        # Act
+        proyecciones = list(self.repository.iterar_proyecciones_por_cuenta(cuenta_id, tamano_lote=2))
+
+        # Assert: mismo orden y valores que proyectar() sobre iterar_por_cuenta
+        esperadas = [proyectar(t) for t in self.repository.iterar_por_cuenta(cuenta_id)]
+        self.assertEqual(proyecciones, esperadas)
+        self.assertEqual([p[5] for p in proyecciones], ['2024-01-01'] + ['2024-01-02'] * 4)
+
+    def test_iterar_todos(self):  # Prueba el recorrido perezoso completo
+        self.repository.guardar_lote([self._crear_transaccion_prueba() for _ in range(7)])
+        self.assertEqual(sum(1 for _ in self.repository.iterar_todos(tamano_lote=3)), 7)
+
+    def test_listar_pagina_por_cuenta(self):  # Prueba la paginación por clave
+        # Arrange: cinco transacciones, dos de ellas con la misma fecha
+        cuenta_id = uuid4()
+        inicio = datetime(2024, 1, 1)
+        transacciones = []
+        for i, dia in enumerate([0, 1, 2, 2, 3]):
+            transaccion = self._crear_transaccion_prueba()
+            transaccion.cuenta_id = cuenta_id
+            transaccion.fecha = inicio + timedelta(days=dia)
+            transacciones.append(transaccion)
+        self.repository.guardar_lote(transacciones)
+        esperado = sorted(transacciones, key=lambda t: (t.fecha, str(t.id)), reverse=True)
+
+        # Act: recorre todas las páginas de 2 elementos usando la última clave como cursor
+        paginas, despues = [], None
+        while True:
+            pagina = self.repository.listar_pagina_por_cuenta(cuenta_id, 2, despues)
+            if not pagina:
+                break
+            paginas.append(pagina)
+            despues = (pagina[-1].fecha, pagina[-1].id)
+
+        # Assert: páginas del tamaño pedido, sin repetidos ni saltos, de la más reciente a la más antigua
+        self.assertEqual([len(p) for p in paginas], [2, 2, 1])
+        self.assertEqual([t.id for p in paginas for t in p], [t.id for t in esperado])
+
+    def test_leer_lote_por_cuenta(self):  # Lotes por clave en el orden de iterar_por_cuenta
+        # Arrange: seis transacciones, tres de ellas con la misma fecha (desempate por id)
+        cuenta_id = uuid4()
+        for dia in [0, 1, 1, 1, 2, 3]:
+            transaccion = self._crear_transaccion_prueba()
+            transaccion.cuenta_id = cuenta_id
+            transaccion.fecha = datetime(2024, 1, 1) + timedelta(days=dia)
+            self.repository.guardar(transaccion)
+
+        # Act: cada lote retoma desde la clave del anterior
+        lotes, proyecciones, despues = [], [], None
+        while True:
+            lote, siguiente = self.repository.leer_lote_por_cuenta(cuenta_id, 2, despues)
+            proyecciones += self.repository.leer_lote_proyecciones_por_cuenta(cuenta_id, 2, despues)[0]
+            lotes.append(lote)
+            if siguiente is None:
+                break
+            despues = siguiente
+
+        # Assert: sin repetidos ni saltos; el último lote (vacío aquí) termina el recorrido
+        self.assertEqual([len(l) for l in lotes], [2, 2, 2, 0])
+        esperado = list(self.repository.iterar_por_cuenta(cuenta_id))
+        self.assertEqual([t.id for l in lotes for t in l], [t.id for t in esperado])
+        self.assertEqual(proyecciones, [proyectar(t) for t in esperado])
+
+    def test_pagina_usa_rango_sobre_indice(self):  # Verifica el plan de ejecución
+        plan = " ".join(str(fila[-1]) for fila in self.connection.execute("""
+            EXPLAIN QUERY PLAN
+            SELECT * FROM transacciones_v2 WHERE cuenta_id = ? AND (fecha, id) < (?, ?)
+            ORDER BY fecha DESC, id DESC LIMIT ?
+        """, (uuid4().bytes, 0, uuid4().bytes, 20)))
+        self.assertIn("idx_transacciones_v2_cuenta_fecha", plan)
+        self.assertNotIn("TEMP B-TREE", plan)
+
+    def test_resumir_aprobadas_por_cuenta(self):  # Prueba la agregación por tipo
+        cuenta_id = uuid4()
+        datos = [
+            (Decimal('100.00'), TransactionType.DEPOSITO, TransactionState.APROBADA),
+            (Decimal('50.25'), TransactionType.DEPOSITO, TransactionState.APROBADA),
+            (Decimal('-30.00'), TransactionType.RETIRO, TransactionState.APROBADA),
+            (Decimal('999.00'), TransactionType.DEPOSITO, TransactionState.PENDIENTE),
+            (Decimal('-5.00'), TransactionType.RETIRO, TransactionState.RECHAZADA),
+        ]
+        self.repository.guardar_lote([
+            Transaction(uuid4(), cuenta_id, monto, tipo, estado, datetime.now())
+            for monto, tipo, estado in datos
+        ])
+        self.repository.guardar(self._crear_transaccion_prueba())  # Otra cuenta
+
+        resumen = self.repository.resumir_aprobadas_por_cuenta(cuenta_id)
+
+        self.assertEqual(resumen.num_depositos, 2)
+        self.assertEqual(resumen.monto_depositos, Decimal('150.25'))
+        self.assertEqual(resumen.num_retiros, 1)
+        self.assertEqual(resumen.monto_retiros, Decimal('-30.00'))
+
+    def test_resumen_se_mantiene_en_cada_escritura(self):  # Prueba los triggers de resumen_cuentas
+        cuenta_id = uuid4()
+        deposito = Transaction(uuid4(), cuenta_id, Decimal('80.00'), TransactionType.DEPOSITO,
+                               TransactionState.PENDIENTE, datetime(2024, 1, 5))
+        retiro = Transaction(uuid4(), cuenta_id, Decimal('-20.00'), TransactionType.RETIRO,
+                             TransactionState.APROBADA, datetime(2024, 1, 1))
+        self.repository.guardar(deposito)
+        self.repository.guardar(retiro)
+
+        resumen = self.repository.resumir_aprobadas_por_cuenta(cuenta_id)
+        self.assertEqual((resumen.num_depositos, resumen.num_retiros), (0, 1))
+        self.assertEqual(resumen.num_transacciones, 2)
+        self.assertEqual((resumen.primera_fecha, resumen.ultima_fecha), (datetime(2024, 1, 1), datetime(2024, 1, 5)))
+
+        # Un cambio de estado se refleja sin recalcular el historial
+        deposito.estado = TransactionState.APROBADA
+        self.repository.guardar(deposito)
+        resumen = self.repository.resumir_aprobadas_por_cuenta(cuenta_id)
+        self.assertEqual((resumen.num_depositos, resumen.monto_depositos), (1, Decimal('80.00')))
+        self.assertEqual(resumen.saldo_aprobado, Decimal('60.00'))
+        self.assertEqual(resumen.num_transacciones, 2)
+
+        # Al borrar una fila se recalcula el rango de fechas
+        self.connection.execute("DELETE FROM transacciones_v2 WHERE id = ?", (retiro.id.bytes,))
+        resumen = self.repository.resumir_aprobadas_por_cuenta(cuenta_id)
+        self.assertEqual((resumen.num_retiros, resumen.monto_retiros), (0, Decimal('0.00')))
+        self.assertEqual(resumen.primera_fecha, datetime(2024, 1, 5))
+
+    def test_resumen_cuenta_sin_transacciones(self):
+        resumen = self.repository.resumir_aprobadas_por_cuenta(uuid4())
+        self.assertEqual(resumen.num_transacciones, 0)
+        self.assertEqual(resumen.saldo_promedio, Decimal('0'))
+
+    def _crear_cuenta(self, account_repository, saldo: str) -> Account:
+        cuenta = Account(uuid4(), uuid4(), Decimal(saldo), Decimal('1000.00'))
+        account_repository.guardar(cuenta)
+        return cuenta
+
+    def _retiro(self, cuenta_id, monto: str, estado=TransactionState.APROBADA) -> Transaction:
+        return Transaction(uuid4(), cuenta_id, Decimal(monto), TransactionType.RETIRO, estado, datetime.now())
+
+    def test_registrar_con_saldo(self):  # Saldo y transacción en la misma operación
+        cuentas = SQLiteAccountRepository(connection=self.connection)
+        cuenta = self._crear_cuenta(cuentas, '100.00')
+        retiro = self._retiro(cuenta.id, '-30.00')
+
+        saldo, version = self.repository.registrar_con_saldo(retiro)
+
+        self.assertEqual((saldo, version), (Decimal('70.00'), 2))
+        self.assertEqual(cuentas.obtener_por_id(cuenta.id).saldo, Decimal('70.00'))
+        self.assertEqual(self.repository.obtener_por_id(retiro.id).monto, Decimal('-30.00'))
+
+    def test_registrar_con_saldo_sin_fondos(self):  # El rechazo no deja rastros
+        cuentas = SQLiteAccountRepository(connection=self.connection)
+        cuenta = self._crear_cuenta(cuentas, '20.00')
+        retiro = self._retiro(cuenta.id, '-30.00')
+
+        with self.assertRaises(ValueError) as contexto:
+            self.repository.registrar_con_saldo(retiro)
+
+        self.assertEqual(str(contexto.exception), "Fondos insuficientes para realizar la transacción.")
+        self.assertEqual(cuentas.obtener_por_id(cuenta.id).saldo, Decimal('20.00'))
+        with self.assertRaises(ValueError):
+            self.repository.obtener_por_id(retiro.id)
+
+    def test_registrar_con_saldo_pendiente_y_rechazada(self):  # Se guardan sin mover saldo ni versión
+        cuentas = SQLiteAccountRepository(connection=self.connection)
+        cuenta = self._crear_cuenta(cuentas, '20.00')
+        pendiente = self._retiro(cuenta.id, '-5.00', TransactionState.PENDIENTE)
+        rechazada = self._retiro(cuenta.id, '-30.00', TransactionState.RECHAZADA)  # Sin fondos: igual se guarda
+
+        self.assertEqual(self.repository.registrar_con_saldo(pendiente), (Decimal('20.00'), 1))
+        self.assertEqual(self.repository.registrar_con_saldo(rechazada), (Decimal('20.00'), 1))
+
+        guardada = cuentas.obtener_por_id(cuenta.id)
+        self.assertEqual((guardada.saldo, guardada.version), (Decimal('20.00'), 1))
+        self.assertEqual(self.repository.obtener_por_id(pendiente.id).estado, TransactionState.PENDIENTE)
+        self.assertEqual(self.repository.obtener_por_id(rechazada.id).estado, TransactionState.RECHAZADA)
+
+    def test_registrar_con_saldo_cuenta_inexistente(self):
+        retiro = self._retiro(uuid4(), '-1.00')
+        with self.assertRaises(ValueError) as contexto:
+            self.repository.registrar_con_saldo(retiro)
+        self.assertEqual(str(contexto.exception), f"La cuenta con ID {retiro.cuenta_id} no existe.")
+
+    def test_registrar_lote_con_saldo(self):  # Todas en una transacción, en orden
+        cuentas = SQLiteAccountRepository(connection=self.connection)
+        cuenta = self._crear_cuenta(cuentas, '100.00')
+
+        resultados = self.repository.registrar_lote_con_saldo(
+            [self._retiro(cuenta.id, '-30.00'), self._retiro(cuenta.id, '-50.00')]
+        )
+
+        self.assertEqual(resultados, [(Decimal('70.00'), 2), (Decimal('20.00'), 3)])
+        self.assertEqual(cuentas.obtener_por_id(cuenta.id).saldo, Decimal('20.00'))
+
+    def test_registrar_lote_con_saldo_todo_o_nada(self):  # Un rechazo revierte el lote completo
+        cuentas = SQLiteAccountRepository(connection=self.connection)
+        cuenta = self._crear_cuenta(cuentas, '100.00')
+        primero = self._retiro(cuenta.id, '-80.00')
+
+        with self.assertRaises(ValueError):
+            self.repository.registrar_lote_con_saldo([primero, self._retiro(cuenta.id, '-30.00')])
+
+        self.assertEqual(cuentas.obtener_por_id(cuenta.id).saldo, Decimal('100.00'))
+        with self.assertRaises(ValueError):
+            self.repository.obtener_por_id(primero.id)
+
+class TestRegistroConcurrente(unittest.TestCase):
+    def setUp(self):
+        """Se ejecuta antes de cada prueba: una base en archivo compartida por varios hilos."""
+        self.directorio = tempfile.TemporaryDirectory()
+        self.pool = SQLitePool(os.path.join(self.directorio.name, "saldos.db"))
+        self.repository = SQLiteTransactionRepository(db_path=self.pool.db_path, pool=self.pool)
+        self.cuentas = SQLiteAccountRepository(db_path=self.pool.db_path, pool=self.pool)
+
+    def tearDown(self):
+        """Se ejecuta después de cada prueba."""
+        self.pool.cerrar()
+        self.directorio.cleanup()
+
+    def test_retiros_concurrentes_no_sobregiran(self):
+        cuenta = Account(uuid4(), uuid4(), Decimal('100.00'), Decimal('1000.00'))
+        self.cuentas.guardar(cuenta)
+        exitos, rechazos = [], []
+
+        def retirar():
+            for _ in range(10):
+                retiro = Transaction(uuid4(), cuenta.id, Decimal('-3.00'), TransactionType.RETIRO,
+                                     TransactionState.APROBADA, datetime.now())
+                try:
+                    exitos.append(self.repository.registrar_con_saldo(retiro))
+                except ValueError:
+                    rechazos.append(retiro)
+
+        hilos = [threading.Thread(target=retirar) for _ in range(8)]
+        for hilo in hilos:
+            hilo.start()
+        for hilo in hilos:
+            hilo.join()
+
+        # 100.00 alcanza para 33 retiros de 3.00; el resto se rechaza
+        self.assertEqual((len(exitos), len(rechazos)), (33, 47))
+        final = self.cuentas.obtener_por_id(cuenta.id)
+        self.assertEqual(final.saldo, Decimal('1.00'))
+        self.assertEqual(final.version, 1 + 33)
+        self.assertEqual(len(self.repository.listar_por_cuenta(cuenta.id)), 33)
+        self.assertEqual(sorted(saldo for saldo, _ in exitos)[0], Decimal('1.00'))
+
+    def test_mide_la_espera_del_bloqueo_de_escritura(self):
+        cuenta = Account(uuid4(), uuid4(), Decimal('100.00'), Decimal('1000.00'))
+        self.cuentas.guardar(cuenta)
+        deposito = lambda: Transaction(uuid4(), cuenta.id, Decimal('1.00'), TransactionType.DEPOSITO,
+                                       TransactionState.APROBADA, datetime.now())
+        self.repository.registrar_con_saldo(deposito())
+        self.assertEqual(self.repository.estadisticas_bloqueo()["esperas"], 0)
+
+        # Otra conexión retiene el bloqueo de escritura: SQLite espera dentro de busy_timeout
+        otra = sqlite3.connect(self.pool.db_path, isolation_level=None, check_same_thread=False)
+        otra.execute("BEGIN IMMEDIATE")
+        liberar = threading.Timer(0.1, otra.execute, ("COMMIT",))
+        liberar.start()
+        try:
+            self.repository.registrar_con_saldo(deposito())
+        finally:
+            liberar.join()
+            otra.close()
+
+        estadisticas = self.repository.estadisticas_bloqueo()
+        self.assertEqual((estadisticas["bloqueos"], estadisticas["esperas"]), (2, 1))
+        self.assertGreaterEqual(estadisticas["max_espera_s"], 0.05)
+        self.assertGreaterEqual(estadisticas["tiempo_espera_s"], estadisticas["max_espera_s"])
+
 if __name__ == '__main__':
     unittest.main()  # Ejecuta las pruebas si se corre el archivo directamente
\ No newline at end of file
@@ -0,0 +1,105 @@
+# tests/test_infrastructure/test_trazador_sql.py
+import os
+import tempfile
+import unittest
+from decimal import Decimal
+from uuid import uuid4
+from domain.entities.account import Account
+from infrastructure.db.sqlite_pool import SQLitePool, cerrar_pools, instalar_trazador, obtener_pool
+from infrastructure.db.trazador_sql import ConexionTrazada, TrazadorSQL, huella_sql, redactar
+from infrastructure.repositories.sqlite_account_repository import SQLiteAccountRepository
+
+class TestTrazadorSQL(unittest.TestCase):
+    def setUp(self):
+        """Se ejecuta antes de cada prueba."""
+        self.directorio = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.directorio.name, "trazas.db")
+        self.trazador = TrazadorSQL(umbral_ms=10_000)
+        self.pool = SQLitePool(self.db_path, trazador=self.trazador)
+        with self.pool.conexion() as conn:
+            conn.execute("CREATE TABLE cuentas (id INTEGER PRIMARY KEY, usuario_id TEXT, saldo INTEGER)")
+            conn.executemany("INSERT INTO cuentas (usuario_id, saldo) VALUES (?, ?)", ((f"u{i}", i) for i in range(50)))
+        self.trazador.reiniciar()
+
+    def tearDown(self):
+        """Se ejecuta después de cada prueba."""
+        self.pool.cerrar()
+        instalar_trazador(None)
+        cerrar_pools()
+        self.directorio.cleanup()
+
+    def _estadistica(self, prefijo: str) -> dict:
+        return next(fila for fila in self.trazador.volcar() if fila["huella"].startswith(prefijo))
+
+    def test_huella_normaliza_literales_y_listas(self):
+        self.assertEqual(
+            huella_sql("SELECT *\n  FROM t WHERE a = 'x''y' AND b IN (?, ?,?) AND c > 10.5 AND t2 = x'0A';"),
+            "SELECT * FROM t WHERE a = ? AND b IN (?+) AND c > ? AND t2 = ?"
+        )
+        self.assertEqual(huella_sql("INSERT INTO t VALUES (?, ?), (?, ?), (?, ?)"), "INSERT INTO t VALUES (?+)")
+        self.assertEqual(huella_sql("SELECT col1 FROM t2"), "SELECT col1 FROM t2")
+
+    def test_redacta_los_parametros(self):
+        self.assertEqual(redactar((b"\x00" * 16, 1500, "secreto", None)), "(bytes[16], int, str[7], NoneType)")
+        self.assertEqual(redactar({"clave": "secreto"}), "{clave: str[7]}")
+
+    def test_avisa_una_vez_del_filtro_sin_indice(self):
+        with self.assertLogs("infrastructure.db.trazador_sql", level="WARNING") as registros:
+            with self.pool.conexion() as conn:
+                for i in range(3):
+                    conn.execute("SELECT * FROM cuentas WHERE usuario_id = ?", (f"u{i}",)).fetchall()
+                conn.execute("SELECT * FROM cuentas WHERE id = ?", (1,)).fetchall()
+                conn.execute("SELECT COUNT(*) FROM cuentas").fetchall()
+
+        self.assertEqual(len(registros.output), 1)
+        self.assertIn("SELECT * FROM cuentas WHERE usuario_id = ?", registros.output[0])
+        self.assertIn("SCAN cuentas", registros.output[0])
+        escaneo = self._estadistica("SELECT * FROM cuentas WHERE usuario_id")
+        self.assertEqual((escaneo["llamadas"], escaneo["escaneo"]), (3, True))
+        self.assertFalse(self._estadistica("SELECT * FROM cuentas WHERE id")["escaneo"])
+        self.assertFalse(self._estadistica("SELECT COUNT(*)")["escaneo"])
+
+    def test_sentencia_lenta_sin_valores_de_parametros(self):
+        self.trazador.umbral = 0.0
+        with self.assertLogs("infrastructure.db.trazador_sql", level="WARNING") as registros:
+            with self.pool.conexion() as conn:
+                conn.execute("UPDATE cuentas SET saldo = saldo + ? WHERE id = ?", (987654, 1))
+
+        lenta = next(linea for linea in registros.output if "Sentencia lenta" in linea)
+        self.assertIn("parámetros=(int, int)", lenta)
+        self.assertIn("USING INTEGER PRIMARY KEY", lenta)
+        self.assertNotIn("987654", lenta)
+        self.assertEqual(self._estadistica("UPDATE cuentas")["lentas"], 1)
+
+    def test_cuenta_las_sentencias_de_los_triggers(self):
+        with self.pool.conexion() as conn:
+            conn.execute("CREATE TABLE auditoria (cuenta_id INTEGER)")
+            conn.execute("CREATE TRIGGER trg AFTER UPDATE ON cuentas BEGIN INSERT INTO auditoria VALUES (NEW.id); END")
+        with self.pool.conexion() as conn:
+            conn.execute("UPDATE cuentas SET saldo = 0 WHERE id = ?", (1,))
+
+        # BEGIN implícito, el UPDATE y el INSERT del trigger
+        self.assertGreaterEqual(self._estadistica("UPDATE cuentas")["sentencias_por_llamada"], 2)
+
+    def test_pools_creados_con_el_trazador_instalado(self):
+        instalar_trazador(self.trazador)
+        repositorio = SQLiteAccountRepository(db_path=os.path.join(self.directorio.name, "repo.db"))
+        cuenta = Account(id=uuid4(), usuario_id=uuid4(), saldo=Decimal("10"), limite_diario=Decimal("100"))
+        repositorio.guardar(cuenta)
+        repositorio.obtener_por_id(cuenta.id)
+
+        with repositorio._pool.conexion() as conn:
+            self.assertIsInstance(conn, ConexionTrazada)
+        self.assertEqual(self._estadistica("SELECT * FROM cuentas_v2 WHERE id")["llamadas"], 1)
+        self.assertIn("SELECT * FROM cuentas_v2 WHERE id", self.trazador.formatear(limite=100))
+        instalar_trazador(None)
+        with obtener_pool(os.path.join(self.directorio.name, "otra.db")).conexion() as conn:
+            self.assertNotIsInstance(conn, ConexionTrazada)
+
+    def test_desde_entorno(self):
+        self.assertIsNone(TrazadorSQL.desde_entorno({}))
+        trazador = TrazadorSQL.desde_entorno({"HSA_SQL_LENTAS_MS": "25", "HSA_SQL_PLANES": "0"})
+        self.assertEqual((trazador.umbral, trazador.planes), (0.025, False))
+
+if __name__ == "__main__":
+    unittest.main()